@@ -0,0 +1,201 @@
+## @file
+# Serve a binary cache directory over HTTP for build --binary-source/--binary-destination
+#
+# The directory has the layout written by build into a local binary cache:
+# objects/<xx>/<sha256> for the output files and <module path>.manifest for
+# the modules, so the same directory can be used both locally and remotely.
+#
+#   GET  /manifests?prefix=<path>   all manifests under a path, as one JSON object
+#   POST /manifests                 store the manifests of a JSON object
+#   POST /objects/missing           return the digests of a JSON list not stored
+#   GET  /objects/<digest>          read an object
+#   PUT  /objects/<digest>          store an object, checked against its digest
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+#
+
+'''
+BinCacheServer
+'''
+from __future__ import print_function
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+import tempfile
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from socketserver import ThreadingMixIn
+from urllib.parse import urlparse, parse_qs
+
+#
+# Globals for help information
+#
+__prog__        = 'BinCacheServer'
+__copyright__   = 'Copyright (c) 2020, Intel Corporation. All rights reserved.'
+__description__ = 'Serve an EDK II binary cache directory over HTTP.\n'
+
+OBJECT_DIR = "objects"
+MANIFEST_SUFFIX = ".manifest"
+DigestPattern = re.compile(r"^[0-9a-f]{64}$")
+
+def TempName(FilePath):
+    Fd, TempFile = tempfile.mkstemp(dir=os.path.dirname(FilePath), prefix=".tmp")
+    os.close(Fd)
+    return TempFile
+
+class CacheRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, Format, *Args):
+        if not self.server.Quiet:
+            BaseHTTPRequestHandler.log_message(self, Format, *Args)
+
+    def SendData(self, Data, ContentType="application/json", Code=200):
+        self.send_response(Code)
+        self.send_header("Content-Type", ContentType)
+        self.send_header("Content-Length", str(len(Data)))
+        self.end_headers()
+        self.wfile.write(Data)
+
+    def SendJson(self, Value):
+        self.SendData(json.dumps(Value).encode("utf-8"))
+
+    def SendError(self, Code, Message):
+        self.SendData(Message.encode("utf-8"), "text/plain", Code)
+
+    def ReadBody(self):
+        Length = int(self.headers.get("Content-Length", 0))
+        return self.rfile.read(Length) if Length else b""
+
+    ## Convert a manifest key to a path in the cache, None if it's not valid
+    def ManifestPath(self, Key):
+        Parts = Key.split("/")
+        if not Key.endswith(MANIFEST_SUFFIX) or any(Part in ("", ".", "..") for Part in Parts) or Parts[0] == OBJECT_DIR:
+            return None
+        return os.path.join(self.server.Root, *Parts)
+
+    def ObjectPath(self, Digest):
+        if not DigestPattern.match(Digest):
+            return None
+        return os.path.join(self.server.Root, OBJECT_DIR, Digest[:2], Digest)
+
+    def do_GET(self):
+        Url = urlparse(self.path)
+        if Url.path == "/manifests":
+            Prefix = parse_qs(Url.query).get("prefix", [""])[0].strip("/")
+            if any(Part in (".", "..") for Part in Prefix.split("/")):
+                return self.SendError(400, "Invalid prefix")
+            Manifests = {}
+            Top = os.path.join(self.server.Root, *Prefix.split("/")) if Prefix else self.server.Root
+            for Root, Dirs, Files in os.walk(Top):
+                if os.path.normcase(Root) == os.path.normcase(os.path.join(self.server.Root, OBJECT_DIR)):
+                    Dirs[:] = []
+                    continue
+                for File in Files:
+                    if not File.endswith(MANIFEST_SUFFIX):
+                        continue
+                    FilePath = os.path.join(Root, File)
+                    try:
+                        with open(FilePath, "r") as Fd:
+                            Manifests[os.path.relpath(FilePath, self.server.Root).replace(os.sep, "/")] = json.load(Fd)
+                    except (IOError, OSError, ValueError):
+                        continue
+            return self.SendJson(Manifests)
+
+        if Url.path.startswith("/objects/"):
+            ObjectFile = self.ObjectPath(Url.path[len("/objects/"):])
+            if ObjectFile is None:
+                return self.SendError(400, "Invalid digest")
+            try:
+                with open(ObjectFile, "rb") as Fd:
+                    Data = Fd.read()
+            except (IOError, OSError):
+                return self.SendError(404, "Not found")
+            return self.SendData(Data, "application/octet-stream")
+        self.SendError(404, "Not found")
+
+    def do_POST(self):
+        Url = urlparse(self.path)
+        try:
+            Value = json.loads(self.ReadBody().decode("utf-8"))
+        except ValueError:
+            return self.SendError(400, "Invalid JSON")
+
+        if Url.path == "/objects/missing":
+            if not isinstance(Value, list):
+                return self.SendError(400, "Expect a list of digests")
+            Missing = []
+            for Digest in Value:
+                ObjectFile = self.ObjectPath(str(Digest))
+                if ObjectFile is None or not os.path.isfile(ObjectFile):
+                    Missing.append(Digest)
+            return self.SendJson(Missing)
+
+        if Url.path == "/manifests":
+            if not isinstance(Value, dict):
+                return self.SendError(400, "Expect an object of manifests")
+            for Key, Manifest in Value.items():
+                ManifestFile = self.ManifestPath(Key)
+                if ManifestFile is None:
+                    return self.SendError(400, "Invalid manifest path %s" % Key)
+                if not os.path.isdir(os.path.dirname(ManifestFile)):
+                    os.makedirs(os.path.dirname(ManifestFile))
+                TempFile = TempName(ManifestFile)
+                with open(TempFile, "w") as Fd:
+                    json.dump(Manifest, Fd, indent=1, sort_keys=True)
+                os.replace(TempFile, ManifestFile)
+            return self.SendJson(len(Value))
+        self.SendError(404, "Not found")
+
+    def do_PUT(self):
+        Url = urlparse(self.path)
+        if not Url.path.startswith("/objects/"):
+            return self.SendError(404, "Not found")
+        Digest = Url.path[len("/objects/"):]
+        ObjectFile = self.ObjectPath(Digest)
+        if ObjectFile is None:
+            return self.SendError(400, "Invalid digest")
+        Data = self.ReadBody()
+        if hashlib.sha256(Data).hexdigest() != Digest:
+            return self.SendError(400, "Digest mismatch")
+        if not os.path.isfile(ObjectFile):
+            if not os.path.isdir(os.path.dirname(ObjectFile)):
+                os.makedirs(os.path.dirname(ObjectFile), exist_ok=True)
+            TempFile = TempName(ObjectFile)
+            with open(TempFile, "wb") as Fd:
+                Fd.write(Data)
+            os.chmod(TempFile, 0o444)
+            os.replace(TempFile, ObjectFile)
+        self.SendJson(Digest)
+
+class CacheServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, Address, Root, Quiet=False):
+        HTTPServer.__init__(self, Address, CacheRequestHandler)
+        self.Root = os.path.abspath(Root)
+        self.Quiet = Quiet
+
+if __name__ == '__main__':
+    Parser = argparse.ArgumentParser(prog=__prog__, description=__description__ + __copyright__)
+    Parser.add_argument("CacheDir", help="The binary cache directory to serve.")
+    Parser.add_argument("--host", dest="Host", default="127.0.0.1", help="The address to listen on, default 127.0.0.1.")
+    Parser.add_argument("--port", dest="Port", type=int, default=8080, help="The port to listen on, 0 for any free port. Default 8080.")
+    Parser.add_argument("-q", "--quiet", dest="Quiet", action="store_true", help="Do not log the requests.")
+    Args = Parser.parse_args()
+
+    if not os.path.isdir(Args.CacheDir):
+        os.makedirs(Args.CacheDir)
+    Server = CacheServer((Args.Host, Args.Port), Args.CacheDir, Args.Quiet)
+    # the first line tells the port, useful with --port 0
+    print("Serving %s on http://%s:%d/" % (Server.Root, Args.Host, Server.server_address[1]))
+    sys.stdout.flush()
+    try:
+        Server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    Server.server_close()
@@ -0,0 +1,108 @@
+## @file
+# Compare the build output pump with the former reader threads
+#
+# Runs many short-lived make jobs, a given number at a time, and redirects
+# their output either with two reader threads per job, as build formerly did,
+# or with the single selector loop of Common.OutputPump.
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+#
+
+'''
+OutputPumpBenchmark
+'''
+from __future__ import print_function
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+from subprocess import Popen, PIPE
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Source', 'Python'))
+from Common.OutputPump import OutputPump, ReadMessage
+
+#
+# Globals for help information
+#
+__prog__        = 'OutputPumpBenchmark'
+__copyright__   = 'Copyright (c) 2020, Intel Corporation. All rights reserved.'
+__description__ = 'Compare the build output pump with two reader threads per command.\n'
+
+## Count the lines and the calls of a logger
+#
+class Collector(object):
+    def __init__(self):
+        self.Lines = 0
+        self.Calls = 0
+        self.Lock = threading.Lock()
+
+    def __call__(self, Message):
+        with self.Lock:
+            self.Calls += 1
+            self.Lines += Message.count("\n") + 1
+
+## Run Jobs make invocations, at most Parallel at a time, with the given launcher
+#
+def RunMakeJobs(Launch, Jobs, Parallel, MakeDir):
+    Sem = threading.BoundedSemaphore(Parallel)
+    Workers = []
+    def Job(Index):
+        try:
+            Launch("make -s -C %s JOB=%d" % (MakeDir, Index))
+        finally:
+            Sem.release()
+    for Index in range(Jobs):
+        Sem.acquire()
+        Th = threading.Thread(target=Job, args=(Index,))
+        Th.start()
+        Workers.append(Th)
+    for Th in Workers:
+        Th.join()
+
+def LaunchWithThreads(Command, Sink):
+    Proc = Popen(Command, stdout=PIPE, stderr=PIPE, bufsize=-1, shell=True)
+    ExitFlag = threading.Event()
+    Readers = [threading.Thread(target=ReadMessage, args=(Stream, Sink, ExitFlag)) for Stream in (Proc.stdout, Proc.stderr)]
+    for Th in Readers:
+        Th.start()
+    Proc.wait()
+    for Th in Readers:
+        Th.join()
+
+def LaunchWithPump(Command, Sink):
+    Proc = Popen(Command, stdout=PIPE, stderr=PIPE, bufsize=-1, shell=True)
+    Watch = OutputPump.Get().Watch(Proc, Sink, Sink)
+    Proc.wait()
+    Watch.Wait()
+
+def Benchmark(Jobs, Parallel):
+    MakeDir = tempfile.mkdtemp()
+    try:
+        with open(os.path.join(MakeDir, "GNUmakefile"), "w") as MakeFile:
+            MakeFile.write("all:\n")
+            for Index in range(20):
+                MakeFile.write("\t@echo \"job $(JOB) step %d\"\n" % Index)
+        for Name, Launch in (("threads", LaunchWithThreads), ("pump", LaunchWithPump)):
+            Sink = Collector()
+            Start = time.time()
+            RunMakeJobs(lambda Command: Launch(Command, Sink), Jobs, Parallel, MakeDir)
+            print("%-8s %d jobs, -n %d: %.2fs, %d lines, %d logger calls" %
+                  (Name, Jobs, Parallel, time.time() - Start, Sink.Lines, Sink.Calls))
+    finally:
+        shutil.rmtree(MakeDir, True)
+
+if __name__ == '__main__':
+    Parser = argparse.ArgumentParser(prog=__prog__, description=__description__ + __copyright__)
+    Parser.add_argument("-j", "--jobs", dest="Jobs", type=int, default=512, help="The number of make jobs, default 512.")
+    Parser.add_argument("-n", "--parallel", dest="Parallel", type=int, default=64, help="The number of make jobs running at a time, default 64.")
+    Args = Parser.parse_args()
+
+    if not shutil.which("make"):
+        print("make is not found in PATH")
+        sys.exit(1)
+    Benchmark(Args.Jobs, Args.Parallel)
@@ -14,6 +14,7 @@ import Common.GlobalData as GlobalData
 import Common.EdkLogger as EdkLogger
 import os
 from Common.MultipleWorkspace import MultipleWorkspace as mws
+from Common.FileIndex import FileIndex
 from AutoGen.AutoGen import AutoGen
 from Workspace.WorkspaceDatabase import BuildDB
 try:
@@ -23,6 +24,7 @@ except:
 import traceback
 import sys
 from AutoGen.DataPipe import MemoryDataPipe
+from Common import BuildTrace
 import logging
 
 def clearQ(q):
@@ -163,6 +165,7 @@ class AutoGenWorkerInProcess(mp.Process):
             if not loglevel:
                 loglevel = EdkLogger.INFO
             EdkLogger.SetLevel(loglevel)
+            BuildTrace.Initialize(self.data_pipe.Get("TraceFile"), "AutoGen worker", IsWorker=True)
             target = self.data_pipe.Get("P_Info").get("Target")
             toolchain = self.data_pipe.Get("P_Info").get("ToolChain")
             archlist = self.data_pipe.Get("P_Info").get("ArchList")
@@ -171,6 +174,7 @@ class AutoGenWorkerInProcess(mp.Process):
             workspacedir = self.data_pipe.Get("P_Info").get("WorkspaceDir")
             PackagesPath = os.getenv("PACKAGES_PATH")
             mws.setWs(workspacedir, PackagesPath)
+            GlobalData.gAllFiles = FileIndex(workspacedir, mws.getPkgPath())
             self.Wa = WorkSpaceInfo(
                 workspacedir,active_p,target,toolchain,archlist
                 )
@@ -182,6 +186,7 @@ class AutoGenWorkerInProcess(mp.Process):
             GlobalData.gDisableIncludePathCheck = False
             GlobalData.gFdfParser = self.data_pipe.Get("FdfParser")
             GlobalData.gDatabasePath = self.data_pipe.Get("DatabasePath")
+            GlobalData.gPackageHash = self.data_pipe.Get("PackageHash") or {}
             pcd_from_build_option = []
             for pcd_tuple in self.data_pipe.Get("BuildOptPcd"):
                 pcd_id = ".".join((pcd_tuple[0],pcd_tuple[1]))
@@ -206,6 +211,7 @@ class AutoGenWorkerInProcess(mp.Process):
                 module_file,module_root,module_path,module_basename,module_originalpath,module_arch,IsLib = self.module_queue.get_nowait()
                 modulefullpath = os.path.join(module_root,module_file)
                 taskname = " : ".join((modulefullpath,module_arch))
+                TaskStart = BuildTrace.Now()
                 module_metafile = PathClass(module_file,module_root)
                 if module_path:
                     module_metafile.Path = module_path
@@ -225,12 +231,14 @@ class AutoGenWorkerInProcess(mp.Process):
                         Ma.ReferenceModules = Refes[(Ma.MetaFile.File,Ma.MetaFile.Root,Ma.Arch,Ma.MetaFile.Path)]
                 Ma.CreateCodeFile(False)
                 Ma.CreateMakeFile(False,GenFfsList=FfsCmd.get((Ma.MetaFile.File, Ma.Arch),[]))
+                BuildTrace.Complete(taskname, "autogen", TaskStart, BuildTrace.Now())
         except Empty:
             pass
         except:
             traceback.print_exc(file=sys.stdout)
             self.feedback_q.put(taskname)
         finally:
+            BuildTrace.SavePart()
             self.feedback_q.put("Done")
     def printStatus(self):
         print("Processs ID: %d Run %d modules in AutoGen " % (os.getpid(),len(AutoGen.Cache())))
@@ -0,0 +1,645 @@
+## @file
+# Content addressed object store for the binary cache
+#
+# Every file put in the binary cache is stored once, in objects/<xx>/<digest>
+# under the cache root, whatever module or platform produced it. The cache
+# directory of a module only holds a manifest which maps the module output
+# files to object digests. A cache hit restores the outputs by cloning
+# (reflink) or hard-linking the objects, so it costs one link per file
+# instead of a copy of the file content.
+#
+# The last use of each manifest is kept in an LRU index, index.json, which
+# Prune() uses to remove the least recently used modules when the cache is
+# over its size limit. This file can also be run as a script:
+#
+#   python -m AutoGen.BinaryCache prune <CacheDir> --max-size <MB>
+#
+# The cache may also be an http:// URL served by BaseTools/Scripts/BinCacheServer.py.
+# Manifests and objects are then fetched into, and pushed from, a local
+# mirror of the cache under Conf/.cache/BinCache.
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+#
+
+## Import Modules
+#
+from __future__ import absolute_import
+import os
+import sys
+import time
+import json
+import shutil
+import hashlib
+import tempfile
+import argparse
+import threading
+import http.client
+from urllib.parse import urlparse, quote
+from concurrent.futures import ThreadPoolExecutor
+from Common.LongFilePathSupport import OpenLongFilePath as open
+from Common.BuildToolError import *
+from Common.Misc import CreateDirectory
+import Common.EdkLogger as EdkLogger
+import Common.GlobalData as GlobalData
+
+## Directory of the objects under the cache root
+OBJECT_DIR = "objects"
+## Suffix of the module manifest file, <ModuleName>.manifest
+MANIFEST_SUFFIX = ".manifest"
+## Suffix of the file listing the hard-linked outputs, <ModuleName>.cachelinks
+LINK_LIST_SUFFIX = ".cachelinks"
+## LRU index file under the cache root
+INDEX_FILE = "index.json"
+## Unreferenced objects younger than this may belong to a build in progress
+PRUNE_GRACE_TIME = 3600
+
+## Reasons of a cache miss
+MISS_NOT_CACHED = "not in cache"
+MISS_OBJECT_MISSING = "objects pruned"
+MISS_PLATFORM = "platform or PCD setting changed"
+MISS_PACKAGE = "package changed"
+MISS_LIBRARY = "library changed"
+MISS_SOURCE = "source changed"
+MISS_UNKNOWN = "hash changed"
+
+## Number of concurrent transfers with a remote cache
+REMOTE_TRANSFER_THREADS = 8
+## Timeout of the requests to a remote cache, in seconds
+REMOTE_TIMEOUT = 60
+
+## Linux ioctl cloning a file, _IOW(0x94, 9, int)
+_FICLONE = 0x40049409
+
+## How a file is restored from the object store
+LINK_CLONE = "clone"
+LINK_HARD = "hardlink"
+LINK_COPY = "copy"
+
+## Return the digest of the content of a file
+def FileDigest(FilePath):
+    Hash = hashlib.sha256()
+    with open(FilePath, "rb") as Fd:
+        while True:
+            Chunk = Fd.read(0x100000)
+            if not Chunk:
+                break
+            Hash.update(Chunk)
+    return Hash.hexdigest()
+
+## Clone a file with copy-on-write, if the file system supports it
+#
+#   @retval True        The file is cloned
+#   @retval False       Cloning is not supported
+#
+def _CloneFile(SrcFile, DstFile):
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+    try:
+        with open(SrcFile, "rb") as Src, open(DstFile, "wb") as Dst:
+            fcntl.ioctl(Dst.fileno(), _FICLONE, Src.fileno())
+        return True
+    except (IOError, OSError):
+        if os.path.exists(DstFile):
+            os.remove(DstFile)
+        return False
+
+## Create a temporary name in the directory of the given file
+def _TempName(DstFile):
+    Fd, TempFile = tempfile.mkstemp(dir=os.path.dirname(DstFile), prefix=".tmp")
+    os.close(Fd)
+    os.remove(TempFile)
+    return TempFile
+
+## ObjectStore class
+#
+#  The objects are read-only and never change once stored. Files are moved in
+#  place with os.replace, so concurrent builds sharing the cache only ever see
+#  complete objects.
+#
+class ObjectStore(object):
+    def __init__(self, CacheRoot):
+        self.Root = os.path.join(CacheRoot, OBJECT_DIR)
+
+    def ObjectPath(self, Digest):
+        return os.path.join(self.Root, Digest[:2], Digest)
+
+    def Has(self, Digest):
+        return os.path.isfile(self.ObjectPath(Digest))
+
+    ## Store a file
+    #
+    #   @param  FilePath        The file to store
+    #
+    #   @retval string          The digest of the file
+    #
+    def Put(self, FilePath):
+        Digest = FileDigest(FilePath)
+        ObjectFile = self.ObjectPath(Digest)
+        if os.path.isfile(ObjectFile):
+            return Digest
+        CreateDirectory(os.path.dirname(ObjectFile))
+        TempFile = _TempName(ObjectFile)
+        try:
+            # outputs are copied, never linked, since the build may rewrite them
+            if not _CloneFile(FilePath, TempFile):
+                shutil.copyfile(FilePath, TempFile)
+            os.chmod(TempFile, 0o444)
+            os.replace(TempFile, ObjectFile)
+        except (IOError, OSError) as X:
+            if os.path.exists(TempFile):
+                os.remove(TempFile)
+            EdkLogger.error("build", FILE_COPY_FAILURE, ExtraData="%s: %s" % (FilePath, X))
+        return Digest
+
+    ## Restore an object to a file
+    #
+    #   @param  Digest          The digest of the object
+    #   @param  DstFile         The file to create or replace
+    #
+    #   @retval string          LINK_CLONE, LINK_HARD or LINK_COPY
+    #
+    def Restore(self, Digest, DstFile):
+        ObjectFile = self.ObjectPath(Digest)
+        CreateDirectory(os.path.dirname(DstFile))
+        if os.path.isfile(DstFile) and os.path.samefile(ObjectFile, DstFile):
+            return LINK_HARD
+        TempFile = _TempName(DstFile)
+        try:
+            if _CloneFile(ObjectFile, TempFile):
+                How = LINK_CLONE
+            else:
+                try:
+                    os.link(ObjectFile, TempFile)
+                    How = LINK_HARD
+                except (AttributeError, OSError):
+                    shutil.copyfile(ObjectFile, TempFile)
+                    How = LINK_COPY
+            os.replace(TempFile, DstFile)
+        except (IOError, OSError) as X:
+            if os.path.exists(TempFile):
+                os.remove(TempFile)
+            EdkLogger.error("build", FILE_COPY_FAILURE, ExtraData="%s: %s" % (DstFile, X))
+        return How
+
+## Save the manifest of a module in the cache
+#
+#   @param  ManifestFile    The manifest file path
+#   @param  ModuleHash      The hash of the module, as in <ModuleName>.hash
+#   @param  Files           The dict of output file path, relative to the
+#                           module output directory, to object digest
+#   @param  Inputs          The digests the module hash is made of, see
+#                           ModuleAutoGen.GenModuleHash
+#   @param  Preflight       The hash used for lookup before AutoGen, see
+#                           ModuleAutoGen.PreflightHash
+#
+def SaveManifest(ManifestFile, ModuleHash, Files, Inputs=None, Preflight=None):
+    CreateDirectory(os.path.dirname(ManifestFile))
+    TempFile = _TempName(ManifestFile)
+    with open(TempFile, "w") as Fd:
+        json.dump({"Hash" : ModuleHash, "Files" : Files, "Inputs" : Inputs or {}, "Preflight" : Preflight},
+                  Fd, indent=1, sort_keys=True)
+    os.replace(TempFile, ManifestFile)
+
+## Load the manifest of a module in the cache
+#
+#   @retval dict            The manifest with "Hash", "Files", "Inputs" and
+#                           "Preflight", or None if there's no valid manifest
+#
+def LoadManifest(ManifestFile):
+    if not os.path.isfile(ManifestFile):
+        return None
+    try:
+        with open(ManifestFile, "r") as Fd:
+            Manifest = json.load(Fd)
+        if not isinstance(Manifest["Hash"], str) or not isinstance(Manifest["Files"], dict):
+            return None
+        Manifest.setdefault("Inputs", {})
+        Manifest.setdefault("Preflight", None)
+        return Manifest
+    except (IOError, OSError, ValueError, KeyError, TypeError):
+        return None
+
+## Explain why the cached module doesn't match the module to build
+#
+#   @param  Manifest        The manifest in cache, or None
+#   @param  Inputs          The hash inputs of the module to build
+#
+#   @retval string          One of the MISS_* reasons
+#
+def GetMissReason(Manifest, Inputs):
+    if Manifest is None:
+        return MISS_NOT_CACHED
+    Cached = Manifest["Inputs"]
+    if not Cached or not Inputs:
+        return MISS_UNKNOWN
+    if Cached.get("Platform") != Inputs.get("Platform"):
+        return MISS_PLATFORM
+    if Cached.get("Package") != Inputs.get("Package"):
+        return MISS_PACKAGE
+    if Cached.get("Library") != Inputs.get("Library"):
+        return MISS_LIBRARY
+    if Cached.get("Source") != Inputs.get("Source"):
+        return MISS_SOURCE
+    return MISS_UNKNOWN
+
+## Format the per-build summary of cache lookups
+#
+#   @param  Lookups         The dict of module to None for a hit, or a miss reason
+#
+#   @retval list            Lines of the summary
+#
+def SummarizeLookups(Lookups):
+    Hits = sum(1 for Reason in Lookups.values() if Reason is None)
+    Reasons = {}
+    for Reason in Lookups.values():
+        if Reason is not None:
+            Reasons[Reason] = Reasons.get(Reason, 0) + 1
+    Lines = ["Binary cache: %d hit(s), %d miss(es)" % (Hits, len(Lookups) - Hits)]
+    for Reason in sorted(Reasons, key=lambda x: (-Reasons[x], x)):
+        Lines.append("    %-32s %d" % (Reason, Reasons[Reason]))
+    return Lines
+
+## Remember the outputs of a module which share their inode with the cache
+def SaveLinkList(BuildDir, ModuleName, FileList):
+    LinkFile = os.path.join(BuildDir, ModuleName + LINK_LIST_SUFFIX)
+    if not FileList:
+        if os.path.exists(LinkFile):
+            os.remove(LinkFile)
+        return
+    with open(LinkFile, "w") as Fd:
+        Fd.write("\n".join(FileList))
+
+## Give private copies to the outputs restored as hard links
+#
+# A module which is going to be built again may rewrite its outputs in place,
+# which would change the objects of the cache through the hard links.
+#
+def UnshareLinkedFiles(BuildDir, ModuleName):
+    LinkFile = os.path.join(BuildDir, ModuleName + LINK_LIST_SUFFIX)
+    if not os.path.exists(LinkFile):
+        return
+    with open(LinkFile, "r") as Fd:
+        FileList = Fd.read().splitlines()
+    for File in FileList:
+        try:
+            if os.stat(File).st_nlink < 2:
+                continue
+            TempFile = _TempName(File)
+            shutil.copyfile(File, TempFile)
+            os.replace(TempFile, File)
+        except (IOError, OSError):
+            continue
+    os.remove(LinkFile)
+
+## CacheManager class
+#
+#  This class keeps the LRU index of a cache and removes the least recently
+#  used modules, and the objects nobody refers to any more, from it.
+#
+class CacheManager(object):
+    def __init__(self, CacheRoot):
+        self.Root = CacheRoot
+        self.Store = ObjectStore(CacheRoot)
+        self._Used = {}
+
+    def _IndexKey(self, ManifestFile):
+        return os.path.relpath(ManifestFile, self.Root).replace(os.sep, "/")
+
+    ## Return the manifest of a module, None if the module is not in cache
+    def GetManifest(self, ManifestFile):
+        return LoadManifest(ManifestFile)
+
+    ## Make sure the given objects are in the local store
+    #
+    #   @retval True        All the objects are available
+    #
+    def FetchObjects(self, Digests):
+        return all(self.Store.Has(Digest) for Digest in Digests)
+
+    ## Make a manifest just written to the store available to other builds
+    def Publish(self, ManifestFile):
+        pass
+
+    ## Record the use of a module manifest, written to the index by Flush()
+    def Touch(self, ManifestFile):
+        self._Used[self._IndexKey(ManifestFile)] = time.time()
+
+    def LoadIndex(self):
+        try:
+            with open(os.path.join(self.Root, INDEX_FILE), "r") as Fd:
+                Index = json.load(Fd)
+            if isinstance(Index, dict):
+                return Index
+        except (IOError, OSError, ValueError):
+            pass
+        return {}
+
+    def _SaveIndex(self, Index):
+        IndexFile = os.path.join(self.Root, INDEX_FILE)
+        TempFile = _TempName(IndexFile)
+        with open(TempFile, "w") as Fd:
+            json.dump(Index, Fd, indent=1, sort_keys=True)
+        os.replace(TempFile, IndexFile)
+
+    ## Merge the uses recorded in this build into the index
+    #
+    # Builds sharing the cache may flush at the same time and lose some of
+    # the updates of each other, in which case the manifest time is used.
+    #
+    def Flush(self):
+        if not self._Used or not os.path.isdir(self.Root):
+            return
+        Index = self.LoadIndex()
+        Index.update(self._Used)
+        try:
+            self._SaveIndex(Index)
+        except (IOError, OSError):
+            # the cache may be read-only for the builds consuming it
+            pass
+        self._Used = {}
+
+    ## Return the modules in cache, least recently used first
+    #
+    #   @retval list        List of (LastUse, ManifestFile, Manifest)
+    #
+    def GetEntries(self):
+        Index = self.LoadIndex()
+        ObjectDir = os.path.normcase(self.Store.Root)
+        Entries = []
+        for Root, Dirs, Files in os.walk(self.Root):
+            if os.path.normcase(Root) == ObjectDir:
+                Dirs[:] = []
+                continue
+            for File in Files:
+                if not File.endswith(MANIFEST_SUFFIX):
+                    continue
+                ManifestFile = os.path.join(Root, File)
+                Manifest = LoadManifest(ManifestFile)
+                if Manifest is None:
+                    continue
+                LastUse = Index.get(self._IndexKey(ManifestFile))
+                if LastUse is None:
+                    LastUse = os.stat(ManifestFile).st_mtime
+                Entries.append((LastUse, ManifestFile, Manifest))
+        Entries.sort(key=lambda x: x[0])
+        return Entries
+
+    ## Return the dict of object digest to (size, modification time)
+    def GetObjects(self):
+        Objects = {}
+        if not os.path.isdir(self.Store.Root):
+            return Objects
+        for Root, Dirs, Files in os.walk(self.Store.Root):
+            for File in Files:
+                if File.startswith(".tmp"):
+                    continue
+                Stat = os.stat(os.path.join(Root, File))
+                Objects[File] = (Stat.st_size, Stat.st_mtime)
+        return Objects
+
+    ## Remove modules until the cache fits in the limits
+    #
+    #   @param  MaxSize     The maximum size of the objects in bytes, or None
+    #   @param  MaxAge      Modules unused for more than this many seconds are
+    #                       removed, None for no limit
+    #   @param  GraceTime   Unreferenced objects younger than this many seconds
+    #                       are kept, they may be written by a running build
+    #
+    #   @retval tuple       (removed modules, removed objects, freed bytes)
+    #
+    def Prune(self, MaxSize=None, MaxAge=None, GraceTime=PRUNE_GRACE_TIME):
+        Now = time.time()
+        Entries = self.GetEntries()
+        Objects = self.GetObjects()
+        Index = self.LoadIndex()
+
+        # the unreferenced objects are removed only out of the grace time
+        def IsRemovable(Digest):
+            return Now - Objects[Digest][1] >= GraceTime
+
+        References = {}
+        for LastUse, ManifestFile, Manifest in Entries:
+            for Digest in set(Manifest["Files"].values()):
+                References[Digest] = References.get(Digest, 0) + 1
+        TotalSize = sum(Size for Digest, (Size, MTime) in Objects.items()
+                        if References.get(Digest, 0) > 0 or not IsRemovable(Digest))
+
+        RemovedModules = 0
+        for LastUse, ManifestFile, Manifest in Entries:
+            TooOld = MaxAge is not None and Now - LastUse > MaxAge
+            TooBig = MaxSize is not None and TotalSize > MaxSize
+            if not TooOld and not TooBig:
+                break
+            try:
+                os.remove(ManifestFile)
+            except OSError:
+                continue
+            Index.pop(self._IndexKey(ManifestFile), None)
+            RemovedModules += 1
+            for Digest in set(Manifest["Files"].values()):
+                References[Digest] -= 1
+                if References[Digest] == 0 and Digest in Objects and IsRemovable(Digest):
+                    TotalSize -= Objects[Digest][0]
+
+        RemovedObjects = 0
+        FreedSize = 0
+        for Digest, (Size, MTime) in Objects.items():
+            if References.get(Digest, 0) > 0 or not IsRemovable(Digest):
+                continue
+            try:
+                os.remove(self.Store.ObjectPath(Digest))
+            except OSError:
+                continue
+            RemovedObjects += 1
+            FreedSize += Size
+
+        if RemovedModules:
+            self._SaveIndex(Index)
+        return RemovedModules, RemovedObjects, FreedSize
+
+## RemoteCacheManager class
+#
+#  This class gives access to a cache served over HTTP. The manifests of a
+#  platform and arch are fetched with one request the first time a module of
+#  them is looked up, and the objects of a hit are downloaded in parallel into
+#  the local mirror. Published modules are pushed at Flush(): one request
+#  finds the objects the server misses, which are uploaded in parallel, and
+#  one request stores all the manifests.
+#
+#  Network errors never fail the build, the modules are just cache misses.
+#
+class RemoteCacheManager(CacheManager):
+    def __init__(self, Url, MirrorRoot):
+        CacheManager.__init__(self, MirrorRoot)
+        self.Url = urlparse(Url)
+        self._Local = threading.local()
+        self._Lock = threading.Lock()
+        self._Prefixes = set()
+        self._Published = []
+        self._Failed = False
+
+    def _Connection(self):
+        Conn = getattr(self._Local, "Connection", None)
+        if Conn is None:
+            ConnClass = http.client.HTTPSConnection if self.Url.scheme == "https" else http.client.HTTPConnection
+            Conn = ConnClass(self.Url.hostname, self.Url.port, timeout=REMOTE_TIMEOUT)
+            self._Local.Connection = Conn
+        return Conn
+
+    ## Send one request, reusing the connection of current thread
+    #
+    #   @retval bytes       The response body, None for 404
+    #
+    def _Request(self, Method, Path, Body=None):
+        Path = self.Url.path.rstrip("/") + Path
+        for Retry in (True, False):
+            Conn = self._Connection()
+            try:
+                Conn.request(Method, Path, Body)
+                Response = Conn.getresponse()
+                Data = Response.read()
+            except (http.client.HTTPException, OSError):
+                Conn.close()
+                self._Local.Connection = None
+                if Retry:
+                    continue
+                raise
+            if Response.status == 404:
+                return None
+            if Response.status != 200:
+                raise IOError("%s %s: HTTP %d %s" % (Method, Path, Response.status, Data[:200]))
+            return Data
+
+    def _Warn(self, Message):
+        if not self._Failed:
+            self._Failed = True
+            EdkLogger.warn("build", "Binary cache %s is not usable" % self.Url.geturl(), ExtraData=str(Message))
+
+    def _ManifestKey(self, ManifestFile):
+        return os.path.relpath(ManifestFile, self.Root).replace(os.sep, "/")
+
+    def GetManifest(self, ManifestFile):
+        # <Platform>/<Target>_<ToolChain>/<Arch>
+        Prefix = "/".join(self._ManifestKey(ManifestFile).split("/")[:3])
+        with self._Lock:
+            if Prefix not in self._Prefixes and not self._Failed:
+                self._Prefixes.add(Prefix)
+                try:
+                    Manifests = json.loads(self._Request("GET", "/manifests?prefix=%s" % quote(Prefix)).decode("utf-8"))
+                    for Key, Manifest in Manifests.items():
+                        LocalFile = os.path.join(self.Root, os.path.normpath(Key))
+                        if not os.path.relpath(LocalFile, self.Root).startswith(os.pardir):
+                            SaveManifest(LocalFile, Manifest.get("Hash"), Manifest.get("Files", {}), Manifest.get("Inputs"),
+                                         Manifest.get("Preflight"))
+                except (IOError, OSError, ValueError, AttributeError) as X:
+                    self._Warn(X)
+        return LoadManifest(ManifestFile)
+
+    def _Download(self, Digest):
+        Data = self._Request("GET", "/objects/%s" % Digest)
+        if Data is None or hashlib.sha256(Data).hexdigest() != Digest:
+            return False
+        ObjectFile = self.Store.ObjectPath(Digest)
+        CreateDirectory(os.path.dirname(ObjectFile))
+        TempFile = _TempName(ObjectFile)
+        with open(TempFile, "wb") as Fd:
+            Fd.write(Data)
+        os.chmod(TempFile, 0o444)
+        os.replace(TempFile, ObjectFile)
+        return True
+
+    def FetchObjects(self, Digests):
+        Missing = [Digest for Digest in set(Digests) if not self.Store.Has(Digest)]
+        if not Missing:
+            return True
+        if self._Failed:
+            return False
+        try:
+            with ThreadPoolExecutor(max_workers=REMOTE_TRANSFER_THREADS) as Executor:
+                return all(Executor.map(self._Download, Missing))
+        except (IOError, OSError, http.client.HTTPException) as X:
+            self._Warn(X)
+            return False
+
+    def Publish(self, ManifestFile):
+        with self._Lock:
+            self._Published.append(ManifestFile)
+
+    def _Upload(self, Digest):
+        with open(self.Store.ObjectPath(Digest), "rb") as Fd:
+            self._Request("PUT", "/objects/%s" % Digest, Fd.read())
+
+    ## Push the published modules to the server
+    def Flush(self):
+        CacheManager.Flush(self)
+        with self._Lock:
+            Published, self._Published = self._Published, []
+        Manifests = {}
+        for ManifestFile in Published:
+            Manifest = LoadManifest(ManifestFile)
+            if Manifest is not None:
+                Manifests[self._ManifestKey(ManifestFile)] = Manifest
+        if not Manifests or self._Failed:
+            return
+        Digests = sorted(set(Digest for Manifest in Manifests.values() for Digest in Manifest["Files"].values()))
+        try:
+            Missing = json.loads(self._Request("POST", "/objects/missing", json.dumps(Digests).encode("utf-8")).decode("utf-8"))
+            with ThreadPoolExecutor(max_workers=REMOTE_TRANSFER_THREADS) as Executor:
+                list(Executor.map(self._Upload, Missing))
+            # manifests go last, so they never refer to objects the server misses
+            self._Request("POST", "/manifests", json.dumps(Manifests).encode("utf-8"))
+        except (IOError, OSError, ValueError, http.client.HTTPException) as X:
+            self._Warn(X)
+
+## Return True if the cache location is a URL
+def IsRemote(Location):
+    return Location.startswith(("http://", "https://"))
+
+_Managers = {}
+
+## Return the manager shared by all modules using the given cache
+#
+#   @param  Location        The cache directory, or the URL of a remote cache
+#
+def GetCacheManager(Location):
+    if Location not in _Managers:
+        if IsRemote(Location):
+            Url = urlparse(Location)
+            MirrorRoot = os.path.join(GlobalData.gConfDirectory, ".cache", "BinCache",
+                                      "%s_%s" % (Url.hostname, Url.port or (443 if Url.scheme == "https" else 80)))
+            _Managers[Location] = RemoteCacheManager(Location, MirrorRoot)
+        else:
+            _Managers[Location] = CacheManager(Location)
+    return _Managers[Location]
+
+## Write the uses recorded by all managers to their index
+def FlushAll():
+    for Manager in _Managers.values():
+        Manager.Flush()
+
+## Entry point of the cache maintenance script
+def Main(Argv=None):
+    Parser = argparse.ArgumentParser(prog="BinaryCache", description="Maintain the binary cache written by build --binary-destination.")
+    SubParsers = Parser.add_subparsers(dest="Command")
+    PruneParser = SubParsers.add_parser("prune", help="Remove the least recently used modules and the objects no module refers to.")
+    PruneParser.add_argument("CacheDir", help="The binary cache directory.")
+    PruneParser.add_argument("--max-size", type=int, dest="MaxSize", help="Maximum size of the cache in MB.")
+    PruneParser.add_argument("--max-age", type=int, dest="MaxAge", help="Remove the modules unused for more than this many days.")
+    Args = Parser.parse_args(Argv)
+    if Args.Command != "prune":
+        Parser.print_help()
+        return 1
+    if not os.path.isdir(Args.CacheDir):
+        print("Cache directory not found: %s" % Args.CacheDir)
+        return 1
+    Manager = CacheManager(Args.CacheDir)
+    Modules, Objects, Size = Manager.Prune(
+        Args.MaxSize * 1024 * 1024 if Args.MaxSize is not None else None,
+        Args.MaxAge * 24 * 3600 if Args.MaxAge is not None else None)
+    print("Removed %d module(s) and %d object(s), %d bytes freed" % (Modules, Objects, Size))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(Main())
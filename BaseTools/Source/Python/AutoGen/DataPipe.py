@@ -12,6 +12,7 @@ import os
 import pickle
 from pickle import HIGHEST_PROTOCOL
 from Common import EdkLogger
+from Common import BuildTrace
 
 class PCD_DATA():
     def __init__(self,TokenCName,TokenSpaceGuidCName,Type,DatumType,SkuInfoList,DefaultValue,
@@ -158,3 +159,5 @@ class MemoryDataPipe(DataPipe):
         self.DataContainer = {"FdfParser": True if GlobalData.gFdfParser else False}
 
         self.DataContainer = {"LogLevel": EdkLogger.GetLevel()}
+
+        self.DataContainer = {"TraceFile": BuildTrace.GetTraceFile()}
@@ -1214,7 +1214,7 @@ cleanlib:
                         if not gIsFileMap[FilePath]:
                             continue
                     # If isfile is called too many times, the performance is slow down.
-                    elif not os.path.isfile(FilePath):
+                    elif not (GlobalData.gAllFiles.IsFile(FilePath) if GlobalData.gAllFiles else os.path.isfile(FilePath)):
                         gIsFileMap[FilePath] = False
                         continue
                     else:
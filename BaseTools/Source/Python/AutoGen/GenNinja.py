@@ -0,0 +1,213 @@
+## @file
+# Create a single ninja build file for all modules of a platform
+#
+# The module makefiles generated by GenMake are read back and their rules,
+# reachable from the "tbuild" target, are emitted as ninja build statements
+# in one build.ninja. Ninja then schedules every module and library of the
+# platform in one process, with restat and, for GCC-like tool chains, compiler
+# generated depfiles.
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+#
+
+## Import Modules
+#
+from __future__ import absolute_import
+import Common.LongFilePathOs as os
+import sys
+from Common.Misc import SaveFileOnChange
+from Common.BuildToolError import *
+from .MakeRunner import Makefile
+import Common.EdkLogger as EdkLogger
+
+## Module makefile target used by multi-thread build
+NINJA_MODULE_TARGET = "tbuild"
+
+## Escape a path used in ninja build statement
+def _EscapePath(Path):
+    return Path.replace("$", "$$").replace(" ", "$ ").replace(":", "$:")
+
+## Escape a string used as ninja variable value
+def _EscapeValue(Value):
+    return Value.replace("$", "$$")
+
+## NinjaFile class
+#
+#  This class encapsules the ninja build file of a platform. The content comes
+#  from the makefiles of the given ModuleAutoGen objects and their libraries.
+#
+class NinjaFile(object):
+    _FILE_NAME_ = "build.ninja"
+
+    _FILE_HEADER_ = '''\
+#
+# DO NOT EDIT
+# This file is auto-generated by build utility
+#
+# Abstract:
+#
+#   Auto-generated ninja file for building all modules of a platform
+#
+
+ninja_required_version = 1.7
+
+rule cmd
+  command = ${command}
+  description = ${desc}
+  restat = 1
+
+rule cc
+  command = ${command}
+  description = ${desc}
+  depfile = ${depfile}
+  deps = gcc
+  restat = 1
+
+'''
+
+    ## Constructor of NinjaFile
+    #
+    #   @param  BuildDir        The directory build.ninja is put in
+    #   @param  ModuleList      The list of ModuleAutoGen objects to build
+    #   @param  MakefileName    The file name of module makefiles
+    #
+    def __init__(self, BuildDir, ModuleList, MakefileName):
+        self.BuildDir = BuildDir
+        self.ModuleList = ModuleList
+        self.MakefileName = MakefileName
+        self._Outputs = set()
+        self._Lines = []
+
+    @property
+    def FilePath(self):
+        return os.path.join(self.BuildDir, self._FILE_NAME_)
+
+    ## Create the ninja file
+    #
+    #   @retval TRUE        The ninja file is created or re-created successfully
+    #   @retval FALSE       The ninja file exists and is the same as the one to be generated
+    #
+    def Generate(self):
+        self._Outputs = set()
+        self._Lines = [self._FILE_HEADER_]
+        Done = {}
+        DefaultList = []
+        for Module in self.ModuleList:
+            DefaultList.append(self._AddModule(Module, Done))
+        self._Lines.append("default %s\n" % " ".join(_EscapePath(Target) for Target in DefaultList))
+        return SaveFileOnChange(self.FilePath, "".join(self._Lines), False)
+
+    ## Name of the phony target representing the build of one module
+    def _ModuleTarget(self, Module):
+        return os.path.join(Module.MakeFileDir, NINJA_MODULE_TARGET)
+
+    ## Add the build statements of a module after the ones of its libraries
+    #
+    #   @retval string      The phony target of the module
+    #
+    def _AddModule(self, Module, Done):
+        Key = os.path.normcase(os.path.normpath(Module.MakeFileDir))
+        if Key in Done:
+            return Done[Key]
+        PhonyTarget = self._ModuleTarget(Module)
+        Done[Key] = PhonyTarget
+
+        LibraryTargets = []
+        for Lib in Module.LibraryAutoGenList:
+            if Lib.IsBinaryModule or Lib.CanSkipbyHash():
+                continue
+            LibraryTargets.append(self._AddModule(Lib, Done))
+
+        MakefilePath = os.path.join(Module.MakeFileDir, self.MakefileName)
+        if not os.path.isfile(MakefilePath):
+            EdkLogger.error("build", FILE_NOT_FOUND, ExtraData=MakefilePath)
+        Macros = {}
+        if Module.BuildCommand:
+            Macros["MAKE"] = Module.BuildCommand[0]
+        MakefileObj = Makefile(MakefilePath, Macros)
+
+        self._Lines.append("# %s [%s]\n" % (Module.MetaFile, Module.Arch))
+        Root = self._AddTarget(MakefileObj, Module, NINJA_MODULE_TARGET, LibraryTargets, {})
+        if Root != PhonyTarget:
+            self._Lines.append("build %s: phony %s\n" % (_EscapePath(PhonyTarget), _EscapePath(Root)))
+        self._Lines.append("\n")
+        return PhonyTarget
+
+    ## Convert a makefile target name to ninja path
+    #
+    # Targets which are not path (like "tbuild" or "force_build") are local to
+    # each makefile, so they are prefixed with the module build directory.
+    #
+    def _TargetPath(self, Module, Target):
+        if os.path.isabs(Target):
+            return os.path.normpath(Target)
+        return os.path.normpath(os.path.join(Module.MakeFileDir, Target))
+
+    ## Emit the build statement for a target and all targets it depends on
+    #
+    #   @retval string      The ninja path of the target
+    #
+    def _AddTarget(self, MakefileObj, Module, Target, OrderOnly, Visited):
+        if Target in Visited:
+            return Visited[Target]
+        OutPath = self._TargetPath(Module, Target)
+        Rule = MakefileObj.Rules.get(Target)
+        if Rule is None:
+            Visited[Target] = OutPath
+            return OutPath
+        for Item in Rule.Targets:
+            Visited[Item] = self._TargetPath(Module, Item)
+
+        Inputs = [self._AddTarget(MakefileObj, Module, Item, OrderOnly, Visited) for Item in Rule.Prerequisites]
+        Outputs = [self._TargetPath(Module, Item) for Item in Rule.Targets]
+        # an output must be produced by only one build statement
+        Outputs = [Item for Item in Outputs if Item not in self._Outputs]
+        if not Outputs:
+            return OutPath
+        self._Outputs.update(Outputs)
+
+        Commands = []
+        DepFile = None
+        for Command in Rule.Commands:
+            IgnoreError = False
+            while Command and Command[0] in "@-+":
+                IgnoreError = IgnoreError or Command[0] == "-"
+                Command = Command[1:]
+            IsCompile = "$(CC)" in Command and " -c " in Command and Module.ToolChainFamily == "GCC"
+            Command = MakefileObj.Expand(Command, {
+                "@" : Rule.Targets[0],
+                "<" : Rule.Prerequisites[0] if Rule.Prerequisites else "",
+                "^" : " ".join(Rule.Prerequisites),
+            }).strip()
+            if not Command:
+                continue
+            if IsCompile and len(Outputs) == 1 and DepFile is None:
+                DepFile = Outputs[0] + ".deps"
+                Command += ' -MMD -MF "%s"' % DepFile
+            if IgnoreError:
+                Command = "(%s) || %s" % (Command, "rem" if sys.platform == "win32" else "true")
+            Commands.append(Command)
+
+        if not Commands:
+            RuleName = "phony"
+        elif DepFile:
+            RuleName = "cc"
+        else:
+            RuleName = "cmd"
+        Statement = "build %s: %s" % (" ".join(_EscapePath(Item) for Item in Outputs), RuleName)
+        if Inputs:
+            Statement += " " + " ".join(_EscapePath(Item) for Item in Inputs)
+        if OrderOnly and Commands:
+            Statement += " || " + " ".join(_EscapePath(Item) for Item in OrderOnly)
+        self._Lines.append(Statement + "\n")
+        if Commands:
+            if sys.platform == "win32":
+                CommandLine = 'cmd.exe /c "cd /d %s && %s"' % (Module.MakeFileDir, " && ".join(Commands))
+            else:
+                CommandLine = 'cd "%s" && %s' % (Module.MakeFileDir, " && ".join(Commands))
+            if DepFile:
+                self._Lines.append("  depfile = %s\n" % _EscapeValue(DepFile))
+            self._Lines.append("  command = %s\n" % _EscapeValue(CommandLine))
+            self._Lines.append("  desc = %s [%s] %s\n" % (Module.Name, Module.Arch, _EscapeValue(os.path.basename(Outputs[0]))))
+        return OutPath
@@ -8,7 +8,7 @@
 # #
 # Import Modules
 #
-from struct import pack, unpack
+from struct import pack, pack_into, unpack
 import collections
 import copy
 from Common.VariableAttributes import VariableAttributes
@@ -19,6 +19,9 @@ import Common.DataType as DataType
 var_info = collections.namedtuple("uefi_var", "pcdindex,pcdname,defaultstoragename,skuname,var_name, var_guid, var_offset,var_attribute,pcd_default_value, default_value, data_type,PcdDscLine,StructurePcd")
 NvStorageHeaderSize = 28
 VariableHeaderSize = 32
+DeltaEntrySize = 4
+# Size of the blocks compared at once to find the differences of the data
+DeltaBlockSize = 64
 
 class VariableMgr(object):
     def __init__(self, DefaultStoreMap, SkuIdMap):
@@ -84,7 +87,8 @@ class VariableMgr(object):
                     for data_byte in range(len(pack_data)):
                         CurvalueList.append(hex(unpack("B", pack_data[data_byte:data_byte + 1])[0]))
                 if CurOffset > len(newvalue_list):
-                    newvalue_list = newvalue_list + ["0x00"] * (CurOffset - len(newvalue_list)) + CurvalueList
+                    newvalue_list.extend(["0x00"] * (CurOffset - len(newvalue_list)))
+                    newvalue_list.extend(CurvalueList)
                 else:
                     newvalue_list[CurOffset : CurOffset + len(CurvalueList)] = CurvalueList
 
@@ -118,10 +122,6 @@ class VariableMgr(object):
 
             default_data_buffer = VariableMgr.PACK_VARIABLES_DATA(default_sku_default.default_value, default_sku_default.data_type, tail)
 
-            default_data_array = ()
-            for item in range(len(default_data_buffer)):
-                default_data_array += unpack("B", default_data_buffer[item:item + 1])
-
             var_data[(DataType.TAB_DEFAULT, DataType.TAB_DEFAULT_STORES_DEFAULT)][index] = (default_data_buffer, sku_var_info[(DataType.TAB_DEFAULT, DataType.TAB_DEFAULT_STORES_DEFAULT)])
 
             for (skuid, defaultstoragename) in indexedvarinfo[index]:
@@ -136,11 +136,7 @@ class VariableMgr(object):
 
                 others_data_buffer = VariableMgr.PACK_VARIABLES_DATA(other_sku_other.default_value, other_sku_other.data_type, tail)
 
-                others_data_array = ()
-                for item in range(len(others_data_buffer)):
-                    others_data_array += unpack("B", others_data_buffer[item:item + 1])
-
-                data_delta = VariableMgr.calculate_delta(default_data_array, others_data_array)
+                data_delta = VariableMgr.calculate_delta(default_data_buffer, others_data_buffer)
 
                 var_data[(skuid, defaultstoragename)][index] = (data_delta, sku_var_info[(skuid, defaultstoragename)])
         return var_data
@@ -179,7 +175,7 @@ class VariableMgr(object):
 
         variable_storage_header_buffer = VariableMgr.PACK_VARIABLE_STORE_HEADER(len(NvStoreDataBuffer) + 28)
 
-        nv_default_part = VariableMgr.AlignData(VariableMgr.PACK_DEFAULT_DATA(0, 0, VariableMgr.unpack_data(variable_storage_header_buffer+NvStoreDataBuffer)), 8)
+        nv_default_part = VariableMgr.AlignData(VariableMgr.PACK_DEFAULT_DATA(0, 0, variable_storage_header_buffer + NvStoreDataBuffer), 8)
 
         data_delta_structure_buffer = bytearray()
         for skuname, defaultstore in var_data:
@@ -207,23 +203,33 @@ class VariableMgr(object):
 
     @staticmethod
     def format_data(data):
-        return  [hex(item) for item in VariableMgr.unpack_data(data)]
+        return  [hex(item) for item in bytes(data)]
 
     @staticmethod
     def unpack_data(data):
-        final_data = ()
-        for item in range(len(data)):
-            final_data += unpack("B", data[item:item + 1])
-        return final_data
+        return tuple(bytes(data))
 
+    ## Return the (offset, value) of the bytes of theother different from default
+    #
+    # The data are compared block by block, and only the blocks different
+    # are compared byte by byte.
+    #
     @staticmethod
     def calculate_delta(default, theother):
         if len(default) - len(theother) != 0:
             EdkLogger.error("build", FORMAT_INVALID, 'The variable data length is not the same for the same PCD.')
+        default = memoryview(bytes(default))
+        theother = memoryview(bytes(theother))
         data_delta = []
-        for i in range(len(default)):
-            if default[i] != theother[i]:
-                data_delta.append((i, theother[i]))
+        if default == theother:
+            return data_delta
+        for start in range(0, len(default), DeltaBlockSize):
+            end = start + DeltaBlockSize
+            if default[start:end] == theother[start:end]:
+                continue
+            for i, (value, other_value) in enumerate(zip(default[start:end], theother[start:end]), start):
+                if value != other_value:
+                    data_delta.append((i, other_value))
         return data_delta
 
     def dump(self):
@@ -284,12 +290,10 @@ class VariableMgr(object):
         Buffer = bytearray()
         data_len = 0
         if data_type == DataType.TAB_VOID:
-            for value_char in var_value.strip("{").strip("}").split(","):
-                Buffer += pack("=B", int(value_char, 16))
+            Buffer += bytearray(int(value_char, 16) for value_char in var_value.strip("{").strip("}").split(","))
             data_len += len(var_value.split(","))
             if tail:
-                for value_char in tail.split(","):
-                    Buffer += pack("=B", int(value_char, 16))
+                Buffer += bytearray(int(value_char, 16) for value_char in tail.split(","))
                 data_len += len(tail.split(","))
         elif data_type == "BOOLEAN":
             Buffer += pack("=B", True) if var_value.upper() in ["TRUE","1"] else pack("=B", False)
@@ -315,9 +319,7 @@ class VariableMgr(object):
         Buffer += pack("=L", 4+8+8)
         Buffer += pack("=Q", int(skuid))
         Buffer += pack("=Q", int(defaultstoragename))
-
-        for item in var_value:
-            Buffer += pack("=B", item)
+        Buffer += bytes(var_value)
 
         Buffer = pack("=L", len(Buffer)+4) + Buffer
 
@@ -336,15 +338,17 @@ class VariableMgr(object):
     def PACK_DELTA_DATA(self, skuname, defaultstoragename, delta_list):
         skuid = self.GetSkuId(skuname)
         defaultstorageid = self.GetDefaultStoreId(defaultstoragename)
-        Buffer = bytearray()
-        Buffer += pack("=L", 4+8+8)
-        Buffer += pack("=Q", int(skuid))
-        Buffer += pack("=Q", int(defaultstorageid))
+        #
+        # Each delta is the UINT32 offset with its last byte replaced by the
+        # value, packed into a buffer allocated once.
+        #
+        Buffer = bytearray(4 + 4 + 8 + 8 + DeltaEntrySize * len(delta_list))
+        pack_into("=LLQQ", Buffer, 0, len(Buffer), 4+8+8, int(skuid), int(defaultstorageid))
+        Position = 4 + 4 + 8 + 8
         for (delta_offset, value) in delta_list:
-            Buffer += pack("=L", delta_offset)
-            Buffer = Buffer[:-1] + pack("=B", value)
-
-        Buffer = pack("=L", len(Buffer) + 4) + Buffer
+            pack_into("=L", Buffer, Position, delta_offset)
+            Buffer[Position + DeltaEntrySize - 1] = value
+            Position += DeltaEntrySize
 
         return Buffer
 
@@ -359,8 +363,4 @@ class VariableMgr(object):
 
     @staticmethod
     def PACK_VARIABLE_NAME(var_name):
-        Buffer = bytearray()
-        for name_char in var_name.strip("{").strip("}").split(","):
-            Buffer += pack("=B", int(name_char, 16))
-
-        return Buffer
+        return bytearray(int(name_char, 16) for name_char in var_name.strip("{").strip("}").split(","))
@@ -0,0 +1,306 @@
+## @file
+# Execute the rules of a module makefile without spawning make
+#
+# The module makefiles generated by GenMake only use a small subset of make:
+# recursive macro definitions, explicit rules and command lines. This file
+# evaluates that subset in the build process, checks the timestamps with a
+# stat cache shared by all modules and runs only the out-of-date commands.
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+#
+
+## Import Modules
+#
+from __future__ import absolute_import
+import Common.LongFilePathOs as os
+import re
+import sys
+import shlex
+import time
+import threading
+from subprocess import Popen, PIPE
+from Common.LongFilePathSupport import OpenLongFilePath as open
+from Common.BuildToolError import *
+from Common.OutputPump import OutputPump
+import Common.EdkLogger as EdkLogger
+
+## Regular expression for macro definition line "NAME = value"
+gMacroDefinePattern = re.compile(r"^([A-Za-z_][A-Za-z0-9_.]*)[ \t]*=[ \t]*(.*)$")
+## Regular expression for macro reference
+gMacroUsePattern = re.compile(r"\$\(([^()$]+)\)|\$\{([^{}$]+)\}|\$([@<^$])")
+## Regular expression for the colon separating targets and prerequisites
+gRuleColonPattern = re.compile(r":(?=[ \t]|$)")
+## Characters which need a shell to interpret the command
+gShellMetaPattern = re.compile(r"[|&;<>()`$*?\[\]~\n#]")
+
+## Timestamps of files, shared by all modules built in the same process
+#
+# Files which are not produced by any rule (sources, headers, makefiles) never
+# change during a build, so their status is read only once. Outputs of a rule
+# are refreshed after the rule's commands run.
+#
+class StatCache(object):
+    def __init__(self):
+        self._Cache = {}
+        self._Lock = threading.Lock()
+
+    ## Return the modification time of a file, or None if it doesn't exist
+    def GetTime(self, FilePath):
+        try:
+            return self._Cache[FilePath]
+        except KeyError:
+            return self.Update(FilePath)
+
+    ## Read the modification time of a file again
+    def Update(self, FilePath):
+        try:
+            TimeStamp = os.stat(FilePath).st_mtime
+        except OSError:
+            TimeStamp = None
+        with self._Lock:
+            self._Cache[FilePath] = TimeStamp
+        return TimeStamp
+
+    def Clear(self):
+        with self._Lock:
+            self._Cache.clear()
+
+gStatCache = StatCache()
+
+## One explicit rule in makefile
+class MakeRule(object):
+    def __init__(self, Targets):
+        self.Targets = Targets
+        self.Prerequisites = []
+        self.Commands = []
+
+## The parsed content of a module makefile
+#
+# The macros used in targets and prerequisites are expanded when the file is
+# read, while the ones used in commands are expanded when the commands run,
+# which is what make does.
+#
+class Makefile(object):
+    ## Constructor
+    #
+    #   @param  FilePath        Path of the makefile
+    #   @param  Macros          Macros defined before reading the file (e.g. MAKE)
+    #
+    def __init__(self, FilePath, Macros=None):
+        self.FilePath = FilePath
+        self.Macros = dict(Macros) if Macros else {}
+        self.Rules = {}
+        self.DefaultTarget = None
+        self._Parse()
+
+    def _Parse(self):
+        with open(self.FilePath, "r") as Fd:
+            Content = Fd.read()
+        Content = re.sub(r"\\[ \t]*\r?\n[ \t]*", " ", Content)
+
+        RuleList = []
+        for Line in Content.splitlines():
+            if Line.startswith("\t"):
+                Command = Line.strip()
+                if Command and not Command.startswith("#"):
+                    for Rule in RuleList:
+                        Rule.Commands.append(Command)
+                continue
+            Line = Line.strip()
+            if not Line or Line.startswith("#") or Line.startswith("!"):
+                continue
+
+            MatchObj = gMacroDefinePattern.match(Line)
+            if MatchObj:
+                self.Macros[MatchObj.group(1)] = MatchObj.group(2).rstrip()
+                RuleList = []
+                continue
+
+            MatchObj = gRuleColonPattern.search(Line)
+            if MatchObj is None:
+                EdkLogger.error("build", FORMAT_NOT_SUPPORTED, "Unsupported makefile statement",
+                                File=self.FilePath, ExtraData=Line)
+            Targets = self.Expand(Line[:MatchObj.start()]).split()
+            Prerequisites = self.Expand(Line[MatchObj.end():]).split()
+            RuleList = self._AddRule(Targets, Prerequisites)
+
+    ## Add the rules of all targets in one rule line
+    #
+    # Each target gets its own rule, as make does for a rule line with several
+    # targets: the commands run once for each target which is out of date, with
+    # $@ set to that target. Several rule lines for the same target merge their
+    # prerequisites.
+    #
+    #   @retval list            The rules the following commands belong to
+    #
+    def _AddRule(self, Targets, Prerequisites):
+        RuleList = []
+        for Target in Targets:
+            Rule = self.Rules.get(Target)
+            if Rule is None:
+                Rule = MakeRule([Target])
+                self.Rules[Target] = Rule
+            for Item in Prerequisites:
+                if Item not in Rule.Prerequisites:
+                    Rule.Prerequisites.append(Item)
+            if Rule not in RuleList:
+                RuleList.append(Rule)
+        if self.DefaultTarget is None and Targets and not Targets[0].startswith("."):
+            self.DefaultTarget = Targets[0]
+        return RuleList
+
+    ## Expand macro references recursively
+    #
+    #   @param  String          The string to expand
+    #   @param  Auto            Values of automatic macros $@, $< and $^
+    #
+    def Expand(self, String, Auto=None, Depth=0):
+        if "$" not in String:
+            return String
+        if Depth > 32:
+            EdkLogger.error("build", FORMAT_INVALID, "Recursive macro reference",
+                            File=self.FilePath, ExtraData=String)
+
+        def _Replace(MatchObj):
+            Name = MatchObj.group(1) or MatchObj.group(2)
+            if Name is None:
+                Name = MatchObj.group(3)
+                if Name == "$":
+                    return "$"
+                return (Auto or {}).get(Name, "")
+            if Name in self.Macros:
+                return self.Expand(self.Macros[Name], Auto, Depth + 1)
+            return os.environ.get(Name, "")
+        return gMacroUsePattern.sub(_Replace, String)
+
+## Build a target in a module makefile in the current process
+#
+class MakefileRunner(object):
+    ## Constructor
+    #
+    #   @param  MakefilePath    Path of the makefile generated by GenMake
+    #   @param  WorkingDir      The directory the commands run in
+    #   @param  MakeCommand     The make command of the tool chain, used for $(MAKE)
+    #
+    def __init__(self, MakefilePath, WorkingDir, MakeCommand=None, Cache=gStatCache):
+        self.WorkingDir = WorkingDir
+        Macros = {}
+        if MakeCommand:
+            Macros["MAKE"] = MakeCommand
+        self.Makefile = Makefile(MakefilePath, Macros)
+        self.Cache = Cache
+        # MAKE_FLAGS of the makefile comes before the one of the environment
+        self.Silent = "-s" in self.Makefile.Expand("$(MAKE_FLAGS)").split()
+        self.CommandCount = 0
+        # target => modification time after it's made, None for "always newer"
+        self._Made = {}
+
+    def _FullPath(self, Target):
+        return os.path.normpath(os.path.join(self.WorkingDir, Target))
+
+    ## Build the given target
+    #
+    #   @param  Target          The target to build, default is the first one
+    #
+    #   @retval string          The build time, in the same format as LaunchCommand
+    #
+    def Run(self, Target=None):
+        BeginTime = time.time()
+        if not Target:
+            Target = self.Makefile.DefaultTarget
+        self._Make(Target, [])
+        return "%dms" % (int(round((time.time() - BeginTime) * 1000)))
+
+    def _Make(self, Target, Stack):
+        if Target in self._Made:
+            return self._Made[Target]
+
+        Rule = self.Makefile.Rules.get(Target)
+        if Rule is None:
+            TimeStamp = self.Cache.GetTime(self._FullPath(Target))
+            if TimeStamp is None:
+                EdkLogger.error("build", FILE_NOT_FOUND, "No rule to make target",
+                                File=self.Makefile.FilePath, ExtraData="%s%s" % (Target,
+                                " needed by %s" % Stack[-1] if Stack else ""))
+            self._Made[Target] = TimeStamp
+            return TimeStamp
+
+        if Target in Stack:
+            EdkLogger.warn("build", "Circular dependency dropped", File=self.Makefile.FilePath, ExtraData=Target)
+            return 0
+
+        Stack.append(Target)
+        PrerequisiteTimes = [self._Make(Item, Stack) for Item in Rule.Prerequisites]
+        Stack.pop()
+
+        TimeStamp = self.Cache.GetTime(self._FullPath(Target))
+        OutOfDate = TimeStamp is None or \
+                    any(Item is None or Item > TimeStamp for Item in PrerequisiteTimes)
+        if OutOfDate and Rule.Commands:
+            Auto = {
+                "@" : Target,
+                "<" : Rule.Prerequisites[0] if Rule.Prerequisites else "",
+                "^" : " ".join(Rule.Prerequisites),
+            }
+            for Command in Rule.Commands:
+                self._RunCommand(Command, Auto)
+            self._Made[Target] = self.Cache.Update(self._FullPath(Target))
+            return self._Made[Target]
+
+        if OutOfDate:
+            # a rule without command or file, like "tbuild", is always remade
+            TimeStamp = None
+        self._Made[Target] = TimeStamp
+        return TimeStamp
+
+    def _RunCommand(self, Command, Auto):
+        IgnoreError = False
+        Silent = self.Silent
+        while Command and Command[0] in "@-+":
+            if Command[0] == "@":
+                Silent = True
+            elif Command[0] == "-":
+                IgnoreError = True
+            Command = Command[1:]
+        Command = self.Makefile.Expand(Command, Auto).strip()
+        if not Command:
+            return
+        if not Silent:
+            EdkLogger.info(Command)
+
+        self.CommandCount += 1
+        try:
+            if sys.platform == "win32" or gShellMetaPattern.search(Command):
+                Proc = Popen(Command, stdout=PIPE, stderr=PIPE, env=os.environ, cwd=self.WorkingDir, bufsize=-1, shell=True)
+            else:
+                Proc = Popen(shlex.split(Command), stdout=PIPE, stderr=PIPE, env=os.environ, cwd=self.WorkingDir, bufsize=-1)
+        except OSError as X:
+            if IgnoreError:
+                return
+            EdkLogger.error("build", COMMAND_FAILURE, "Failed to start command",
+                            ExtraData="%s [%s]\n\t%s" % (Command, self.WorkingDir, str(X)))
+        Watch = OutputPump.Get().Watch(Proc, EdkLogger.info, EdkLogger.quiet)
+        Proc.wait()
+        Watch.Wait()
+        if Proc.returncode != 0 and not IgnoreError:
+            # print out the Response file and its content when command failure
+            RespFile = os.path.join(self.WorkingDir, 'OUTPUT', 'respfilelist.txt')
+            if os.path.isfile(RespFile):
+                with open(RespFile) as Fd:
+                    EdkLogger.info(Fd.read())
+            EdkLogger.error("build", COMMAND_FAILURE, ExtraData="%s [%s]" % (Command, self.WorkingDir))
+
+## Build a module target with its makefile, without launching make
+#
+#   @param  MakefilePath    Path of the module makefile
+#   @param  Target          The target to build
+#   @param  WorkingDir      The directory the commands run in
+#   @param  MakeCommand     The make command of the tool chain, used for $(MAKE)
+#
+#   @retval string          The build time, in the same format as LaunchCommand
+#
+def RunMakefile(MakefilePath, Target, WorkingDir, MakeCommand=None):
+    if not os.path.isfile(MakefilePath):
+        EdkLogger.error("build", FILE_NOT_FOUND, ExtraData=MakefilePath)
+    return MakefileRunner(MakefilePath, WorkingDir, MakeCommand).Run(Target)
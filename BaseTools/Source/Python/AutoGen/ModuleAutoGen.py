@@ -12,7 +12,7 @@ from Common.DataType import *
 from Common.Misc import *
 from Common.StringUtils import NormPath,GetSplitList
 from collections import defaultdict
-from Workspace.WorkspaceCommon import OrderedListDict
+from Workspace.WorkspaceCommon import OrderedListDict,GetModuleLibInstances
 import os.path as path
 import copy
 import hashlib
@@ -25,6 +25,8 @@ from GenPatchPcdTable.GenPatchPcdTable import parsePcdInfoFromMapFile
 from Workspace.MetaFileCommentParser import UsageList
 from .GenPcdDb import CreatePcdDatabaseCode
 from Common.caching import cached_class_function
+from Common.BuildTrace import TraceMethod
+from . import BinaryCache
 from AutoGen.ModuleAutoGenHelper import PlatformInfo,WorkSpaceInfo
 
 ## Mapping Makefile type
@@ -141,6 +143,22 @@ def _MakeDir(PathList):
     CreateDirectory(RetVal)
     return RetVal
 
+# Return the digest of the INF of a module or library, the sources listed in
+# it and the packages it depends on, or None if a package has no hash yet
+def _GetInputHash(ModuleObj):
+    Key = (ModuleObj.MetaFile.Path, ModuleObj.Arch)
+    if Key not in GlobalData.gModuleInputHash:
+        m = hashlib.md5()
+        for Pkg in sorted(ModuleObj.Packages, key=lambda x: x.PackageName):
+            if Pkg.PackageName not in GlobalData.gPackageHash:
+                return None
+            m.update(GlobalData.gPackageHash[Pkg.PackageName].encode('utf-8'))
+        for File in [ModuleObj.MetaFile] + sorted(ModuleObj.Sources, key=lambda x: str(x)):
+            with open(str(File), 'rb') as f:
+                m.update(f.read())
+        GlobalData.gModuleInputHash[Key] = m.hexdigest()
+    return GlobalData.gModuleInputHash[Key]
+
 #
 # Convert string to C format array
 #
@@ -1608,29 +1626,111 @@ class ModuleAutoGen(AutoGen):
 
         self.IsAsBuiltInfCreated = True
 
+    ## Return the directory of the module in the binary cache
+    #
+    #   @param      CacheRoot   The --binary-destination or --binary-source directory
+    #
+    def GetBinCacheDir(self, CacheRoot):
+        return path.join(CacheRoot, self.PlatformInfo.Name, self.BuildTarget + "_" + self.ToolChain, self.Arch, self.SourceDir, self.MetaFile.BaseName)
+
+    ## Put the outputs of the module in the binary cache
+    #
+    # The outputs are stored in the content addressed object store of the
+    # cache, and the module cache directory gets a manifest of them.
+    #
+    @TraceMethod("cache")
     def CopyModuleToCache(self):
-        FileDir = path.join(GlobalData.gBinCacheDest, self.PlatformInfo.Name, self.BuildTarget + "_" + self.ToolChain, self.Arch, self.SourceDir, self.MetaFile.BaseName)
-        CreateDirectory (FileDir)
         HashFile = path.join(self.BuildDir, self.Name + '.hash')
-        if os.path.exists(HashFile):
-            CopyFileOnChange(HashFile, FileDir)
-        ModuleFile = path.join(self.OutputDir, self.Name + '.inf')
-        if os.path.exists(ModuleFile):
-            CopyFileOnChange(ModuleFile, FileDir)
+        if not os.path.exists(HashFile):
+            return
+        with open(HashFile, 'r') as f:
+            ModuleHash = f.read()
+        Manager = BinaryCache.GetCacheManager(GlobalData.gBinCacheDest)
+        Store = Manager.Store
+        ManifestFile = path.join(self.GetBinCacheDir(Manager.Root), self.Name + BinaryCache.MANIFEST_SUFFIX)
+        Manager.Touch(ManifestFile)
+        Manifest = BinaryCache.LoadManifest(ManifestFile)
+        if Manifest and Manifest["Hash"] == ModuleHash and Manifest["Preflight"] == self.PreflightHash \
+          and all(Store.Has(Digest) for Digest in Manifest["Files"].values()):
+            return
+
         if not self.OutputFile:
             Ma = self.BuildDatabase[self.MetaFile, self.Arch, self.BuildTarget, self.ToolChain]
             self.OutputFile = Ma.Binaries
+        FileList = [path.join(self.OutputDir, self.Name + '.inf')]
         for File in self.OutputFile:
             File = str(File)
             if not os.path.isabs(File):
                 File = os.path.join(self.OutputDir, File)
+            FileList.append(File)
+        Files = {}
+        for File in FileList:
             if os.path.exists(File):
-                sub_dir = os.path.relpath(File, self.OutputDir)
-                destination_file = os.path.join(FileDir, sub_dir)
-                destination_dir = os.path.dirname(destination_file)
-                CreateDirectory(destination_dir)
-                CopyFileOnChange(File, destination_dir)
+                Files[os.path.relpath(File, self.OutputDir).replace(os.sep, '/')] = Store.Put(File)
+        BinaryCache.SaveManifest(ManifestFile, ModuleHash, Files, GlobalData.gModuleHashInputs.get(self.Arch, {}).get(self.Name),
+                                 self.PreflightHash)
+        Manager.Publish(ManifestFile)
+
+    ## Return the hash used to look up the module in the binary cache before AutoGen
+    #
+    # It only uses the inputs known before AutoGen: the platform hash, the
+    # platform PCD settings, and the INF, sources and packages of the module
+    # and of its library instances. None is returned for the modules which
+    # have to go through AutoGen, and when a package has no hash.
+    #
+    @cached_property
+    def PreflightHash(self):
+        if self.IsLibrary or self.IsBinaryModule or self.PcdIsDriver:
+            return None
+        if self.MetaFile not in self.PlatformInfo.Platform.Modules:
+            return None
+        for File in self.Module.Sources:
+            if '.inc' in str(File):
+                return None
+        LibList = GetModuleLibInstances(self.Module, self.PlatformInfo.Platform, self.BuildDatabase,
+                                        self.Arch, self.BuildTarget, self.ToolChain)
+        InputHashList = [_GetInputHash(Module) for Module in [self.Module] + LibList]
+        if None in InputHashList:
+            return None
+        m = hashlib.md5()
+        m.update(GlobalData.gPlatformHash.encode('utf-8'))
+        m.update(self.PlatformInfo.PcdDigest.encode('utf-8'))
+        for InputHash in InputHashList:
+            m.update(InputHash.encode('utf-8'))
+        return m.hexdigest()
+
+    ## Restore the module from the binary cache without doing its AutoGen
+    #
+    #   @retval     True        The outputs of the module are restored
+    #   @retval     False       The module has to go through AutoGen
+    #
+    @TraceMethod("cache")
+    def AttemptPreflightCacheCopy(self):
+        if self.PreflightHash is None:
+            return False
+        Manager = BinaryCache.GetCacheManager(GlobalData.gBinCacheSource)
+        ManifestFile = path.join(self.GetBinCacheDir(Manager.Root), self.Name + BinaryCache.MANIFEST_SUFFIX)
+        Manifest = Manager.GetManifest(ManifestFile)
+        if Manifest is None or Manifest["Preflight"] != self.PreflightHash:
+            return False
+        if not Manager.FetchObjects(Manifest["Files"].values()):
+            return False
+        self._RestoreFromCache(Manager, ManifestFile, Manifest)
+        return True
 
+    ## Restore the outputs listed in a cache manifest in the module directories
+    def _RestoreFromCache(self, Manager, ManifestFile, Manifest):
+        LinkList = []
+        for File, Digest in Manifest["Files"].items():
+            DstFile = path.join(self.OutputDir, os.path.normpath(File))
+            if Manager.Store.Restore(Digest, DstFile) == BinaryCache.LINK_HARD:
+                LinkList.append(DstFile)
+        BinaryCache.SaveLinkList(self.BuildDir, self.Name, LinkList)
+        SaveFileOnChange(path.join(self.BuildDir, self.Name + '.hash'), Manifest["Hash"], False)
+        Manager.Touch(ManifestFile)
+        GlobalData.gBinCacheLookup[(self.MetaFile.Path, self.Arch)] = None
+
+    @TraceMethod("cache")
     def AttemptModuleCacheCopy(self):
         # If library or Module is binary do not skip by hash
         if self.IsBinaryModule:
@@ -1639,30 +1739,22 @@ class ModuleAutoGen(AutoGen):
         for f_ext in self.SourceFileList:
             if '.inc' in str(f_ext):
                 return False
-        FileDir = path.join(GlobalData.gBinCacheSource, self.PlatformInfo.Name, self.BuildTarget + "_" + self.ToolChain, self.Arch, self.SourceDir, self.MetaFile.BaseName)
-        HashFile = path.join(FileDir, self.Name + '.hash')
-        if os.path.exists(HashFile):
-            f = open(HashFile, 'r')
-            CacheHash = f.read()
-            f.close()
-            self.GenModuleHash()
-            if GlobalData.gModuleHash[self.Arch][self.Name]:
-                if CacheHash == GlobalData.gModuleHash[self.Arch][self.Name]:
-                    for root, dir, files in os.walk(FileDir):
-                        for f in files:
-                            if self.Name + '.hash' in f:
-                                CopyFileOnChange(HashFile, self.BuildDir)
-                            else:
-                                File = path.join(root, f)
-                                sub_dir = os.path.relpath(File, FileDir)
-                                destination_file = os.path.join(self.OutputDir, sub_dir)
-                                destination_dir = os.path.dirname(destination_file)
-                                CreateDirectory(destination_dir)
-                                CopyFileOnChange(File, destination_dir)
-                    if self.Name == "PcdPeim" or self.Name == "PcdDxe":
-                        CreatePcdDatabaseCode(self, TemplateString(), TemplateString())
-                    return True
-        return False
+        Manager = BinaryCache.GetCacheManager(GlobalData.gBinCacheSource)
+        ManifestFile = path.join(self.GetBinCacheDir(Manager.Root), self.Name + BinaryCache.MANIFEST_SUFFIX)
+        LookupKey = (self.MetaFile.Path, self.Arch)
+        Manifest = Manager.GetManifest(ManifestFile)
+        self.GenModuleHash()
+        if Manifest is None or Manifest["Hash"] != GlobalData.gModuleHash[self.Arch][self.Name]:
+            GlobalData.gBinCacheLookup[LookupKey] = BinaryCache.GetMissReason(Manifest, GlobalData.gModuleHashInputs.get(self.Arch, {}).get(self.Name))
+            return False
+        if not Manager.FetchObjects(Manifest["Files"].values()):
+            GlobalData.gBinCacheLookup[LookupKey] = BinaryCache.MISS_OBJECT_MISSING
+            return False
+
+        self._RestoreFromCache(Manager, ManifestFile, Manifest)
+        if self.Name == "PcdPeim" or self.Name == "PcdDxe":
+            CreatePcdDatabaseCode(self, TemplateString(), TemplateString())
+        return True
 
     ## Create makefile for the module and its dependent libraries
     #
@@ -1819,6 +1911,10 @@ class ModuleAutoGen(AutoGen):
 
         # Initialze hash object
         m = hashlib.md5()
+        # The digest of each kind of input, kept to explain binary cache misses
+        PkgHash = hashlib.md5()
+        SrcHash = hashlib.md5()
+        LibHash = {}
 
         # Add Platform level hash
         m.update(GlobalData.gPlatformHash.encode('utf-8'))
@@ -1828,6 +1924,7 @@ class ModuleAutoGen(AutoGen):
             for Pkg in sorted(self.DependentPackageList, key=lambda x: x.PackageName):
                 if Pkg.PackageName in GlobalData.gPackageHash:
                     m.update(GlobalData.gPackageHash[Pkg.PackageName].encode('utf-8'))
+                    PkgHash.update(GlobalData.gPackageHash[Pkg.PackageName].encode('utf-8'))
 
         # Add Library hash
         if self.LibraryAutoGenList:
@@ -1835,12 +1932,14 @@ class ModuleAutoGen(AutoGen):
                 if Lib.Name not in GlobalData.gModuleHash[self.Arch]:
                     Lib.GenModuleHash()
                 m.update(GlobalData.gModuleHash[self.Arch][Lib.Name].encode('utf-8'))
+                LibHash[Lib.Name] = GlobalData.gModuleHash[self.Arch][Lib.Name]
 
         # Add Module self
         f = open(str(self.MetaFile), 'rb')
         Content = f.read()
         f.close()
         m.update(Content)
+        SrcHash.update(Content)
 
         # Add Module's source files
         if self.SourceFileList:
@@ -1849,8 +1948,15 @@ class ModuleAutoGen(AutoGen):
                 Content = f.read()
                 f.close()
                 m.update(Content)
+                SrcHash.update(Content)
 
         GlobalData.gModuleHash[self.Arch][self.Name] = m.hexdigest()
+        GlobalData.gModuleHashInputs.setdefault(self.Arch, {})[self.Name] = {
+            "Platform" : GlobalData.gPlatformHash,
+            "Package"  : PkgHash.hexdigest(),
+            "Library"  : LibHash,
+            "Source"   : SrcHash.hexdigest(),
+            }
 
         return GlobalData.gModuleHash[self.Arch][self.Name].encode('utf-8')
 
@@ -1858,8 +1964,13 @@ class ModuleAutoGen(AutoGen):
     def CanSkipbyHash(self):
         # Hashing feature is off
         if not GlobalData.gUseHashCache:
+            BinaryCache.UnshareLinkedFiles(self.BuildDir, self.Name)
             return False
 
+        # Already restored from the binary cache
+        if GlobalData.gBinCacheLookup.get((self.MetaFile.Path, self.Arch), False) is None:
+            return True
+
         # Initialize a dictionary for each arch type
         if self.Arch not in GlobalData.gBuildHashSkipTracking:
             GlobalData.gBuildHashSkipTracking[self.Arch] = dict()
@@ -1886,6 +1997,9 @@ class ModuleAutoGen(AutoGen):
         if self.Name not in GlobalData.gBuildHashSkipTracking[self.Arch]:
             # If hashes are the same, SaveFileOnChange() will return False.
             GlobalData.gBuildHashSkipTracking[self.Arch][self.Name] = not SaveFileOnChange(HashFile, self.GenModuleHash(), True)
+            if not GlobalData.gBuildHashSkipTracking[self.Arch][self.Name]:
+                # outputs restored from the cache are going to be rebuilt
+                BinaryCache.UnshareLinkedFiles(self.BuildDir, self.Name)
             return GlobalData.gBuildHashSkipTracking[self.Arch][self.Name]
         else:
             return GlobalData.gBuildHashSkipTracking[self.Arch][self.Name]
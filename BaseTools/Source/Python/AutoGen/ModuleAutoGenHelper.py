@@ -15,11 +15,13 @@ from Common.DataType import *
 from CommonDataClass.Exceptions import *
 from CommonDataClass.CommonClass import SkuInfoClass
 import Common.EdkLogger as EdkLogger
+from Common import GlobalData
 from Common.BuildToolError import OPTION_CONFLICT,FORMAT_INVALID,RESOURCE_NOT_AVAILABLE
 from Common.MultipleWorkspace import MultipleWorkspace as mws
 from collections import defaultdict
 from Common.Misc import PathClass
 import os
+import hashlib
 
 
 #
@@ -41,6 +43,49 @@ PrioList = {"0x11111"  : 16,     #  TARGET_TOOLCHAIN_ARCH_COMMANDTYPE_ATTRIBUTE
             "0x01001"  : 3,      #  ******_TOOLCHAIN_****_***********_ATTRIBUTE
             "0x10001"  : 2,      #  TARGET_*********_****_***********_ATTRIBUTE
             "0x00001"  : 1}      #  ******_*********_****_***********_ATTRIBUTE (Lowest)
+## Indexes of the platform PCD settings applied to the module PCDs
+#
+#   The PCD settings are the ones of GlobalData in the build process, the
+#   classes getting them from elsewhere override _PlatformMixedPcd and
+#   _PlatformBuildOptionPcd.
+#
+class PlatformPcdIndex(object):
+    @property
+    def _PlatformMixedPcd(self):
+        return GlobalData.MixedPcd
+
+    @property
+    def _PlatformBuildOptionPcd(self):
+        return GlobalData.BuildOptionPcd
+
+    ## The name used in platform of the PCDs split by MixedPcd, indexed by (TokenCName, TokenSpaceGuidCName)
+    @cached_property
+    def _MixedPcdName(self):
+        RetVal = {}
+        for PcdItem in self._PlatformMixedPcd:
+            for Pcd in self._PlatformMixedPcd[PcdItem]:
+                RetVal.setdefault(Pcd, PcdItem[0])
+        return RetVal
+
+    ## The PCD values from command line, indexed by (TokenCName, TokenSpaceGuidCName)
+    @cached_property
+    def _BuildOptionPcdValue(self):
+        RetVal = {}
+        for (TokenSpaceGuidCName, TokenCName, FieldName, pcdvalue, _) in self._PlatformBuildOptionPcd or []:
+            if FieldName == "":
+                RetVal.setdefault((TokenCName, TokenSpaceGuidCName), pcdvalue)
+        return RetVal
+
+    @cached_property
+    def _VariableGuidValue(self):
+        return {}
+
+    ## Return the value of the GUID of a HII PCD variable, looked up once for each GUID
+    def _GetVariableGuidValue(self, VariableGuid):
+        if VariableGuid not in self._VariableGuidValue:
+            self._VariableGuidValue[VariableGuid] = GuidValue(VariableGuid, self.PackageList, self.MetaFile.Path)
+        return self._VariableGuidValue[VariableGuid]
+
 ## Base class for AutoGen
 #
 #   This class just implements the cache mechanism of AutoGen objects.
@@ -246,7 +291,7 @@ class WorkSpaceInfo(AutoGenInfo):
         self.ArchList = Arch
 
 
-class PlatformInfo(AutoGenInfo):
+class PlatformInfo(AutoGenInfo, PlatformPcdIndex):
     def __init__(self, Workspace, MetaFile, Target, ToolChain, Arch,DataPipe):
         self.Wa = Workspace
         self.WorkspaceDir = self.Wa.WorkspaceDir
@@ -373,11 +418,7 @@ class PlatformInfo(AutoGenInfo):
         # at this point, ToPcd.Type has the type found from dependent
         # package
         #
-        TokenCName = ToPcd.TokenCName
-        for PcdItem in self.MixedPcd:
-            if (ToPcd.TokenCName, ToPcd.TokenSpaceGuidCName) in self.MixedPcd[PcdItem]:
-                TokenCName = PcdItem[0]
-                break
+        TokenCName = self._MixedPcdName.get((ToPcd.TokenCName, ToPcd.TokenSpaceGuidCName), ToPcd.TokenCName)
         if FromPcd is not None:
             if ToPcd.Pending and FromPcd.Type:
                 ToPcd.Type = FromPcd.Type
@@ -465,7 +506,7 @@ class PlatformInfo(AutoGenInfo):
             for SkuId in PcdInModule.SkuInfoList:
                 Sku = PcdInModule.SkuInfoList[SkuId]
                 if Sku.VariableGuid == '': continue
-                Sku.VariableGuidValue = GuidValue(Sku.VariableGuid, self.PackageList, self.MetaFile.Path)
+                Sku.VariableGuidValue = self._GetVariableGuidValue(Sku.VariableGuid)
                 if Sku.VariableGuidValue is None:
                     PackageList = "\n\t".join(str(P) for P in self.PackageList)
                     EdkLogger.error(
@@ -481,13 +522,10 @@ class PlatformInfo(AutoGenInfo):
         if Module in self.Platform.Modules:
             PlatformModule = self.Platform.Modules[str(Module)]
             for Key  in PlatformModule.Pcds:
-                if self.BuildOptionPcd:
-                    for pcd in self.BuildOptionPcd:
-                        (TokenSpaceGuidCName, TokenCName, FieldName, pcdvalue, _) = pcd
-                        if (TokenCName, TokenSpaceGuidCName) == Key and FieldName =="":
-                            PlatformModule.Pcds[Key].DefaultValue = pcdvalue
-                            PlatformModule.Pcds[Key].PcdValueFromComm = pcdvalue
-                            break
+                if Key in self._BuildOptionPcdValue:
+                    pcdvalue = self._BuildOptionPcdValue[Key]
+                    PlatformModule.Pcds[Key].DefaultValue = pcdvalue
+                    PlatformModule.Pcds[Key].PcdValueFromComm = pcdvalue
                 Flag = False
                 if Key in Pcds:
                     ToPcd = Pcds[Key]
@@ -524,6 +562,20 @@ class PlatformInfo(AutoGenInfo):
 #                 pcd.SkuInfoList[skuid] = self.CreateSkuInfoFromDict(pcd.SkuInfoList[skuid])
         return {(pcddata.TokenCName,pcddata.TokenSpaceGuidCName):pcddata for pcddata in PlatformPcdData}
 
+    ## Return the digest of the platform PCD settings
+    #
+    # It's one of the inputs of ModuleAutoGen.PreflightHash, so it covers
+    # the resolved values, including the ones given in command line.
+    #
+    @cached_property
+    def PcdDigest(self):
+        m = hashlib.md5()
+        for Pcd in sorted(self.Pcds.values(), key=lambda x: (x.TokenSpaceGuidCName, x.TokenCName)):
+            SkuInfo = sorted((str(SkuName), str(Sku)) for SkuName, Sku in (Pcd.SkuInfoList or {}).items())
+            m.update(str((Pcd.TokenSpaceGuidCName, Pcd.TokenCName, Pcd.Type, Pcd.DatumType, Pcd.DefaultValue,
+                          Pcd.MaxDatumSize, Pcd.TokenValue, SkuInfo)).encode('utf-8'))
+        return m.hexdigest()
+
     def CreateSkuInfoFromDict(self,SkuInfoDict):
         return SkuInfoClass(
             SkuInfoDict.get("SkuIdName"),
@@ -550,6 +602,12 @@ class PlatformInfo(AutoGenInfo):
     @cached_property
     def BuildOptionPcd(self):
         return self.DataPipe.Get("BuildOptPcd")
+    @property
+    def _PlatformMixedPcd(self):
+        return self.MixedPcd
+    @property
+    def _PlatformBuildOptionPcd(self):
+        return self.BuildOptionPcd
     def ApplyBuildOption(self,module):
         PlatformOptions = self.DataPipe.Get("PLA_BO")
         ModuleBuildOptions = self.DataPipe.Get("MOL_BO")
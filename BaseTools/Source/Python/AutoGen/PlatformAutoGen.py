@@ -18,6 +18,7 @@ from .GenVar import VariableMgr, var_info
 from . import GenMake
 from AutoGen.DataPipe import MemoryDataPipe
 from AutoGen.ModuleAutoGen import ModuleAutoGen
+from AutoGen.ModuleAutoGenHelper import PlatformPcdIndex
 from AutoGen.AutoGen import AutoGen
 from AutoGen.AutoGen import CalculatePriorityValue
 from Workspace.WorkspaceCommon import GetModuleLibInstances
@@ -64,7 +65,7 @@ def _SplitOption(OptionString):
 #  PlatformAutoGen class will process the original information in platform
 #  file in order to generate makefile for platform.
 #
-class PlatformAutoGen(AutoGen):
+class PlatformAutoGen(AutoGen, PlatformPcdIndex):
     # call super().__init__ then call the worker function with different parameter count
     def __init__(self, Workspace, MetaFile, Target, Toolchain, Arch, *args, **kwargs):
         if not hasattr(self, "_Init"):
@@ -311,6 +312,9 @@ class PlatformAutoGen(AutoGen):
         for InfName in self._AsBuildInfList:
             InfName = mws.join(self.WorkspaceDir, InfName)
             FdfModuleList.append(os.path.normpath(InfName))
+        FdfModuleSet = set(FdfModuleList)
+        DynaPcdIndex = self._GetPcdIndex(self._DynaPcdList_)
+        NonDynaPcdIndex = self._GetPcdIndex(self._NonDynaPcdList_)
         for M in self._MbList:
 #            F is the Module for which M is the module autogen
             ModPcdList = self.ApplyPcdSetting(M, M.ModulePcdList)
@@ -318,6 +322,7 @@ class PlatformAutoGen(AutoGen):
             for lib in M.LibraryPcdList:
                 LibPcdList.extend(self.ApplyPcdSetting(M, M.LibraryPcdList[lib], lib))
             for PcdFromModule in ModPcdList + LibPcdList:
+                PcdKey = (PcdFromModule.TokenCName, PcdFromModule.TokenSpaceGuidCName)
 
                 # make sure that the "VOID*" kind of datum has MaxDatumSize set
                 if PcdFromModule.DatumType == TAB_VOID and not PcdFromModule.MaxDatumSize:
@@ -328,10 +333,10 @@ class PlatformAutoGen(AutoGen):
                     PcdFromModule.IsFromBinaryInf = True
 
                 # Check the PCD from DSC or not
-                PcdFromModule.IsFromDsc = (PcdFromModule.TokenCName, PcdFromModule.TokenSpaceGuidCName) in self.Platform.Pcds
+                PcdFromModule.IsFromDsc = PcdKey in self.Platform.Pcds
 
                 if PcdFromModule.Type in PCD_DYNAMIC_TYPE_SET or PcdFromModule.Type in PCD_DYNAMIC_EX_TYPE_SET:
-                    if M.MetaFile.Path not in FdfModuleList:
+                    if M.MetaFile.Path not in FdfModuleSet:
                         # If one of the Source built modules listed in the DSC is not listed
                         # in FDF modules, and the INF lists a PCD can only use the PcdsDynamic
                         # access method (it is only listed in the DEC file that declares the
@@ -359,21 +364,23 @@ class PlatformAutoGen(AutoGen):
                     #
                     if M.ModuleType in SUP_MODULE_SET_PEI:
                         PcdFromModule.Phase = "PEI"
-                    if PcdFromModule not in self._DynaPcdList_:
+                    if PcdKey not in DynaPcdIndex:
+                        DynaPcdIndex[PcdKey] = len(self._DynaPcdList_)
                         self._DynaPcdList_.append(PcdFromModule)
                     elif PcdFromModule.Phase == 'PEI':
                         # overwrite any the same PCD existing, if Phase is PEI
-                        Index = self._DynaPcdList_.index(PcdFromModule)
-                        self._DynaPcdList_[Index] = PcdFromModule
-                elif PcdFromModule not in self._NonDynaPcdList_:
+                        self._DynaPcdList_[DynaPcdIndex[PcdKey]] = PcdFromModule
+                elif PcdKey not in NonDynaPcdIndex:
+                    NonDynaPcdIndex[PcdKey] = len(self._NonDynaPcdList_)
                     self._NonDynaPcdList_.append(PcdFromModule)
-                elif PcdFromModule in self._NonDynaPcdList_ and PcdFromModule.IsFromBinaryInf == True:
-                    Index = self._NonDynaPcdList_.index(PcdFromModule)
+                elif PcdFromModule.IsFromBinaryInf == True:
+                    Index = NonDynaPcdIndex[PcdKey]
                     if self._NonDynaPcdList_[Index].IsFromBinaryInf == False:
                         #The PCD from Binary INF will override the same one from source INF
-                        self._NonDynaPcdList_.remove (self._NonDynaPcdList_[Index])
+                        del self._NonDynaPcdList_[Index]
                         PcdFromModule.Pending = False
                         self._NonDynaPcdList_.append (PcdFromModule)
+                        NonDynaPcdIndex = self._GetPcdIndex(self._NonDynaPcdList_)
         DscModuleSet = {os.path.normpath(ModuleInf.Path) for ModuleInf in self.Platform.Modules}
         # add the PCD from modules that listed in FDF but not in DSC to Database
         for InfName in FdfModuleList:
@@ -388,6 +395,7 @@ class PlatformAutoGen(AutoGen):
                 # Override the module PCD setting by platform setting
                 ModulePcdList = self.ApplyPcdSetting(M, M.Pcds)
                 for PcdFromModule in ModulePcdList:
+                    PcdKey = (PcdFromModule.TokenCName, PcdFromModule.TokenSpaceGuidCName)
                     PcdFromModule.IsFromBinaryInf = True
                     PcdFromModule.IsFromDsc = False
                     # Only allow the DynamicEx and Patchable PCD in AsBuild INF
@@ -401,17 +409,19 @@ class PlatformAutoGen(AutoGen):
                         NoDatumTypePcdList.add("%s.%s [%s]" % (PcdFromModule.TokenSpaceGuidCName, PcdFromModule.TokenCName, InfName))
                     if M.ModuleType in SUP_MODULE_SET_PEI:
                         PcdFromModule.Phase = "PEI"
-                    if PcdFromModule not in self._DynaPcdList_ and PcdFromModule.Type in PCD_DYNAMIC_EX_TYPE_SET:
+                    if PcdKey not in DynaPcdIndex and PcdFromModule.Type in PCD_DYNAMIC_EX_TYPE_SET:
+                        DynaPcdIndex[PcdKey] = len(self._DynaPcdList_)
                         self._DynaPcdList_.append(PcdFromModule)
-                    elif PcdFromModule not in self._NonDynaPcdList_ and PcdFromModule.Type in TAB_PCDS_PATCHABLE_IN_MODULE:
+                    elif PcdKey not in NonDynaPcdIndex and PcdFromModule.Type in TAB_PCDS_PATCHABLE_IN_MODULE:
+                        NonDynaPcdIndex[PcdKey] = len(self._NonDynaPcdList_)
                         self._NonDynaPcdList_.append(PcdFromModule)
-                    if PcdFromModule in self._DynaPcdList_ and PcdFromModule.Phase == 'PEI' and PcdFromModule.Type in PCD_DYNAMIC_EX_TYPE_SET:
+                    if PcdKey in DynaPcdIndex and PcdFromModule.Phase == 'PEI' and PcdFromModule.Type in PCD_DYNAMIC_EX_TYPE_SET:
                         # Overwrite the phase of any the same PCD existing, if Phase is PEI.
                         # It is to solve the case that a dynamic PCD used by a PEM module/PEI
                         # module & DXE module at a same time.
                         # Overwrite the type of the PCDs in source INF by the type of AsBuild
                         # INF file as DynamicEx.
-                        Index = self._DynaPcdList_.index(PcdFromModule)
+                        Index = DynaPcdIndex[PcdKey]
                         self._DynaPcdList_[Index].Phase = PcdFromModule.Phase
                         self._DynaPcdList_[Index].Type = PcdFromModule.Type
         for PcdFromModule in self._NonDynaPcdList_:
@@ -422,15 +432,16 @@ class PlatformAutoGen(AutoGen):
             # section, then the tools must NOT add the PCD to the Platform's PCD
             # Database; the build must assign the access method for this PCD as
             # PcdsPatchableInModule.
-            if PcdFromModule not in self._DynaPcdList_:
+            PcdKey = (PcdFromModule.TokenCName, PcdFromModule.TokenSpaceGuidCName)
+            if PcdKey not in DynaPcdIndex:
                 continue
-            Index = self._DynaPcdList_.index(PcdFromModule)
+            Index = DynaPcdIndex[PcdKey]
             if PcdFromModule.IsFromDsc == False and \
                 PcdFromModule.Type in TAB_PCDS_PATCHABLE_IN_MODULE and \
                 PcdFromModule.IsFromBinaryInf == True and \
                 self._DynaPcdList_[Index].IsFromBinaryInf == False:
-                Index = self._DynaPcdList_.index(PcdFromModule)
-                self._DynaPcdList_.remove (self._DynaPcdList_[Index])
+                del self._DynaPcdList_[Index]
+                DynaPcdIndex = self._GetPcdIndex(self._DynaPcdList_)
 
         # print out error information and break the build, if error found
         if len(NoDatumTypePcdList) > 0:
@@ -442,6 +453,14 @@ class PlatformAutoGen(AutoGen):
         self._NonDynamicPcdList = self._NonDynaPcdList_
         self._DynamicPcdList = self._DynaPcdList_
 
+    ## Return the index of the PCDs in a list by (TokenCName, TokenSpaceGuidCName)
+    @staticmethod
+    def _GetPcdIndex(PcdList):
+        PcdIndex = {}
+        for Index, Pcd in enumerate(PcdList):
+            PcdIndex.setdefault((Pcd.TokenCName, Pcd.TokenSpaceGuidCName), Index)
+        return PcdIndex
+
     def SortDynamicPcd(self):
         #
         # Sort dynamic PCD list to:
@@ -560,16 +579,14 @@ class PlatformAutoGen(AutoGen):
             # Fix the PCDs define in VPD PCD section that never referenced by module.
             # An example is PCD for signature usage.
             #
+            VpdPcdSet = {(VpdPcd.TokenSpaceGuidCName, VpdPcd.TokenCName) for VpdPcd in VpdFile._VpdArray}
+            DecPcdIndex = None
             for DscPcd in PlatformPcds:
                 DscPcdEntry = self._PlatformPcds[DscPcd]
                 if DscPcdEntry.Type in [TAB_PCDS_DYNAMIC_VPD, TAB_PCDS_DYNAMIC_EX_VPD]:
                     if not (self.Platform.VpdToolGuid is None or self.Platform.VpdToolGuid == ''):
-                        FoundFlag = False
-                        for VpdPcd in VpdFile._VpdArray:
-                            # This PCD has been referenced by module
-                            if (VpdPcd.TokenSpaceGuidCName == DscPcdEntry.TokenSpaceGuidCName) and \
-                               (VpdPcd.TokenCName == DscPcdEntry.TokenCName):
-                                    FoundFlag = True
+                        # This PCD has been referenced by module
+                        FoundFlag = (DscPcdEntry.TokenSpaceGuidCName, DscPcdEntry.TokenCName) in VpdPcdSet
 
                         # Not found, it should be signature
                         if not FoundFlag :
@@ -580,28 +597,29 @@ class PlatformAutoGen(AutoGen):
                             if DefaultSku:
                                 defaultindex = SkuObjList.index((TAB_DEFAULT, DefaultSku))
                                 SkuObjList[0], SkuObjList[defaultindex] = SkuObjList[defaultindex], SkuObjList[0]
+                            # Index the DEC PCDs to get the value & datumtype
+                            if DecPcdIndex is None:
+                                DecPcdIndex = defaultdict(list)
+                                for eachDec in self.PackageList:
+                                    for DecPcdEntry in eachDec.Pcds.values():
+                                        DecPcdIndex[DecPcdEntry.TokenSpaceGuidCName, DecPcdEntry.TokenCName].append((eachDec, DecPcdEntry))
                             for (SkuName, Sku) in SkuObjList:
                                 Sku.VpdOffset = Sku.VpdOffset.strip()
 
-                                # Need to iterate DEC pcd information to get the value & datumtype
-                                for eachDec in self.PackageList:
-                                    for DecPcd in eachDec.Pcds:
-                                        DecPcdEntry = eachDec.Pcds[DecPcd]
-                                        if (DecPcdEntry.TokenSpaceGuidCName == DscPcdEntry.TokenSpaceGuidCName) and \
-                                           (DecPcdEntry.TokenCName == DscPcdEntry.TokenCName):
-                                            # Print warning message to let the developer make a determine.
-                                            EdkLogger.warn("build", "Unreferenced vpd pcd used!",
-                                                            File=self.MetaFile, \
-                                                            ExtraData = "PCD: %s.%s used in the DSC file %s is unreferenced." \
-                                                            %(DscPcdEntry.TokenSpaceGuidCName, DscPcdEntry.TokenCName, self.Platform.MetaFile.Path))
-
-                                            DscPcdEntry.DatumType    = DecPcdEntry.DatumType
-                                            DscPcdEntry.DefaultValue = DecPcdEntry.DefaultValue
-                                            DscPcdEntry.TokenValue = DecPcdEntry.TokenValue
-                                            DscPcdEntry.TokenSpaceGuidValue = eachDec.Guids[DecPcdEntry.TokenSpaceGuidCName]
-                                            # Only fix the value while no value provided in DSC file.
-                                            if not Sku.DefaultValue:
-                                                DscPcdEntry.SkuInfoList[list(DscPcdEntry.SkuInfoList.keys())[0]].DefaultValue = DecPcdEntry.DefaultValue
+                                for eachDec, DecPcdEntry in DecPcdIndex.get((DscPcdEntry.TokenSpaceGuidCName, DscPcdEntry.TokenCName), []):
+                                    # Print warning message to let the developer make a determine.
+                                    EdkLogger.warn("build", "Unreferenced vpd pcd used!",
+                                                    File=self.MetaFile, \
+                                                    ExtraData = "PCD: %s.%s used in the DSC file %s is unreferenced." \
+                                                    %(DscPcdEntry.TokenSpaceGuidCName, DscPcdEntry.TokenCName, self.Platform.MetaFile.Path))
+
+                                    DscPcdEntry.DatumType    = DecPcdEntry.DatumType
+                                    DscPcdEntry.DefaultValue = DecPcdEntry.DefaultValue
+                                    DscPcdEntry.TokenValue = DecPcdEntry.TokenValue
+                                    DscPcdEntry.TokenSpaceGuidValue = eachDec.Guids[DecPcdEntry.TokenSpaceGuidCName]
+                                    # Only fix the value while no value provided in DSC file.
+                                    if not Sku.DefaultValue:
+                                        DscPcdEntry.SkuInfoList[list(DscPcdEntry.SkuInfoList.keys())[0]].DefaultValue = DecPcdEntry.DefaultValue
 
                                 if DscPcdEntry not in self._DynamicPcdList:
                                     self._DynamicPcdList.append(DscPcdEntry)
@@ -1133,11 +1151,7 @@ class PlatformAutoGen(AutoGen):
         # at this point, ToPcd.Type has the type found from dependent
         # package
         #
-        TokenCName = ToPcd.TokenCName
-        for PcdItem in GlobalData.MixedPcd:
-            if (ToPcd.TokenCName, ToPcd.TokenSpaceGuidCName) in GlobalData.MixedPcd[PcdItem]:
-                TokenCName = PcdItem[0]
-                break
+        TokenCName = self._MixedPcdName.get((ToPcd.TokenCName, ToPcd.TokenSpaceGuidCName), ToPcd.TokenCName)
         if FromPcd is not None:
             if ToPcd.Pending and FromPcd.Type:
                 ToPcd.Type = FromPcd.Type
@@ -1231,7 +1245,7 @@ class PlatformAutoGen(AutoGen):
             for SkuId in PcdInModule.SkuInfoList:
                 Sku = PcdInModule.SkuInfoList[SkuId]
                 if Sku.VariableGuid == '': continue
-                Sku.VariableGuidValue = GuidValue(Sku.VariableGuid, self.PackageList, self.MetaFile.Path)
+                Sku.VariableGuidValue = self._GetVariableGuidValue(Sku.VariableGuid)
                 if Sku.VariableGuidValue is None:
                     PackageList = "\n\t".join(str(P) for P in self.PackageList)
                     EdkLogger.error(
@@ -1247,13 +1261,10 @@ class PlatformAutoGen(AutoGen):
         if Module in self.Platform.Modules:
             PlatformModule = self.Platform.Modules[str(Module)]
             for Key  in PlatformModule.Pcds:
-                if GlobalData.BuildOptionPcd:
-                    for pcd in GlobalData.BuildOptionPcd:
-                        (TokenSpaceGuidCName, TokenCName, FieldName, pcdvalue, _) = pcd
-                        if (TokenCName, TokenSpaceGuidCName) == Key and FieldName =="":
-                            PlatformModule.Pcds[Key].DefaultValue = pcdvalue
-                            PlatformModule.Pcds[Key].PcdValueFromComm = pcdvalue
-                            break
+                if Key in self._BuildOptionPcdValue:
+                    pcdvalue = self._BuildOptionPcdValue[Key]
+                    PlatformModule.Pcds[Key].DefaultValue = pcdvalue
+                    PlatformModule.Pcds[Key].PcdValueFromComm = pcdvalue
                 Flag = False
                 if Key in Pcds:
                     ToPcd = Pcds[Key]
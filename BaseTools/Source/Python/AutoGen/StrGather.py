@@ -10,6 +10,8 @@
 #
 from __future__ import absolute_import
 import re
+import json
+import hashlib
 import Common.EdkLogger as EdkLogger
 from Common.BuildToolError import *
 from .UniClassObject import *
@@ -55,6 +57,12 @@ COMMENT_NOT_REFERENCED = ' ' + COMMENT + NOT_REFERENCED
 CHAR_ARRAY_DEFIN = 'unsigned char'
 COMMON_FILE_NAME = 'Strings'
 STRING_TOKEN = re.compile('STRING_TOKEN *\(([A-Z0-9_]+) *\)', re.MULTILINE | re.UNICODE)
+STRING_TOKEN_BYTES = re.compile(b'STRING_TOKEN *\\(([A-Z0-9_]+) *\\)')
+
+#
+# The string identifiers used by the source files, {(Path, Digest) : [Name]}
+#
+gStringTokenCache = {}
 
 EFI_HII_ARRAY_SIZE_LENGTH = 4
 EFI_HII_PACKAGE_HEADER_LENGTH = 4
@@ -521,46 +529,164 @@ def GetFileList(SourceFileList, IncludeList, SkipList):
 #
 # @retval UniObjectClass: UniObjectClass after searched
 #
-def SearchString(UniObjectClass, FileList, IsCompatibleMode):
+def SearchString(UniObjectClass, FileList, IsCompatibleMode, StringTokens=None):
     if FileList == []:
         return UniObjectClass
 
+    if StringTokens is None:
+        StringTokens = SearchStringTokens(FileList)
+    for StrName in StringTokens:
+        UniObjectClass.SetStringReferenced(StrName)
+
+    UniObjectClass.ReToken()
+
+    return UniObjectClass
+
+## SearchStringTokens
+#
+# Search the string identifiers used by STRING_TOKEN in the files
+#
+# @param FileList:        Search path list
+#
+# @retval list:           The string identifiers found, sorted
+#
+def SearchStringTokens(FileList):
+    StringTokens = set()
     for File in FileList:
         try:
             if os.path.isfile(File):
-                Lines = open(File, 'r')
-                for Line in Lines:
-                    for StrName in STRING_TOKEN.findall(Line):
-                        EdkLogger.debug(EdkLogger.DEBUG_5, "Found string identifier: " + StrName)
-                        UniObjectClass.SetStringReferenced(StrName)
+                StringTokens.update(SearchFileStringTokens(File)[1])
         except:
             EdkLogger.error("UnicodeStringGather", AUTOGEN_ERROR, "SearchString: Error while processing file", File=File, RaiseError=False)
             raise
+    return sorted(StringTokens)
 
-    UniObjectClass.ReToken()
+## SearchFileStringTokens
+#
+# Search the string identifiers in one file. The whole file is searched at
+# once, and only once for each content of the file.
+#
+# @param File:            The file to search
+#
+# @retval tuple:          The digest of the file and the string identifiers
+#
+def SearchFileStringTokens(File):
+    with open(File, 'rb') as Fd:
+        Data = Fd.read()
+    Key = (File, hashlib.md5(Data).hexdigest())
+    if Key not in gStringTokenCache:
+        StringTokens = set()
+        for StrName in STRING_TOKEN_BYTES.findall(Data):
+            StringTokens.add(StrName.decode())
+        for StrName in sorted(StringTokens):
+            EdkLogger.debug(EdkLogger.DEBUG_5, "Found string identifier: " + StrName)
+        gStringTokenCache[Key] = sorted(StringTokens)
+    return Key[1], gStringTokenCache[Key]
 
-    return UniObjectClass
+## Digest of the content of a file, None if the file cannot be read
+def GetFileDigest(FilePath):
+    try:
+        with open(FilePath, 'rb') as Fd:
+            return hashlib.md5(Fd.read()).hexdigest()
+    except (IOError, OSError):
+        return None
+
+## LoadStringCache
+#
+# Load the strings generated by previous build. The string identifiers found
+# in the source files are added to gStringTokenCache.
+#
+# @param CacheFile:       The file keeping the strings generated
+#
+# @retval dict:           The cached strings, None if there's no cache
+#
+def LoadStringCache(CacheFile):
+    try:
+        with open(CacheFile, 'r') as Fd:
+            Cache = json.load(Fd)
+    except (IOError, OSError, ValueError):
+        return None
+    if not isinstance(Cache, dict):
+        return None
+    for FilePath, (Digest, StringTokens) in Cache.get("SourceTokens", {}).items():
+        gStringTokenCache.setdefault((FilePath, Digest), StringTokens)
+    return Cache
+
+## Return True if the strings are generated for the same inputs
+#
+# @param Cache:           The cached strings returned by LoadStringCache
+# @param Key:             The digest of the inputs other than the .uni files
+#
+def IsStringCacheValid(Cache, Key):
+    if Cache.get("Key") != Key:
+        return False
+    for FilePath, Digest in Cache.get("UniFiles", {}).items():
+        if GetFileDigest(FilePath) != Digest:
+            return False
+    return True
+
+## SaveStringCache
+#
+# Save the strings generated for the inputs
+#
+def SaveStringCache(CacheFile, Key, Uni, FileList, HFile, CFile, UniGenBinBuffer):
+    SourceTokens = {}
+    for File in FileList:
+        if os.path.isfile(File):
+            SourceTokens[File] = SearchFileStringTokens(File)
+    Cache = {
+        "Key"       : Key,
+        "UniFiles"  : Uni.FileDigest,
+        "SourceTokens" : SourceTokens,
+        "HFile"     : HFile,
+        "CFile"     : CFile,
+        "BinBuffer" : UniGenBinBuffer.getvalue().hex() if UniGenBinBuffer else None
+        }
+    try:
+        CacheDir = os.path.dirname(CacheFile)
+        if CacheDir and not os.path.isdir(CacheDir):
+            os.makedirs(CacheDir)
+        with open(CacheFile, 'w') as Fd:
+            json.dump(Cache, Fd)
+    except (IOError, OSError):
+        EdkLogger.verbose("Failed to save the string cache %s" % CacheFile)
 
 ## GetStringFiles
 #
 # This function is used for UEFI2.1 spec
 #
 #
-def GetStringFiles(UniFilList, SourceFileList, IncludeList, IncludePathList, SkipList, BaseName, IsCompatibleMode = False, ShellMode = False, UniGenCFlag = True, UniGenBinBuffer = None, FilterInfo = [True, []]):
-    if len(UniFilList) > 0:
-        if ShellMode:
-            #
-            # support ISO 639-2 codes in .UNI files of EDK Shell
-            #
-            Uni = UniFileClassObject(sorted(UniFilList, key=lambda x: x.File), True, IncludePathList)
-        else:
-            Uni = UniFileClassObject(sorted(UniFilList, key=lambda x: x.File), IsCompatibleMode, IncludePathList)
-    else:
+# The .h and .c files, and the string package, are kept in CacheFile, if it's
+# given, and used again until the .uni files, the string identifiers used by
+# the source files or the options are changed.
+#
+def GetStringFiles(UniFilList, SourceFileList, IncludeList, IncludePathList, SkipList, BaseName, IsCompatibleMode = False, ShellMode = False, UniGenCFlag = True, UniGenBinBuffer = None, FilterInfo = [True, []], CacheFile = None):
+    if len(UniFilList) == 0:
         EdkLogger.error("UnicodeStringGather", AUTOGEN_ERROR, 'No unicode files given')
 
-    FileList = GetFileList(SourceFileList, IncludeList, SkipList)
+    FileList = sorted(GetFileList(SourceFileList, IncludeList, SkipList))
+    Cache = LoadStringCache(CacheFile) if CacheFile else None
+    StringTokens = SearchStringTokens(FileList)
+
+    if CacheFile:
+        Inputs = [BaseName, IsCompatibleMode, ShellMode, UniGenCFlag, bool(UniGenBinBuffer), FilterInfo,
+                  sorted(str(File) for File in UniFilList), [str(Dir) for Dir in IncludePathList], bool(FileList), StringTokens]
+        Key = hashlib.md5(json.dumps(Inputs).encode('utf-8')).hexdigest()
+        if Cache and IsStringCacheValid(Cache, Key):
+            EdkLogger.debug(EdkLogger.DEBUG_5, "Strings of %s are not changed" % BaseName)
+            if UniGenBinBuffer and Cache["BinBuffer"]:
+                UniGenBinBuffer.write(bytes.fromhex(Cache["BinBuffer"]))
+            return Cache["HFile"], Cache["CFile"]
+
+    if ShellMode:
+        #
+        # support ISO 639-2 codes in .UNI files of EDK Shell
+        #
+        Uni = UniFileClassObject(sorted(UniFilList, key=lambda x: x.File), True, IncludePathList)
+    else:
+        Uni = UniFileClassObject(sorted(UniFilList, key=lambda x: x.File), IsCompatibleMode, IncludePathList)
 
-    Uni = SearchString(Uni, sorted (FileList), IsCompatibleMode)
+    Uni = SearchString(Uni, FileList, IsCompatibleMode, StringTokens)
 
     HFile = CreateHFile(BaseName, Uni, IsCompatibleMode, UniGenCFlag)
     CFile = None
@@ -569,6 +695,8 @@ def GetStringFiles(UniFilList, SourceFileList, IncludeList, IncludePathList, Ski
     if UniGenBinBuffer:
         CreateCFileContent(BaseName, Uni, IsCompatibleMode, UniGenBinBuffer, FilterInfo)
 
+    if CacheFile:
+        SaveStringCache(CacheFile, Key, Uni, FileList, HFile, CFile, UniGenBinBuffer)
     return HFile, CFile
 
 #
@@ -13,6 +13,7 @@
 from __future__ import print_function
 import Common.LongFilePathOs as os, codecs, re
 import distutils.util
+import hashlib
 import Common.EdkLogger as EdkLogger
 from io import BytesIO
 from Common.BuildToolError import *
@@ -40,6 +41,11 @@ BACK_SLASH_PLACEHOLDER = u'\u0006'
 
 gIncludePattern = re.compile("^#include +[\"<]+([^\"< >]+)[>\"]+$", re.MULTILINE | re.UNICODE)
 
+#
+# The pre-processed lines of the .uni files, {(Path, Digest) : [Line or (IncludeFile,)]}
+#
+gUniFileCache = {}
+
 ## Convert a unicode string to a Hex list
 #
 # Convert a unicode string to a Hex list
@@ -152,7 +158,8 @@ class Ucs2Codec(codecs.Codec):
 
 TheUcs2Codec = Ucs2Codec()
 def Ucs2Search(name):
-    if name == 'ucs-2':
+    # the name is normalized to ucs_2 since Python 3.9
+    if name in ['ucs-2', 'ucs_2']:
         return codecs.CodecInfo(
             name=name,
             encode=TheUcs2Codec.encode,
@@ -224,6 +231,7 @@ class UniFileClassObject(object):
         self.OrderedStringList = {}             #{ u'LanguageIdentifier' : [StringDefClassObject]  }
         self.OrderedStringDict = {}             #{ u'LanguageIdentifier' : {StringName:(IndexInList)}  }
         self.OrderedStringListByToken = {}      #{ u'LanguageIdentifier' : {Token: StringDefClassObject} }
+        self.FileDigest = {}                    #{ FilePath : Digest of the file content }
         self.IsCompatibleMode = IsCompatibleMode
         self.IncludePathList = IncludePathList
         if len(self.FileList) > 0:
@@ -291,7 +299,10 @@ class UniFileClassObject(object):
             UniFile.close()
         except:
             EdkLogger.Error("build", FILE_OPEN_FAILURE, ExtraData=File)
+        return UniFileClassObject.DecodeUniData(FileIn, FileName)
 
+    @staticmethod
+    def DecodeUniData(FileIn, FileName):
         #
         # Detect Byte Order Mark at beginning of file.  Default to UTF-8
         #
@@ -370,12 +381,41 @@ class UniFileClassObject(object):
     #
     # Pre-process before parse .uni file
     #
+    # The lines of a file are processed once for each content of the file and
+    # kept in gUniFileCache, the include files are resolved for each use.
+    #
     def PreProcess(self, File):
         if not os.path.exists(File.Path) or not os.path.isfile(File.Path):
             EdkLogger.error("Unicode File Parser", FILE_NOT_FOUND, ExtraData=File.Path)
 
         try:
-            FileIn = UniFileClassObject.OpenUniFile(LongFilePath(File.Path))
+            with open(LongFilePath(File.Path), 'rb') as UniFile:
+                FileData = UniFile.read()
+        except:
+            EdkLogger.error("build", FILE_OPEN_FAILURE, ExtraData=File.Path);
+        Digest = hashlib.md5(FileData).hexdigest()
+        self.FileDigest[File.Path] = Digest
+        if (File.Path, Digest) not in gUniFileCache:
+            gUniFileCache[File.Path, Digest] = self.PreProcessData(File, FileData)
+
+        Lines = []
+        for Line in gUniFileCache[File.Path, Digest]:
+            if isinstance(Line, tuple):
+                for Dir in [File.Dir] + self.IncludePathList:
+                    IncFile = PathClass(Line[0], Dir)
+                    if os.path.isfile(IncFile.Path):
+                        Lines.extend(self.PreProcess(IncFile))
+                        break
+                else:
+                    EdkLogger.error("Unicode File Parser", FILE_NOT_FOUND, Message="Cannot find include file", ExtraData=Line[0])
+                continue
+            Lines.append(Line)
+
+        return Lines
+
+    def PreProcessData(self, File, FileData):
+        try:
+            FileIn = UniFileClassObject.DecodeUniData(FileData, LongFilePath(File.Path))
         except UnicodeError as X:
             EdkLogger.error("build", FILE_READ_FAILURE, "File read failure: %s" % str(X), ExtraData=File.Path);
         except:
@@ -431,13 +471,7 @@ class UniFileClassObject(object):
 
             IncList = gIncludePattern.findall(Line)
             if len(IncList) == 1:
-                for Dir in [File.Dir] + self.IncludePathList:
-                    IncFile = PathClass(str(IncList[0]), Dir)
-                    if os.path.isfile(IncFile.Path):
-                        Lines.extend(self.PreProcess(IncFile))
-                        break
-                else:
-                    EdkLogger.error("Unicode File Parser", FILE_NOT_FOUND, Message="Cannot find include file", ExtraData=str(IncList[0]))
+                Lines.append((str(IncList[0]),))
                 continue
 
             Lines.append(Line)
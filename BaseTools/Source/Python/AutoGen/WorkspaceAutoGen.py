@@ -12,6 +12,7 @@ from __future__ import absolute_import
 import os.path as path
 import hashlib
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from GenFds.FdfParser import FdfParser
 from Workspace.WorkspaceCommon import GetModuleLibInstances
 from AutoGen import GenMake
@@ -30,6 +31,36 @@ gDepexTokenPattern = re.compile("(\(|\)|\w+| \S+\.inf)")
 ## Regular expression for match: PCD(xxxx.yyy)
 gPCDAsGuidPattern = re.compile(r"^PCD\(.+\..+\)$")
 
+## Size of the chunks the files are read in to compute their hash
+gHashChunkSize = 0x100000
+
+## Update a hash object with the content of a file
+def _UpdateFileHash(HashObj, FilePath):
+    with open(FilePath, 'rb') as f:
+        while True:
+            Chunk = f.read(gHashChunkSize)
+            if not Chunk:
+                break
+            HashObj.update(Chunk)
+
+## Return the hash of a package
+#
+#   @param  DecFile         The path of the package DEC file
+#   @param  IncludeList     The sorted include directories of the package
+#
+#   @retval string          The hex digest of the DEC file and all the files
+#                           in the include directories
+#
+def _GetPackageHash(DecFile, IncludeList):
+    m = hashlib.md5()
+    _UpdateFileHash(m, DecFile)
+    for inc in IncludeList:
+        for Root, Dirs, Files in os.walk(inc):
+            Dirs.sort()
+            for File in sorted(Files):
+                _UpdateFileHash(m, os.path.join(Root, File))
+    return m.hexdigest()
+
 ## Workspace AutoGen class
 #
 #   This class is used mainly to control the whole platform build for different
@@ -369,7 +400,7 @@ class WorkspaceAutoGen(AutoGen):
                                     GlobalData.MixedPcd[item].append(NewPcd2)
 
             BuildData = self.BuildDatabase[self.MetaFile, Arch, self.BuildTarget, self.ToolChain]
-            for key in BuildData.Pcds:
+            for key in list(BuildData.Pcds.keys()):
                 for SinglePcd in GlobalData.MixedPcd:
                     if (BuildData.Pcds[key].TokenCName, BuildData.Pcds[key].TokenSpaceGuidCName) == SinglePcd:
                         for item in GlobalData.MixedPcd[SinglePcd]:
@@ -484,12 +515,37 @@ class WorkspaceAutoGen(AutoGen):
     #
     # Generate Package level hash value
     #
+    # The packages are hashed concurrently. The hash of each package is saved
+    # in its build directory, and the hashes of each arch are given to the
+    # AutoGen workers in the data pipe.
+    #
     def GeneratePkgLevelHash(self):
+        if not GlobalData.gUseHashCache:
+            GlobalData.gPackageHash = {}
+            return
+
+        # Get the files of the packages first, the build database is not thread safe
+        PkgFiles = {}
+        for Arch in self.ArchList:
+            for Pkg in self.PkgSet[Arch]:
+                PkgFiles[Arch, Pkg] = (Pkg.MetaFile.Path, tuple(sorted(str(inc) for inc in Pkg.Includes)))
+        FileList = list(set(PkgFiles.values()))
+        with ThreadPoolExecutor() as Executor:
+            HashList = list(Executor.map(lambda Files: _GetPackageHash(*Files), FileList))
+        PkgHash = dict(zip(FileList, HashList))
+
         for Arch in self.ArchList:
             GlobalData.gPackageHash = {}
-            if GlobalData.gUseHashCache:
-                for Pkg in self.PkgSet[Arch]:
-                    self._GenPkgLevelHash(Pkg)
+            for Pkg in self.PkgSet[Arch]:
+                if Pkg.PackageName in GlobalData.gPackageHash:
+                    continue
+                PkgDir = os.path.join(self.BuildDir, Pkg.Arch, Pkg.PackageName)
+                CreateDirectory(PkgDir)
+                HashFile = os.path.join(PkgDir, Pkg.PackageName + '.hash')
+                SaveFileOnChange(HashFile, PkgHash[PkgFiles[Arch, Pkg]], False)
+                GlobalData.gPackageHash[Pkg.PackageName] = PkgHash[PkgFiles[Arch, Pkg]]
+            Pa = PlatformAutoGen(self, self.MetaFile, self.BuildTarget, self.ToolChain, Arch)
+            Pa.DataPipe.DataContainer = {"PackageHash" : dict(GlobalData.gPackageHash)}
 
 
     def CreateBuildOptionsFile(self):
@@ -546,10 +602,7 @@ class WorkspaceAutoGen(AutoGen):
             for files in AllWorkSpaceMetaFiles:
                 if files.endswith('.dec'):
                     continue
-                f = open(files, 'rb')
-                Content = f.read()
-                f.close()
-                m.update(Content)
+                _UpdateFileHash(m, files)
             SaveFileOnChange(os.path.join(self.BuildDir, 'AutoGen.hash'), m.hexdigest(), False)
             GlobalData.gPlatformHash = m.hexdigest()
 
@@ -566,32 +619,6 @@ class WorkspaceAutoGen(AutoGen):
                 print(f, file=file)
         return True
 
-    def _GenPkgLevelHash(self, Pkg):
-        if Pkg.PackageName in GlobalData.gPackageHash:
-            return
-
-        PkgDir = os.path.join(self.BuildDir, Pkg.Arch, Pkg.PackageName)
-        CreateDirectory(PkgDir)
-        HashFile = os.path.join(PkgDir, Pkg.PackageName + '.hash')
-        m = hashlib.md5()
-        # Get .dec file's hash value
-        f = open(Pkg.MetaFile.Path, 'rb')
-        Content = f.read()
-        f.close()
-        m.update(Content)
-        # Get include files hash value
-        if Pkg.Includes:
-            for inc in sorted(Pkg.Includes, key=lambda x: str(x)):
-                for Root, Dirs, Files in os.walk(str(inc)):
-                    for File in sorted(Files):
-                        File_Path = os.path.join(Root, File)
-                        f = open(File_Path, 'rb')
-                        Content = f.read()
-                        f.close()
-                        m.update(Content)
-        SaveFileOnChange(HashFile, m.hexdigest(), False)
-        GlobalData.gPackageHash[Pkg.PackageName] = m.hexdigest()
-
     def _GetMetaFiles(self, Target, Toolchain):
         AllWorkSpaceMetaFiles = set()
         #
@@ -750,72 +777,57 @@ class WorkspaceAutoGen(AutoGen):
     # @return  None
     #
     def _CheckAllPcdsTokenValueConflict(self):
+        MixedPcdSet = set()
+        for PcdItem in GlobalData.MixedPcd:
+            MixedPcdSet.update(GlobalData.MixedPcd[PcdItem])
         for Pa in self.AutoGenObjectList:
             for Package in Pa.PackageList:
-                PcdList = list(Package.Pcds.values())
-                PcdList.sort(key=lambda x: int(x.TokenValue, 0))
-                Count = 0
-                while (Count < len(PcdList) - 1) :
-                    Item = PcdList[Count]
-                    ItemNext = PcdList[Count + 1]
-                    #
-                    # Make sure in the same token space the TokenValue should be unique
-                    #
-                    if (int(Item.TokenValue, 0) == int(ItemNext.TokenValue, 0)):
-                        SameTokenValuePcdList = []
-                        SameTokenValuePcdList.append(Item)
-                        SameTokenValuePcdList.append(ItemNext)
-                        RemainPcdListLength = len(PcdList) - Count - 2
-                        for ValueSameCount in range(RemainPcdListLength):
-                            if int(PcdList[len(PcdList) - RemainPcdListLength + ValueSameCount].TokenValue, 0) == int(Item.TokenValue, 0):
-                                SameTokenValuePcdList.append(PcdList[len(PcdList) - RemainPcdListLength + ValueSameCount])
-                            else:
-                                break;
-                        #
-                        # Sort same token value PCD list with TokenGuid and TokenCName
-                        #
-                        SameTokenValuePcdList.sort(key=lambda x: "%s.%s" % (x.TokenSpaceGuidCName, x.TokenCName))
-                        SameTokenValuePcdListCount = 0
-                        while (SameTokenValuePcdListCount < len(SameTokenValuePcdList) - 1):
-                            Flag = False
-                            TemListItem = SameTokenValuePcdList[SameTokenValuePcdListCount]
-                            TemListItemNext = SameTokenValuePcdList[SameTokenValuePcdListCount + 1]
-
-                            if (TemListItem.TokenSpaceGuidCName == TemListItemNext.TokenSpaceGuidCName) and (TemListItem.TokenCName != TemListItemNext.TokenCName):
-                                for PcdItem in GlobalData.MixedPcd:
-                                    if (TemListItem.TokenCName, TemListItem.TokenSpaceGuidCName) in GlobalData.MixedPcd[PcdItem] or \
-                                        (TemListItemNext.TokenCName, TemListItemNext.TokenSpaceGuidCName) in GlobalData.MixedPcd[PcdItem]:
-                                        Flag = True
-                                if not Flag:
-                                    EdkLogger.error(
-                                                'build',
-                                                FORMAT_INVALID,
-                                                "The TokenValue [%s] of PCD [%s.%s] is conflict with: [%s.%s] in %s"\
-                                                % (TemListItem.TokenValue, TemListItem.TokenSpaceGuidCName, TemListItem.TokenCName, TemListItemNext.TokenSpaceGuidCName, TemListItemNext.TokenCName, Package),
-                                                ExtraData=None
-                                                )
-                            SameTokenValuePcdListCount += 1
-                        Count += SameTokenValuePcdListCount
-                    Count += 1
-
-                PcdList = list(Package.Pcds.values())
-                PcdList.sort(key=lambda x: "%s.%s" % (x.TokenSpaceGuidCName, x.TokenCName))
-                Count = 0
-                while (Count < len(PcdList) - 1) :
-                    Item = PcdList[Count]
-                    ItemNext = PcdList[Count + 1]
+                #
+                # Index the PCDs by TokenValue and by TokenSpaceGuidCName.TokenCName
+                #
+                SameTokenValuePcds = defaultdict(list)
+                SameNamePcds = defaultdict(list)
+                for Pcd in Package.Pcds.values():
+                    SameTokenValuePcds[int(Pcd.TokenValue, 0)].append(Pcd)
+                    SameNamePcds["%s.%s" % (Pcd.TokenSpaceGuidCName, Pcd.TokenCName)].append(Pcd)
+
+                #
+                # Make sure in the same token space the TokenValue should be unique
+                #
+                for TokenValue in sorted(SameTokenValuePcds):
+                    SameTokenValuePcdList = SameTokenValuePcds[TokenValue]
+                    if len(SameTokenValuePcdList) < 2:
+                        continue
                     #
-                    # Check PCDs with same TokenSpaceGuidCName.TokenCName have same token value as well.
+                    # Sort same token value PCD list with TokenGuid and TokenCName
                     #
-                    if (Item.TokenSpaceGuidCName == ItemNext.TokenSpaceGuidCName) and (Item.TokenCName == ItemNext.TokenCName) and (int(Item.TokenValue, 0) != int(ItemNext.TokenValue, 0)):
-                        EdkLogger.error(
-                                    'build',
-                                    FORMAT_INVALID,
-                                    "The TokenValue [%s] of PCD [%s.%s] in %s defined in two places should be same as well."\
-                                    % (Item.TokenValue, Item.TokenSpaceGuidCName, Item.TokenCName, Package),
-                                    ExtraData=None
-                                    )
-                    Count += 1
+                    SameTokenValuePcdList.sort(key=lambda x: "%s.%s" % (x.TokenSpaceGuidCName, x.TokenCName))
+                    for TemListItem, TemListItemNext in zip(SameTokenValuePcdList, SameTokenValuePcdList[1:]):
+                        if (TemListItem.TokenSpaceGuidCName == TemListItemNext.TokenSpaceGuidCName) and (TemListItem.TokenCName != TemListItemNext.TokenCName):
+                            if (TemListItem.TokenCName, TemListItem.TokenSpaceGuidCName) not in MixedPcdSet and \
+                                (TemListItemNext.TokenCName, TemListItemNext.TokenSpaceGuidCName) not in MixedPcdSet:
+                                EdkLogger.error(
+                                            'build',
+                                            FORMAT_INVALID,
+                                            "The TokenValue [%s] of PCD [%s.%s] is conflict with: [%s.%s] in %s"\
+                                            % (TemListItem.TokenValue, TemListItem.TokenSpaceGuidCName, TemListItem.TokenCName, TemListItemNext.TokenSpaceGuidCName, TemListItemNext.TokenCName, Package),
+                                            ExtraData=None
+                                            )
+
+                #
+                # Check PCDs with same TokenSpaceGuidCName.TokenCName have same token value as well.
+                #
+                for Name in sorted(SameNamePcds):
+                    SameNamePcdList = SameNamePcds[Name]
+                    for Item, ItemNext in zip(SameNamePcdList, SameNamePcdList[1:]):
+                        if int(Item.TokenValue, 0) != int(ItemNext.TokenValue, 0):
+                            EdkLogger.error(
+                                        'build',
+                                        FORMAT_INVALID,
+                                        "The TokenValue [%s] of PCD [%s.%s] in %s defined in two places should be same as well."\
+                                        % (Item.TokenValue, Item.TokenSpaceGuidCName, Item.TokenCName, Package),
+                                        ExtraData=None
+                                        )
     ## Generate fds command
     @property
     def GenFdsCommand(self):
@@ -0,0 +1,168 @@
+## @file
+# Record build phase timing in Chrome trace event format
+#
+# Each traced phase, worker task or external command becomes one complete
+# ("X") event. Worker processes save their own events in a part file next to
+# the trace file, which the main build process merges when it saves the
+# trace. The result can be loaded by chrome://tracing or Perfetto.
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+#
+
+## Import Modules
+#
+import os
+import sys
+import glob
+import json
+import time
+import threading
+import functools
+
+## Suffix of the files written by worker processes
+TRACE_PART_SUFFIX = ".part"
+
+_TraceFile = None
+_Events = []
+_Lock = threading.Lock()
+_NamedThreads = set()
+
+## Enable tracing
+#
+#   @param  TraceFile       The trace file to write, None to disable tracing
+#   @param  ProcessName     The name shown for current process in the trace
+#   @param  IsWorker        True for worker processes, whose events are merged
+#                           by the main process
+#
+def Initialize(TraceFile, ProcessName=None, IsWorker=False):
+    global _TraceFile
+    with _Lock:
+        _TraceFile = os.path.abspath(TraceFile) if TraceFile else None
+        del _Events[:]
+        _NamedThreads.clear()
+    if _TraceFile:
+        if not IsWorker:
+            # remove the files left by workers of previous build
+            for PartFile in glob.glob(glob.escape(_TraceFile) + ".*" + TRACE_PART_SUFFIX):
+                os.remove(PartFile)
+        _Metadata("process_name", ProcessName or os.path.basename(sys.argv[0]))
+
+## Return True if tracing is enabled
+def IsEnabled():
+    return _TraceFile is not None
+
+## Return the trace file, or None
+def GetTraceFile():
+    return _TraceFile
+
+## Current time stamp in microseconds
+#
+# Wall clock time is used since events come from several processes.
+#
+def Now():
+    return time.time() * 1000000
+
+def _Metadata(Name, Value, Tid=0):
+    _Events.append({"name" : Name, "ph" : "M", "pid" : os.getpid(), "tid" : Tid, "args" : {"name" : Value}})
+
+## Record one complete event
+#
+#   @param  Name            Name of the event
+#   @param  Category        Category of the event, like "autogen" or "make"
+#   @param  Start           Start time stamp returned by Now()
+#   @param  End             End time stamp returned by Now()
+#   @param  Args            Extra information shown with the event
+#
+def Complete(Name, Category, Start, End, Args=None):
+    if _TraceFile is None:
+        return
+    Thread = threading.current_thread()
+    Tid = Thread.ident
+    Event = {
+        "name" : Name,
+        "cat"  : Category,
+        "ph"   : "X",
+        "ts"   : round(Start, 1),
+        "dur"  : round(max(End - Start, 0), 1),
+        "pid"  : os.getpid(),
+        "tid"  : Tid,
+    }
+    if Args:
+        Event["args"] = dict((Key, str(Value)) for Key, Value in Args.items())
+    with _Lock:
+        if Tid not in _NamedThreads:
+            _NamedThreads.add(Tid)
+            _Metadata("thread_name", Thread.name, Tid)
+        _Events.append(Event)
+
+## Context manager recording the time spent in a with block
+#
+# Example:
+#
+#   with BuildTrace.Span("GenFds", "genfds"):
+#       GenFdsApi(...)
+#
+class Span(object):
+    def __init__(self, Name, Category, **Args):
+        self.Name = Name
+        self.Category = Category
+        self.Args = Args
+        self.Start = None
+
+    def __enter__(self):
+        if _TraceFile is not None:
+            self.Start = Now()
+        return self
+
+    def __exit__(self, ExcType, ExcValue, Traceback):
+        if self.Start is not None:
+            if ExcType is not None:
+                self.Args["error"] = ExcType.__name__
+            Complete(self.Name, self.Category, self.Start, Now(), self.Args)
+        return False
+
+## Decorator recording each call of a method of AutoGen objects
+#
+#   @param  Category        Category of the events
+#
+def TraceMethod(Category):
+    def Decorator(Function):
+        @functools.wraps(Function)
+        def Wrapper(Self, *Args, **KwArgs):
+            if _TraceFile is None:
+                return Function(Self, *Args, **KwArgs)
+            with Span(Function.__name__, Category, object=Self):
+                return Function(Self, *Args, **KwArgs)
+        return Wrapper
+    return Decorator
+
+## Save the events of a worker process for the main process to merge
+def SavePart():
+    if _TraceFile is None:
+        return
+    # the time stamp keeps the files of workers reusing the same pid apart
+    PartFile = "%s.%d.%d%s" % (_TraceFile, os.getpid(), int(Now()), TRACE_PART_SUFFIX)
+    with _Lock:
+        Events = list(_Events)
+    with open(PartFile, "w") as Fd:
+        json.dump(Events, Fd)
+
+## Write the trace file, including the events saved by worker processes
+def Save():
+    if _TraceFile is None:
+        return
+    with _Lock:
+        Events = list(_Events)
+    for PartFile in glob.glob(glob.escape(_TraceFile) + ".*" + TRACE_PART_SUFFIX):
+        try:
+            with open(PartFile) as Fd:
+                Events.extend(json.load(Fd))
+            os.remove(PartFile)
+        except (IOError, OSError, ValueError):
+            continue
+    TraceDir = os.path.dirname(_TraceFile)
+    if TraceDir and not os.path.isdir(TraceDir):
+        os.makedirs(TraceDir)
+    with open(_TraceFile, "w") as Fd:
+        json.dump({"traceEvents" : Events, "displayTimeUnit" : "ms"}, Fd)
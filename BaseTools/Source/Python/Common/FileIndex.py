@@ -0,0 +1,168 @@
+## @file
+# Index of the files in the workspace and the package paths
+#
+# The directories are read with os.scandir once, on the first query touching
+# them, so that checking the existence or the case-correct name of files
+# doesn't probe the file system again. Tools writing files through
+# Common.Misc keep the index up to date. The time stamps are not cached, a
+# file can be changed without the index knowing it.
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+#
+
+##
+# Import Modules
+#
+from __future__ import absolute_import
+from concurrent.futures import ThreadPoolExecutor
+import Common.LongFilePathOs as os
+
+## Whether the file system matches the names regardless of the case
+_IgnoreCase = os.path.normcase('A') == 'a'
+
+## Retrieve and cache the real path name and the state of files in file system
+#
+#   @param      Root            The root directory of path relative to
+#   @param      PackagesPath    Other root directories indexed, like PACKAGES_PATH
+#
+class FileIndex(object):
+    def __init__(self, Root, PackagesPath=None):
+        self._Root = Root
+        self._Roots = [os.path.normpath(Root)]
+        for Path in PackagesPath or []:
+            Path = os.path.normpath(Path)
+            if Path not in self._Roots:
+                self._Roots.append(Path)
+        # sort the roots so that the deepest one containing a path is found first
+        self._RootKeys = sorted(((os.path.normcase(Path), Path) for Path in self._Roots), reverse=True)
+        # directory key : ({name : DirEntry}, {NAME : name}), or None for no directory
+        self._Dirs = {}
+        if len(self._Roots) > 1:
+            with ThreadPoolExecutor(len(self._Roots)) as Executor:
+                list(Executor.map(self._ScanDir, self._Roots))
+        else:
+            self._ScanDir(self._Roots[0])
+
+    def _ScanDir(self, Dir):
+        Key = os.path.normcase(Dir)
+        if Key in self._Dirs:
+            return self._Dirs[Key]
+        Entries = {}
+        UpperNames = {}
+        try:
+            for Entry in os.scandir(Dir):
+                Entries[Entry.name] = Entry
+                UpperNames.setdefault(Entry.name.upper(), Entry.name)
+            Listing = (Entries, UpperNames)
+        except OSError:
+            Listing = None
+        self._Dirs[Key] = Listing
+        return Listing
+
+    ## Split a path into the indexed root containing it and the relative names
+    def _Split(self, Path):
+        Key = os.path.normcase(Path)
+        for RootKey, Root in self._RootKeys:
+            if Key == RootKey:
+                return Root, []
+            if Key.startswith(RootKey) and Key[len(RootKey)] == os.sep:
+                return Path[:len(RootKey)], Path[len(RootKey) + 1:].split(os.sep)
+        if os.path.isabs(Path):
+            return None, None
+        # relative path is relative to the workspace
+        if Path == '.':
+            return self._Root, []
+        return self._Root, Path.split(os.sep)
+
+    ## Find the file system entry of a path
+    #
+    #   @param      Path        The path to find
+    #   @param      IgnoreCase  Whether to match the names regardless of the case
+    #
+    #   @retval     (RealPath, DirEntry)    DirEntry is None for the roots
+    #   @retval     (None, None)            The path doesn't exist
+    #   @retval     (False, None)           The path is not under any indexed root
+    #
+    def _Find(self, Path, IgnoreCase):
+        Path = os.path.normpath(Path)
+        Root, Names = self._Split(Path)
+        if Root is None or '..' in Names:
+            return False, None
+        if not Names:
+            return Root, None
+        Dir = Root
+        Entry = None
+        for Name in Names:
+            if Entry is not None and not Entry.is_dir():
+                return None, None
+            Listing = self._ScanDir(Dir)
+            if Listing is None:
+                return None, None
+            Entries, UpperNames = Listing
+            if Name not in Entries:
+                if not IgnoreCase or Name.upper() not in UpperNames:
+                    return None, None
+                Name = UpperNames[Name.upper()]
+            Entry = Entries[Name]
+            Dir = os.path.join(Dir, Name)
+        return Dir, Entry
+
+    ## =[] operator, return the path in the case of the file system, or None
+    def __getitem__(self, Path):
+        RealPath, Entry = self._Find(Path, True)
+        if RealPath is False:
+            return os.path.normpath(Path) if os.path.exists(Path) else None
+        return RealPath
+
+    ## Check the existence of a path, in the case sensitivity of the file system
+    def Exists(self, Path):
+        RealPath, Entry = self._Find(Path, _IgnoreCase)
+        if RealPath is False:
+            return os.path.exists(Path)
+        return RealPath is not None
+
+    def IsFile(self, Path):
+        RealPath, Entry = self._Find(Path, _IgnoreCase)
+        if RealPath is False:
+            return os.path.isfile(Path)
+        return Entry is not None and Entry.is_file()
+
+    def IsDir(self, Path):
+        RealPath, Entry = self._Find(Path, _IgnoreCase)
+        if RealPath is False:
+            return os.path.isdir(Path)
+        return RealPath is not None and (Entry is None or Entry.is_dir())
+
+    ## Return the time stamp of a file, like os.stat(Path)[8]
+    #
+    # The file is found in the index but always stat'ed again, the state
+    # cached by os.scandir is the one of the time the directory was read.
+    #
+    def GetTimeStamp(self, Path):
+        RealPath, Entry = self._Find(Path, _IgnoreCase)
+        if Entry is None:
+            return os.stat(Path)[8]
+        return os.stat(RealPath)[8]
+
+    ## Forget the state of a path created, changed or removed
+    #
+    # The directory containing the path is read again on the next query, and
+    # so are the directories under the path.
+    #
+    def Update(self, Path):
+        Key = os.path.normcase(os.path.normpath(os.path.abspath(Path)))
+        Dir = os.path.dirname(Key)
+        self._Dirs.pop(Dir, None)
+        # the directories created along with the path
+        while True:
+            Dir, Name = os.path.split(Dir)
+            Listing = self._Dirs.get(Dir)
+            if not Name or Listing is None or Name.upper() in Listing[1]:
+                break
+            del self._Dirs[Dir]
+        if Key in self._Dirs:
+            del self._Dirs[Key]
+            Prefix = Key + os.sep
+            for DirKey in [DirKey for DirKey in self._Dirs if DirKey.startswith(Prefix)]:
+                del self._Dirs[DirKey]
@@ -106,9 +106,27 @@ gBinCacheSource = None
 gPlatformHash = None
 gPackageHash = {}
 gModuleHash = {}
+# The digests each module hash is made of, see ModuleAutoGen.GenModuleHash
+gModuleHashInputs = {}
+# Result of binary cache lookups, key: (module path, arch), value: None for
+# hit, or the reason of the miss
+gBinCacheLookup = {}
+# Digest of the INF, sources and packages of each module, key: (module path,
+# arch), see ModuleAutoGen.PreflightHash
+gModuleInputHash = {}
 gEnableGenfdsMultiThread = False
 gSikpAutoGenCache = set()
 
+#
+# Build flag for running module makefile rules without launching make
+#
+gDirectBuild = False
+
+#
+# Build flag for building all modules of a platform with one ninja process
+#
+gNinjaBuild = False
+
 # Dictionary for tracking Module build status as success or failure
 # Top Dict:     Key: Arch Type              Value: Dictionary
 # Second Dict:  Key: AutoGen Obj    Value: 'SUCCESS'\'FAIL'\'FAIL_METAFILE'
@@ -53,6 +53,9 @@ def stat(path):
 def utime(path, times):
     return os.utime(LongFilePath(path), times)
 
+def scandir(path):
+    return os.scandir(LongFilePath(path))
+
 def listdir(path):
     List = []
     uList = os.listdir(u"%s" % LongFilePath(path))
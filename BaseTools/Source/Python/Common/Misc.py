@@ -414,6 +414,8 @@ def CreateDirectory(Directory):
     try:
         if not os.access(Directory, os.F_OK):
             os.makedirs(Directory)
+            if GlobalData.gAllFiles:
+                GlobalData.gAllFiles.Update(Directory)
     except:
         return False
     return True
@@ -435,6 +437,8 @@ def RemoveDirectory(Directory, Recursively=False):
                 os.remove(File)
         os.chdir(CurrentDirectory)
     os.rmdir(Directory)
+    if GlobalData.gAllFiles:
+        GlobalData.gAllFiles.Update(Directory)
 
 ## Store content in file
 #
@@ -496,6 +500,8 @@ def SaveFileOnChange(File, Content, IsBinaryFile=True):
         except IOError as X:
             EdkLogger.error(None, FILE_CREATE_FAILURE, ExtraData='IOError %s' % X)
 
+    if GlobalData.gAllFiles:
+        GlobalData.gAllFiles.Update(File)
     return True
 
 ## Copy source file only if it is different from the destination file
@@ -550,79 +556,10 @@ def CopyFileOnChange(SrcFile, Dst):
     except IOError as X:
         EdkLogger.error(None, FILE_COPY_FAILURE, ExtraData='IOError %s' % X)
 
+    if GlobalData.gAllFiles:
+        GlobalData.gAllFiles.Update(DstFile)
     return True
 
-## Retrieve and cache the real path name in file system
-#
-#   @param      Root    The root directory of path relative to
-#
-#   @retval     str     The path string if the path exists
-#   @retval     None    If path doesn't exist
-#
-class DirCache:
-    _CACHE_ = set()
-    _UPPER_CACHE_ = {}
-
-    def __init__(self, Root):
-        self._Root = Root
-        for F in os.listdir(Root):
-            self._CACHE_.add(F)
-            self._UPPER_CACHE_[F.upper()] = F
-
-    # =[] operator
-    def __getitem__(self, Path):
-        Path = Path[len(os.path.commonprefix([Path, self._Root])):]
-        if not Path:
-            return self._Root
-        if Path and Path[0] == os.path.sep:
-            Path = Path[1:]
-        if Path in self._CACHE_:
-            return os.path.join(self._Root, Path)
-        UpperPath = Path.upper()
-        if UpperPath in self._UPPER_CACHE_:
-            return os.path.join(self._Root, self._UPPER_CACHE_[UpperPath])
-
-        IndexList = []
-        LastSepIndex = -1
-        SepIndex = Path.find(os.path.sep)
-        while SepIndex > -1:
-            Parent = UpperPath[:SepIndex]
-            if Parent not in self._UPPER_CACHE_:
-                break
-            LastSepIndex = SepIndex
-            SepIndex = Path.find(os.path.sep, LastSepIndex + 1)
-
-        if LastSepIndex == -1:
-            return None
-
-        Cwd = os.getcwd()
-        os.chdir(self._Root)
-        SepIndex = LastSepIndex
-        while SepIndex > -1:
-            Parent = Path[:SepIndex]
-            ParentKey = UpperPath[:SepIndex]
-            if ParentKey not in self._UPPER_CACHE_:
-                os.chdir(Cwd)
-                return None
-
-            if Parent in self._CACHE_:
-                ParentDir = Parent
-            else:
-                ParentDir = self._UPPER_CACHE_[ParentKey]
-            for F in os.listdir(ParentDir):
-                Dir = os.path.join(ParentDir, F)
-                self._CACHE_.add(Dir)
-                self._UPPER_CACHE_[Dir.upper()] = Dir
-
-            SepIndex = Path.find(os.path.sep, SepIndex + 1)
-
-        os.chdir(Cwd)
-        if Path in self._CACHE_:
-            return os.path.join(self._Root, Path)
-        elif UpperPath in self._UPPER_CACHE_:
-            return os.path.join(self._Root, self._UPPER_CACHE_[UpperPath])
-        return None
-
 def RealPath(File, Dir='', OverrideDir=''):
     NewFile = os.path.normpath(os.path.join(Dir, File))
     NewFile = GlobalData.gAllFiles[NewFile]
@@ -1509,6 +1446,8 @@ class PathClass(object):
 
     @property
     def TimeStamp(self):
+        if GlobalData.gAllFiles:
+            return GlobalData.gAllFiles.GetTimeStamp(self.Path)
         return os.stat(self.Path)[8]
 
     def Validate(self, Type='', CaseSensitive=True):
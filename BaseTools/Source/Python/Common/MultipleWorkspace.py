@@ -10,6 +10,7 @@
 
 import Common.LongFilePathOs as os
 from Common.DataType import TAB_WORKSPACE
+from Common import GlobalData
 
 ## MultipleWorkspace
 #
@@ -54,6 +55,19 @@ class MultipleWorkspace(object):
         else:
             cls.PACKAGES_PATH = []
 
+    ## exists()
+    #
+    #   check the existence of a path, from the workspace file index if any
+    #
+    #   @param  cls       The class pointer
+    #   @param  Path      the path to check
+    #
+    @classmethod
+    def exists(cls, Path):
+        if GlobalData.gAllFiles:
+            return GlobalData.gAllFiles.Exists(Path)
+        return os.path.exists(Path)
+
     ## join()
     #
     #   rewrite os.path.join function
@@ -66,10 +80,10 @@ class MultipleWorkspace(object):
     @classmethod
     def join(cls, Ws, *p):
         Path = os.path.join(Ws, *p)
-        if not os.path.exists(Path):
+        if not cls.exists(Path):
             for Pkg in cls.PACKAGES_PATH:
                 Path = os.path.join(Pkg, *p)
-                if os.path.exists(Path):
+                if cls.exists(Path):
                     return Path
             Path = os.path.join(Ws, *p)
         return Path
@@ -105,10 +119,10 @@ class MultipleWorkspace(object):
     @classmethod
     def getWs(cls, Ws, Path):
         absPath = os.path.join(Ws, Path)
-        if not os.path.exists(absPath):
+        if not cls.exists(absPath):
             for Pkg in cls.PACKAGES_PATH:
                 absPath = os.path.join(Pkg, Path)
-                if os.path.exists(absPath):
+                if cls.exists(absPath):
                     return Pkg
         return Ws
 
@@ -129,10 +143,10 @@ class MultipleWorkspace(object):
                     if MacroStartPos != -1:
                         Substr = str[MacroStartPos:]
                         Path = Substr.replace(TAB_WORKSPACE, cls.WORKSPACE).strip()
-                        if not os.path.exists(Path):
+                        if not cls.exists(Path):
                             for Pkg in cls.PACKAGES_PATH:
                                 Path = Substr.replace(TAB_WORKSPACE, Pkg).strip()
-                                if os.path.exists(Path):
+                                if cls.exists(Path):
                                     break
                         PathList[i] = str[0:MacroStartPos] + Path
             PathStr = ' '.join(PathList)
@@ -0,0 +1,230 @@
+## @file
+# Redirect the output of external programs with a single I/O thread.
+#
+# All child processes launched by build share one selector loop instead of
+# getting a pair of reader threads each. Lines read in one selector round are
+# handed to the logger in a single call per destination.
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+#
+
+##
+# Import Modules
+#
+import os
+import sys
+import threading
+from collections import OrderedDict
+import Common.EdkLogger as EdkLogger
+from Common.BuildToolError import UNKNOWN_ERROR
+
+try:
+    import selectors
+except ImportError:
+    selectors = None
+
+## Maximum number of bytes read from one pipe in one selector round
+PUMP_READ_SIZE = 0x10000
+
+## Get the output of an external program
+#
+# This is the entrance method of thread reading output of an external program and
+# putting them in STDOUT/STDERR of current program. It is only used on hosts
+# whose selector cannot wait on pipes.
+#
+# @param  From      The stream message read from
+# @param  To        The stream message put on
+# @param  ExitFlag  The flag used to indicate stopping reading
+#
+def ReadMessage(From, To, ExitFlag):
+    while True:
+        # read one line a time
+        Line = From.readline()
+        # empty string means "end"
+        if Line is not None and Line != b"":
+            To(Line.rstrip().decode(encoding='utf-8', errors='ignore'))
+        else:
+            break
+        if ExitFlag.isSet():
+            break
+
+## One pipe served by the output pump
+#
+class _PumpStream(object):
+    def __init__(self, Stream, To, Watch):
+        self.Stream = Stream
+        self.To = To
+        self.Watch = Watch
+        self.Partial = b""
+
+    ## Split the received data into complete lines
+    #
+    #   @param  Data        The bytes read from the pipe
+    #   @param  Batch       Dict of destination => list of lines of this round
+    #
+    def Feed(self, Data, Batch):
+        Lines = (self.Partial + Data).split(b"\n")
+        self.Partial = Lines.pop()
+        if Lines:
+            Batch.setdefault(self.To, []).extend(
+                Line.rstrip().decode(encoding='utf-8', errors='ignore') for Line in Lines)
+
+    ## Flush the last incomplete line at the end of the stream
+    #
+    def Close(self, Batch):
+        if self.Partial:
+            Batch.setdefault(self.To, []).append(
+                self.Partial.rstrip().decode(encoding='utf-8', errors='ignore'))
+            self.Partial = b""
+        try:
+            self.Stream.close()
+        except (OSError, ValueError):
+            pass
+
+## The handle returned for one watched process
+#
+# The Wait() method returns after all output of the process has been passed
+# to the logger.
+#
+class PumpWatch(object):
+    def __init__(self, StreamNumber):
+        self._Remaining = StreamNumber
+        self._Lock = threading.Lock()
+        self._Done = threading.Event()
+        self._Threads = []
+        if StreamNumber == 0:
+            self._Done.set()
+
+    def _StreamClosed(self):
+        with self._Lock:
+            self._Remaining -= 1
+            if self._Remaining <= 0:
+                self._Done.set()
+
+    ## Wait until all watched streams reached end of file
+    #
+    #   @param  Timeout     Seconds to wait for, or None to wait forever
+    #
+    #   @retval True        All output has been delivered
+    #   @retval False       Timeout
+    #
+    def Wait(self, Timeout=None):
+        for Th in self._Threads:
+            Th.join(Timeout)
+        return self._Done.wait(Timeout)
+
+## Output pump serving all running child processes
+#
+# A single daemon thread waits on the stdout/stderr pipes of every child with
+# the selectors module. On hosts whose selector cannot handle pipes (Windows),
+# it falls back to one ReadMessage thread per stream.
+#
+class OutputPump(object):
+    _Instance = None
+    _InstanceLock = threading.Lock()
+
+    ## Get the pump shared by the whole build process
+    #
+    @classmethod
+    def Get(cls):
+        with cls._InstanceLock:
+            if cls._Instance is None:
+                cls._Instance = cls()
+            return cls._Instance
+
+    def __init__(self):
+        self._UseSelector = selectors is not None and sys.platform != "win32"
+        self._Lock = threading.Lock()
+        self._NewStreams = []
+        self._Thread = None
+        if self._UseSelector:
+            self._Selector = selectors.DefaultSelector()
+            self._WakeRead, self._WakeWrite = os.pipe()
+            self._Selector.register(self._WakeRead, selectors.EVENT_READ, None)
+
+    ## Watch the output streams of a child process
+    #
+    #   @param  Proc        The subprocess.Popen object started with stdout/stderr=PIPE
+    #   @param  OutTo       Callable receiving the (possibly multi-line) stdout text
+    #   @param  ErrTo       Callable receiving the (possibly multi-line) stderr text
+    #
+    #   @retval PumpWatch   Handle used to wait for the end of the output
+    #
+    def Watch(self, Proc, OutTo, ErrTo):
+        Streams = [(S, To) for S, To in ((Proc.stdout, OutTo), (Proc.stderr, ErrTo)) if S]
+        Watch = PumpWatch(len(Streams))
+        if not Streams:
+            return Watch
+
+        if not self._UseSelector:
+            ExitFlag = threading.Event()
+            for Stream, To in Streams:
+                Th = threading.Thread(target=self._ThreadReader, args=(Stream, To, ExitFlag, Watch),
+                                      name="STDOUT-Redirector" if Stream is Proc.stdout else "STDERR-Redirector",
+                                      daemon=False)
+                Watch._Threads.append(Th)
+                Th.start()
+            return Watch
+
+        with self._Lock:
+            self._NewStreams.extend(_PumpStream(Stream, To, Watch) for Stream, To in Streams)
+            if self._Thread is None:
+                self._Thread = threading.Thread(target=self._Run, name="Output-Pump", daemon=True)
+                self._Thread.start()
+        os.write(self._WakeWrite, b"\0")
+        return Watch
+
+    @staticmethod
+    def _ThreadReader(Stream, To, ExitFlag, Watch):
+        try:
+            ReadMessage(Stream, To, ExitFlag)
+        finally:
+            Watch._StreamClosed()
+
+    ## Register the streams queued by Watch(); called in the pump thread only
+    #
+    def _AddNewStreams(self):
+        try:
+            os.read(self._WakeRead, PUMP_READ_SIZE)
+        except OSError:
+            pass
+        with self._Lock:
+            NewStreams = self._NewStreams
+            self._NewStreams = []
+        for Item in NewStreams:
+            self._Selector.register(Item.Stream, selectors.EVENT_READ, Item)
+
+    ## The pump thread body
+    #
+    def _Run(self):
+        while True:
+            Batch = OrderedDict()
+            Closed = []
+            for Key, _ in self._Selector.select():
+                Item = Key.data
+                if Item is None:
+                    self._AddNewStreams()
+                    continue
+                try:
+                    Data = os.read(Key.fd, PUMP_READ_SIZE)
+                except OSError:
+                    Data = b""
+                if Data:
+                    Item.Feed(Data, Batch)
+                else:
+                    self._Selector.unregister(Item.Stream)
+                    Item.Close(Batch)
+                    Closed.append(Item)
+
+            for To, Lines in Batch.items():
+                Message = "\n".join(Lines)
+                try:
+                    To(Message)
+                except Exception as Excpt:
+                    # keep the output and go on serving the other commands
+                    EdkLogger.error(None, UNKNOWN_ERROR, "Failed to log the output of a command: %s" % Excpt,
+                                    ExtraData=Message, RaiseError=False)
+            # signal the end of streams only after their last lines were logged
+            for Item in Closed:
+                Item.Watch._StreamClosed()
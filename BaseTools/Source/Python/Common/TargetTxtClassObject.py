@@ -10,7 +10,7 @@
 #
 from __future__ import print_function
 from __future__ import absolute_import
-from Common.buildoptions import BuildOption,BuildTarget
+from Common.buildoptions import GetConfDirectory
 import Common.GlobalData as GlobalData
 import Common.LongFilePathOs as os
 from . import EdkLogger
@@ -146,9 +146,10 @@ class TargetTxtClassObject(object):
 #
 def TargetTxtDict():
     Target = TargetTxtClassObject()
-    if BuildOption.ConfDirectory:
+    ConfDirectory = GetConfDirectory()
+    if ConfDirectory:
         # Get alternate Conf location, if it is absolute, then just use the absolute directory name
-        ConfDirectoryPath = os.path.normpath(BuildOption.ConfDirectory)
+        ConfDirectoryPath = os.path.normpath(ConfDirectory)
 
         if not os.path.isabs(ConfDirectoryPath):
             # Since alternate directory name is not absolute, the alternate directory is located within the WORKSPACE
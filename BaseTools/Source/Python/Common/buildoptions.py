@@ -9,6 +9,7 @@
 #
 
 # Version and Copyright
+import sys
 from Common.BuildVersion import gBUILD_VERSION
 from optparse import OptionParser
 VersionNumber = "0.60" + ' ' + gBUILD_VERSION
@@ -82,11 +83,47 @@ def MyOptionParser():
     Parser.add_option("--pcd", action="append", dest="OptionPcd", help="Set PCD value by command line. Format: \"PcdName=Value\" ")
     Parser.add_option("-l", "--cmd-len", action="store", type="int", dest="CommandLength", help="Specify the maximum line length of build command. Default is 4096.")
     Parser.add_option("--hash", action="store_true", dest="UseHashCache", default=False, help="Enable hash-based caching during build process.")
-    Parser.add_option("--binary-destination", action="store", type="string", dest="BinCacheDest", help="Generate a cache of binary files in the specified directory.")
-    Parser.add_option("--binary-source", action="store", type="string", dest="BinCacheSource", help="Consume a cache of binary files from the specified directory.")
+    Parser.add_option("--binary-destination", action="store", type="string", dest="BinCacheDest", help="Generate a cache of binary files in the specified directory, or push them to the specified http:// URL of a cache server.")
+    Parser.add_option("--binary-source", action="store", type="string", dest="BinCacheSource", help="Consume a cache of binary files from the specified directory, or from the specified http:// URL of a cache server.")
+    Parser.add_option("--binary-cache-size", action="store", type="int", dest="BinCacheSize", help="Limit the size of the --binary-destination cache to the specified number of MB. The least recently used modules are removed at the end of build.")
     Parser.add_option("--genfds-multi-thread", action="store_true", dest="GenfdsMultiThread", default=False, help="Enable GenFds multi thread to generate ffs file.")
+    Parser.add_option("--direct-build", action="store_true", dest="DirectBuild", default=False, help="Run the out-of-date commands of module makefiles directly instead of launching make for each module.")
+    Parser.add_option("--ninja", action="store_true", dest="NinjaBuild", default=False, help="Generate one build.ninja for all modules of the platform and build them with ninja instead of make. Only for the [all] target of a platform build, not with -m.")
+    Parser.add_option("--trace-file", action="store", type="string", dest="TraceFile", help="Record the time of every build phase, AutoGen task and external command in the specified file, in Chrome trace event format.")
     Parser.add_option("--disable-include-path-check", action="store_true", dest="DisableIncludePathCheck", default=False, help="Disable the include path check for outside of package.")
     (Opt, Args) = Parser.parse_args()
     return (Opt, Args)
 
-BuildOption, BuildTarget = MyOptionParser()
+#
+# The command line is parsed as build options on the first use of BuildOption
+# or BuildTarget, not when this module is imported, because the other tools
+# (Ecc, GenFds...) import it through the modules they share with build and
+# have command lines of their own.
+#
+_BuildOptions = None
+
+def __getattr__(Name):
+    global _BuildOptions
+    if Name in ("BuildOption", "BuildTarget"):
+        if _BuildOptions is None:
+            _BuildOptions = MyOptionParser()
+        return _BuildOptions[0] if Name == "BuildOption" else _BuildOptions[1]
+    raise AttributeError("module %r has no attribute %r" % (__name__, Name))
+
+## Get the Conf directory given on the command line
+#
+# The options of build are used if they were parsed. Otherwise only --conf is
+# read from the command line, the other options belong to the tool running.
+#
+# @retval ConfDirectory     The Conf directory, None if not given
+#
+def GetConfDirectory():
+    if _BuildOptions is not None:
+        return _BuildOptions[0].ConfDirectory
+    ConfDirectory = None
+    for Index, Arg in enumerate(sys.argv[1:], 1):
+        if Arg == "--conf" and Index + 1 < len(sys.argv):
+            ConfDirectory = sys.argv[Index + 1]
+        elif Arg.startswith("--conf="):
+            ConfDirectory = Arg[len("--conf="):]
+    return ConfDirectory
@@ -7,6 +7,7 @@
 from __future__ import absolute_import
 import Common.LongFilePathOs as os
 import re
+import io
 from CommonDataClass.DataClass import *
 import Common.DataType as DT
 from Ecc.EccToolError import *
@@ -16,6 +17,56 @@ from Ecc import c
 from Common.LongFilePathSupport import OpenLongFilePath as open
 from Common.MultipleWorkspace import MultipleWorkspace as mws
 
+## The errors reported by the checks comparing the files of the whole target
+#
+# An incremental run generates the reports of these errors again for all files.
+#
+GlobalCheckErrorList = [ERROR_GENERAL_CHECK_UNI_HELP_INFO,
+                        ERROR_INCLUDE_FILE_CHECK_DATA,
+                        ERROR_INCLUDE_FILE_CHECK_NAME,
+                        ERROR_DECLARATION_DATA_TYPE_CHECK_SAME_STRUCTURE,
+                        ERROR_NAMING_CONVENTION_CHECK_PATH_NAME,
+                        ERROR_NAMING_CONVENTION_CHECK_FUNCTION_NAME,
+                        ERROR_SMM_COMM_PARA_CHECK_BUFFER_TYPE] + \
+                       [ErrorID for ErrorID in gEccErrorMessage if ERROR_META_DATA_FILE_CHECK_ALL <= ErrorID < ERROR_SPELLING_CHECK_ALL]
+
+## The characters reported by GeneralCheckNonAcsii
+NonAcsiiPattern = re.compile(r'[^\x00-\x7e]')
+
+## GeneralCheckFile
+#
+# The content of a file read once by the general checks
+#
+# @param FullPath:  The full path of the file
+#
+class GeneralCheckFile(object):
+    def __init__(self, FullPath):
+        self.FullPath = FullPath
+        self._Content = None
+        self._Lines = None
+        self._BinaryLines = None
+
+    @property
+    def Content(self):
+        if self._Content is None:
+            with open(self.FullPath, 'rb') as File:
+                self._Content = File.read()
+        return self._Content
+
+    ## The lines read from the file opened in text mode
+    @property
+    def Lines(self):
+        if self._Lines is None:
+            self._Lines = io.TextIOWrapper(io.BytesIO(self.Content)).readlines()
+        return self._Lines
+
+    ## The lines read from the file opened in binary mode
+    @property
+    def BinaryLines(self):
+        if self._BinaryLines is None:
+            self._BinaryLines = io.BytesIO(self.Content).readlines()
+        return self._BinaryLines
+
 ## Check
 #
 # This class is to define checkpoints used by ECC tool
@@ -38,6 +89,20 @@ class Check(object):
         self.NamingConventionCheck()
         self.SmmCommParaCheck()
 
+    # Check whether a file is to be checked, all files are checked unless an
+    # incremental run selected them in EccGlobalData.gCheckFileSet
+    def IsCheckFile(self, FullName):
+        return EccGlobalData.gCheckFileSet is None or os.path.normpath(FullName) in EccGlobalData.gCheckFileSet
+
+    def GetCheckFileList(self, FileList):
+        return [FullName for FullName in FileList if self.IsCheckFile(FullName)]
+
+    def GetCheckTableList(self, IdentifierTableList):
+        if EccGlobalData.gCheckFileSet is None:
+            return IdentifierTableList
+        return [IdentifierTable for IdentifierTable in IdentifierTableList
+                if int(IdentifierTable[len('Identifier'):]) in EccGlobalData.gCheckFileIdSet]
+
     def SmmCommParaCheck(self):
         self.SmmCommParaCheckBufferType()
 
@@ -165,96 +230,85 @@ class Check(object):
                                 else:
                                     pass
 
-    # Check UNI files
-    def UniCheck(self):
+    # General Checking, each file is read once for all the general checks enabled
+    def GeneralCheck(self):
+        CheckList = []
+        if EccGlobalData.gConfig.GeneralCheckNonAcsii == '1' or EccGlobalData.gConfig.GeneralCheckAll == '1' or EccGlobalData.gConfig.CheckAll == '1':
+            EdkLogger.quiet("Checking Non-ACSII char in file ...")
+            CheckList.append(self.GeneralCheckNonAcsii)
         if EccGlobalData.gConfig.GeneralCheckUni == '1' or EccGlobalData.gConfig.GeneralCheckAll == '1' or EccGlobalData.gConfig.CheckAll == '1':
             EdkLogger.quiet("Checking whether UNI file is UTF-16 ...")
-            SqlCommand = """select ID, FullPath, ExtName from File where ExtName like 'uni'"""
-            RecordSet = EccGlobalData.gDb.TblFile.Exec(SqlCommand)
-            for Record in RecordSet:
-                File = Record[1]
-                FileIn = open(File, 'rb').read(2)
-                if FileIn != '\xff\xfe':
-                    OtherMsg = "File %s is not a valid UTF-16 UNI file" % Record[1]
-                    EccGlobalData.gDb.TblReport.Insert(ERROR_GENERAL_CHECK_UNI, OtherMsg=OtherMsg, BelongsToTable='File', BelongsToItem=Record[0])
+            CheckList.append(self.UniCheck)
+        if EccGlobalData.gConfig.GeneralCheckNoTab == '1' or EccGlobalData.gConfig.GeneralCheckAll == '1' or EccGlobalData.gConfig.CheckAll == '1':
+            EdkLogger.quiet("Checking No TAB used in file ...")
+            CheckList.append(self.GeneralCheckNoTab)
+        if EccGlobalData.gConfig.GeneralCheckLineEnding == '1' or EccGlobalData.gConfig.GeneralCheckAll == '1' or EccGlobalData.gConfig.CheckAll == '1':
+            EdkLogger.quiet("Checking line ending in file ...")
+            CheckList.append(self.GeneralCheckLineEnding)
+        if EccGlobalData.gConfig.GeneralCheckTrailingWhiteSpaceLine == '1' or EccGlobalData.gConfig.GeneralCheckAll == '1' or EccGlobalData.gConfig.CheckAll == '1':
+            EdkLogger.quiet("Checking trailing white space line in file ...")
+            CheckList.append(self.GeneralCheckTrailingWhiteSpaceLine)
+        if not CheckList:
+            return
+
+        # The errors are reported check by check, in the order of the checks
+        ErrorList = [[] for Check in CheckList]
+        SqlCommand = """select ID, FullPath, ExtName from File where ExtName in ('.dec', '.inf', '.dsc', 'c', 'h') or ExtName like 'uni'"""
+        RecordSet = EccGlobalData.gDb.TblFile.Exec(SqlCommand)
+        for Record in RecordSet:
+            if not self.IsCheckFile(Record[1]):
+                continue
+            File = GeneralCheckFile(Record[1])
+            for Check, Errors in zip(CheckList, ErrorList):
+                Check(Record, File, Errors)
+        for Errors in ErrorList:
+            for ErrorID, OtherMsg, FileID in Errors:
+                EccGlobalData.gDb.TblReport.Insert(ErrorID, OtherMsg=OtherMsg, BelongsToTable='File', BelongsToItem=FileID)
 
-    # General Checking
-    def GeneralCheck(self):
-        self.GeneralCheckNonAcsii()
-        self.UniCheck()
-        self.GeneralCheckNoTab()
-        self.GeneralCheckLineEnding()
-        self.GeneralCheckTrailingWhiteSpaceLine()
+    # Check whether a file of the File table is checked as a text file
+    def IsGeneralCheckTextFile(self, Record):
+        return Record[2] in ('.dec', '.inf', '.dsc', 'c', 'h') and Record[2].upper() not in EccGlobalData.gConfig.BinaryExtList
+
+    # Check UNI files
+    def UniCheck(self, Record, File, Errors):
+        if Record[2].lower() == 'uni':
+            if File.Content[:2] != '\xff\xfe':
+                OtherMsg = "File %s is not a valid UTF-16 UNI file" % Record[1]
+                Errors.append((ERROR_GENERAL_CHECK_UNI, OtherMsg, Record[0]))
 
     # Check whether NO Tab is used, replaced with spaces
-    def GeneralCheckNoTab(self):
-        if EccGlobalData.gConfig.GeneralCheckNoTab == '1' or EccGlobalData.gConfig.GeneralCheckAll == '1' or EccGlobalData.gConfig.CheckAll == '1':
-            EdkLogger.quiet("Checking No TAB used in file ...")
-            SqlCommand = """select ID, FullPath, ExtName from File where ExtName in ('.dec', '.inf', '.dsc', 'c', 'h')"""
-            RecordSet = EccGlobalData.gDb.TblFile.Exec(SqlCommand)
-            for Record in RecordSet:
-                if Record[2].upper() not in EccGlobalData.gConfig.BinaryExtList:
-                    op = open(Record[1]).readlines()
-                    IndexOfLine = 0
-                    for Line in op:
-                        IndexOfLine += 1
-                        IndexOfChar = 0
-                        for Char in Line:
-                            IndexOfChar += 1
-                            if Char == '\t':
-                                OtherMsg = "File %s has TAB char at line %s column %s" % (Record[1], IndexOfLine, IndexOfChar)
-                                EccGlobalData.gDb.TblReport.Insert(ERROR_GENERAL_CHECK_NO_TAB, OtherMsg=OtherMsg, BelongsToTable='File', BelongsToItem=Record[0])
+    def GeneralCheckNoTab(self, Record, File, Errors):
+        if self.IsGeneralCheckTextFile(Record):
+            for IndexOfLine, Line in enumerate(File.Lines, 1):
+                IndexOfChar = Line.find('\t')
+                while IndexOfChar != -1:
+                    OtherMsg = "File %s has TAB char at line %s column %s" % (Record[1], IndexOfLine, IndexOfChar + 1)
+                    Errors.append((ERROR_GENERAL_CHECK_NO_TAB, OtherMsg, Record[0]))
+                    IndexOfChar = Line.find('\t', IndexOfChar + 1)
 
     # Check Only use CRLF (Carriage Return Line Feed) line endings.
-    def GeneralCheckLineEnding(self):
-        if EccGlobalData.gConfig.GeneralCheckLineEnding == '1' or EccGlobalData.gConfig.GeneralCheckAll == '1' or EccGlobalData.gConfig.CheckAll == '1':
-            EdkLogger.quiet("Checking line ending in file ...")
-            SqlCommand = """select ID, FullPath, ExtName from File where ExtName in ('.dec', '.inf', '.dsc', 'c', 'h')"""
-            RecordSet = EccGlobalData.gDb.TblFile.Exec(SqlCommand)
-            for Record in RecordSet:
-                if Record[2].upper() not in EccGlobalData.gConfig.BinaryExtList:
-                    op = open(Record[1], 'rb').readlines()
-                    IndexOfLine = 0
-                    for Line in op:
-                        IndexOfLine += 1
-                        if not bytes.decode(Line).endswith('\r\n'):
-                            OtherMsg = "File %s has invalid line ending at line %s" % (Record[1], IndexOfLine)
-                            EccGlobalData.gDb.TblReport.Insert(ERROR_GENERAL_CHECK_INVALID_LINE_ENDING, OtherMsg=OtherMsg, BelongsToTable='File', BelongsToItem=Record[0])
+    def GeneralCheckLineEnding(self, Record, File, Errors):
+        if self.IsGeneralCheckTextFile(Record):
+            for IndexOfLine, Line in enumerate(File.BinaryLines, 1):
+                if not bytes.decode(Line).endswith('\r\n'):
+                    OtherMsg = "File %s has invalid line ending at line %s" % (Record[1], IndexOfLine)
+                    Errors.append((ERROR_GENERAL_CHECK_INVALID_LINE_ENDING, OtherMsg, Record[0]))
 
     # Check if there is no trailing white space in one line.
-    def GeneralCheckTrailingWhiteSpaceLine(self):
-        if EccGlobalData.gConfig.GeneralCheckTrailingWhiteSpaceLine == '1' or EccGlobalData.gConfig.GeneralCheckAll == '1' or EccGlobalData.gConfig.CheckAll == '1':
-            EdkLogger.quiet("Checking trailing white space line in file ...")
-            SqlCommand = """select ID, FullPath, ExtName from File where ExtName in ('.dec', '.inf', '.dsc', 'c', 'h')"""
-            RecordSet = EccGlobalData.gDb.TblFile.Exec(SqlCommand)
-            for Record in RecordSet:
-                if Record[2].upper() not in EccGlobalData.gConfig.BinaryExtList:
-                    op = open(Record[1], 'r').readlines()
-                    IndexOfLine = 0
-                    for Line in op:
-                        IndexOfLine += 1
-                        if Line.replace('\r', '').replace('\n', '').endswith(' '):
-                            OtherMsg = "File %s has trailing white spaces at line %s" % (Record[1], IndexOfLine)
-                            EccGlobalData.gDb.TblReport.Insert(ERROR_GENERAL_CHECK_TRAILING_WHITE_SPACE_LINE, OtherMsg=OtherMsg, BelongsToTable='File', BelongsToItem=Record[0])
+    def GeneralCheckTrailingWhiteSpaceLine(self, Record, File, Errors):
+        if self.IsGeneralCheckTextFile(Record):
+            for IndexOfLine, Line in enumerate(File.Lines, 1):
+                if Line.replace('\r', '').replace('\n', '').endswith(' '):
+                    OtherMsg = "File %s has trailing white spaces at line %s" % (Record[1], IndexOfLine)
+                    Errors.append((ERROR_GENERAL_CHECK_TRAILING_WHITE_SPACE_LINE, OtherMsg, Record[0]))
 
     # Check whether file has non ACSII char
-    def GeneralCheckNonAcsii(self):
-        if EccGlobalData.gConfig.GeneralCheckNonAcsii == '1' or EccGlobalData.gConfig.GeneralCheckAll == '1' or EccGlobalData.gConfig.CheckAll == '1':
-            EdkLogger.quiet("Checking Non-ACSII char in file ...")
-            SqlCommand = """select ID, FullPath, ExtName from File where ExtName in ('.dec', '.inf', '.dsc', 'c', 'h')"""
-            RecordSet = EccGlobalData.gDb.TblFile.Exec(SqlCommand)
-            for Record in RecordSet:
-                if Record[2].upper() not in EccGlobalData.gConfig.BinaryExtList:
-                    op = open(Record[1]).readlines()
-                    IndexOfLine = 0
-                    for Line in op:
-                        IndexOfLine += 1
-                        IndexOfChar = 0
-                        for Char in Line:
-                            IndexOfChar += 1
-                            if ord(Char) > 126:
-                                OtherMsg = "File %s has Non-ASCII char at line %s column %s" % (Record[1], IndexOfLine, IndexOfChar)
-                                EccGlobalData.gDb.TblReport.Insert(ERROR_GENERAL_CHECK_NON_ACSII, OtherMsg=OtherMsg, BelongsToTable='File', BelongsToItem=Record[0])
+    def GeneralCheckNonAcsii(self, Record, File, Errors):
+        if self.IsGeneralCheckTextFile(Record):
+            for IndexOfLine, Line in enumerate(File.Lines, 1):
+                for Match in NonAcsiiPattern.finditer(Line):
+                    OtherMsg = "File %s has Non-ASCII char at line %s column %s" % (Record[1], IndexOfLine, Match.start() + 1)
+                    Errors.append((ERROR_GENERAL_CHECK_NON_ACSII, OtherMsg, Record[0]))
 
     # C Function Layout Checking
     def FunctionLayoutCheck(self):
@@ -311,7 +365,7 @@ class Check(object):
                                      'GetEfiGlobalVariable',
                                      )
 
-            for IdentifierTable in EccGlobalData.gIdentifierTableList:
+            for IdentifierTable in self.GetCheckTableList(EccGlobalData.gIdentifierTableList):
                 SqlCommand = """select ID, Name, BelongsToFile from %s
                                 where Model = %s """ % (IdentifierTable, MODEL_IDENTIFIER_FUNCTION_CALLING)
                 RecordSet = EccGlobalData.gDb.TblFile.Exec(SqlCommand)
@@ -353,7 +407,7 @@ class Check(object):
 #                    if os.path.splitext(F)[1] in ('.c', '.h'):
 #                        FullName = os.path.join(Dirpath, F)
 #                        c.CheckFuncLayoutReturnType(FullName)
-            for FullName in EccGlobalData.gCFileList + EccGlobalData.gHFileList:
+            for FullName in self.GetCheckFileList(EccGlobalData.gCFileList + EccGlobalData.gHFileList):
                 c.CheckFuncLayoutReturnType(FullName)
 
     # Check whether any optional functional modifiers exist and next to the return type
@@ -366,7 +420,7 @@ class Check(object):
 #                    if os.path.splitext(F)[1] in ('.c', '.h'):
 #                        FullName = os.path.join(Dirpath, F)
 #                        c.CheckFuncLayoutModifier(FullName)
-            for FullName in EccGlobalData.gCFileList + EccGlobalData.gHFileList:
+            for FullName in self.GetCheckFileList(EccGlobalData.gCFileList + EccGlobalData.gHFileList):
                 c.CheckFuncLayoutModifier(FullName)
 
     # Check whether the next line contains the function name, left justified, followed by the beginning of the parameter list
@@ -380,7 +434,7 @@ class Check(object):
 #                    if os.path.splitext(F)[1] in ('.c', '.h'):
 #                        FullName = os.path.join(Dirpath, F)
 #                        c.CheckFuncLayoutName(FullName)
-            for FullName in EccGlobalData.gCFileList + EccGlobalData.gHFileList:
+            for FullName in self.GetCheckFileList(EccGlobalData.gCFileList + EccGlobalData.gHFileList):
                 c.CheckFuncLayoutName(FullName)
 
     # Check whether the function prototypes in include files have the same form as function definitions
@@ -394,7 +448,7 @@ class Check(object):
 #                        FullName = os.path.join(Dirpath, F)
 #                        EdkLogger.quiet("[PROTOTYPE]" + FullName)
 #                        c.CheckFuncLayoutPrototype(FullName)
-            for FullName in EccGlobalData.gCFileList:
+            for FullName in self.GetCheckFileList(EccGlobalData.gCFileList):
                 EdkLogger.quiet("[PROTOTYPE]" + FullName)
                 c.CheckFuncLayoutPrototype(FullName)
 
@@ -408,7 +462,7 @@ class Check(object):
 #                    if os.path.splitext(F)[1] in ('.c'):
 #                        FullName = os.path.join(Dirpath, F)
 #                        c.CheckFuncLayoutBody(FullName)
-            for FullName in EccGlobalData.gCFileList:
+            for FullName in self.GetCheckFileList(EccGlobalData.gCFileList):
                 c.CheckFuncLayoutBody(FullName)
 
     # Check whether the data declarations is the first code in a module.
@@ -424,7 +478,7 @@ class Check(object):
 #                        FullName = os.path.join(Dirpath, F)
 #                        c.CheckFuncLayoutLocalVariable(FullName)
 
-            for FullName in EccGlobalData.gCFileList:
+            for FullName in self.GetCheckFileList(EccGlobalData.gCFileList):
                 c.CheckFuncLayoutLocalVariable(FullName)
 
     # Check whether no use of STATIC for functions
@@ -451,7 +505,7 @@ class Check(object):
 #                    if os.path.splitext(F)[1] in ('.h', '.c'):
 #                        FullName = os.path.join(Dirpath, F)
 #                        c.CheckDeclNoUseCType(FullName)
-            for FullName in EccGlobalData.gCFileList + EccGlobalData.gHFileList:
+            for FullName in self.GetCheckFileList(EccGlobalData.gCFileList + EccGlobalData.gHFileList):
                 c.CheckDeclNoUseCType(FullName)
 
     # Check whether the modifiers IN, OUT, OPTIONAL, and UNALIGNED are used only to qualify arguments to a function and should not appear in a data type declaration
@@ -464,7 +518,7 @@ class Check(object):
 #                    if os.path.splitext(F)[1] in ('.h', '.c'):
 #                        FullName = os.path.join(Dirpath, F)
 #                        c.CheckDeclArgModifier(FullName)
-            for FullName in EccGlobalData.gCFileList + EccGlobalData.gHFileList:
+            for FullName in self.GetCheckFileList(EccGlobalData.gCFileList + EccGlobalData.gHFileList):
                 c.CheckDeclArgModifier(FullName)
 
     # Check whether the EFIAPI modifier should be used at the entry of drivers, events, and member functions of protocols
@@ -483,7 +537,7 @@ class Check(object):
 #                        FullName = os.path.join(Dirpath, F)
 #                        EdkLogger.quiet("[ENUM]" + FullName)
 #                        c.CheckDeclEnumTypedef(FullName)
-            for FullName in EccGlobalData.gCFileList + EccGlobalData.gHFileList:
+            for FullName in self.GetCheckFileList(EccGlobalData.gCFileList + EccGlobalData.gHFileList):
                 EdkLogger.quiet("[ENUM]" + FullName)
                 c.CheckDeclEnumTypedef(FullName)
 
@@ -498,7 +552,7 @@ class Check(object):
 #                        FullName = os.path.join(Dirpath, F)
 #                        EdkLogger.quiet("[STRUCT]" + FullName)
 #                        c.CheckDeclStructTypedef(FullName)
-            for FullName in EccGlobalData.gCFileList + EccGlobalData.gHFileList:
+            for FullName in self.GetCheckFileList(EccGlobalData.gCFileList + EccGlobalData.gHFileList):
                 EdkLogger.quiet("[STRUCT]" + FullName)
                 c.CheckDeclStructTypedef(FullName)
 
@@ -535,7 +589,7 @@ class Check(object):
 #                        FullName = os.path.join(Dirpath, F)
 #                        EdkLogger.quiet("[UNION]" + FullName)
 #                        c.CheckDeclUnionTypedef(FullName)
-            for FullName in EccGlobalData.gCFileList + EccGlobalData.gHFileList:
+            for FullName in self.GetCheckFileList(EccGlobalData.gCFileList + EccGlobalData.gHFileList):
                 EdkLogger.quiet("[UNION]" + FullName)
                 c.CheckDeclUnionTypedef(FullName)
 
@@ -556,7 +610,7 @@ class Check(object):
 #                        FullName = os.path.join(Dirpath, F)
 #                        EdkLogger.quiet("[BOOLEAN]" + FullName)
 #                        c.CheckBooleanValueComparison(FullName)
-            for FullName in EccGlobalData.gCFileList:
+            for FullName in self.GetCheckFileList(EccGlobalData.gCFileList):
                 EdkLogger.quiet("[BOOLEAN]" + FullName)
                 c.CheckBooleanValueComparison(FullName)
 
@@ -571,7 +625,7 @@ class Check(object):
 #                        FullName = os.path.join(Dirpath, F)
 #                        EdkLogger.quiet("[NON-BOOLEAN]" + FullName)
 #                        c.CheckNonBooleanValueComparison(FullName)
-            for FullName in EccGlobalData.gCFileList:
+            for FullName in self.GetCheckFileList(EccGlobalData.gCFileList):
                 EdkLogger.quiet("[NON-BOOLEAN]" + FullName)
                 c.CheckNonBooleanValueComparison(FullName)
 
@@ -586,7 +640,7 @@ class Check(object):
 #                        FullName = os.path.join(Dirpath, F)
 #                        EdkLogger.quiet("[POINTER]" + FullName)
 #                        c.CheckPointerNullComparison(FullName)
-            for FullName in EccGlobalData.gCFileList:
+            for FullName in self.GetCheckFileList(EccGlobalData.gCFileList):
                 EdkLogger.quiet("[POINTER]" + FullName)
                 c.CheckPointerNullComparison(FullName)
 
@@ -632,7 +686,7 @@ class Check(object):
 #                    if os.path.splitext(F)[1] in ('.h'):
 #                        FullName = os.path.join(Dirpath, F)
 #                        MsgList = c.CheckHeaderFileIfndef(FullName)
-            for FullName in EccGlobalData.gHFileList:
+            for FullName in self.GetCheckFileList(EccGlobalData.gHFileList):
                 MsgList = c.CheckHeaderFileIfndef(FullName)
 
     # Check whether include files NOT contain code or define data variables
@@ -673,6 +727,8 @@ class Check(object):
 
             for Dirpath, Dirnames, Filenames in self.WalkTree():
                 for F in Filenames:
+                    if not self.IsCheckFile(os.path.join(Dirpath, F)):
+                        continue
                     Ext = os.path.splitext(F)[1]
                     if Ext in ('.h', '.c'):
                         FullName = os.path.join(Dirpath, F)
@@ -766,7 +822,7 @@ class Check(object):
 #                    if os.path.splitext(F)[1] in ('.h', '.c'):
 #                        FullName = os.path.join(Dirpath, F)
 #                        MsgList = c.CheckFuncHeaderDoxygenComments(FullName)
-            for FullName in EccGlobalData.gCFileList + EccGlobalData.gHFileList:
+            for FullName in self.GetCheckFileList(EccGlobalData.gCFileList + EccGlobalData.gHFileList):
                 MsgList = c.CheckFuncHeaderDoxygenComments(FullName)
 
 
@@ -786,7 +842,7 @@ class Check(object):
 #                    if os.path.splitext(F)[1] in ('.h', '.c'):
 #                        FullName = os.path.join(Dirpath, F)
 #                        MsgList = c.CheckDoxygenTripleForwardSlash(FullName)
-            for FullName in EccGlobalData.gCFileList + EccGlobalData.gHFileList:
+            for FullName in self.GetCheckFileList(EccGlobalData.gCFileList + EccGlobalData.gHFileList):
                 MsgList = c.CheckDoxygenTripleForwardSlash(FullName)
 
     # Check whether only Doxygen commands allowed to mark the code are @bug and @todo.
@@ -799,7 +855,7 @@ class Check(object):
 #                    if os.path.splitext(F)[1] in ('.h', '.c'):
 #                        FullName = os.path.join(Dirpath, F)
 #                        MsgList = c.CheckDoxygenCommand(FullName)
-            for FullName in EccGlobalData.gCFileList + EccGlobalData.gHFileList:
+            for FullName in self.GetCheckFileList(EccGlobalData.gCFileList + EccGlobalData.gHFileList):
                 MsgList = c.CheckDoxygenCommand(FullName)
 
     # Meta-Data File Processing Checking
@@ -1380,6 +1436,8 @@ class Check(object):
                 for F in Filenames:
                     if os.path.splitext(F)[1] in ('.h', '.c'):
                         FullName = os.path.join(Dirpath, F)
+                        if not self.IsCheckFile(FullName):
+                            continue
                         Id = c.GetTableID(FullName)
                         if Id < 0:
                             continue
@@ -21,10 +21,13 @@ from Table.TableFunction import TableFunction
 from Table.TablePcd import TablePcd
 from Table.TableIdentifier import TableIdentifier
 from Table.TableReport import TableReport
+from Table.TableFileDigest import TableFileDigest
 from Ecc.MetaFileWorkspace.MetaFileTable import ModuleTable
 from Ecc.MetaFileWorkspace.MetaFileTable import PackageTable
 from Ecc.MetaFileWorkspace.MetaFileTable import PlatformTable
 from Table.TableFdf import TableFdf
+from Table.Table import FlushTables
+from Table.Table import SetBuildPragmas
 
 ##
 # Static definitions
@@ -39,14 +42,16 @@ DATABASE_PATH = "Ecc.db"
 #
 # @param object:    Inherited from object class
 # @param DbPath:    A string for the path of the ECC database
+# @param Kept:      Whether the database is kept for the next runs
 #
 # @var Conn:        Connection of the ECC database
 # @var Cur:         Cursor of the connection
 # @var TblDataModel:  Local instance for TableDataModel
 #
 class Database(object):
-    def __init__(self, DbPath):
+    def __init__(self, DbPath, Kept=False):
         self.DbPath = DbPath
+        self.Kept = Kept
         self.Conn = None
         self.Cur = None
         self.TblDataModel = None
@@ -59,6 +64,7 @@ class Database(object):
         self.TblDec = None
         self.TblDsc = None
         self.TblFdf = None
+        self.TblFileDigest = None
 
     ## Initialize ECC database
     #
@@ -76,7 +82,7 @@ class Database(object):
                 os.remove(self.DbPath)
         self.Conn = sqlite3.connect(self.DbPath, isolation_level = 'DEFERRED')
         self.Conn.execute("PRAGMA page_size=4096")
-        self.Conn.execute("PRAGMA synchronous=OFF")
+        SetBuildPragmas(self.Conn, self.Kept)
         # to avoid non-ascii character conversion error
         self.Conn.text_factory = str
         self.Cur = self.Conn.cursor()
@@ -91,6 +97,7 @@ class Database(object):
         self.TblDec = PackageTable(self.Cur)
         self.TblDsc = PlatformTable(self.Cur)
         self.TblFdf = TableFdf(self.Cur)
+        self.TblFileDigest = TableFileDigest(self.Cur)
 
         #
         # Create new tables
@@ -105,6 +112,7 @@ class Database(object):
             self.TblDec.Create()
             self.TblDsc.Create()
             self.TblFdf.Create()
+        self.TblFileDigest.Create()
 
         #
         # Init each table's ID
@@ -143,6 +151,7 @@ class Database(object):
         #
         # Commit to file
         #
+        FlushTables()
         self.Conn.commit()
 
         #
@@ -151,6 +160,20 @@ class Database(object):
         self.Cur.close()
         self.Conn.close()
 
+    ## Create the indexes of the tables
+    #
+    # Create the indexes on the columns the checks query by, once the records
+    # of the files are loaded
+    #
+    def CreateIndexes(self):
+        self.TblFile.CreateIndex('Model')
+        self.TblFunction.CreateIndex('BelongsToFile')
+        self.TblPcd.CreateIndex('BelongsToFile')
+        for (Table,) in self.TblFile.Exec("""select name from sqlite_master where type = 'table' and name like 'Identifier%'"""):
+            IdTable = TableIdentifier(self.Cur)
+            IdTable.Table = Table
+            IdTable.CreateIndex('Model')
+
     ## Insert one file information
     #
     # Insert one file's information to the database
@@ -161,6 +184,8 @@ class Database(object):
     # 3. Create variables one by one
     # 4. Create pcds one by one
     #
+    # @retval FileID:  The ID of the record of the file
+    #
     def InsertOneFile(self, File):
         #
         # Insert a record for file
@@ -205,6 +230,31 @@ class Database(object):
                                    FileID, -1, Pcd.StartLine, Pcd.StartColumn, Pcd.EndLine, Pcd.EndColumn)
 
         EdkLogger.verbose("Insert information from file %s ... DONE!" % File.FullPath)
+        return FileID
+
+    ## Delete files
+    #
+    # Delete the records of files from the database
+    # 1. Delete the reports of the files
+    # 2. Delete the functions and the pcds of the files
+    # 3. Drop the identifier tables of the files
+    # 4. Delete the records of the files in TableFile
+    #
+    # @param FileIDList:  The IDs of the files
+    #
+    def DeleteFiles(self, FileIDList):
+        if not FileIDList:
+            return
+        self.TblReport.DeleteByFile(FileIDList)
+        IDString = ','.join(str(ID) for ID in FileIDList)
+        for Table in (self.TblFunction, self.TblPcd):
+            SqlCommand = """delete from %s where BelongsToFile in (%s)""" % (Table.Table, IDString)
+            Table.Exec(SqlCommand)
+        for FileID in FileIDList:
+            SqlCommand = """drop table IF EXISTS Identifier%s""" % FileID
+            self.TblFile.Exec(SqlCommand)
+        SqlCommand = """delete from %s where ID in (%s)""" % (self.TblFile.Table, IDString)
+        self.TblFile.Exec(SqlCommand)
 
     ## UpdateIdentifierBelongsToFunction
     #
@@ -263,11 +313,14 @@ class Database(object):
     #
     # Update the field "BelongsToFunction" for each Identifier
     #
+    # @param FileIDList:  Only update the identifiers of these files if given
     #
-    def UpdateIdentifierBelongsToFunction(self):
+    def UpdateIdentifierBelongsToFunction(self, FileIDList=None):
         EdkLogger.verbose("Update 'BelongsToFunction' for Identifiers started ...")
 
         SqlCommand = """select ID, BelongsToFile, StartLine, EndLine from Function"""
+        if FileIDList is not None:
+            SqlCommand += """ where BelongsToFile in (%s)""" % ','.join(str(ID) for ID in FileIDList)
         Records = self.TblFunction.Exec(SqlCommand)
         Data1 = []
         Data2 = []
@@ -14,8 +14,13 @@ gWorkspace = ''
 gTarget = ''
 gConfig = None
 gDb = None
+# number of processes parsing the C source files, 0 for one per processor
+gThreadNumber = 0
 gIdentifierTableList = []
 gCFileList = []
 gHFileList = []
 gUFileList = []
+# full path and ID of the files to check in an incremental run, None to check all files
+gCheckFileSet = None
+gCheckFileIdSet = None
 gException = None
@@ -17,13 +17,14 @@ from Ecc.MetaDataParser import *
 from optparse import OptionParser
 from Ecc.Configuration import Configuration
 from Ecc.Check import Check
+from Ecc.Check import GlobalCheckErrorList
 import Common.GlobalData as GlobalData
 
 from Common.StringUtils import NormPath
 from Common.BuildVersion import gBUILD_VERSION
 from Common import BuildToolError
 from Common.Misc import PathClass
-from Common.Misc import DirCache
+from Common.FileIndex import FileIndex
 from Ecc.MetaFileWorkspace.MetaFileParser import DscParser
 from Ecc.MetaFileWorkspace.MetaFileParser import DecParser
 from Ecc.MetaFileWorkspace.MetaFileParser import InfParser
@@ -34,6 +35,9 @@ import re, string
 from Ecc.Exception import *
 from Common.LongFilePathSupport import OpenLongFilePath as open
 from Common.MultipleWorkspace import MultipleWorkspace as mws
+from Table.TableFileDigest import GetFileDigest
+import hashlib
+import sqlite3
 
 ## Ecc
 #
@@ -57,6 +61,7 @@ class Ecc(object):
         self.ScanMetaData = True
         self.MetaFile = ''
         self.OnlyScan = None
+        self.Incremental = False
 
         # Parse the options and args
         self.ParseOption()
@@ -81,13 +86,27 @@ class Ecc(object):
         EccGlobalData.gException = ExceptionCheck(self.ExceptionFile)
 
         # Init Ecc database
-        EccGlobalData.gDb = Database.Database(Database.DATABASE_PATH)
-        EccGlobalData.gDb.InitDatabase(self.IsInit)
+        EccGlobalData.gDb = Database.Database(Database.DATABASE_PATH, self.Incremental)
+        if self.Incremental and os.path.isfile(Database.DATABASE_PATH):
+            try:
+                EccGlobalData.gDb.InitDatabase(False)
+                KeepDatabase = EccGlobalData.gDb.TblFileDigest.GetDigests().get(EccGlobalData.gTarget) == self.GetSettingDigest()
+            except sqlite3.DatabaseError as X:
+                # the database of the previous run is corrupted
+                EdkLogger.warn("ECC", "The database %s can't be read, it is built again" % Database.DATABASE_PATH, ExtraData=str(X))
+                KeepDatabase = False
+            if not KeepDatabase:
+                # nothing was written to the database yet, start from a new one
+                if EccGlobalData.gDb.Conn is not None:
+                    EccGlobalData.gDb.Conn.close()
+                EccGlobalData.gDb.InitDatabase()
+        else:
+            EccGlobalData.gDb.InitDatabase(self.IsInit)
 
         #
         # Get files real name in workspace dir
         #
-        GlobalData.gAllFiles = DirCache(GlobalData.gWorkspace)
+        GlobalData.gAllFiles = FileIndex(GlobalData.gWorkspace, mws.getPkgPath())
 
         # Build ECC database
 #         self.BuildDatabase()
@@ -136,11 +155,14 @@ class Ecc(object):
     #
     def BuildDatabase(self, SpeciDirs = None):
         # Clean report table
-        EccGlobalData.gDb.TblReport.Drop()
-        EccGlobalData.gDb.TblReport.Create()
+        if not self.Incremental:
+            EccGlobalData.gDb.TblReport.Drop()
+            EccGlobalData.gDb.TblReport.Create()
 
         # Build database
-        if self.IsInit:
+        if self.Incremental:
+            self.UpdateDatabase()
+        elif self.IsInit:
             if self.ScanMetaData:
                 EdkLogger.quiet("Building database for Meta Data File ...")
                 self.BuildMetaDataFileDatabase(SpeciDirs)
@@ -151,17 +173,100 @@ class Ecc(object):
                 else:
                     for specificDir in SpeciDirs:
                         c.CollectSourceCodeDataIntoDB(os.path.join(EccGlobalData.gTarget, specificDir))
+        EccGlobalData.gDb.CreateIndexes()
 
         EccGlobalData.gIdentifierTableList = GetTableList((MODEL_FILE_C, MODEL_FILE_H), 'Identifier', EccGlobalData.gDb)
         EccGlobalData.gCFileList = GetFileList(MODEL_FILE_C, EccGlobalData.gDb)
         EccGlobalData.gHFileList = GetFileList(MODEL_FILE_H, EccGlobalData.gDb)
         EccGlobalData.gUFileList = GetFileList(MODEL_FILE_UNI, EccGlobalData.gDb)
 
+    ## UpdateDatabase
+    #
+    # Update the database kept from the last run for the files changed since,
+    # and select the files to check again
+    # 1. Parse the meta data files, they are parsed for every run
+    # 2. Parse the source files changed, delete the records of files removed
+    # 3. Select the files changed, the new records and the files depending on
+    #    the files changed to be checked, clean their reports
+    #
+    def UpdateDatabase(self):
+        Db = EccGlobalData.gDb
+        LastDigests = Db.TblFileDigest.GetDigests()
+        LastFileID = Db.TblFile.ID
+        Db.TblReport.DeleteByErrorID(GlobalCheckErrorList)
+
+        #
+        # Delete the records of files removed, and the records of UNI and FDF
+        # files which are inserted again with the meta data
+        #
+        FileIDList = []
+        RemovedFileSet = set(Path for Path in LastDigests if Path != EccGlobalData.gTarget and not os.path.isfile(Path))
+        for FileID, FullPath, Model in Db.TblFile.Exec("select ID, FullPath, Model from File"):
+            if not os.path.isfile(FullPath):
+                RemovedFileSet.add(FullPath)
+                FileIDList.append(FileID)
+            elif Model in (MODEL_FILE_UNI, MODEL_FILE_FDF):
+                FileIDList.append(FileID)
+        Db.DeleteFiles(FileIDList)
+        Db.TblInf.Create()
+        Db.TblDec.Create()
+        Db.TblDsc.Create()
+        Db.TblFdf.Drop()
+        Db.TblFdf.Create()
+
+        Digests = {}
+        EdkLogger.quiet("Building database for Meta Data File ...")
+        self.BuildMetaDataFileDatabase(Digests=Digests)
+        EdkLogger.quiet("Building database for Meta Data File Done!")
+        c.CollectSourceCodeDataIntoDB(EccGlobalData.gTarget, Digests, LastDigests)
+
+        #
+        # Select the files to check
+        #
+        ChangedFileSet = set(Path for Path in Digests if Digests[Path] != LastDigests.get(Path)) | RemovedFileSet
+        CheckFileSet = set(ChangedFileSet)
+        CheckFileSet.update(Path for (Path,) in Db.TblFile.Exec("select FullPath from File where ID > %s" % LastFileID))
+        CheckFileSet.update(c.GetIncludingFileSet([Path for Path in ChangedFileSet if Path.lower().endswith('.h')]))
+        # the include paths of the source files come from the INF and DEC files
+        MetaDirList = [os.path.dirname(Path) + os.sep for Path in ChangedFileSet if os.path.splitext(Path)[1].lower() in ('.inf', '.dec')]
+        if MetaDirList:
+            SqlCommand = "select FullPath from File where Model in (%s, %s)" % (MODEL_FILE_C, MODEL_FILE_H)
+            for (Path,) in Db.TblFile.Exec(SqlCommand):
+                if any(Path.startswith(Dir) for Dir in MetaDirList):
+                    CheckFileSet.add(Path)
+
+        EccGlobalData.gCheckFileSet = CheckFileSet
+        EccGlobalData.gCheckFileIdSet = set()
+        for FileID, FullPath in Db.TblFile.Exec("select ID, FullPath from File"):
+            if FullPath in CheckFileSet:
+                EccGlobalData.gCheckFileIdSet.add(FileID)
+        Db.TblReport.DeleteByFile([FileID for FileID in EccGlobalData.gCheckFileIdSet if FileID <= LastFileID])
+        EdkLogger.quiet("%s of %s files changed, %s files to check" % (len(ChangedFileSet), len(Digests), len(CheckFileSet)))
+
+        Digests[EccGlobalData.gTarget] = self.GetSettingDigest()
+        Db.TblFileDigest.SetDigests(Digests)
+        Db.Conn.commit()
+
+    ## GetSettingDigest
+    #
+    # Get the digest of the settings a database is built for, the database of
+    # an incremental run is only kept for the same target and settings
+    #
+    def GetSettingDigest(self):
+        Md5 = hashlib.md5()
+        for Setting in (EccGlobalData.gTarget, os.getenv("WORKSPACE"), os.getenv("PACKAGES_PATH"),
+                        GetFileDigest(self.ConfigFile), GetFileDigest(self.ExceptionFile), self.VersionNumber):
+            Md5.update(str(Setting).encode('utf-8'))
+        return Md5.hexdigest()
+
     ## BuildMetaDataFileDatabase
     #
     # Build the database for meta data files
     #
-    def BuildMetaDataFileDatabase(self, SpecificDirs = None):
+    # @param SpecificDirs:  The folders to scan, the whole target if None
+    # @param Digests:       A dict filled with the digests of the files parsed, if given
+    #
+    def BuildMetaDataFileDatabase(self, SpecificDirs = None, Digests = None):
         ScanFolders = []
         if SpecificDirs is None:
             ScanFolders.append(EccGlobalData.gTarget)
@@ -189,6 +294,9 @@ class Ecc(object):
                             Dirs.append(Dirname)
 
                 for File in Files:
+                    if Digests is not None and len(File) > 4 and File[-4:].upper() in (".DEC", ".DSC", ".INF", ".FDF", ".UNI"):
+                        Filename = os.path.normpath(os.path.join(Root, File))
+                        Digests[Filename] = GetFileDigest(Filename)
                     if len(File) > 4 and File[-4:].upper() == ".DEC":
                         Filename = os.path.normpath(os.path.join(Root, File))
                         EdkLogger.quiet("Parsing %s" % Filename)
@@ -340,6 +448,14 @@ class Ecc(object):
             self.ScanMetaData = False
         if Options.folders is not None:
             self.OnlyScan = True
+        if Options.ThreadNumber is not None:
+            if Options.ThreadNumber < 0:
+                EdkLogger.error("ECC", BuildToolError.OPTION_VALUE_INVALID, ExtraData="Invalid thread number [%d]" % Options.ThreadNumber)
+            EccGlobalData.gThreadNumber = Options.ThreadNumber
+        if Options.Incremental is not None:
+            if not self.IsInit or not self.ScanMetaData or not self.ScanSourceCode or self.OnlyScan:
+                EdkLogger.error("ECC", BuildToolError.OPTION_CONFLICT, ExtraData="--incremental can't be specified with -k, -m, -s or -f")
+            self.Incremental = True
 
     ## SetLogLevel
     #
@@ -391,6 +507,11 @@ class Ecc(object):
         Parser.add_option("-d", "--debug", action="store", type="int", help="Enable debug messages at specified level.")
         Parser.add_option("-w", "--workspace", action="store", type="string", dest='Workspace', help="Specify workspace.")
         Parser.add_option("-f", "--folders", action="store_true", type=None, help="Only scanning specified folders which are recorded in config.ini file.")
+        Parser.add_option("-n", action="store", type="int", dest="ThreadNumber", help="Parse the C source files using multiple processes. When value is set to 0 "\
+                                                                                      "(the default), tool automatically detect number of processor threads, set value to 1 "\
+                                                                                      "means disable multi-process parsing.")
+        Parser.add_option("--incremental", action="store_true", type=None, dest="Incremental", help="Keep the Ecc database between the runs, only parse "\
+                                                                                                   "the files changed since the last run and only check them and the files depending on them.")
 
         (Opt, Args)=Parser.parse_args()
 
@@ -406,9 +527,9 @@ if __name__ == '__main__':
     EdkLogger.Initialize()
     EdkLogger.IsRaiseError = False
 
-    StartTime = time.clock()
+    StartTime = time.perf_counter()
     Ecc = Ecc()
-    FinishTime = time.clock()
+    FinishTime = time.perf_counter()
 
     BuildDuration = time.strftime("%M:%S", time.gmtime(int(round(FinishTime - StartTime))))
     EdkLogger.quiet("\n%s [%s]" % (time.strftime("%H:%M:%S, %b.%d %Y", time.localtime()), BuildDuration))
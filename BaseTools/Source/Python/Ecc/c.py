@@ -11,6 +11,7 @@ import sys
 import Common.LongFilePathOs as os
 import re
 import string
+import multiprocessing
 from Ecc import CodeFragmentCollector
 from Ecc import FileProfile
 from CommonDataClass import DataClass
@@ -19,6 +20,7 @@ from Common import EdkLogger
 from Ecc.EccToolError import *
 from Ecc import EccGlobalData
 from Ecc import MetaDataParser
+from Table.TableFileDigest import GetFileDigest
 
 IncludeFileListDict = {}
 AllIncludeFileListDict = {}
@@ -490,13 +492,90 @@ def GetFileModificationTimeFromDB(FullFileName):
         TimeValue = Result[0]
     return TimeValue
 
-def CollectSourceCodeDataIntoDB(RootDir):
+## Parse one C source or header file
+#
+# It runs in the worker processes of CollectSourceCodeDataIntoDB, so the
+# result only depends on its parameters.
+#
+#   @param  Args            The file to parse and the token replace list
+#
+#   @retval FunctionList    The functions of the file
+#   @retval IdentifierList  The identifiers of the file
+#   @retval ParseError      True if the file was parsed again with the
+#                           preprocessor directives cleared
+#
+def ParseSourceFile(Args):
+    FullName, TokenReleaceList = Args
+    ParseError = False
+    collector = CodeFragmentCollector.CodeFragmentCollector(FullName)
+    collector.TokenReleaceList = TokenReleaceList
+    try:
+        collector.ParseFile()
+    except UnicodeError:
+        ParseError = True
+        collector.CleanFileProfileBuffer()
+        collector.ParseFileWithClearedPPDirective()
+    Result = (GetFunctionList(), GetIdentifierList(), ParseError)
+    collector.CleanFileProfileBuffer()
+    return Result
+
+## Parse the C source and header files, in parallel if more than one process is allowed
+#
+#   @param  FileList        The full path of the files to parse
+#   @param  TokenReleaceList The tokens replaced before parsing
+#
+#   @retval iterator        The result of ParseSourceFile for each file, in order
+#
+def ParseSourceFiles(FileList, TokenReleaceList):
+    ProcessNumber = EccGlobalData.gThreadNumber
+    if ProcessNumber == 0:
+        ProcessNumber = multiprocessing.cpu_count()
+    ProcessNumber = min(ProcessNumber, len(FileList))
+    ArgsList = [(FullName, TokenReleaceList) for FullName in FileList]
+    if ProcessNumber <= 1:
+        for Args in ArgsList:
+            EdkLogger.info("Parsing " + Args[0])
+            yield ParseSourceFile(Args)
+        return
+
+    Pool = multiprocessing.Pool(ProcessNumber)
+    try:
+        for FullName, Result in zip(FileList, Pool.imap(ParseSourceFile, ArgsList, 4)):
+            EdkLogger.info("Parsing " + FullName)
+            yield Result
+    finally:
+        Pool.terminate()
+        Pool.join()
+
+## Collect the data of the files under a directory into the database
+#
+#   @param  RootDir         The directory to walk
+#   @param  Digests         A dict filled with the digests of the files walked,
+#                           {FullPath : Digest}, if given
+#   @param  LastDigests     The digests of the files in the database from the
+#                           last run; the files with the same digest keep
+#                           their records instead of being parsed again
+#
+def CollectSourceCodeDataIntoDB(RootDir, Digests=None, LastDigests=None):
     FileObjList = []
     tuple = os.walk(RootDir)
     IgnoredPattern = GetIgnoredDirListPattern()
     ParseErrorFileList = []
     TokenReleaceList = EccGlobalData.gConfig.TokenReleaceList
     TokenReleaceList.extend(['L",\\\""'])
+    SourceFileList = []
+    Db = GetDB()
+
+    # The records of the files from the last run
+    FileRecordDict = {}
+    if LastDigests is not None:
+        SqlStatement = """ select ID, FullPath
+                           from File
+                           where Model in (%s, %s, %s)
+                       """ % (DataClass.MODEL_FILE_C, DataClass.MODEL_FILE_H, DataClass.MODEL_FILE_OTHERS)
+        for FileID, FullPath in Db.TblFile.Exec(SqlStatement):
+            FileRecordDict.setdefault(FullPath, []).append(FileID)
+    ChangedFileIDList = []
 
     for dirpath, dirnames, filenames in tuple:
         if IgnoredPattern.match(dirpath.upper()):
@@ -514,39 +593,50 @@ def CollectSourceCodeDataIntoDB(RootDir):
         for f in filenames:
             if f.lower() in EccGlobalData.gConfig.SkipFileList:
                 continue
-            collector = None
             FullName = os.path.normpath(os.path.join(dirpath, f))
+            if Digests is not None:
+                if FullName not in Digests:
+                    Digests[FullName] = GetFileDigest(FullName)
+                if LastDigests is not None:
+                    if FullName in FileRecordDict and LastDigests.get(FullName) == Digests[FullName]:
+                        continue
+                    ChangedFileIDList.extend(FileRecordDict.get(FullName, []))
             model = DataClass.MODEL_FILE_OTHERS
             if os.path.splitext(f)[1] in ('.h', '.c'):
-                EdkLogger.info("Parsing " + FullName)
                 model = f.endswith('c') and DataClass.MODEL_FILE_C or DataClass.MODEL_FILE_H
-                collector = CodeFragmentCollector.CodeFragmentCollector(FullName)
-                collector.TokenReleaceList = TokenReleaceList
-                try:
-                    collector.ParseFile()
-                except UnicodeError:
-                    ParseErrorFileList.append(FullName)
-                    collector.CleanFileProfileBuffer()
-                    collector.ParseFileWithClearedPPDirective()
-#                collector.PrintFragments()
+                SourceFileList.append(FullName)
             BaseName = os.path.basename(f)
             DirName = os.path.dirname(FullName)
             Ext = os.path.splitext(f)[1].lstrip('.')
             ModifiedTime = os.path.getmtime(FullName)
-            FileObj = DataClass.FileClass(-1, BaseName, Ext, DirName, FullName, model, ModifiedTime, GetFunctionList(), GetIdentifierList(), [])
+            FileObj = DataClass.FileClass(-1, BaseName, Ext, DirName, FullName, model, ModifiedTime, [], [], [])
             FileObjList.append(FileObj)
-            if collector:
-                collector.CleanFileProfileBuffer()
+
+    #
+    # Parse the source files in worker processes, the functions and the
+    # identifiers come back in the order of the files
+    #
+    SourceFileObjList = [FileObj for FileObj in FileObjList if FileObj.Model in (DataClass.MODEL_FILE_C, DataClass.MODEL_FILE_H)]
+    for FileObj, (FunctionList, IdentifierList, ParseError) in zip(SourceFileObjList, ParseSourceFiles(SourceFileList, TokenReleaceList)):
+        FileObj.FunctionList = FunctionList
+        FileObj.IdentifierList = IdentifierList
+        if ParseError:
+            ParseErrorFileList.append(FileObj.FullPath)
 
     if len(ParseErrorFileList) > 0:
         EdkLogger.info("Found unrecoverable error during parsing:\n\t%s\n" % "\n\t".join(ParseErrorFileList))
 
-    Db = GetDB()
+    # The records of the changed files are replaced
+    Db.DeleteFiles(ChangedFileIDList)
+    FileIDList = []
     for file in FileObjList:
         if file.ExtName.upper() not in ['INF', 'DEC', 'DSC', 'FDF']:
-            Db.InsertOneFile(file)
+            FileIDList.append(Db.InsertOneFile(file))
 
-    Db.UpdateIdentifierBelongsToFunction()
+    if LastDigests is not None:
+        Db.UpdateIdentifierBelongsToFunction(FileIDList)
+    else:
+        Db.UpdateIdentifierBelongsToFunction()
 
 def GetTableID(FullFileName, ErrorMsgList=None):
     if ErrorMsgList is None:
@@ -591,6 +681,13 @@ def GetIncludeFileList(FullFileName):
     IncludeFileListDict[FullFileName] = ResultSet
     return ResultSet
 
+## Get the file name in an #include statement
+def GetIncludeFileName(Str):
+    FileName = Str.lstrip('#').strip()
+    FileName = FileName.lstrip('include').strip()
+    FileName = FileName.strip('\"')
+    return FileName.lstrip('<').rstrip('>').strip()
+
 def GetFullPathOfIncludeFile(Str, IncludePathList):
     for IncludePath in IncludePathList:
         FullPath = os.path.join(IncludePath, Str)
@@ -612,10 +709,7 @@ def GetAllIncludeFiles(FullFileName):
         IncludePathListDict[FileDirName] = IncludePathList
     IncludeFileQueue = []
     for IncludeFile in GetIncludeFileList(FullFileName):
-        FileName = IncludeFile[0].lstrip('#').strip()
-        FileName = FileName.lstrip('include').strip()
-        FileName = FileName.strip('\"')
-        FileName = FileName.lstrip('<').rstrip('>').strip()
+        FileName = GetIncludeFileName(IncludeFile[0])
         FullPath = GetFullPathOfIncludeFile(FileName, IncludePathList)
         if FullPath is not None:
             IncludeFileQueue.append(FullPath)
@@ -623,10 +717,7 @@ def GetAllIncludeFiles(FullFileName):
     i = 0
     while i < len(IncludeFileQueue):
         for IncludeFile in GetIncludeFileList(IncludeFileQueue[i]):
-            FileName = IncludeFile[0].lstrip('#').strip()
-            FileName = FileName.lstrip('include').strip()
-            FileName = FileName.strip('\"')
-            FileName = FileName.lstrip('<').rstrip('>').strip()
+            FileName = GetIncludeFileName(IncludeFile[0])
             FullPath = GetFullPathOfIncludeFile(FileName, IncludePathList)
             if FullPath is not None and FullPath not in IncludeFileQueue:
                 IncludeFileQueue.insert(i + 1, FullPath)
@@ -635,6 +726,44 @@ def GetAllIncludeFiles(FullFileName):
     AllIncludeFileListDict[FullFileName] = IncludeFileQueue
     return IncludeFileQueue
 
+## Get the C source and header files including some header files
+#
+# The #include statements are matched by the file names only, so that the
+# result doesn't miss a file whatever its include paths are.
+#
+#   @param  HeaderList      The full path of the header files
+#
+#   @retval set             The full path of the files including the header
+#                           files, directly or through other header files
+#
+def GetIncludingFileSet(HeaderList):
+    Db = GetDB()
+    IncludingFileDict = {}
+    SqlStatement = """ select ID, FullPath
+                       from File
+                       where Model in (%s, %s)
+                   """ % (DataClass.MODEL_FILE_C, DataClass.MODEL_FILE_H)
+    for FileID, FullPath in Db.TblFile.Exec(SqlStatement):
+        SqlStatement = """ select Value
+                           from Identifier%s
+                           where Model = %d
+                       """ % (FileID, DataClass.MODEL_IDENTIFIER_INCLUDE)
+        for IncludeFile in Db.TblFile.Exec(SqlStatement):
+            Name = os.path.basename(GetIncludeFileName(IncludeFile[0]).replace('\\', '/')).lower()
+            IncludingFileDict.setdefault(Name, set()).add(FullPath)
+
+    NameQueue = list(set(os.path.basename(Header).lower() for Header in HeaderList))
+    NameSet = set(NameQueue)
+    IncludingFileSet = set()
+    while NameQueue:
+        for FullPath in IncludingFileDict.get(NameQueue.pop(), ()):
+            IncludingFileSet.add(FullPath)
+            Name = os.path.basename(FullPath).lower()
+            if Name.endswith('.h') and Name not in NameSet:
+                NameSet.add(Name)
+                NameQueue.append(Name)
+    return IncludingFileSet
+
 def GetPredicateListFromPredicateExpStr(PES):
 
     PredicateList = []
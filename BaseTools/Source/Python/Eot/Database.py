@@ -24,6 +24,8 @@ from Table.TableDec import TableDec
 from Table.TableDsc import TableDsc
 from Table.TableFdf import TableFdf
 from Table.TableQuery import TableQuery
+from Table.Table import FlushTables
+from Table.Table import SetBuildPragmas
 
 ##
 # Static definitions
@@ -76,7 +78,7 @@ class Database(object):
                 os.remove(self.DbPath)
         self.Conn = sqlite3.connect(self.DbPath, isolation_level = 'DEFERRED')
         self.Conn.execute("PRAGMA page_size=8192")
-        self.Conn.execute("PRAGMA synchronous=OFF")
+        SetBuildPragmas(self.Conn)
         # to avoid non-ascii character conversion error
         self.Conn.text_factory = str
         self.Cur = self.Conn.cursor()
@@ -146,12 +148,30 @@ class Database(object):
     #
     def Close(self):
         # Commit to file
+        FlushTables()
         self.Conn.commit()
 
         # Close connection and cursor
         self.Cur.close()
         self.Conn.close()
 
+    ## CreateIndexes() method
+    #
+    #  Create the indexes on the columns the searches query by, once the
+    #  records of the files are loaded
+    #
+    #  @param self: The object pointer
+    #
+    def CreateIndexes(self):
+        self.TblFile.CreateIndex('Model')
+        self.TblFunction.CreateIndex('BelongsToFile')
+        self.TblInf.CreateIndex('BelongsToFile')
+        self.TblInf.CreateIndex('Model')
+        for (Table,) in self.TblFile.Exec("""select name from sqlite_master where type = 'table' and name like 'Identifier%'"""):
+            IdTable = TableIdentifier(self.Cur)
+            IdTable.Table = Table
+            IdTable.CreateIndex('Model')
+
     ## InsertOneFile() method
     #
     # Insert one file's information to the database
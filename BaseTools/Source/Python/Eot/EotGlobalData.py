@@ -22,6 +22,8 @@ gMap = {}
 
 gDb = ''
 gIdentifierTableList = []
+# number of processes parsing the C source files, 0 for one per processor
+gThreadNumber = 0
 
 # Global macro
 gMACRO = {}
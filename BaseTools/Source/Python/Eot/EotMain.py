@@ -22,13 +22,14 @@ from Eot.InfParserLite import EdkInfParser
 from Common.StringUtils import GetSplitValueList
 from Eot import c
 from Eot import Database
-from array import array
 from Eot.Report import Report
 from Common.BuildVersion import gBUILD_VERSION
 from Eot.Parser import ConvertGuid
 from Common.LongFilePathSupport import OpenLongFilePath as open
 import struct
 import uuid
+import heapq
+import mmap
 import copy
 import codecs
 from GenFds.AprioriSection import DXE_APRIORI_GUID, PEI_APRIORI_GUID
@@ -36,13 +37,17 @@ from GenFds.AprioriSection import DXE_APRIORI_GUID, PEI_APRIORI_GUID
 gGuidStringFormat = "%08X-%04X-%04X-%02X%02X-%02X%02X%02X%02X%02X%02X"
 gIndention = -4
 
-class Image(array):
+## Image() class
+#
+#  The bytes of an image are a memoryview of the buffer the image is parsed
+#  from, so that the nested images of a firmware volume share the bytes of the
+#  firmware volume file instead of copying them. The bytes are copied only
+#  when a field of the image is changed.
+#
+class Image(object):
     _HEADER_ = struct.Struct("")
     _HEADER_SIZE_ = _HEADER_.size
 
-    def __new__(cls, *args, **kwargs):
-        return array.__new__(cls, 'B')
-
     def __init__(self, ID=None):
         if ID is None:
             self._ID_ = str(uuid.uuid1()).upper()
@@ -51,57 +56,66 @@ class Image(array):
         self._BUF_ = None
         self._LEN_ = None
         self._OFF_ = None
+        self._DATA_ = memoryview(b'')
 
         self._SubImages = sdict() # {offset: Image()}
 
-        array.__init__(self)
-
     def __repr__(self):
         return self._ID_
 
     def __len__(self):
-        Len = array.__len__(self)
+        Len = len(self._DATA_)
         for Offset in self._SubImages.keys():
             Len += len(self._SubImages[Offset])
         return Len
 
+    def __getitem__(self, Index):
+        return self._DATA_[Index]
+
     def _Unpack(self):
-        self.extend(self._BUF_[self._OFF_ : self._OFF_ + self._LEN_])
+        self._DATA_ = self._BUF_[self._OFF_ : self._OFF_ + self._LEN_]
         return len(self)
 
     def _Pack(self, PadByte=0xFF):
         raise NotImplementedError
 
     def frombuffer(self, Buffer, Offset=0, Size=None):
-        self._BUF_ = Buffer
+        if isinstance(Buffer, Image):
+            Buffer = Buffer._DATA_
+        self._BUF_ = memoryview(Buffer)
         self._OFF_ = Offset
         # we may need the Size information in advance if it's given
         self._LEN_ = Size
         self._LEN_ = self._Unpack()
 
+    def tofile(self, f):
+        f.write(self._DATA_)
+
     def empty(self):
-        del self[0:]
+        self._DATA_ = memoryview(b'')
 
     def GetField(self, FieldStruct, Offset=0):
-        return FieldStruct.unpack_from(self, Offset)
+        return FieldStruct.unpack_from(self._DATA_, Offset)
 
     def SetField(self, FieldStruct, Offset, *args):
+        # copy the bytes shared with the buffer before changing them
+        Data = bytearray(self._DATA_)
         # check if there's enough space
         Size = FieldStruct.size
-        if Size > len(self):
-            self.extend([0] * (Size - len(self)))
-        FieldStruct.pack_into(self, Offset, *args)
+        if Size > len(Data):
+            Data.extend(bytes(Size - len(Data)))
+        FieldStruct.pack_into(Data, Offset, *args)
+        self._DATA_ = memoryview(Data)
 
     def _SetData(self, Data):
-        if len(self) < self._HEADER_SIZE_:
-            self.extend([0] * (self._HEADER_SIZE_ - len(self)))
-        else:
-            del self[self._HEADER_SIZE_:]
-        self.extend(Data)
+        NewData = bytearray(self._DATA_[:self._HEADER_SIZE_])
+        NewData.extend(bytes(self._HEADER_SIZE_ - len(NewData)))
+        NewData.extend(Data)
+        self._DATA_ = memoryview(NewData)
 
     def _GetData(self):
         if len(self) > self._HEADER_SIZE_:
-            return self[self._HEADER_SIZE_:]
+            return self._DATA_[self._HEADER_SIZE_:]
         return None
 
     Data = property(_GetData, _SetData)
@@ -121,6 +135,7 @@ class CompressedImage(Image):
 
     def __init__(self, CompressedData=None, CompressionType=None, UncompressedLength=None):
         Image.__init__(self)
+        self._SectionList = None
         if UncompressedLength is not None:
             self.UncompressedLength = UncompressedLength
         if CompressionType is not None:
@@ -149,14 +164,13 @@ class CompressedImage(Image):
         return self.GetField(self._CMPRS_TYPE_)[0]
 
     def _GetSections(self):
+        # decompress once, the sections are walked again on each dispatch round
+        if self._SectionList is not None:
+            return self._SectionList
         try:
-            TmpData = DeCompress('Efi', self[self._HEADER_SIZE_:])
-            DecData = array('B')
-            DecData.fromstring(TmpData)
+            DecData = memoryview(DeCompress('Efi', self[self._HEADER_SIZE_:]))
         except:
-            TmpData = DeCompress('Framework', self[self._HEADER_SIZE_:])
-            DecData = array('B')
-            DecData.fromstring(TmpData)
+            DecData = memoryview(DeCompress('Framework', self[self._HEADER_SIZE_:]))
 
         SectionList = []
         Offset = 0
@@ -169,6 +183,7 @@ class CompressedImage(Image):
             except:
                 break
             SectionList.append(Sec)
+        self._SectionList = SectionList
         return SectionList
 
     UncompressedLength = property(_GetOriginalSize, _SetOriginalSize)
@@ -191,12 +206,11 @@ class Ui(Image):
 
     def _Unpack(self):
         # keep header in this Image object
-        self.empty()
-        self.extend(self._BUF_[self._OFF_ : self._OFF_ + self._LEN_])
+        self._DATA_ = self._BUF_[self._OFF_ : self._OFF_ + self._LEN_]
         return len(self)
 
     def _GetUiString(self):
-        return codecs.utf_16_decode(self[0:-2].tostring())[0]
+        return codecs.utf_16_decode(self[0:-2].tobytes())[0]
 
     String = property(_GetUiString)
 
@@ -259,8 +273,7 @@ class Depex(Image):
 
     def _Unpack(self):
         # keep header in this Image object
-        self.empty()
-        self.extend(self._BUF_[self._OFF_ : self._OFF_ + self._LEN_])
+        self._DATA_ = self._BUF_[self._OFF_ : self._OFF_ + self._LEN_]
         return len(self)
 
     def _GetExpression(self):
@@ -268,7 +281,7 @@ class Depex(Image):
             Offset = 0
             CurrentData = self._OPCODE_
             while Offset < len(self):
-                Token = CurrentData.unpack_from(self, Offset)
+                Token = self.GetField(CurrentData, Offset)
                 Offset += CurrentData.size
                 if len(Token) == 1:
                     Token = Token[0]
@@ -452,6 +465,10 @@ class FirmwareVolume(Image):
 
         self.DisPatchDxe(Db)
 
+    ## Load the protocols produced by a module
+    #
+    # @retval GuidList:  The GUIDs of the protocols in lower case
+    #
     def LoadProtocol(self, Db, ModuleGuid):
         SqlCommand = """select GuidValue from Report
                         where SourceFileFullPath in
@@ -462,19 +479,16 @@ class FirmwareVolume(Image):
                         and ItemType = 'Protocol' and ItemMode = 'Produced'""" \
                         % (ModuleGuid, 5001, 3007)
         RecordSet = Db.TblReport.Exec(SqlCommand)
+        GuidList = []
         for Record in RecordSet:
-            SqlCommand = """select Value2 from Inf where BelongsToFile =
-                            (select DISTINCT BelongsToFile from Inf
-                            where Value1 =
-                            (select SourceFileFullPath from Report
-                            where GuidValue like '%s' and ItemMode = 'Callback'))
-                            and Value1 = 'FILE_GUID'""" % Record[0]
-            CallBackSet = Db.TblReport.Exec(SqlCommand)
-            if CallBackSet != []:
-                EotGlobalData.gProtocolList[Record[0].lower()] = ModuleGuid
-            else:
-                EotGlobalData.gProtocolList[Record[0].lower()] = ModuleGuid
+            EotGlobalData.gProtocolList[Record[0].lower()] = ModuleGuid
+            GuidList.append(Record[0].lower())
+        return GuidList
 
+    ## Load the PPIs produced by a module
+    #
+    # @retval GuidList:  The GUIDs of the PPIs in lower case
+    #
     def LoadPpi(self, Db, ModuleGuid):
         SqlCommand = """select GuidValue from Report
                         where SourceFileFullPath in
@@ -485,50 +499,92 @@ class FirmwareVolume(Image):
                         and ItemType = 'Ppi' and ItemMode = 'Produced'""" \
                         % (ModuleGuid, 5001, 3007)
         RecordSet = Db.TblReport.Exec(SqlCommand)
+        GuidList = []
         for Record in RecordSet:
             EotGlobalData.gPpiList[Record[0].lower()] = ModuleGuid
+            GuidList.append(Record[0].lower())
+        return GuidList
 
-    def DisPatchDxe(self, Db):
-        IsInstalled = False
-        ScheduleList = sdict()
-        for FfsID in list(self.UnDispatchedFfsDict.keys()):
-            CouldBeLoaded = False
-            DepexString = ''
-            FileDepex = None
-            Ffs = self.UnDispatchedFfsDict[FfsID]
-            if Ffs.Type == 0x07:
-                # Get Depex
-                IsFoundDepex = False
-                for Section in Ffs.Sections.values():
-                    # Find Depex
-                    if Section.Type == 0x13:
-                        IsFoundDepex = True
-                        CouldBeLoaded, DepexString, FileDepex = self.ParseDepex(Section._SubImages[4], 'Protocol')
+    ## Find the depex of a module
+    #
+    # The depex is searched in the sections, in the compressed sections and
+    # in the GUID defined sections in them, the last one found is used
+    #
+    def FindDepex(self, Ffs, DepexType):
+        Depex = None
+        for Section in Ffs.Sections.values():
+            if Section.Type == DepexType:
+                Depex = Section._SubImages[4]
+                break
+            if Section.Type == 0x01:
+                CompressSections = Section._SubImages[4]
+                for CompressSection in CompressSections.Sections:
+                    if CompressSection.Type == DepexType:
+                        Depex = CompressSection._SubImages[4]
                         break
-                    if Section.Type == 0x01:
-                        CompressSections = Section._SubImages[4]
-                        for CompressSection in CompressSections.Sections:
-                            if CompressSection.Type == 0x13:
-                                IsFoundDepex = True
-                                CouldBeLoaded, DepexString, FileDepex = self.ParseDepex(CompressSection._SubImages[4], 'Protocol')
+                    if CompressSection.Type == 0x02:
+                        NewSections = CompressSection._SubImages[4]
+                        for NewSection in NewSections.Sections:
+                            if NewSection.Type == DepexType:
+                                Depex = NewSection._SubImages[4]
                                 break
-                            if CompressSection.Type == 0x02:
-                                NewSections = CompressSection._SubImages[4]
-                                for NewSection in NewSections.Sections:
-                                    if NewSection.Type == 0x13:
-                                        IsFoundDepex = True
-                                        CouldBeLoaded, DepexString, FileDepex = self.ParseDepex(NewSection._SubImages[4], 'Protocol')
-                                        break
-
-                # Not find Depex
-                if not IsFoundDepex:
+        return Depex
+
+    ## Find the depex of modules and index the modules by the GUIDs they wait for
+    #
+    # A module waits for the PPIs or protocols its depex pushes, in lower case,
+    # and for the modules its depex is BEFORE or AFTER. A module without depex
+    # waits for NoDepexGuids.
+    #
+    # @retval DepexList:  The depex of each module, None for no depex
+    # @retval WaitDict:   {Guid : [Index of module in FfsIDList]}
+    #
+    def GetDepexWaitDict(self, FfsIDList, DepexType, NoDepexGuids=()):
+        DepexList = []
+        WaitDict = {}
+        for Index, FfsID in enumerate(FfsIDList):
+            Depex = self.FindDepex(self.UnDispatchedFfsDict[FfsID], DepexType)
+            DepexList.append(Depex)
+            GuidList = [Guid.lower() for Guid in NoDepexGuids]
+            if Depex is not None:
+                Expression = Depex.Expression
+                GuidList = []
+                for Position in range(0, len(Expression) - 1):
+                    if not isinstance(Expression[Position + 1], tuple):
+                        continue
+                    Guid = gGuidStringFormat % Expression[Position + 1]
+                    if Expression[Position] == 0x02:
+                        GuidList.append(Guid.lower())
+                    elif Expression[Position] in (0x00, 0x01):
+                        GuidList.append(Guid)
+            for Guid in GuidList:
+                WaitDict.setdefault(Guid, []).append(Index)
+        return DepexList, WaitDict
+
+    ## Dispatch the DXE drivers
+    #
+    # The drivers are dispatched in rounds. A round schedules, in the order of
+    # the FV, the drivers whose depex is satisfied when it starts, then loads
+    # their protocols. A driver is evaluated again only in the round after a
+    # GUID it waits for is installed.
+    #
+    def DisPatchDxe(self, Db):
+        FfsIDList = [FfsID for FfsID in self.UnDispatchedFfsDict if self.UnDispatchedFfsDict[FfsID].Type == 0x07]
+        DepexList, WaitDict = self.GetDepexWaitDict(FfsIDList, 0x13, EotGlobalData.gArchProtocolGuids)
+        Round = list(range(0, len(FfsIDList)))
+        while Round:
+            ScheduleList = sdict()
+            for Index in Round:
+                FfsID = FfsIDList[Index]
+                if DepexList[Index] is not None:
+                    CouldBeLoaded, DepexString, FileDepex = self.ParseDepex(DepexList[Index], 'Protocol')
+                else:
                     CouldBeLoaded = self.CheckArchProtocol()
                     DepexString = ''
                     FileDepex = None
 
                 # Append New Ffs
                 if CouldBeLoaded:
-                    IsInstalled = True
                     NewFfs = self.UnDispatchedFfsDict.pop(FfsID)
                     NewFfs.Depex = DepexString
                     if FileDepex is not None:
@@ -538,61 +594,62 @@ class FirmwareVolume(Image):
                 else:
                     self.UnDispatchedFfsDict[FfsID].Depex = DepexString
 
-        for FfsID in ScheduleList.keys():
-            NewFfs = ScheduleList.pop(FfsID)
-            FfsName = 'UnKnown'
-            self.OrderedFfsDict[FfsID] = NewFfs
-            self.LoadProtocol(Db, FfsID)
-
-            SqlCommand = """select Value2 from Inf
-                            where BelongsToFile = (select BelongsToFile from Inf where Value1 = 'FILE_GUID' and lower(Value2) = lower('%s') and Model = %s)
-                            and Model = %s and Value1='BASE_NAME'""" % (FfsID, 5001, 5001)
-            RecordSet = Db.TblReport.Exec(SqlCommand)
-            if RecordSet != []:
-                FfsName = RecordSet[0][0]
-
-        if IsInstalled:
-            self.DisPatchDxe(Db)
+            NextRound = set()
+            for FfsID, NewFfs in list(ScheduleList.items()):
+                self.OrderedFfsDict[FfsID] = NewFfs
+                for Guid in self.LoadProtocol(Db, FfsID) + [FfsID]:
+                    for Index in WaitDict.pop(Guid, []):
+                        if FfsIDList[Index] in self.UnDispatchedFfsDict:
+                            NextRound.add(Index)
+            Round = sorted(NextRound)
 
+    ## Dispatch the PEIMs
+    #
+    # The PEIMs are evaluated in rounds over the FV, a PEIM is dispatched as
+    # soon as its depex is satisfied and its PPIs are loaded at once. A PEIM
+    # is evaluated again only after a GUID it waits for is installed, later
+    # in the same round if it comes after the PEIM installing the GUID, else
+    # in the next round.
+    #
     def DisPatchPei(self, Db):
+        FfsIDList = [FfsID for FfsID in self.UnDispatchedFfsDict if self.UnDispatchedFfsDict[FfsID].Type in (0x06, 0x08)]
+        DepexList, WaitDict = self.GetDepexWaitDict(FfsIDList, 0x1B)
+        Round = list(range(0, len(FfsIDList)))
+        RoundSet = set(Round)
+        NextRound = set()
         IsInstalled = False
-        for FfsID in list(self.UnDispatchedFfsDict.keys()):
+        while Round or (IsInstalled and NextRound):
+            if not Round:
+                Round = sorted(NextRound)
+                RoundSet = NextRound
+                NextRound = set()
+                IsInstalled = False
+            Current = heapq.heappop(Round)
+            RoundSet.discard(Current)
+            FfsID = FfsIDList[Current]
             CouldBeLoaded = True
             DepexString = ''
-            FileDepex = None
-            Ffs = self.UnDispatchedFfsDict[FfsID]
-            if Ffs.Type == 0x06 or Ffs.Type == 0x08:
-                # Get Depex
-                for Section in Ffs.Sections.values():
-                    if Section.Type == 0x1B:
-                        CouldBeLoaded, DepexString, FileDepex = self.ParseDepex(Section._SubImages[4], 'Ppi')
-                        break
-                    if Section.Type == 0x01:
-                        CompressSections = Section._SubImages[4]
-                        for CompressSection in CompressSections.Sections:
-                            if CompressSection.Type == 0x1B:
-                                CouldBeLoaded, DepexString, FileDepex = self.ParseDepex(CompressSection._SubImages[4], 'Ppi')
-                                break
-                            if CompressSection.Type == 0x02:
-                                NewSections = CompressSection._SubImages[4]
-                                for NewSection in NewSections.Sections:
-                                    if NewSection.Type == 0x1B:
-                                        CouldBeLoaded, DepexString, FileDepex = self.ParseDepex(NewSection._SubImages[4], 'Ppi')
-                                        break
-
-                # Append New Ffs
-                if CouldBeLoaded:
-                    IsInstalled = True
-                    NewFfs = self.UnDispatchedFfsDict.pop(FfsID)
-                    NewFfs.Depex = DepexString
-                    self.OrderedFfsDict[FfsID] = NewFfs
-                    self.LoadPpi(Db, FfsID)
-                else:
-                    self.UnDispatchedFfsDict[FfsID].Depex = DepexString
-
-        if IsInstalled:
-            self.DisPatchPei(Db)
-
+            if DepexList[Current] is not None:
+                CouldBeLoaded, DepexString, FileDepex = self.ParseDepex(DepexList[Current], 'Ppi')
+
+            # Append New Ffs
+            if CouldBeLoaded:
+                IsInstalled = True
+                NewFfs = self.UnDispatchedFfsDict.pop(FfsID)
+                NewFfs.Depex = DepexString
+                self.OrderedFfsDict[FfsID] = NewFfs
+                for Guid in self.LoadPpi(Db, FfsID) + [FfsID]:
+                    for Index in WaitDict.pop(Guid, []):
+                        if FfsIDList[Index] not in self.UnDispatchedFfsDict:
+                            continue
+                        if Index > Current:
+                            if Index not in RoundSet:
+                                RoundSet.add(Index)
+                                heapq.heappush(Round, Index)
+                        else:
+                            NextRound.add(Index)
+            else:
+                self.UnDispatchedFfsDict[FfsID].Depex = DepexString
 
     def __str__(self):
         global gIndention
@@ -605,8 +662,7 @@ class FirmwareVolume(Image):
 
     def _Unpack(self):
         Size = self._LENGTH_.unpack_from(self._BUF_, self._OFF_)[0]
-        self.empty()
-        self.extend(self._BUF_[self._OFF_:self._OFF_ + Size])
+        self._DATA_ = self._BUF_[self._OFF_:self._OFF_ + Size]
 
         # traverse the FFS
         EndOfFv = Size
@@ -677,6 +733,7 @@ class GuidDefinedImage(Image):
 
     def __init__(self, SectionDefinitionGuid=None, DataOffset=None, Attributes=None, Data=None):
         Image.__init__(self)
+        self._SectionList = None
         if SectionDefinitionGuid is not None:
             self.SectionDefinitionGuid = SectionDefinitionGuid
         if DataOffset is not None:
@@ -694,8 +751,7 @@ class GuidDefinedImage(Image):
 
     def _Unpack(self):
         # keep header in this Image object
-        self.empty()
-        self.extend(self._BUF_[self._OFF_ : self._OFF_ + self._LEN_])
+        self._DATA_ = self._BUF_[self._OFF_ : self._OFF_ + self._LEN_]
         return len(self)
 
     def _SetAttribute(self, Attribute):
@@ -717,6 +773,9 @@ class GuidDefinedImage(Image):
         return self.GetField(self._DATA_OFFSET_)[0]
 
     def _GetSections(self):
+        # decode once, the sections are walked again on each dispatch round
+        if self._SectionList is not None:
+            return self._SectionList
         SectionList = []
         Guid = gGuidStringFormat % self.SectionDefinitionGuid
         if Guid == self.CRC32_GUID:
@@ -736,9 +795,7 @@ class GuidDefinedImage(Image):
             try:
                 # skip the header
                 Offset = self.DataOffset - 4
-                TmpData = DeCompress('Framework', self[self.Offset:])
-                DecData = array('B')
-                DecData.fromstring(TmpData)
+                DecData = memoryview(DeCompress('Framework', self[self.Offset:]))
                 Offset = 0
                 while Offset < len(DecData):
                     Sec = Section()
@@ -757,9 +814,7 @@ class GuidDefinedImage(Image):
                 # skip the header
                 Offset = self.DataOffset - 4
 
-                TmpData = DeCompress('Lzma', self[self.Offset:])
-                DecData = array('B')
-                DecData.fromstring(TmpData)
+                DecData = memoryview(DeCompress('Lzma', self[self.Offset:]))
                 Offset = 0
                 while Offset < len(DecData):
                     Sec = Section()
@@ -774,6 +829,7 @@ class GuidDefinedImage(Image):
             except:
                 pass
 
+        self._SectionList = SectionList
         return SectionList
 
     Attributes = property(_GetAttribute, _SetAttribute)
@@ -844,17 +900,16 @@ class Section(Image):
         return SectionInfo
 
     def _Unpack(self):
-        self.empty()
         Type, = self._TYPE_.unpack_from(self._BUF_, self._OFF_)
         Size1, Size2, Size3 = self._SIZE_.unpack_from(self._BUF_, self._OFF_)
         Size = Size1 + (Size2 << 8) + (Size3 << 16)
 
         if Type not in self._SectionSubImages:
             # no need to extract sub-image, keep all in this Image object
-            self.extend(self._BUF_[self._OFF_ : self._OFF_ + Size])
+            self._DATA_ = self._BUF_[self._OFF_ : self._OFF_ + Size]
         else:
             # keep header in this Image object
-            self.extend(self._BUF_[self._OFF_ : self._OFF_ + self._HEADER_SIZE_])
+            self._DATA_ = self._BUF_[self._OFF_ : self._OFF_ + self._HEADER_SIZE_]
             #
             # use new Image object to represent payload, which may be another kind
             # of image such as PE32
@@ -983,8 +1038,7 @@ class Ffs(Image):
     def _Unpack(self):
         Size1, Size2, Size3 = self._SIZE_.unpack_from(self._BUF_, self._OFF_)
         Size = Size1 + (Size2 << 8) + (Size3 << 16)
-        self.empty()
-        self.extend(self._BUF_[self._OFF_ : self._OFF_ + Size])
+        self._DATA_ = self._BUF_[self._OFF_ : self._OFF_ + Size]
 
         # Pad FFS may use the same GUID. We need to avoid it.
         if self.Type == 0xf0:
@@ -1085,15 +1139,16 @@ class MultipleFv(FirmwareVolume):
         FirmwareVolume.__init__(self)
         self.BasicInfo = []
         for FvPath in FvList:
-            Fd = None
+            if not FvPath.strip():
+                continue
             FvName = os.path.splitext(os.path.split(FvPath)[1])[0]
-            if FvPath.strip():
-                Fd = open(FvPath, 'rb')
-            Buf = array('B')
-            try:
-                Buf.fromfile(Fd, os.path.getsize(FvPath))
-            except EOFError:
-                pass
+            # map the file instead of reading it, the images only refer to its bytes
+            with open(FvPath, 'rb') as Fd:
+                try:
+                    Buf = mmap.mmap(Fd.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    # empty file can't be mapped
+                    Buf = b''
 
             Fv = FirmwareVolume(FvName)
             Fv.frombuffer(Buf, 0, len(Buf))
@@ -1575,6 +1630,7 @@ class Eot(object):
             EdkLogger.quiet("Building database for source code ...")
             c.CreateCCodeDB(EotGlobalData.gSOURCE_FILES)
             EdkLogger.quiet("Building database for source code done!")
+            EotGlobalData.gDb.CreateIndexes()
 
         EotGlobalData.gIdentifierTableList = GetTableList((MODEL_FILE_C, MODEL_FILE_H), 'Identifier', EotGlobalData.gDb)
 
@@ -1632,6 +1688,11 @@ class Eot(object):
         if Options.keepdatabase:
             self.IsInit = False
 
+        if Options.ThreadNumber is not None:
+            if Options.ThreadNumber < 0:
+                EdkLogger.error("EOT", BuildToolError.OPTION_VALUE_INVALID, ExtraData="Invalid thread number [%d]" % Options.ThreadNumber)
+            EotGlobalData.gThreadNumber = Options.ThreadNumber
+
     ## SetLogLevel() method
     #
     #  Set current log level of the tool based on args
@@ -1680,6 +1741,9 @@ class Eot(object):
             help="Specify real execution log file")
 
         Parser.add_option("-k", "--keepdatabase", action="store_true", type=None, help="The existing Eot database will not be cleaned except report information if this option is specified.")
+        Parser.add_option("-n", action="store", type="int", dest="ThreadNumber", help="Parse the C source files using multiple processes. When value is set to 0 "\
+                                                                                      "(the default), tool automatically detect number of processor threads, set value to 1 "\
+                                                                                      "means disable multi-process parsing.")
 
         Parser.add_option("-q", "--quiet", action="store_true", type=None, help="Disable all messages except FATAL ERRORS.")
         Parser.add_option("-v", "--verbose", action="store_true", type=None, help="Turn on verbose output with informational messages printed, "\
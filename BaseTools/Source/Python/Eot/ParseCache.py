@@ -0,0 +1,87 @@
+## @file
+# This file is used to keep the results of parsing the C source files between
+# the runs of the EOT tool
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+#
+
+##
+# Import Modules
+#
+from __future__ import absolute_import
+import sqlite3
+import pickle
+import Common.LongFilePathOs as os
+
+##
+# Static definitions
+#
+PARSE_CACHE_PATH = "EotParseCache.db"
+
+# Change it when the parser or the parse results change, to drop the results
+# kept by the former versions
+PARSE_CACHE_VERSION = 1
+
+## ParseCache class
+#
+# The results of parsing the C source files, keyed by the digest of the content
+# of the files, so that a file is parsed again only when it changes
+#
+#   @param  DbPath:    The file path of the cache database
+#
+class ParseCache(object):
+    def __init__(self, DbPath=PARSE_CACHE_PATH):
+        self.DbPath = DbPath
+        self.Conn = None
+        try:
+            self._Open()
+        except sqlite3.DatabaseError:
+            # a broken cache is built again
+            if self.Conn is not None:
+                self.Conn.close()
+            os.remove(self.DbPath)
+            self._Open()
+
+    def _Open(self):
+        self.Conn = sqlite3.connect(self.DbPath)
+        self.Conn.execute("PRAGMA synchronous=OFF")
+        self.Conn.execute("PRAGMA journal_mode=MEMORY")
+        if self.Conn.execute("PRAGMA user_version").fetchone()[0] != PARSE_CACHE_VERSION:
+            self.Conn.execute("drop table IF EXISTS ParseResult")
+            self.Conn.execute("PRAGMA user_version=%d" % PARSE_CACHE_VERSION)
+        self.Conn.execute("""create table IF NOT EXISTS ParseResult (Digest VARCHAR PRIMARY KEY,
+                                                                     Result BLOB NOT NULL
+                                                                    )""")
+
+    ## Get the parse result of a file
+    #
+    #   @param  Digest:    The digest of the content of the file
+    #
+    #   @retval Result:    The parse result, None if the file was never parsed
+    #
+    def Get(self, Digest):
+        if Digest is None:
+            return None
+        Row = self.Conn.execute("select Result from ParseResult where Digest = ?", (Digest,)).fetchone()
+        if Row is None:
+            return None
+        return pickle.loads(Row[0])
+
+    ## Keep the parse result of a file
+    #
+    #   @param  Digest:    The digest of the content of the file
+    #   @param  Result:    The parse result
+    #
+    def Set(self, Digest, Result):
+        if Digest is None:
+            return
+        self.Conn.execute("insert or replace into ParseResult values(?, ?)",
+                          (Digest, sqlite3.Binary(pickle.dumps(Result, pickle.HIGHEST_PROTOCOL))))
+
+    ## Save the parse results and close the cache
+    def Close(self):
+        if self.Conn is not None:
+            self.Conn.commit()
+            self.Conn.close()
+            self.Conn = None
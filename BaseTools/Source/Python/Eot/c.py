@@ -14,8 +14,11 @@ from __future__ import absolute_import
 import sys
 import Common.LongFilePathOs as os
 import re
+import multiprocessing
 from . import CodeFragmentCollector
 from . import FileProfile
+from .ParseCache import ParseCache
+from Table.TableFileDigest import GetFileDigest
 from CommonDataClass import DataClass
 from Common import EdkLogger
 from .EotToolError import *
@@ -330,6 +333,72 @@ def GetFunctionList():
 
     return FuncObjList
 
+## ParseSourceFile() method
+#
+#  Parse one C source or header file. It runs in the worker processes of
+#  ParseSourceFiles, so the result only depends on the file.
+#
+#  @param FullName: The full path of the file
+#
+#  @return FunctionList: The functions of the file
+#  @return IdentifierList: The identifiers of the file
+#  @return ParseError: True if the file could not be parsed to the end
+#
+def ParseSourceFile(FullName):
+    ParseError = False
+    collector = CodeFragmentCollector.CodeFragmentCollector(FullName)
+    try:
+        collector.ParseFile()
+    except:
+        ParseError = True
+    Result = (GetFunctionList(), GetIdentifierList(), ParseError)
+    collector.CleanFileProfileBuffer()
+    return Result
+
+## ParseSourceFiles() method
+#
+#  Parse the C source and header files changed since they were last parsed,
+#  in parallel if more than one process is allowed, and reuse the results
+#  kept in the parse cache for the others
+#
+#  @param FileNameList: The full path of the files to parse
+#
+#  @return iterator: The result of ParseSourceFile for each file, in order
+#
+def ParseSourceFiles(FileNameList):
+    Cache = ParseCache()
+    try:
+        DigestList = [GetFileDigest(FullName) for FullName in FileNameList]
+        ResultList = [Cache.Get(Digest) for Digest in DigestList]
+        ParseList = [FullName for FullName, Result in zip(FileNameList, ResultList) if Result is None]
+
+        ProcessNumber = EotGlobalData.gThreadNumber
+        if ProcessNumber == 0:
+            ProcessNumber = multiprocessing.cpu_count()
+        ProcessNumber = min(ProcessNumber, len(ParseList))
+        Pool = None
+        if ProcessNumber <= 1:
+            ParsedResults = (ParseSourceFile(FullName) for FullName in ParseList)
+        else:
+            Pool = multiprocessing.Pool(ProcessNumber)
+            ParsedResults = Pool.imap(ParseSourceFile, ParseList, 4)
+
+        try:
+            for FullName, Digest, Result in zip(FileNameList, DigestList, ResultList):
+                if Result is None:
+                    EdkLogger.info("Parsing " + FullName)
+                    Result = next(ParsedResults)
+                    Cache.Set(Digest, Result)
+                else:
+                    EdkLogger.verbose("Reusing the parse result of " + FullName)
+                yield Result
+        finally:
+            if Pool is not None:
+                Pool.terminate()
+                Pool.join()
+    finally:
+        Cache.Close()
+
 ## CreateCCodeDB() method
 #
 #  Create database for all c code
@@ -340,25 +409,27 @@ def CreateCCodeDB(FileNameList):
     FileObjList = []
     ParseErrorFileList = []
     ParsedFiles = {}
+    SourceFileList = []
     for FullName in FileNameList:
         if os.path.splitext(FullName)[1] in ('.h', '.c'):
             if FullName.lower() in ParsedFiles:
                 continue
             ParsedFiles[FullName.lower()] = 1
-            EdkLogger.info("Parsing " + FullName)
-            model = FullName.endswith('c') and DataClass.MODEL_FILE_C or DataClass.MODEL_FILE_H
-            collector = CodeFragmentCollector.CodeFragmentCollector(FullName)
-            try:
-                collector.ParseFile()
-            except:
-                ParseErrorFileList.append(FullName)
-            BaseName = os.path.basename(FullName)
-            DirName = os.path.dirname(FullName)
-            Ext = os.path.splitext(BaseName)[1].lstrip('.')
-            ModifiedTime = os.path.getmtime(FullName)
-            FileObj = DataClass.FileClass(-1, BaseName, Ext, DirName, FullName, model, ModifiedTime, GetFunctionList(), GetIdentifierList(), [])
-            FileObjList.append(FileObj)
-            collector.CleanFileProfileBuffer()
+            SourceFileList.append(FullName)
+
+    #
+    # The functions and the identifiers come back in the order of the files
+    #
+    for FullName, (FunctionList, IdentifierList, ParseError) in zip(SourceFileList, ParseSourceFiles(SourceFileList)):
+        if ParseError:
+            ParseErrorFileList.append(FullName)
+        model = FullName.endswith('c') and DataClass.MODEL_FILE_C or DataClass.MODEL_FILE_H
+        BaseName = os.path.basename(FullName)
+        DirName = os.path.dirname(FullName)
+        Ext = os.path.splitext(BaseName)[1].lstrip('.')
+        ModifiedTime = os.path.getmtime(FullName)
+        FileObj = DataClass.FileClass(-1, BaseName, Ext, DirName, FullName, model, ModifiedTime, FunctionList, IdentifierList, [])
+        FileObjList.append(FileObj)
 
     if len(ParseErrorFileList) > 0:
         EdkLogger.info("Found unrecoverable error during parsing:\n\t%s\n" % "\n\t".join(ParseErrorFileList))
@@ -25,10 +25,11 @@ from Common.DataType import *
 import Common.GlobalData as GlobalData
 from Common import EdkLogger
 from Common.StringUtils import NormPath
-from Common.Misc import DirCache, PathClass, GuidStructureStringToGuidString
+from Common.Misc import PathClass, GuidStructureStringToGuidString
 from Common.Misc import SaveFileOnChange, ClearDuplicatedInf
 from Common.BuildVersion import gBUILD_VERSION
 from Common.MultipleWorkspace import MultipleWorkspace as mws
+from Common.FileIndex import FileIndex
 from Common.BuildToolError import FatalError, GENFDS_ERROR, CODE_ERROR, FORMAT_INVALID, RESOURCE_NOT_AVAILABLE, FILE_NOT_FOUND, OPTION_MISSING, FORMAT_NOT_SUPPORTED, OPTION_VALUE_INVALID, PARAMETER_INVALID
 from Workspace.WorkspaceDatabase import WorkspaceDatabase
 
@@ -264,7 +265,7 @@ def GenFdsApi(FdsCommandDict, WorkSpaceDataBase=None):
         #
         # Get files real name in workspace dir
         #
-        GlobalData.gAllFiles = DirCache(Workspace)
+        GlobalData.gAllFiles = FileIndex(Workspace, mws.getPkgPath())
         GlobalData.gWorkspace = Workspace
 
         if FdsCommandDict.get("build_architecture_list"):
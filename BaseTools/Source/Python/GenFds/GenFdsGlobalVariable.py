@@ -20,6 +20,7 @@ from array import array
 
 from Common.BuildToolError import COMMAND_FAILURE,GENFDS_ERROR
 from Common import EdkLogger
+from Common import BuildTrace
 from Common.Misc import SaveFileOnChange
 
 from Common.TargetTxtClassObject import TargetTxt
@@ -700,14 +701,15 @@ class GenFdsGlobalVariable:
             if GenFdsGlobalVariable.SharpCounter % GenFdsGlobalVariable.SharpNumberPerLine == 0:
                 stdout.write('\n')
 
-        try:
-            PopenObject = Popen(' '.join(cmd), stdout=PIPE, stderr=PIPE, shell=True)
-        except Exception as X:
-            EdkLogger.error("GenFds", COMMAND_FAILURE, ExtraData="%s: %s" % (str(X), cmd[0]))
-        (out, error) = PopenObject.communicate()
+        with BuildTrace.Span(os.path.basename(cmd[0]), "genfds", command=' '.join(cmd)):
+            try:
+                PopenObject = Popen(' '.join(cmd), stdout=PIPE, stderr=PIPE, shell=True)
+            except Exception as X:
+                EdkLogger.error("GenFds", COMMAND_FAILURE, ExtraData="%s: %s" % (str(X), cmd[0]))
+            (out, error) = PopenObject.communicate()
 
-        while PopenObject.returncode is None:
-            PopenObject.wait()
+            while PopenObject.returncode is None:
+                PopenObject.wait()
         if returnValue != [] and returnValue[0] != 0:
             #get command return value
             returnValue[0] = PopenObject.returncode
@@ -10,6 +10,38 @@
 #
 import Common.EdkLogger as EdkLogger
 
+## The count of records inserted in batch before they are written to a table
+PENDING_RECORD_MAX = 10000
+
+## The tables with records inserted in batch and not yet written
+_PendingTableList = []
+
+## Write the records inserted in batch to all tables
+#
+# The records must be written before any sql command reads or changes the
+# tables, the commands may join any of them
+#
+def FlushTables():
+    while _PendingTableList:
+        _PendingTableList[0].Flush()
+
+## Set the pragmas of a database built from the source files
+#
+# A database built again by each run doesn't need to survive a crash: it is
+# never synced to the disk and its journal is kept in memory. A database kept
+# between the runs keeps the default journal and synchronous settings, so a
+# crash can't leave it corrupted.
+#
+# @param Conn:  Connection to the database
+# @param Kept:  Whether the database is kept for the next runs
+#
+def SetBuildPragmas(Conn, Kept=False):
+    if not Kept:
+        Conn.execute("PRAGMA synchronous=OFF")
+        Conn.execute("PRAGMA journal_mode=MEMORY")
+    Conn.execute("PRAGMA temp_store=MEMORY")
+    Conn.execute("PRAGMA cache_size=-65536")
+
 ## TableFile
 #
 # This class defined a common table
@@ -24,6 +56,7 @@ class Table(object):
         self.Cur = Cursor
         self.Table = ''
         self.ID = 0
+        self.PendingList = []
 
     ## Create table
     #
@@ -41,12 +74,49 @@ class Table(object):
     def Insert(self, SqlCommand):
         self.Exec(SqlCommand)
 
+    ## Insert a record in batch
+    #
+    # The record is written with the other records inserted in batch by one
+    # executemany, when there are enough of them or before the next sql command
+    #
+    # @param Record:  The values of all the columns of the record
+    #
+    def BatchInsert(self, Record):
+        if not self.PendingList:
+            _PendingTableList.append(self)
+        self.PendingList.append(Record)
+        if len(self.PendingList) >= PENDING_RECORD_MAX:
+            self.Flush()
+
+    ## Write the records inserted in batch to the table
+    #
+    def Flush(self):
+        if self.PendingList:
+            SqlCommand = """insert into %s values(%s)""" % (self.Table, ', '.join('?' * len(self.PendingList[0])))
+            EdkLogger.debug(4, "SqlCommand: %s, %s records" % (SqlCommand, len(self.PendingList)))
+            _PendingTableList.remove(self)
+            self.Cur.executemany(SqlCommand, self.PendingList)
+            self.PendingList = []
+
+    ## Create an index
+    #
+    # Create an index of the table on columns, after the records are loaded
+    #
+    # @param Columns:  The columns of the index
+    #
+    def CreateIndex(self, *Columns):
+        FlushTables()
+        SqlCommand = """create index IF NOT EXISTS %s_%s on %s(%s)""" % (self.Table, '_'.join(Columns), self.Table, ', '.join(Columns))
+        self.Cur.execute(SqlCommand)
+        EdkLogger.verbose(SqlCommand + " ... DONE!")
+
     ## Query table
     #
     # Query all records of the table
     #
     def Query(self):
         EdkLogger.verbose("\nQuery table %s started ..." % self.Table)
+        FlushTables()
         SqlCommand = """select * from %s""" % self.Table
         self.Cur.execute(SqlCommand)
         for Rs in self.Cur:
@@ -61,6 +131,7 @@ class Table(object):
     # Drop the table
     #
     def Drop(self):
+        FlushTables()
         SqlCommand = """drop table IF EXISTS %s""" % self.Table
         self.Cur.execute(SqlCommand)
         EdkLogger.verbose("Drop tabel %s ... DONE!" % self.Table)
@@ -72,6 +143,7 @@ class Table(object):
     # @retval Count:  Total count of all records
     #
     def GetCount(self):
+        FlushTables()
         SqlCommand = """select count(ID) from %s""" % self.Table
         self.Cur.execute(SqlCommand)
         for Item in self.Cur:
@@ -93,10 +165,14 @@ class Table(object):
 
     ## Init the ID of the table
     #
-    # Init the ID of the table
+    # Init the ID of the table with the largest ID in use, records may have
+    # been deleted from a database kept from a previous run
     #
     def InitID(self):
-        self.ID = self.GetCount()
+        FlushTables()
+        SqlCommand = """select max(ID) from %s""" % self.Table
+        self.Cur.execute(SqlCommand)
+        self.ID = self.Cur.fetchone()[0] or 0
 
     ## Exec
     #
@@ -107,6 +183,7 @@ class Table(object):
     # @retval RecordSet:  The result after executed
     #
     def Exec(self, SqlCommand):
+        FlushTables()
         EdkLogger.debug(4, "SqlCommand: %s" % SqlCommand)
         self.Cur.execute(SqlCommand)
         RecordSet = self.Cur.fetchall()
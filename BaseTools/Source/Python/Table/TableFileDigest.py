@@ -0,0 +1,68 @@
+## @file
+# This file is used to create/update/query/erase table for the digests of files
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+#
+
+##
+# Import Modules
+#
+from __future__ import absolute_import
+import hashlib
+from Table.Table import Table
+from Common.LongFilePathSupport import OpenLongFilePath as open
+
+## Get the digest of the content of a file
+#
+# @param FullPath:  The full path of the file
+#
+# @retval Digest:   The MD5 digest of the file, None if it can't be read
+#
+def GetFileDigest(FullPath):
+    try:
+        with open(FullPath, 'rb') as File:
+            return hashlib.md5(File.read()).hexdigest()
+    except (IOError, OSError):
+        return None
+
+## TableFileDigest
+#
+# This class defined a table used for the digests of the files recorded in
+# a database, to find the files changed since the database was built
+#
+# @param object:       Inherited from object class
+#
+class TableFileDigest(Table):
+    def __init__(self, Cursor):
+        Table.__init__(self, Cursor)
+        self.Table = 'FileDigest'
+
+    ## Create table
+    #
+    # Create table FileDigest
+    #
+    # @param FullPath:  FullPath of a File
+    # @param Digest:    Digest of the content of a File
+    #
+    def Create(self):
+        SqlCommand = """create table IF NOT EXISTS %s (FullPath VARCHAR PRIMARY KEY,
+                                                       Digest VARCHAR NOT NULL
+                                                      )""" % self.Table
+        Table.Create(self, SqlCommand)
+
+    ## Get the digests of all files
+    #
+    # @retval Digests:  A dict of {FullPath : Digest}
+    #
+    def GetDigests(self):
+        SqlCommand = """select FullPath, Digest from %s""" % self.Table
+        return dict(self.Exec(SqlCommand))
+
+    ## Replace the digests of all files
+    #
+    # @param Digests:   A dict of {FullPath : Digest}
+    #
+    def SetDigests(self, Digests):
+        self.Cur.execute("""delete from %s""" % self.Table)
+        self.Cur.executemany("""insert into %s values(?, ?)""" % self.Table, Digests.items())
@@ -11,7 +11,6 @@
 from __future__ import absolute_import
 import Common.EdkLogger as EdkLogger
 from Table.Table import Table
-from Common.StringUtils import ConvertToSqlString
 
 ## TableFunction
 #
@@ -82,9 +81,6 @@ class TableFunction(Table):
     #
     def Insert(self, Header, Modifier, Name, ReturnStatement, StartLine, StartColumn, EndLine, EndColumn, BodyStartLine, BodyStartColumn, BelongsToFile, FunNameStartLine, FunNameStartColumn):
         self.ID = self.ID + 1
-        (Header, Modifier, Name, ReturnStatement) = ConvertToSqlString((Header, Modifier, Name, ReturnStatement))
-        SqlCommand = """insert into %s values(%s, '%s', '%s', '%s', '%s', %s, %s, %s, %s, %s, %s, %s, %s, %s)""" \
-                                    % (self.Table, self.ID, Header, Modifier, Name, ReturnStatement, StartLine, StartColumn, EndLine, EndColumn, BodyStartLine, BodyStartColumn, BelongsToFile, FunNameStartLine, FunNameStartColumn)
-        Table.Insert(self, SqlCommand)
+        self.BatchInsert((self.ID, Header, Modifier, Name, ReturnStatement, StartLine, StartColumn, EndLine, EndColumn, BodyStartLine, BodyStartColumn, BelongsToFile, FunNameStartLine, FunNameStartColumn))
 
         return self.ID
@@ -10,7 +10,6 @@
 #
 from __future__ import absolute_import
 import Common.EdkLogger as EdkLogger
-from Common.StringUtils import ConvertToSqlString
 from Table.Table import Table
 
 ## TableIdentifier
@@ -77,9 +76,6 @@ class TableIdentifier(Table):
     #
     def Insert(self, Modifier, Type, Name, Value, Model, BelongsToFile, BelongsToFunction, StartLine, StartColumn, EndLine, EndColumn):
         self.ID = self.ID + 1
-        (Modifier, Type, Name, Value) = ConvertToSqlString((Modifier, Type, Name, Value))
-        SqlCommand = """insert into %s values(%s, '%s', '%s', '%s', '%s', %s, %s, %s, %s, %s, %s, %s)""" \
-                                           % (self.Table, self.ID, Modifier, Type, Name, Value, Model, BelongsToFile, BelongsToFunction, StartLine, StartColumn, EndLine, EndColumn)
-        Table.Insert(self, SqlCommand)
+        self.BatchInsert((self.ID, Modifier, Type, Name, Value, Model, BelongsToFile, BelongsToFunction, StartLine, StartColumn, EndLine, EndColumn))
 
         return self.ID
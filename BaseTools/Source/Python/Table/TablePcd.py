@@ -11,7 +11,6 @@
 from __future__ import absolute_import
 import Common.EdkLogger as EdkLogger
 from Table.Table import Table
-from Common.StringUtils import ConvertToSqlString
 
 ## TablePcd
 #
@@ -77,9 +76,6 @@ class TablePcd(Table):
     #
     def Insert(self, CName, TokenSpaceGuidCName, Token, DatumType, Model, BelongsToFile, BelongsToFunction, StartLine, StartColumn, EndLine, EndColumn):
         self.ID = self.ID + 1
-        (CName, TokenSpaceGuidCName, DatumType) = ConvertToSqlString((CName, TokenSpaceGuidCName, DatumType))
-        SqlCommand = """insert into %s values(%s, '%s', '%s', %s, '%s', %s, %s, %s, %s, %s, %s, %s)""" \
-                                           % (self.Table, self.ID, CName, TokenSpaceGuidCName, Token, DatumType, Model, BelongsToFile, BelongsToFunction, StartLine, StartColumn, EndLine, EndColumn)
-        Table.Insert(self, SqlCommand)
+        self.BatchInsert((self.ID, CName, TokenSpaceGuidCName, Token, DatumType, Model, BelongsToFile, BelongsToFunction, StartLine, StartColumn, EndLine, EndColumn))
 
         return self.ID
@@ -12,7 +12,6 @@ from __future__ import absolute_import
 import Common.EdkLogger as EdkLogger
 import Common.LongFilePathOs as os, time
 from Table.Table import Table
-from Common.StringUtils import ConvertToSqlString2
 import Ecc.EccToolError as EccToolError
 import Ecc.EccGlobalData as EccGlobalData
 from Common.LongFilePathSupport import OpenLongFilePath as open
@@ -65,9 +64,7 @@ class TableReport(Table):
     #
     def Insert(self, ErrorID, OtherMsg='', BelongsToTable='', BelongsToItem= -1, Enabled=0, Corrected= -1):
         self.ID = self.ID + 1
-        SqlCommand = """insert into %s values(%s, %s, '%s', '%s', %s, %s, %s)""" \
-                     % (self.Table, self.ID, ErrorID, ConvertToSqlString2(OtherMsg), BelongsToTable, BelongsToItem, Enabled, Corrected)
-        Table.Insert(self, SqlCommand)
+        self.BatchInsert((self.ID, ErrorID, OtherMsg, str(BelongsToTable), BelongsToItem, Enabled, Corrected))
 
         return self.ID
 
@@ -87,6 +84,33 @@ class TableReport(Table):
                         and OtherMsg like '%%%s%%'""" % (ItemID, File)
         return self.Exec(SqlCommand)
 
+    ## Delete the reports of files
+    #
+    # Delete the reports belonging to the files, to their functions or to
+    # their identifiers
+    #
+    # @param FileIDList:  The IDs of the files
+    #
+    def DeleteByFile(self, FileIDList):
+        if not FileIDList:
+            return
+        IDString = ','.join(str(ID) for ID in FileIDList)
+        SqlCommand = """delete from %s where BelongsToTable = 'File' and BelongsToItem in (%s)""" % (self.Table, IDString)
+        self.Exec(SqlCommand)
+        SqlCommand = """delete from %s where BelongsToTable = 'Function' and BelongsToItem in
+                        (select ID from Function where BelongsToFile in (%s))""" % (self.Table, IDString)
+        self.Exec(SqlCommand)
+        SqlCommand = """delete from %s where BelongsToTable in (%s)""" % (self.Table, ','.join("'Identifier%s'" % ID for ID in FileIDList))
+        self.Exec(SqlCommand)
+
+    ## Delete the reports of errors
+    #
+    # @param ErrorIDList:  The IDs of the errors
+    #
+    def DeleteByErrorID(self, ErrorIDList):
+        SqlCommand = """delete from %s where ErrorID in (%s)""" % (self.Table, ','.join(str(ID) for ID in ErrorIDList))
+        self.Exec(SqlCommand)
+
     ## Convert to CSV
     #
     # Get all enabled records from table report and save them to a .csv file
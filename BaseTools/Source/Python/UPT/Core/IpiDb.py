@@ -16,6 +16,7 @@ IpiDb
 import sqlite3
 import os.path
 import time
+from contextlib import contextmanager
 
 import Logger.Log as Logger
 from Logger import StringTable as ST
@@ -23,6 +24,27 @@ from Logger.ToolError import UPT_ALREADY_RUNNING_ERROR
 from Logger.ToolError import UPT_DB_UPDATE_ERROR
 import platform as pf
 
+## The version of the database schema, kept in the user_version of the
+# database. The databases created by the former versions are migrated when
+# they are opened.
+#
+IPI_DB_VERSION = 1
+
+## The indexes of the database, as (Table, Columns)
+#
+# They serve the queries for the packages, the modules and the files of a
+# distribution package, and the lookup of the module dependencies.
+#
+IPI_DB_INDEX_LIST = [
+    ('DpInfo', ('NewPkgFileName',)),
+    ('DpFileListInfo', ('DpGuid', 'DpVersion')),
+    ('PkgInfo', ('DpGuid', 'DpVersion')),
+    ('ModInPkgInfo', ('PackageGuid', 'PackageVersion')),
+    ('StandaloneModInfo', ('DpGuid', 'DpVersion')),
+    ('ModDepexInfo', ('ModuleGuid', 'ModuleVersion', 'InstallPath')),
+    ('ModDepexInfo', ('DepexGuid',)),
+]
+
 ## IpiDb
 #
 # This class represents the installed package information database
@@ -148,16 +170,52 @@ class IpiDatabase(object):
         )""" % self.ModDepexTable
         self.Cur.execute(SqlCommand)
 
+        self._MigrateDatabase()
+
         self.Conn.commit()
 
         Logger.Verbose(ST.MSG_INIT_IPI_FINISH)
 
+    ## Migrate the database to the current schema version
+    #
+    # The tables are the same in all versions, the version 1 adds the
+    # indexes.
+    #
+    def _MigrateDatabase(self):
+        Version = self.Cur.execute("PRAGMA user_version").fetchone()[0]
+        if Version >= IPI_DB_VERSION:
+            return
+        for (Table, Columns) in IPI_DB_INDEX_LIST:
+            SqlCommand = """create index IF NOT EXISTS %s_%s on %s (%s)""" % \
+            (Table, '_'.join(Columns), Table, ', '.join(Columns))
+            self.Cur.execute(SqlCommand)
+        self.Cur.execute("PRAGMA user_version=%d" % IPI_DB_VERSION)
+
     def RollBack(self):
         self.Conn.rollback()
 
     def Commit(self):
         self.Conn.commit()
 
+    ## Run the updates of a distribution package in one transaction
+    #
+    # The updates are undone together if one of them fails. The transaction
+    # is committed or rolled back along with the files installed or removed,
+    # by Commit() or RollBack().
+    #
+    @contextmanager
+    def _Transaction(self):
+        if not self.Conn.in_transaction:
+            self.Cur.execute("begin")
+        self.Cur.execute("savepoint DpUpdate")
+        try:
+            yield
+        except:
+            self.Cur.execute("rollback to DpUpdate")
+            self.Cur.execute("release DpUpdate")
+            raise
+        self.Cur.execute("release DpUpdate")
+
     ## Add a distribution install information from DpObj
     #
     # @param DpObj:
@@ -166,63 +224,83 @@ class IpiDatabase(object):
     # @param RePackage: A RePackage
     #
     def AddDPObject(self, DpObj, NewDpPkgFileName, DpPkgFileName, RePackage):
-        try:
-            for PkgKey in DpObj.PackageSurfaceArea.keys():
-                PkgGuid = PkgKey[0]
-                PkgVersion = PkgKey[1]
-                PkgInstallPath = PkgKey[2]
-                self._AddPackage(PkgGuid, PkgVersion, DpObj.Header.GetGuid(), \
-                                 DpObj.Header.GetVersion(), PkgInstallPath)
-                PkgObj = DpObj.PackageSurfaceArea[PkgKey]
-                for ModKey in PkgObj.GetModuleDict().keys():
-                    ModGuid = ModKey[0]
-                    ModVersion = ModKey[1]
-                    ModName = ModKey[2]
-                    ModInstallPath = ModKey[3]
-                    ModInstallPath = \
-                    os.path.normpath(os.path.join(PkgInstallPath, ModInstallPath))
-                    self._AddModuleInPackage(ModGuid, ModVersion, ModName, PkgGuid, \
-                                             PkgVersion, ModInstallPath)
-                    ModObj = PkgObj.GetModuleDict()[ModKey]
-                    for Dep in ModObj.GetPackageDependencyList():
-                        DepexGuid = Dep.GetGuid()
-                        DepexVersion = Dep.GetVersion()
-                        self._AddModuleDepex(ModGuid, ModVersion, ModName, ModInstallPath, \
-                                             DepexGuid, DepexVersion)
-                for (FilePath, Md5Sum) in PkgObj.FileList:
-                    self._AddDpFilePathList(DpObj.Header.GetGuid(), \
-                                            DpObj.Header.GetVersion(), FilePath, \
-                                            Md5Sum)
-
-            for ModKey in DpObj.ModuleSurfaceArea.keys():
+        #
+        # The records of each table, inserted at once in the end
+        #
+        PkgList = []
+        ModInPkgList = []
+        StandaloneModList = []
+        ModDepexList = []
+        DpFileList = []
+        for PkgKey in DpObj.PackageSurfaceArea.keys():
+            PkgGuid = PkgKey[0]
+            PkgVersion = PkgKey[1]
+            PkgInstallPath = PkgKey[2]
+            PkgList.append(self._AddPackage(PkgGuid, PkgVersion, DpObj.Header.GetGuid(), \
+                                            DpObj.Header.GetVersion(), PkgInstallPath))
+            PkgObj = DpObj.PackageSurfaceArea[PkgKey]
+            for ModKey in PkgObj.GetModuleDict().keys():
                 ModGuid = ModKey[0]
                 ModVersion = ModKey[1]
                 ModName = ModKey[2]
                 ModInstallPath = ModKey[3]
-                self._AddStandaloneModule(ModGuid, ModVersion, ModName, \
-                                          DpObj.Header.GetGuid(), \
-                                          DpObj.Header.GetVersion(), \
-                                          ModInstallPath)
-                ModObj = DpObj.ModuleSurfaceArea[ModKey]
+                ModInstallPath = \
+                os.path.normpath(os.path.join(PkgInstallPath, ModInstallPath))
+                ModInPkgList.append(self._AddModuleInPackage(ModGuid, ModVersion, ModName, PkgGuid, \
+                                                             PkgVersion, ModInstallPath))
+                ModObj = PkgObj.GetModuleDict()[ModKey]
                 for Dep in ModObj.GetPackageDependencyList():
                     DepexGuid = Dep.GetGuid()
                     DepexVersion = Dep.GetVersion()
-                    self._AddModuleDepex(ModGuid, ModVersion, ModName, ModInstallPath, \
-                                         DepexGuid, DepexVersion)
-                for (Path, Md5Sum) in ModObj.FileList:
-                    self._AddDpFilePathList(DpObj.Header.GetGuid(), \
-                                            DpObj.Header.GetVersion(), \
-                                            Path, Md5Sum)
-
-            #
-            # add tool/misc files
-            #
-            for (Path, Md5Sum) in DpObj.FileList:
-                self._AddDpFilePathList(DpObj.Header.GetGuid(), \
-                                        DpObj.Header.GetVersion(), Path, Md5Sum)
+                    ModDepexList.append(self._AddModuleDepex(ModGuid, ModVersion, ModName, ModInstallPath, \
+                                                             DepexGuid, DepexVersion))
+            for (FilePath, Md5Sum) in PkgObj.FileList:
+                DpFileList.append(self._AddDpFilePathList(DpObj.Header.GetGuid(), \
+                                                          DpObj.Header.GetVersion(), FilePath, \
+                                                          Md5Sum))
+
+        for ModKey in DpObj.ModuleSurfaceArea.keys():
+            ModGuid = ModKey[0]
+            ModVersion = ModKey[1]
+            ModName = ModKey[2]
+            ModInstallPath = ModKey[3]
+            StandaloneModList.append(self._AddStandaloneModule(ModGuid, ModVersion, ModName, \
+                                                               DpObj.Header.GetGuid(), \
+                                                               DpObj.Header.GetVersion(), \
+                                                               ModInstallPath))
+            ModObj = DpObj.ModuleSurfaceArea[ModKey]
+            for Dep in ModObj.GetPackageDependencyList():
+                DepexGuid = Dep.GetGuid()
+                DepexVersion = Dep.GetVersion()
+                ModDepexList.append(self._AddModuleDepex(ModGuid, ModVersion, ModName, ModInstallPath, \
+                                                         DepexGuid, DepexVersion))
+            for (Path, Md5Sum) in ModObj.FileList:
+                DpFileList.append(self._AddDpFilePathList(DpObj.Header.GetGuid(), \
+                                                          DpObj.Header.GetVersion(), \
+                                                          Path, Md5Sum))
+
+        #
+        # add tool/misc files
+        #
+        for (Path, Md5Sum) in DpObj.FileList:
+            DpFileList.append(self._AddDpFilePathList(DpObj.Header.GetGuid(), \
+                                                      DpObj.Header.GetVersion(), Path, Md5Sum))
+
+        DpList = [self._AddDp(DpObj.Header.GetGuid(), DpObj.Header.GetVersion(), \
+                              NewDpPkgFileName, DpPkgFileName, RePackage)]
 
-            self._AddDp(DpObj.Header.GetGuid(), DpObj.Header.GetVersion(), \
-                        NewDpPkgFileName, DpPkgFileName, RePackage)
+        try:
+            with self._Transaction():
+                for (Table, RecordList) in ((self.PkgTable, PkgList),
+                                            (self.ModInPkgTable, ModInPkgList),
+                                            (self.ModDepexTable, ModDepexList),
+                                            (self.DpFileListTable, DpFileList),
+                                            (self.StandaloneModTable, StandaloneModList),
+                                            (self.DpTable, DpList)):
+                    if RecordList:
+                        SqlCommand = """insert into %s values(%s)""" % \
+                        (Table, ', '.join('?' * len(RecordList[0])))
+                        self.Cur.executemany(SqlCommand, RecordList)
 
         except sqlite3.IntegrityError as DetailMsg:
             Logger.Error("UPT",
@@ -238,6 +316,8 @@ class IpiDatabase(object):
     # @param NewDpFileName the saved filename of distribution package file
     # @param DistributionFileName the filename of distribution package file
     #
+    # @retval Record      The record of the distribution package
+    #
     def _AddDp(self, Guid, Version, NewDpFileName, DistributionFileName, \
                RePackage):
 
@@ -252,12 +332,8 @@ class IpiDatabase(object):
         else:
             PkgFileName = NewDpFileName
         CurrentTime = time.time()
-        SqlCommand = \
-        """insert into %s values('%s', '%s', %s, '%s', '%s', '%s')""" % \
-        (self.DpTable, Guid, Version, CurrentTime, PkgFileName, \
-         DistributionFileName, str(RePackage).upper())
-        self.Cur.execute(SqlCommand)
-
+        return (Guid, Version, CurrentTime, PkgFileName, DistributionFileName, \
+                str(RePackage).upper())
 
     ## Add a file list from DP
     #
@@ -266,6 +342,8 @@ class IpiDatabase(object):
     # @param Path: A Path
     # @param Path: A Md5Sum
     #
+    # @retval Record: The record of the file
+    #
     def _AddDpFilePathList(self, DpGuid, DpVersion, Path, Md5Sum):
         Path = os.path.normpath(Path)
         if pf.system() == 'Windows':
@@ -274,10 +352,7 @@ class IpiDatabase(object):
         else:
             if Path.startswith(self.Workspace + os.sep):
                 Path = Path[len(self.Workspace)+1:]
-        SqlCommand = """insert into %s values('%s', '%s', '%s', '%s')""" % \
-        (self.DpFileListTable, Path, DpGuid, DpVersion, Md5Sum)
-
-        self.Cur.execute(SqlCommand)
+        return (Path, DpGuid, DpVersion, Md5Sum)
 
     ## Add a package install information
     #
@@ -287,6 +362,8 @@ class IpiDatabase(object):
     # @param DpVersion: A DpVersion
     # @param Path: A Path
     #
+    # @retval Record: The record of the package
+    #
     def _AddPackage(self, Guid, Version, DpGuid=None, DpVersion=None, Path=''):
 
         if Version is None or len(Version.strip()) == 0:
@@ -302,10 +379,7 @@ class IpiDatabase(object):
         # Add newly installed package information to DB.
         #
         CurrentTime = time.time()
-        SqlCommand = \
-        """insert into %s values('%s', '%s', %s, '%s', '%s', '%s')""" % \
-        (self.PkgTable, Guid, Version, CurrentTime, DpGuid, DpVersion, Path)
-        self.Cur.execute(SqlCommand)
+        return (Guid, Version, CurrentTime, DpGuid, DpVersion, Path)
 
     ## Add a module that from a package install information
     #
@@ -316,6 +390,8 @@ class IpiDatabase(object):
     # @param PkgVersion: Package version
     # @param Path:    Package relative path that module installs
     #
+    # @retval Record: The record of the module
+    #
     def _AddModuleInPackage(self, Guid, Version, Name, PkgGuid=None, \
                             PkgVersion=None, Path=''):
 
@@ -337,11 +413,7 @@ class IpiDatabase(object):
         # Add module from package information to DB.
         #
         CurrentTime = time.time()
-        SqlCommand = \
-        """insert into %s values('%s', '%s', '%s', %s, '%s', '%s', '%s')""" % \
-        (self.ModInPkgTable, Guid, Version, Name, CurrentTime, PkgGuid, PkgVersion, \
-         Path)
-        self.Cur.execute(SqlCommand)
+        return (Guid, Version, Name, CurrentTime, PkgGuid, PkgVersion, Path)
 
     ## Add a module that is standalone install information
     #
@@ -352,6 +424,8 @@ class IpiDatabase(object):
     # @param DpVersion: a DpVersion
     # @param Path: path
     #
+    # @retval Record: The record of the module
+    #
     def _AddStandaloneModule(self, Guid, Version, Name, DpGuid=None, \
                              DpVersion=None, Path=''):
 
@@ -368,11 +442,7 @@ class IpiDatabase(object):
         # Add module standalone information to DB.
         #
         CurrentTime = time.time()
-        SqlCommand = \
-        """insert into %s values('%s', '%s', '%s', %s, '%s', '%s', '%s')""" % \
-        (self.StandaloneModTable, Guid, Version, Name, CurrentTime, DpGuid, \
-         DpVersion, Path)
-        self.Cur.execute(SqlCommand)
+        return (Guid, Version, Name, CurrentTime, DpGuid, DpVersion, Path)
 
     ## Add a module depex
     #
@@ -382,6 +452,8 @@ class IpiDatabase(object):
     # @param DepexGuid: a module DepexGuid
     # @param DepexVersion: a module DepexVersion
     #
+    # @retval Record: The record of the dependency
+    #
     def _AddModuleDepex(self, Guid, Version, Name, Path, DepexGuid=None, \
                         DepexVersion=None):
 
@@ -396,12 +468,7 @@ class IpiDatabase(object):
         else:
             Path = Path.replace('/', os.sep)
 
-        #
-        # Add module depex information to DB.
-        #
-        SqlCommand = """insert into %s values('%s', '%s', '%s', '%s', '%s', '%s')"""\
-         % (self.ModDepexTable, Guid, Version, Name, Path, DepexGuid, DepexVersion)
-        self.Cur.execute(SqlCommand)
+        return (Guid, Version, Name, Path, DepexGuid, DepexVersion)
 
     ## Remove a distribution install information, if no version specified,
     # remove all DPs with this Guid.
@@ -412,90 +479,84 @@ class IpiDatabase(object):
     def RemoveDpObj(self, DpGuid, DpVersion):
 
         PkgList = self.GetPackageListFromDp(DpGuid, DpVersion)
-        #
-        # delete from ModDepex the standalone module's dependency
-        #
-        SqlCommand = \
-        """delete from ModDepexInfo where ModDepexInfo.ModuleGuid in
-        (select ModuleGuid from StandaloneModInfo as B where B.DpGuid = '%s'
-        and B.DpVersion = '%s')
-        and ModDepexInfo.ModuleVersion in
-        (select ModuleVersion from StandaloneModInfo as B
-        where B.DpGuid = '%s' and B.DpVersion = '%s')
-        and ModDepexInfo.ModuleName in
-        (select ModuleName from StandaloneModInfo as B
-        where B.DpGuid = '%s' and B.DpVersion = '%s')
-        and ModDepexInfo.InstallPath in
-        (select InstallPath from StandaloneModInfo as B
-        where B.DpGuid = '%s' and B.DpVersion = '%s') """ % \
-        (DpGuid, DpVersion, DpGuid, DpVersion, DpGuid, DpVersion, DpGuid, DpVersion)
-
-        self.Cur.execute(SqlCommand)
-        #
-        # delete from ModDepex the from pkg module's dependency
-        #
-        for Pkg in PkgList:
+        PkgKeyList = [(Pkg[0], Pkg[1]) for Pkg in PkgList]
+        with self._Transaction():
+            #
+            # delete from ModDepex the standalone module's dependency
+            #
+            SqlCommand = \
+            """delete from ModDepexInfo where ModDepexInfo.ModuleGuid in
+            (select ModuleGuid from StandaloneModInfo as B where B.DpGuid = '%s'
+            and B.DpVersion = '%s')
+            and ModDepexInfo.ModuleVersion in
+            (select ModuleVersion from StandaloneModInfo as B
+            where B.DpGuid = '%s' and B.DpVersion = '%s')
+            and ModDepexInfo.ModuleName in
+            (select ModuleName from StandaloneModInfo as B
+            where B.DpGuid = '%s' and B.DpVersion = '%s')
+            and ModDepexInfo.InstallPath in
+            (select InstallPath from StandaloneModInfo as B
+            where B.DpGuid = '%s' and B.DpVersion = '%s') """ % \
+            (DpGuid, DpVersion, DpGuid, DpVersion, DpGuid, DpVersion, DpGuid, DpVersion)
 
+            self.Cur.execute(SqlCommand)
+            #
+            # delete from ModDepex the from pkg module's dependency
+            #
             SqlCommand = \
             """delete from ModDepexInfo where ModDepexInfo.ModuleGuid in
             (select ModuleGuid from ModInPkgInfo
-            where ModInPkgInfo.PackageGuid ='%s' and
-            ModInPkgInfo.PackageVersion = '%s')
+            where ModInPkgInfo.PackageGuid = ?1 and
+            ModInPkgInfo.PackageVersion = ?2)
             and ModDepexInfo.ModuleVersion in
             (select ModuleVersion from ModInPkgInfo
-            where ModInPkgInfo.PackageGuid ='%s' and
-            ModInPkgInfo.PackageVersion = '%s')
+            where ModInPkgInfo.PackageGuid = ?1 and
+            ModInPkgInfo.PackageVersion = ?2)
             and ModDepexInfo.ModuleName in
             (select ModuleName from ModInPkgInfo
-            where ModInPkgInfo.PackageGuid ='%s' and
-            ModInPkgInfo.PackageVersion = '%s')
+            where ModInPkgInfo.PackageGuid = ?1 and
+            ModInPkgInfo.PackageVersion = ?2)
             and ModDepexInfo.InstallPath in
             (select InstallPath from ModInPkgInfo where
-            ModInPkgInfo.PackageGuid ='%s'
-            and ModInPkgInfo.PackageVersion = '%s')""" \
-                            % (Pkg[0], Pkg[1], Pkg[0], Pkg[1], Pkg[0], Pkg[1], Pkg[0], Pkg[1])
-
+            ModInPkgInfo.PackageGuid = ?1
+            and ModInPkgInfo.PackageVersion = ?2)"""
+            self.Cur.executemany(SqlCommand, PkgKeyList)
+            #
+            # delete the standalone module
+            #
+            SqlCommand = \
+            """delete from %s where DpGuid ='%s' and DpVersion = '%s'""" % \
+            (self.StandaloneModTable, DpGuid, DpVersion)
             self.Cur.execute(SqlCommand)
-        #
-        # delete the standalone module
-        #
-        SqlCommand = \
-        """delete from %s where DpGuid ='%s' and DpVersion = '%s'""" % \
-        (self.StandaloneModTable, DpGuid, DpVersion)
-        self.Cur.execute(SqlCommand)
-        #
-        # delete the from pkg module
-        #
-        for Pkg in PkgList:
+            #
+            # delete the from pkg module
+            #
             SqlCommand = \
-            """delete from %s where %s.PackageGuid ='%s'
-            and %s.PackageVersion = '%s'""" % \
-            (self.ModInPkgTable, self.ModInPkgTable, Pkg[0], \
-             self.ModInPkgTable, Pkg[1])
+            """delete from %s where %s.PackageGuid = ?
+            and %s.PackageVersion = ?""" % \
+            (self.ModInPkgTable, self.ModInPkgTable, self.ModInPkgTable)
+            self.Cur.executemany(SqlCommand, PkgKeyList)
+            #
+            # delete packages
+            #
+            SqlCommand = \
+            """delete from %s where DpGuid ='%s' and DpVersion = '%s'""" % \
+            (self.PkgTable, DpGuid, DpVersion)
+            self.Cur.execute(SqlCommand)
+            #
+            # delete file list from DP
+            #
+            SqlCommand = \
+            """delete from %s where DpGuid ='%s' and DpVersion = '%s'""" % \
+            (self.DpFileListTable, DpGuid, DpVersion)
+            self.Cur.execute(SqlCommand)
+            #
+            # delete DP
+            #
+            SqlCommand = \
+            """delete from %s where DpGuid ='%s' and DpVersion = '%s'""" % \
+            (self.DpTable, DpGuid, DpVersion)
             self.Cur.execute(SqlCommand)
-        #
-        # delete packages
-        #
-        SqlCommand = \
-        """delete from %s where DpGuid ='%s' and DpVersion = '%s'""" % \
-        (self.PkgTable, DpGuid, DpVersion)
-        self.Cur.execute(SqlCommand)
-        #
-        # delete file list from DP
-        #
-        SqlCommand = \
-        """delete from %s where DpGuid ='%s' and DpVersion = '%s'""" % \
-        (self.DpFileListTable, DpGuid, DpVersion)
-        self.Cur.execute(SqlCommand)
-        #
-        # delete DP
-        #
-        SqlCommand = \
-        """delete from %s where DpGuid ='%s' and DpVersion = '%s'""" % \
-        (self.DpTable, DpGuid, DpVersion)
-        self.Cur.execute(SqlCommand)
-
-        #self.Conn.commit()
 
     ## Get a list of distribution install information.
     #
@@ -580,26 +641,18 @@ class IpiDatabase(object):
     # @retval FileDict:  a Dict of file, key is file path, value is (DpGuid, DpVersion, NewDpFileName, RePackage)
     #
     def GetRePkgDict(self):
-        SqlCommand = """select * from %s """ % (self.DpTable)
+        SqlCommand = """select B.FilePath, A.DpGuid, A.DpVersion, A.NewPkgFileName, A.RePackage
+        from %s as A, %s as B where A.DpGuid = B.DpGuid and A.DpVersion = B.DpVersion
+        order by A.rowid, B.rowid""" % (self.DpTable, self.DpFileListTable)
         self.Cur.execute(SqlCommand)
 
-        DpInfoList = []
-        for Result in self.Cur:
-            DpInfoList.append(Result)
-
         FileDict = {}
-        for Result in DpInfoList:
-            DpGuid = Result[0]
-            DpVersion = Result[1]
-            NewDpFileName = Result[3]
-            RePackage = Result[5]
+        for (Path, DpGuid, DpVersion, NewDpFileName, RePackage) in self.Cur:
             if RePackage == 'TRUE':
                 RePackage = True
             else:
                 RePackage = False
-            for FileInfo in self.GetDpFileList(DpGuid, DpVersion):
-                PathInfo = FileInfo[0]
-                FileDict[PathInfo] = DpGuid, DpVersion, NewDpFileName, RePackage
+            FileDict[os.path.join(self.Workspace, Path)] = DpGuid, DpVersion, NewDpFileName, RePackage
 
         return FileDict
 
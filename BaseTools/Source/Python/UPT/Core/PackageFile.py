@@ -18,6 +18,8 @@ import os.path
 import zipfile
 import tempfile
 import platform
+from hashlib import md5
+from concurrent.futures import ThreadPoolExecutor
 
 from Logger.ToolError import FILE_OPEN_FAILURE
 from Logger.ToolError import FILE_CHECKSUM_FAILURE
@@ -33,6 +35,9 @@ from Library.Misc import RemoveDirectory
 from Core.FileHook import __FileHookOpen__
 from Common.MultipleWorkspace import MultipleWorkspace as mws
 
+## The size of the blocks a file is extracted by
+#
+UNPACK_BLOCK_SIZE = 0x100000
 
 class PackageFile:
     def __init__(self, FileName, Mode="r"):
@@ -43,7 +48,9 @@ class PackageFile:
             self._ZipFile = zipfile.ZipFile(FileName, Mode, \
                                             zipfile.ZIP_DEFLATED)
             self._Files = {}
-            for Filename in self._ZipFile.namelist():
+            NameList = self._ZipFile.namelist()
+            self._NameSet = set(NameList)
+            for Filename in NameList:
                 self._Files[os.path.normpath(Filename)] = Filename
         except BaseException as Xstr:
             Logger.Error("PackagingTool", FILE_OPEN_FAILURE,
@@ -79,27 +86,75 @@ class PackageFile:
     # @param ToFile:  the destination file
     #
     def UnpackFile(self, File, ToFile):
-        File = File.replace('\\', '/')
-        if File in self._ZipFile.namelist():
+        return self.UnpackFiles([(File, ToFile)])[0][0]
+
+    ## Extract the files with a pool of threads
+    #
+    # The files are hashed while they are extracted, so that they needn't be
+    # read again to get their MD5 sum.
+    #
+    # @param FileList:  a list of (File, ToFile), the extracted file and the
+    #                   destination file
+    #
+    # @retval ResultList:  a list of (ToFile, Md5Sum) for each file. ToFile
+    #                      is '' if the file is not in the zip file, Md5Sum
+    #                      is None if the file is not extracted.
+    #
+    def UnpackFiles(self, FileList):
+        #
+        # the index of each file in ExtractList, None if it is not in the zip file
+        #
+        IndexList = []
+        ExtractList = []
+        ExtractDict = {}
+        for (File, ToFile) in FileList:
+            File = File.replace('\\', '/')
+            if File not in self._NameSet:
+                IndexList.append(None)
+                continue
             Msg = "%s -> %s" % (File, ToFile)
             Logger.Info(Msg)
-            self.Extract(File, ToFile)
-            return ToFile
+            #
+            # a file is written by one thread only
+            #
+            Key = os.path.normcase(os.path.normpath(ToFile))
+            if Key not in ExtractDict:
+                ExtractDict[Key] = len(ExtractList)
+                ExtractList.append((File, ToFile))
+                #
+                # create the directories before the threads write in them
+                #
+                CreateDirectory(os.path.dirname(ToFile))
+            IndexList.append(ExtractDict[Key])
 
-        return ''
+        if len(ExtractList) > 1:
+            with ThreadPoolExecutor() as Executor:
+                Md5SumList = list(Executor.map(lambda Item: self.Extract(*Item), ExtractList))
+        else:
+            Md5SumList = [self.Extract(File, ToFile) for (File, ToFile) in ExtractList]
+
+        ResultList = []
+        for ((File, ToFile), Index) in zip(FileList, IndexList):
+            if Index is None:
+                ResultList.append(('', None))
+            else:
+                ResultList.append((ToFile, Md5SumList[Index]))
+        return ResultList
 
     ## Extract the file
     #
     # @param Which:  the source path
     # @param ToDest:  the destination path
     #
+    # @retval Md5Sum:  the MD5 sum of the file, None if it is not overwritten
+    #
     def Extract(self, Which, ToDest):
         Which = os.path.normpath(Which)
         if Which not in self._Files:
             Logger.Error("PackagingTool", FILE_NOT_FOUND,
                             ExtraData="[%s] in %s" % (Which, self._FileName))
         try:
-            FileContent = self._ZipFile.read(self._Files[Which])
+            FromFile = self._ZipFile.open(self._Files[Which])
         except BaseException as Xstr:
             Logger.Error("PackagingTool", FILE_DECOMPRESS_FAILURE,
                             ExtraData="[%s] in %s (%s)" % (Which, \
@@ -110,19 +165,36 @@ class PackageFile:
             if os.path.exists(ToDest) and not os.access(ToDest, os.W_OK):
                 Logger.Warn("PackagingTool", \
                             ST.WRN_FILE_NOT_OVERWRITTEN % ToDest)
-                return
+                FromFile.close()
+                return None
             else:
                 ToFile = __FileHookOpen__(ToDest, 'wb')
         except BaseException as Xstr:
             Logger.Error("PackagingTool", FILE_OPEN_FAILURE,
                             ExtraData="%s (%s)" % (ToDest, str(Xstr)))
 
-        try:
-            ToFile.write(FileContent)
-            ToFile.close()
-        except BaseException as Xstr:
-            Logger.Error("PackagingTool", FILE_WRITE_FAILURE,
-                            ExtraData="%s (%s)" % (ToDest, str(Xstr)))
+        #
+        # copy the file by blocks, and hash them on the way
+        #
+        Md5Signature = md5()
+        with FromFile, ToFile:
+            while True:
+                try:
+                    Block = FromFile.read(UNPACK_BLOCK_SIZE)
+                except BaseException as Xstr:
+                    Logger.Error("PackagingTool", FILE_DECOMPRESS_FAILURE,
+                                    ExtraData="[%s] in %s (%s)" % (Which, \
+                                                                   self._FileName, \
+                                                                   str(Xstr)))
+                if not Block:
+                    break
+                Md5Signature.update(Block)
+                try:
+                    ToFile.write(Block)
+                except BaseException as Xstr:
+                    Logger.Error("PackagingTool", FILE_WRITE_FAILURE,
+                                    ExtraData="%s (%s)" % (ToDest, str(Xstr)))
+        return Md5Signature.hexdigest()
 
     ## Remove the file
     #
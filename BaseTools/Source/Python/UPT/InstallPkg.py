@@ -18,7 +18,6 @@ from os import SEEK_SET
 from os import SEEK_END
 import stat
 from hashlib import md5
-import copy
 from sys import stdin
 from sys import platform
 from shutil import rmtree
@@ -153,7 +152,7 @@ def UnZipDp(WorkspaceDir, DpPkgFileName, Index=1):
     #
     # unzip contents.zip file
     #
-    ContentFile = DistFile.UnpackFile(ContentFileName, os.path.normpath(os.path.join(TempDir, ContentFileName)))
+    ContentFile, ContentMd5Sum = DistFile.UnpackFiles([(ContentFileName, os.path.normpath(os.path.join(TempDir, ContentFileName)))])[0]
     if not ContentFile:
         Logger.Error("InstallPkg", FILE_NOT_FOUND,
             ST.ERR_FILE_BROKEN % ContentFileName)
@@ -170,8 +169,9 @@ def UnZipDp(WorkspaceDir, DpPkgFileName, Index=1):
     # verify MD5 signature when existed
     #
     if DistPkg.Header.Signature != '':
-        Md5Signature = md5(__FileHookOpen__(ContentFile, 'rb').read())
-        if DistPkg.Header.Signature != Md5Signature.hexdigest():
+        if ContentMd5Sum is None:
+            ContentMd5Sum = md5(__FileHookOpen__(ContentFile, 'rb').read()).hexdigest()
+        if DistPkg.Header.Signature != ContentMd5Sum:
             ContentZipFile.Close()
             Logger.Error("InstallPkg", FILE_CHECKSUM_FAILURE,
                 ExtraData=ContentFile)
@@ -463,6 +463,7 @@ def GenToolMisc(DistPkg, WorkspaceDir, ContentZipFile):
             RootDir = os.environ['EDK_TOOLS_PATH']
     if MiscObject:
         FileList += MiscObject.GetFileList()
+    FileInfoList = []
     for FileObject in FileList:
         FileNum += 1
         if FileNum > ToolFileNum:
@@ -483,8 +484,9 @@ def GenToolMisc(DistPkg, WorkspaceDir, ContentZipFile):
             OrigPath = os.path.split(ToFile)[0]
             ToFile = os.path.normpath(os.path.join(OrigPath, Input))
         FromFile = os.path.join(FileObject.GetURI())
-        Md5Sum = InstallFile(ContentZipFile, FromFile, ToFile, DistPkg.Header.ReadOnly, FileObject.GetExecutable())
-        DistPkg.FileList.append((ToFile, Md5Sum))
+        FileInfoList.append((FromFile, ToFile, DistPkg.Header.ReadOnly, FileObject.GetExecutable()))
+    for FileInfo, Md5Sum in zip(FileInfoList, InstallFiles(ContentZipFile, FileInfoList)):
+        DistPkg.FileList.append((FileInfo[1], Md5Sum))
 
 ## Tool entrance method
 #
@@ -652,6 +654,7 @@ def InstallModuleContent(FromPath, NewPath, ModulePath, Module, ContentZipFile,
         ConvertPath(Module.GetName()) + '.inf')))
     Module.FileList = []
 
+    FileInfoList = []
     for MiscFile in Module.GetMiscFileList():
         if not MiscFile:
             continue
@@ -666,13 +669,7 @@ def InstallModuleContent(FromPath, NewPath, ModulePath, Module, ContentZipFile,
             FromFile = os.path.join(FromPath, ModulePath, File)
             Executable = Item.GetExecutable()
             ToFile = os.path.normpath(os.path.join(NewModuleFullPath, ConvertPath(File)))
-            Md5Sum = InstallFile(ContentZipFile, FromFile, ToFile, ReadOnly, Executable)
-            if Package and ((ToFile, Md5Sum) not in Package.FileList):
-                Package.FileList.append((ToFile, Md5Sum))
-            elif Package:
-                continue
-            elif (ToFile, Md5Sum) not in Module.FileList:
-                Module.FileList.append((ToFile, Md5Sum))
+            FileInfoList.append((FromFile, ToFile, ReadOnly, Executable))
     for Item in Module.GetSourceFileList():
         File = Item.GetSourceFile()
         if File.startswith("\\") or File.startswith("/"):
@@ -683,13 +680,7 @@ def InstallModuleContent(FromPath, NewPath, ModulePath, Module, ContentZipFile,
 
         FromFile = os.path.join(FromPath, ModulePath, File)
         ToFile = os.path.normpath(os.path.join(NewModuleFullPath, ConvertPath(File)))
-        Md5Sum = InstallFile(ContentZipFile, FromFile, ToFile, ReadOnly)
-        if Package and ((ToFile, Md5Sum) not in Package.FileList):
-            Package.FileList.append((ToFile, Md5Sum))
-        elif Package:
-            continue
-        elif (ToFile, Md5Sum) not in Module.FileList:
-            Module.FileList.append((ToFile, Md5Sum))
+        FileInfoList.append((FromFile, ToFile, ReadOnly, False))
     for Item in Module.GetBinaryFileList():
         FileNameList = Item.GetFileNameList()
         for FileName in FileNameList:
@@ -702,13 +693,19 @@ def InstallModuleContent(FromPath, NewPath, ModulePath, Module, ContentZipFile,
 
             FromFile = os.path.join(FromPath, ModulePath, File)
             ToFile = os.path.normpath(os.path.join(NewModuleFullPath, ConvertPath(File)))
-            Md5Sum = InstallFile(ContentZipFile, FromFile, ToFile, ReadOnly)
-            if Package and ((ToFile, Md5Sum) not in Package.FileList):
-                Package.FileList.append((ToFile, Md5Sum))
-            elif Package:
-                continue
-            elif (ToFile, Md5Sum) not in Module.FileList:
-                Module.FileList.append((ToFile, Md5Sum))
+            FileInfoList.append((FromFile, ToFile, ReadOnly, False))
+
+    #
+    # extract all files of the module at once
+    #
+    for FileInfo, Md5Sum in zip(FileInfoList, InstallFiles(ContentZipFile, FileInfoList)):
+        ToFile = FileInfo[1]
+        if Package and ((ToFile, Md5Sum) not in Package.FileList):
+            Package.FileList.append((ToFile, Md5Sum))
+        elif Package:
+            continue
+        elif (ToFile, Md5Sum) not in Module.FileList:
+            Module.FileList.append((ToFile, Md5Sum))
 
     InstallModuleContentZipFile(ContentZipFile, FromPath, ModulePath, WorkspaceDir, NewPath, Module, Package, ReadOnly,
                                 ModuleList)
@@ -723,6 +720,13 @@ def InstallModuleContentZipFile(ContentZipFile, FromPath, ModulePath, WorkspaceD
     # Extract other files under current module path in content Zip file but not listed in the description
     #
     if ContentZipFile:
+        #
+        # the files installed already, and the files to install
+        #
+        InstalledFileSet = set(Item[0] for Item in Module.FileList)
+        if Package:
+            InstalledFileSet.update(Item[0] for Item in Package.FileList)
+        FileInfoList = []
         for FileName in ContentZipFile.GetZipFile().namelist():
             FileName = os.path.normpath(FileName)
             CheckPath = os.path.normpath(os.path.join(FromPath, ModulePath))
@@ -736,20 +740,18 @@ def InstallModuleContentZipFile(ContentZipFile, FromPath, ModulePath, WorkspaceD
                 FromFile = FileName
                 ToFile = os.path.normpath(os.path.join(WorkspaceDir,
                         ConvertPath(FileName.replace(FromPath, NewPath, 1))))
-                CheckList = copy.copy(Module.FileList)
-                if Package:
-                    CheckList += Package.FileList
-                for Item in CheckList:
-                    if Item[0] == ToFile:
-                        break
-                else:
-                    Md5Sum = InstallFile(ContentZipFile, FromFile, ToFile, ReadOnly)
-                    if Package and ((ToFile, Md5Sum) not in Package.FileList):
-                        Package.FileList.append((ToFile, Md5Sum))
-                    elif Package:
-                        continue
-                    elif (ToFile, Md5Sum) not in Module.FileList:
-                        Module.FileList.append((ToFile, Md5Sum))
+                if ToFile not in InstalledFileSet:
+                    InstalledFileSet.add(ToFile)
+                    FileInfoList.append((FromFile, ToFile, ReadOnly, False))
+
+        for FileInfo, Md5Sum in zip(FileInfoList, InstallFiles(ContentZipFile, FileInfoList)):
+            ToFile = FileInfo[1]
+            if Package and ((ToFile, Md5Sum) not in Package.FileList):
+                Package.FileList.append((ToFile, Md5Sum))
+            elif Package:
+                continue
+            elif (ToFile, Md5Sum) not in Module.FileList:
+                Module.FileList.append((ToFile, Md5Sum))
 
     ModuleList.append((Module, Package))
 
@@ -774,16 +776,35 @@ def FileUnderPath(FileName, CheckPath):
 
     return False
 
-## InstallFile
-#  Extract File from Zipfile, set file attribute, and return the Md5Sum
+## InstallFiles
+#  Extract Files from Zipfile, set file attribute, and return the Md5Sum of
+#  each file
 #
-# @return:  True or False
+#  The files are extracted by a pool of threads, and hashed while they are
+#  extracted. The files existing already are not extracted, but hashed.
 #
-def InstallFile(ContentZipFile, FromFile, ToFile, ReadOnly, Executable=False):
-    if os.path.exists(os.path.normpath(ToFile)):
-        pass
+# @param FileInfoList: a list of (FromFile, ToFile, ReadOnly, Executable)
+#
+# @return:  the list of Md5Sum, in the order of FileInfoList
+#
+def InstallFiles(ContentZipFile, FileInfoList):
+    Md5SumDict = {}
+    UnpackList = []
+    for (FromFile, ToFile, ReadOnly, Executable) in FileInfoList:
+        if ToFile in Md5SumDict:
+            continue
+        Md5SumDict[ToFile] = None
+        if not os.path.exists(os.path.normpath(ToFile)):
+            if not ContentZipFile:
+                Logger.Error("UPT", FILE_NOT_FOUND, ST.ERR_INSTALL_FILE_FROM_EMPTY_CONTENT % FromFile)
+            UnpackList.append((FromFile, ToFile, ReadOnly, Executable))
+
+    if UnpackList:
+        ResultList = ContentZipFile.UnpackFiles([(FromFile, ToFile) for (FromFile, ToFile, ReadOnly, Executable) in UnpackList])
     else:
-        if not ContentZipFile or not ContentZipFile.UnpackFile(FromFile, ToFile):
+        ResultList = []
+    for (FromFile, ToFile, ReadOnly, Executable), (RetFile, Md5Sum) in zip(UnpackList, ResultList):
+        if not RetFile:
             Logger.Error("UPT", FILE_NOT_FOUND, ST.ERR_INSTALL_FILE_FROM_EMPTY_CONTENT % FromFile)
 
         if ReadOnly:
@@ -796,11 +817,17 @@ def InstallFile(ContentZipFile, FromFile, ToFile, ReadOnly, Executable=False):
                   stat.S_IWOTH | stat.S_IEXEC | stat.S_IXGRP | stat.S_IXOTH)
         else:
             chmod(ToFile, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH | stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+        Md5SumDict[ToFile] = Md5Sum
 
-    Md5Signature = md5(__FileHookOpen__(str(ToFile), 'rb').read())
-    Md5Sum = Md5Signature.hexdigest()
+    #
+    # hash the files not extracted
+    #
+    for ToFile in Md5SumDict:
+        if Md5SumDict[ToFile] is None:
+            Md5Signature = md5(__FileHookOpen__(str(ToFile), 'rb').read())
+            Md5SumDict[ToFile] = Md5Signature.hexdigest()
 
-    return Md5Sum
+    return [Md5SumDict[FileInfo[1]] for FileInfo in FileInfoList]
 
 ## InstallPackageContent method
 #
@@ -831,6 +858,7 @@ def InstallPackageContent(FromPath, ToPath, Package, ContentZipFile, Dep,
         Logger.Error("UPT", FORMAT_INVALID, ST.ERR_FILE_NAME_INVALIDE%FromPath)
 
     PackageFullPath = os.path.normpath(os.path.join(WorkspaceDir, ToPath))
+    FileInfoList = []
     for MiscFile in Package.GetMiscFileList():
         for Item in MiscFile.GetFileList():
             FileName = Item.GetURI()
@@ -843,10 +871,12 @@ def InstallPackageContent(FromPath, ToPath, Package, ContentZipFile, Dep,
             FromFile = os.path.join(FromPath, FileName)
             Executable = Item.GetExecutable()
             ToFile =  (os.path.join(PackageFullPath, ConvertPath(FileName)))
-            Md5Sum = InstallFile(ContentZipFile, FromFile, ToFile, ReadOnly, Executable)
-            if (ToFile, Md5Sum) not in Package.FileList:
-                Package.FileList.append((ToFile, Md5Sum))
+            FileInfoList.append((FromFile, ToFile, ReadOnly, Executable))
+    for FileInfo, Md5Sum in zip(FileInfoList, InstallFiles(ContentZipFile, FileInfoList)):
+        if (FileInfo[1], Md5Sum) not in Package.FileList:
+            Package.FileList.append((FileInfo[1], Md5Sum))
     PackageIncludeArchList = []
+    IncludeFileList = []
     for Item in Package.GetPackageIncludeFileList():
         FileName = Item.GetFilePath()
         if FileName.startswith("\\") or FileName.startswith("/"):
@@ -857,7 +887,9 @@ def InstallPackageContent(FromPath, ToPath, Package, ContentZipFile, Dep,
 
         FromFile = os.path.join(FromPath, FileName)
         ToFile = os.path.normpath(os.path.join(PackageFullPath, ConvertPath(FileName)))
-        RetFile = ContentZipFile.UnpackFile(FromFile, ToFile)
+        IncludeFileList.append((Item, FromFile, ToFile))
+    ResultList = ContentZipFile.UnpackFiles([(FromFile, ToFile) for (Item, FromFile, ToFile) in IncludeFileList])
+    for (Item, FromFile, ToFile), (RetFile, Md5Sum) in zip(IncludeFileList, ResultList):
         if RetFile == '':
             #
             # a non-exist path in Zipfile will return '', which means an include directory in our case
@@ -870,12 +902,14 @@ def InstallPackageContent(FromPath, ToPath, Package, ContentZipFile, Dep,
             chmod(ToFile, stat.S_IRUSR|stat.S_IRGRP|stat.S_IROTH)
         else:
             chmod(ToFile, stat.S_IRUSR|stat.S_IRGRP|stat.S_IROTH|stat.S_IWUSR|stat.S_IWGRP|stat.S_IWOTH)
-        Md5Signature = md5(__FileHookOpen__(str(ToFile), 'rb').read())
-        Md5Sum = Md5Signature.hexdigest()
+        if Md5Sum is None:
+            Md5Signature = md5(__FileHookOpen__(str(ToFile), 'rb').read())
+            Md5Sum = Md5Signature.hexdigest()
         if (ToFile, Md5Sum) not in Package.FileList:
             Package.FileList.append((ToFile, Md5Sum))
     Package.SetIncludeArchList(PackageIncludeArchList)
 
+    FileInfoList = []
     for Item in Package.GetStandardIncludeFileList():
         FileName = Item.GetFilePath()
         if FileName.startswith("\\") or FileName.startswith("/"):
@@ -886,9 +920,10 @@ def InstallPackageContent(FromPath, ToPath, Package, ContentZipFile, Dep,
 
         FromFile = os.path.join(FromPath, FileName)
         ToFile = os.path.normpath(os.path.join(PackageFullPath, ConvertPath(FileName)))
-        Md5Sum = InstallFile(ContentZipFile, FromFile, ToFile, ReadOnly)
-        if (ToFile, Md5Sum) not in Package.FileList:
-            Package.FileList.append((ToFile, Md5Sum))
+        FileInfoList.append((FromFile, ToFile, ReadOnly, False))
+    for FileInfo, Md5Sum in zip(FileInfoList, InstallFiles(ContentZipFile, FileInfoList)):
+        if (FileInfo[1], Md5Sum) not in Package.FileList:
+            Package.FileList.append((FileInfo[1], Md5Sum))
 
     #
     # Update package
@@ -15,6 +15,7 @@ XmlRoutines
 # Import Modules
 #
 import xml.dom.minidom
+import xml.etree.ElementTree as ElementTree
 import re
 import codecs
 from Logger.ToolError import PARSER_ERROR
@@ -221,3 +222,96 @@ def XmlParseFile(FileName):
     except BaseException as XExcept:
         XmlFile.close()
         Logger.Error('\nUPT', PARSER_ERROR, XExcept, File=FileName, RaiseError=True)
+
+## Get the name of a tag read by ElementTree as it is in a XML DOM.
+#
+# ElementTree puts the namespace of a tag in front of its name, as in
+# "{namespace}name", while minidom keeps the name only.
+#
+# @param  Tag                The tag read by ElementTree.
+#
+def _TagName(Tag):
+    if Tag[:1] == '{':
+        return Tag[Tag.index('}') + 1:]
+    return Tag
+
+## The text node of a XmlStreamElement.
+#
+# @param  Data               The text of the node.
+#
+class XmlStreamText(object):
+    __slots__ = ('data',)
+    nodeType = xml.dom.Node.TEXT_NODE
+
+    def __init__(self, Data):
+        self.data = Data
+
+## An XML element read by XmlIterParseFile.
+#
+# It has the attributes and the methods of a XML DOM element used by the
+# routines above, so that they read it in the same way as a XML DOM element.
+# Only the child elements are kept as child nodes, the text between them is
+# never read.
+#
+# @param  Element            The element read by ElementTree.
+#
+class XmlStreamElement(object):
+    __slots__ = ('tagName', 'childNodes', 'firstChild', 'Attributes')
+    ELEMENT_NODE = xml.dom.Node.ELEMENT_NODE
+    DOCUMENT_NODE = xml.dom.Node.DOCUMENT_NODE
+    nodeType = ELEMENT_NODE
+
+    def __init__(self, Element):
+        self.tagName = _TagName(Element.tag)
+        self.Attributes = Element.attrib
+        self.childNodes = [XmlStreamElement(Child) for Child in Element]
+        if Element.text:
+            self.firstChild = XmlStreamText(Element.text)
+        elif self.childNodes:
+            self.firstChild = self.childNodes[0]
+        else:
+            self.firstChild = None
+
+    @property
+    def nodeName(self):
+        return self.tagName
+
+    def getAttribute(self, Attribute):
+        return self.Attributes.get(Attribute, '')
+
+## Parse an XML file one child element of the root element at a time.
+#
+# Parse the input XML file named FileName with ElementTree.iterparse, and yield
+# each child element of the root element as a XmlStreamElement once its end tag
+# is read. The elements are dropped once they are yielded, so that only one of
+# them is kept in memory. Nothing is yielded if the root element is not named
+# RootName. If the input File is not a valid XML file, then an error is
+# reported once the elements before the invalid part are yielded.
+#
+# @param  FileName           The XML file name.
+# @param  RootName           The name of the root element.
+#
+def XmlIterParseFile(FileName, RootName):
+    try:
+        Events = ElementTree.iterparse(FileName, ('start', 'end'))
+    except BaseException as XExcept:
+        Logger.Error('\nUPT', PARSER_ERROR, XExcept, File=FileName, RaiseError=True)
+    Root = None
+    Depth = 0
+    while True:
+        try:
+            Event, Element = next(Events)
+        except StopIteration:
+            return
+        except BaseException as XExcept:
+            Logger.Error('\nUPT', PARSER_ERROR, XExcept, File=FileName, RaiseError=True)
+        if Event == 'start':
+            if Root is None:
+                Root = Element
+            Depth += 1
+            continue
+        Depth -= 1
+        if Depth == 1:
+            if _TagName(Root.tag) == RootName:
+                yield XmlStreamElement(Element)
+            Root.clear()
@@ -0,0 +1,186 @@
+## @file
+# This file contain unit test for the extraction of the files of a distribution package
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+#
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+
+import os
+import random
+import stat
+import tempfile
+import unittest
+import zipfile
+from hashlib import md5
+import Logger.Log as Logger
+from Logger.Log import FatalError
+from Logger.ToolError import FILE_NOT_FOUND
+
+from Core.PackageFile import PackageFile
+from Core.PackageFile import UNPACK_BLOCK_SIZE
+from Library.Misc import RemoveDirectory
+from InstallPkg import InstallFiles
+from InstallPkg import InstallModuleContentZipFile
+from InstallPkg import FileUnderPath
+
+#
+# The files of the content zip file, one spans several blocks
+#
+_CONTENT = {
+    'TestPkg/TestMod/TestMod.c'     : b'int main (void) { return 0; }\n',
+    'TestPkg/TestMod/TestMod.h'     : b'#define TEST 1\n',
+    'TestPkg/TestMod/Sub/Data.bin'  : bytes(random.Random(0).getrandbits(8) for _ in range(UNPACK_BLOCK_SIZE * 2 + 17)),
+    'TestPkg/TestMod/Sub/Empty.txt' : b'',
+    'TestPkg/TestMod/Readme.txt'    : b'Readme\n',
+    'TestPkg/Other/Other.c'         : b'int Other;\n',
+}
+
+#
+# The module of InstallModuleContentZipFile, without a package
+#
+class _Module(object):
+    def __init__(self, FileList):
+        self.FileList = FileList
+
+## Extract a file as the serial InstallFile did before the files were extracted in batch
+#
+def _SerialInstallFile(ZipFile, FromFile, ToFile, ReadOnly, Executable=False):
+    if not os.path.exists(os.path.normpath(ToFile)):
+        FromFile = FromFile.replace('\\', '/')
+        if FromFile not in ZipFile.namelist():
+            Logger.Error("UPT", FILE_NOT_FOUND)
+        if not os.path.isdir(os.path.dirname(ToFile)):
+            os.makedirs(os.path.dirname(ToFile))
+        with open(ToFile, 'wb') as File:
+            File.write(ZipFile.read(FromFile))
+        if ReadOnly:
+            Mode = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+            if Executable:
+                Mode |= stat.S_IEXEC | stat.S_IXGRP | stat.S_IXOTH
+        else:
+            Mode = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH | stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH
+            if Executable:
+                Mode |= stat.S_IEXEC | stat.S_IXGRP | stat.S_IXOTH
+        os.chmod(ToFile, Mode)
+    with open(ToFile, 'rb') as File:
+        return md5(File.read()).hexdigest()
+
+class InstallFilesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.Dir = tempfile.mkdtemp()
+        self.ZipFileName = os.path.join(self.Dir, 'content.zip')
+        with zipfile.ZipFile(self.ZipFileName, 'w', zipfile.ZIP_DEFLATED) as ZipFile:
+            for Name in sorted(_CONTENT):
+                ZipFile.writestr(Name, _CONTENT[Name])
+        self.ContentZipFile = PackageFile(self.ZipFileName)
+        self.ZipFile = zipfile.ZipFile(self.ZipFileName)
+
+    def tearDown(self):
+        self.ContentZipFile.Close()
+        self.ZipFile.close()
+        RemoveDirectory(self.Dir, True)
+
+    ## The workspace to install in, with a read-only file existing already
+    #
+    def Workspace(self, Name):
+        WorkspaceDir = os.path.join(self.Dir, Name)
+        Existing = os.path.join(WorkspaceDir, 'TestPkg', 'TestMod', 'Readme.txt')
+        os.makedirs(os.path.dirname(Existing))
+        with open(Existing, 'wb') as File:
+            File.write(b'Installed before\n')
+        os.chmod(Existing, stat.S_IRUSR)
+        return WorkspaceDir
+
+    ## The (FromFile, ToFile, ReadOnly, Executable) of the files, with a destination listed twice
+    #
+    def FileInfoList(self, WorkspaceDir):
+        FileInfoList = []
+        for Index, Name in enumerate(sorted(_CONTENT) + ['TestPkg/TestMod/TestMod.c']):
+            ToFile = os.path.normpath(os.path.join(WorkspaceDir, Name))
+            FileInfoList.append((Name, ToFile, Index % 2 == 0, Index % 3 == 0))
+        #
+        # the second one doesn't overwrite the first one
+        #
+        FileInfoList.append(('TestPkg/TestMod/TestMod.h', FileInfoList[0][1], False, False))
+        return FileInfoList
+
+    def Installed(self, WorkspaceDir):
+        FileDict = {}
+        for Root, Dirs, Files in os.walk(WorkspaceDir):
+            for Name in Files:
+                FullName = os.path.join(Root, Name)
+                with open(FullName, 'rb') as File:
+                    FileDict[os.path.relpath(FullName, WorkspaceDir)] = (File.read(), stat.S_IMODE(os.stat(FullName).st_mode))
+        return FileDict
+
+    def testInstallFiles(self):
+        OldDir = self.Workspace('Old')
+        Expected = [_SerialInstallFile(self.ZipFile, *Info) for Info in self.FileInfoList(OldDir)]
+        NewDir = self.Workspace('New')
+        self.assertEqual(InstallFiles(self.ContentZipFile, self.FileInfoList(NewDir)), Expected)
+        self.assertEqual(self.Installed(NewDir), self.Installed(OldDir))
+        #
+        # the existing file is kept
+        #
+        self.assertEqual(Expected[1], md5(b'Installed before\n').hexdigest())
+        self.assertEqual(Expected[-2], Expected[4])
+        self.assertEqual(Expected[-1], md5(_CONTENT['TestPkg/Other/Other.c']).hexdigest())
+
+    def testFileList(self):
+        OldDir = self.Workspace('Old')
+        Module = _Module([(os.path.normpath(os.path.join(OldDir, 'TestPkg/TestMod/TestMod.h')), 'Md5Sum')])
+        #
+        # the loop of InstallModuleContentZipFile, installing the files one by one
+        #
+        for FileName in self.ZipFile.namelist():
+            FileName = os.path.normpath(FileName)
+            if FileUnderPath(FileName, os.path.normpath('TestPkg/TestMod')):
+                ToFile = os.path.normpath(os.path.join(OldDir, FileName))
+                if ToFile not in [Item[0] for Item in Module.FileList]:
+                    Md5Sum = _SerialInstallFile(self.ZipFile, FileName, ToFile, True)
+                    if (ToFile, Md5Sum) not in Module.FileList:
+                        Module.FileList.append((ToFile, Md5Sum))
+        Expected = [(os.path.relpath(ToFile, OldDir), Md5Sum) for (ToFile, Md5Sum) in Module.FileList]
+
+        NewDir = self.Workspace('New')
+        Module = _Module([(os.path.normpath(os.path.join(NewDir, 'TestPkg/TestMod/TestMod.h')), 'Md5Sum')])
+        ModuleList = []
+        InstallModuleContentZipFile(self.ContentZipFile, 'TestPkg', 'TestMod', NewDir, 'TestPkg', Module, None, True,
+                                    ModuleList)
+        self.assertEqual([(os.path.relpath(ToFile, NewDir), Md5Sum) for (ToFile, Md5Sum) in Module.FileList], Expected)
+        self.assertEqual(ModuleList, [(Module, None)])
+        self.assertEqual(self.Installed(NewDir), self.Installed(OldDir))
+
+    def testUnpackFiles(self):
+        ToFile = os.path.join(self.Dir, 'Unpack', 'Data.bin')
+        ResultList = self.ContentZipFile.UnpackFiles([('TestPkg/TestMod/Sub/Data.bin', ToFile),
+                                                      ('TestPkg/TestMod/Missing.c', os.path.join(self.Dir, 'Missing.c')),
+                                                      ('TestPkg\\TestMod\\Sub\\Data.bin', ToFile)])
+        Md5Sum = md5(_CONTENT['TestPkg/TestMod/Sub/Data.bin']).hexdigest()
+        self.assertEqual(ResultList, [(ToFile, Md5Sum), ('', None), (ToFile, Md5Sum)])
+        with open(ToFile, 'rb') as File:
+            self.assertEqual(File.read(), _CONTENT['TestPkg/TestMod/Sub/Data.bin'])
+        self.assertFalse(os.path.exists(os.path.join(self.Dir, 'Missing.c')))
+
+    @unittest.skipIf(hasattr(os, 'geteuid') and os.geteuid() == 0, 'root can write read-only files')
+    def testReadOnlyDestination(self):
+        ToFile = os.path.join(self.Workspace('New'), 'TestPkg', 'TestMod', 'Readme.txt')
+        self.assertEqual(self.ContentZipFile.UnpackFiles([('TestPkg/TestMod/Readme.txt', ToFile)]), [(ToFile, None)])
+        with open(ToFile, 'rb') as File:
+            self.assertEqual(File.read(), b'Installed before\n')
+
+    def testFileNotFound(self):
+        NewDir = self.Workspace('New')
+        FileInfoList = self.FileInfoList(NewDir)
+        FileInfoList.insert(1, ('TestPkg/TestMod/Missing.c', os.path.join(NewDir, 'Missing.c'), False, False))
+        try:
+            InstallFiles(self.ContentZipFile, FileInfoList)
+        except FatalError as Error:
+            self.assertEqual(Error.args[0], FILE_NOT_FOUND)
+        else:
+            self.fail('FILE_NOT_FOUND is not reported')
+        self.assertFalse(os.path.exists(os.path.join(NewDir, 'Missing.c')))
+
+if __name__ == '__main__':
+    Logger.Initialize()
+    unittest.main()
@@ -0,0 +1,136 @@
+## @file
+# This file contain unit test for the installed package information database
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+#
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+
+import os
+import shutil
+import tempfile
+import unittest
+import Logger.Log as Logger
+from Logger.Log import FatalError
+
+from Core.IpiDb import IpiDatabase
+from Core.IpiDb import IPI_DB_VERSION
+from Core.IpiDb import IPI_DB_INDEX_LIST
+
+#
+# The parts of the distribution package objects used by IpiDatabase
+#
+class _Header(object):
+    def __init__(self, Guid, Version):
+        self.Guid = Guid
+        self.Version = Version
+
+    def GetGuid(self):
+        return self.Guid
+
+    def GetVersion(self):
+        return self.Version
+
+class _Dep(_Header):
+    pass
+
+class _Module(object):
+    def __init__(self, DepList, FileList):
+        self.DepList = DepList
+        self.FileList = FileList
+
+    def GetPackageDependencyList(self):
+        return self.DepList
+
+class _Package(object):
+    def __init__(self, ModuleDict, FileList):
+        self.ModuleDict = ModuleDict
+        self.FileList = FileList
+
+    def GetModuleDict(self):
+        return self.ModuleDict
+
+class _Dp(object):
+    def __init__(self, Guid, Version):
+        self.Header = _Header(Guid, Version)
+        Module = _Module([_Dep('PkgGuid', '1.0')], [])
+        self.PackageSurfaceArea = {
+            ('PkgGuid', '1.0', 'TestPkg') : _Package({('ModGuid', '1.0', 'Mod', 'Mod') : Module},
+                                                      [('TestPkg/TestPkg.dec', 'md5pkg')])
+        }
+        self.ModuleSurfaceArea = {
+            ('SModGuid', '1.0', 'SMod', 'SMod') : _Module([_Dep('PkgGuid', '')], [('SMod/SMod.inf', 'md5smod')])
+        }
+        self.FileList = [('Tool/Tool.txt', 'md5tool')]
+
+#
+# Test IpiDatabase
+#
+class IpiDatabaseTestCase(unittest.TestCase):
+    def setUp(self):
+        self.Workspace = tempfile.mkdtemp()
+        self.DbPath = os.path.join(self.Workspace, 'Conf', 'DistributionPackageDatabase.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.Workspace)
+
+    def OpenDb(self):
+        Db = IpiDatabase(self.DbPath, self.Workspace)
+        Db.InitDatabase()
+        return Db
+
+    def GetIndexList(self, Db):
+        Db.Cur.execute("select name from sqlite_master where type = 'index' and sql is not null")
+        return sorted(Result[0] for Result in Db.Cur)
+
+    def testMigrate(self):
+        Db = self.OpenDb()
+        IndexList = self.GetIndexList(Db)
+        self.assertEqual(len(IndexList), len(IPI_DB_INDEX_LIST))
+        #
+        # a database of the former version has no index
+        #
+        for Index in IndexList:
+            Db.Cur.execute("drop index %s" % Index)
+        Db.Cur.execute("PRAGMA user_version=0")
+        Db.CloseDb()
+
+        Db = self.OpenDb()
+        self.assertEqual(self.GetIndexList(Db), IndexList)
+        self.assertEqual(Db.Cur.execute("PRAGMA user_version").fetchone()[0], IPI_DB_VERSION)
+        Db.CloseDb()
+
+    def testAddRemove(self):
+        Db = self.OpenDb()
+        Db.AddDPObject(_Dp('DpGuid', '1.0'), 'New.dist', 'Test.dist', False)
+        Db.Commit()
+        self.assertEqual(Db.GetPackageListFromDp('DpGuid', '1.0'), [('PkgGuid', '1.0', 'TestPkg')])
+        self.assertEqual(len(Db.GetModInPackage('ModGuid', '1.0', 'Mod', os.path.normpath('TestPkg/Mod'))), 1)
+        Db.Cur.execute("select DepexGuid, DepexVersion from ModDepexInfo where ModuleGuid = 'SModGuid'")
+        self.assertEqual(Db.Cur.fetchall(), [('PkgGuid', 'N/A')])
+        self.assertEqual(Db.GetDpByName('New.dist'), ('DpGuid', '1.0', 'New.dist'))
+        RePkgDict = Db.GetRePkgDict()
+        self.assertEqual(len(RePkgDict), 3)
+        self.assertEqual(RePkgDict[os.path.join(self.Workspace, os.path.normpath('Tool/Tool.txt'))],
+                         ('DpGuid', '1.0', 'New.dist', False))
+
+        Db.RemoveDpObj('DpGuid', '1.0')
+        Db.Commit()
+        for Table in (Db.DpTable, Db.PkgTable, Db.ModInPkgTable, Db.StandaloneModTable, Db.ModDepexTable, Db.DpFileListTable):
+            self.assertEqual(Db.Cur.execute("select count(*) from %s" % Table).fetchone()[0], 0)
+        Db.CloseDb()
+
+    def testAddConflict(self):
+        Db = self.OpenDb()
+        Db.AddDPObject(_Dp('DpGuid', '1.0'), 'New.dist', 'Test.dist', False)
+        #
+        # the second distribution package installs the same files, nothing of it is added
+        #
+        self.assertRaises(FatalError, Db.AddDPObject, _Dp('OtherGuid', '1.0'), 'Other.dist', 'Other.dist', False)
+        self.assertEqual(Db.GetDp('OtherGuid', '1.0'), [])
+        self.assertEqual(Db.GetPackageListFromDp('OtherGuid', '1.0'), [])
+        self.assertEqual(len(Db.GetDp('DpGuid', '1.0')), 1)
+        Db.CloseDb()
+
+if __name__ == '__main__':
+    Logger.Initialize()
+    unittest.main()
@@ -0,0 +1,107 @@
+## @file
+# This file contain unit test for the XML routines
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+#
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+
+import os
+import shutil
+import tempfile
+import unittest
+import Logger.Log as Logger
+from Logger.Log import FatalError
+
+from Library.Xml.XmlRoutines import XmlParseFile
+from Library.Xml.XmlRoutines import XmlIterParseFile
+from Library.Xml.XmlRoutines import XmlList
+from Library.Xml.XmlRoutines import XmlNode
+from Library.Xml.XmlRoutines import XmlElement
+from Library.Xml.XmlRoutines import XmlElement2
+from Library.Xml.XmlRoutines import XmlElementList
+from Library.Xml.XmlRoutines import XmlAttribute
+from Library.Xml.XmlRoutines import XmlNodeName
+
+SAMPLE_XML = '''<?xml version="1.0" encoding="utf-8"?>
+<DistributionPackage xmlns="http://www.uefi.org/2011/1.1">
+  <DistributionHeader ReadOnly="true">
+    <Name BaseName="Test">Test &amp; Sample</Name>
+    <Description>
+      First line
+      Second line
+    </Description>
+    <Empty/>
+  </DistributionHeader>
+  <PackageSurfaceArea>
+    <Header><Name>FirstPkg</Name></Header>
+    <Modules>
+      <ModuleSurfaceArea><Header><Name>Mod</Name></Header></ModuleSurfaceArea>
+    </Modules>
+  </PackageSurfaceArea>
+  <PackageSurfaceArea>
+    <Header><Name>SecondPkg</Name></Header>
+  </PackageSurfaceArea>
+  <UserExtensions UserId="TianoCore" Identifier="Test">Text<Item>1</Item></UserExtensions>
+</DistributionPackage>
+'''
+
+#
+# Test XmlIterParseFile
+#
+class XmlIterParseFileTestCase(unittest.TestCase):
+    def setUp(self):
+        self.Workspace = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.Workspace)
+
+    def WriteFile(self, Content):
+        FileName = os.path.join(self.Workspace, 'Test.xml')
+        with open(FileName, 'w') as XmlFile:
+            XmlFile.write(Content)
+        return FileName
+
+    #
+    # the elements read one at a time are read by the routines like the DOM
+    #
+    def testSameAsDom(self):
+        FileName = self.WriteFile(SAMPLE_XML)
+        DomList = [Node for Node in XmlParseFile(FileName).documentElement.childNodes \
+                   if Node.nodeType == Node.ELEMENT_NODE]
+        StreamList = list(XmlIterParseFile(FileName, 'DistributionPackage'))
+        self.assertEqual([XmlNodeName(Node) for Node in StreamList],
+                         ['DistributionHeader', 'PackageSurfaceArea', 'PackageSurfaceArea', 'UserExtensions'])
+        for Dom, Stream in zip(DomList, StreamList):
+            Key = XmlNodeName(Dom)
+            for Path in [Key, '%s/Name' % Key, '%s/Description' % Key, '%s/Empty' % Key,
+                         '%s/Header/Name' % Key, '%s/Modules/ModuleSurfaceArea/Header/Name' % Key,
+                         '%s/Item' % Key, '%s/Missing/Name' % Key]:
+                self.assertEqual(XmlElement(Stream, Path), XmlElement(Dom, Path))
+                self.assertEqual(XmlElement2(Stream, Path), XmlElement2(Dom, Path))
+                self.assertEqual(XmlElementList(Stream, Path), XmlElementList(Dom, Path))
+                self.assertEqual(len(XmlList(Stream, Path)), len(XmlList(Dom, Path)))
+                self.assertEqual(XmlNode(Stream, Path) is None, XmlNode(Dom, Path) is None)
+            for Attribute in ['ReadOnly', 'UserId', 'Missing']:
+                self.assertEqual(XmlAttribute(Stream, Attribute), XmlAttribute(Dom, Attribute))
+            self.assertEqual(XmlAttribute(XmlNode(Stream, '%s/Name' % Key), 'BaseName'),
+                             XmlAttribute(XmlNode(Dom, '%s/Name' % Key), 'BaseName'))
+
+    def testOtherRoot(self):
+        FileName = self.WriteFile(SAMPLE_XML.replace('DistributionPackage', 'Other'))
+        self.assertEqual(list(XmlIterParseFile(FileName, 'DistributionPackage')), [])
+
+    def testInvalidFile(self):
+        FileName = self.WriteFile(SAMPLE_XML[:SAMPLE_XML.index('<UserExtensions')])
+        StreamList = []
+        try:
+            for Node in XmlIterParseFile(FileName, 'DistributionPackage'):
+                StreamList.append(XmlNodeName(Node))
+        except FatalError:
+            pass
+        else:
+            self.fail('invalid XML file is not reported')
+        self.assertEqual(StreamList, ['DistributionHeader', 'PackageSurfaceArea', 'PackageSurfaceArea'])
+
+if __name__ == '__main__':
+    Logger.Initialize()
+    unittest.main()
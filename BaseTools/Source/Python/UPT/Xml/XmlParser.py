@@ -15,10 +15,8 @@ XmlParser
 #
 import re
 
-from Library.Xml.XmlRoutines import XmlNode
 from Library.Xml.XmlRoutines import CreateXmlElement
-from Library.Xml.XmlRoutines import XmlList
-from Library.Xml.XmlRoutines import XmlParseFile
+from Library.Xml.XmlRoutines import XmlIterParseFile
 from Core.DistributionPackageClass import DistributionPackageClass
 from Object.POM.ModuleObject import DepexObject
 from Library.ParserValidate import IsValidInfMoudleType
@@ -158,58 +156,68 @@ class DistributionPackageXml(object):
     def FromXml(self, Filename=None):
         if Filename is not None:
             self.DistP = DistributionPackageClass()
+            self.DistP.Header = None
+            self.DistP.Tools = None
+            self.DistP.MiscellaneousFiles = None
             #
-            # Load to XML
+            # The sections parsed only once, from their first element
             #
-            self.Pkg = XmlParseFile(Filename)
+            ParsedSet = set()
 
             #
-            # Parse Header information
+            # Parse the XML file one section at a time, in the order of the
+            # file, which is the order of the XML schema, so that only one
+            # section is kept in memory
             #
-            Tmp = DistributionPackageHeaderXml()
-            DistributionPackageHeader = \
-            Tmp.FromXml(XmlNode(self.Pkg, '/DistributionPackage/DistributionHeader'), 'DistributionHeader')
-            self.DistP.Header = DistributionPackageHeader
-            #
-            # Parse each PackageSurfaceArea
-            #
-            for Item in XmlList(self.Pkg, '/DistributionPackage/PackageSurfaceArea'):
-                Psa = PackageSurfaceAreaXml()
-                Package = Psa.FromXml(Item, 'PackageSurfaceArea')
-                self.DistP.PackageSurfaceArea[(Package.GetGuid(), \
-                                               Package.GetVersion(), \
-                                               Package.GetPackagePath())] = \
-                                               Package
-            #
-            # Parse each ModuleSurfaceArea
-            #
-            for Item in XmlList(self.Pkg, '/DistributionPackage/ModuleSurfaceArea'):
-                Msa = ModuleSurfaceAreaXml()
-                Module = Msa.FromXml(Item, 'ModuleSurfaceArea', True)
-                ModuleKey = (Module.GetGuid(), Module.GetVersion(), Module.GetName(), Module.GetModulePath())
-                self.DistP.ModuleSurfaceArea[ModuleKey] = Module
-
-            #
-            # Parse Tools
-            #
-            Tmp = MiscellaneousFileXml()
-            self.DistP.Tools = Tmp.FromXml2(XmlNode(self.Pkg, '/DistributionPackage/Tools'), 'Tools')
-
-            #
-            # Parse MiscFiles
-            #
-            Tmp = MiscellaneousFileXml()
-            self.DistP.MiscellaneousFiles = \
-            Tmp.FromXml2(XmlNode(self.Pkg, \
-                                 '/DistributionPackage/MiscellaneousFiles'), \
-                                 'MiscellaneousFiles')
-
-            #
-            # Parse UserExtensions
-            #
-            for Item in XmlList(self.Pkg, '/DistributionPackage/UserExtensions'):
-                Tmp = UserExtensionsXml()
-                self.DistP.UserExtensions.append(Tmp.FromXml2(Item, 'UserExtensions'))
+            for Item in XmlIterParseFile(Filename, 'DistributionPackage'):
+                Tag = Item.tagName
+                if Tag in ParsedSet:
+                    continue
+                #
+                # Parse Header information
+                #
+                if Tag == 'DistributionHeader':
+                    Tmp = DistributionPackageHeaderXml()
+                    self.DistP.Header = Tmp.FromXml(Item, 'DistributionHeader')
+                    ParsedSet.add(Tag)
+                #
+                # Parse each PackageSurfaceArea
+                #
+                elif Tag == 'PackageSurfaceArea':
+                    Psa = PackageSurfaceAreaXml()
+                    Package = Psa.FromXml(Item, 'PackageSurfaceArea')
+                    self.DistP.PackageSurfaceArea[(Package.GetGuid(), \
+                                                   Package.GetVersion(), \
+                                                   Package.GetPackagePath())] = \
+                                                   Package
+                #
+                # Parse each ModuleSurfaceArea
+                #
+                elif Tag == 'ModuleSurfaceArea':
+                    Msa = ModuleSurfaceAreaXml()
+                    Module = Msa.FromXml(Item, 'ModuleSurfaceArea', True)
+                    ModuleKey = (Module.GetGuid(), Module.GetVersion(), Module.GetName(), Module.GetModulePath())
+                    self.DistP.ModuleSurfaceArea[ModuleKey] = Module
+                #
+                # Parse Tools
+                #
+                elif Tag == 'Tools':
+                    Tmp = MiscellaneousFileXml()
+                    self.DistP.Tools = Tmp.FromXml2(Item, 'Tools')
+                    ParsedSet.add(Tag)
+                #
+                # Parse MiscFiles
+                #
+                elif Tag == 'MiscellaneousFiles':
+                    Tmp = MiscellaneousFileXml()
+                    self.DistP.MiscellaneousFiles = Tmp.FromXml2(Item, 'MiscellaneousFiles')
+                    ParsedSet.add(Tag)
+                #
+                # Parse UserExtensions
+                #
+                elif Tag == 'UserExtensions':
+                    Tmp = UserExtensionsXml()
+                    self.DistP.UserExtensions.append(Tmp.FromXml2(Item, 'UserExtensions'))
 
             #
             # Check Required Items for XML
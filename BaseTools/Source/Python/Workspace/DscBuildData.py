@@ -243,6 +243,8 @@ class DscBuildData(PlatformBuildClassObject):
         self._Clear()
         self.WorkspaceDir = os.getenv("WORKSPACE") if os.getenv("WORKSPACE") else ""
         self.DefaultStores = None
+        # Library instances resolved by GetModuleLibInstances
+        self.LibInstanceCache = {}
         self.SkuIdMgr = SkuClass(self.SkuName, self.SkuIds)
 
     @property
@@ -107,16 +107,28 @@ def GetModuleLibInstances(Module, Platform, BuildDatabase, Arch, Target, Toolcha
         if LibraryClass.startswith("NULL"):
             Module.LibraryClasses[LibraryClass] = Platform.Modules[str(Module)].LibraryClasses[LibraryClass]
 
+    if FileName:
+        EdkLogger.verbose("")
+        EdkLogger.verbose("Library instances of module [%s] [%s]:" % (str(Module), Arch))
+
+    # The library instances only depend on the module type, the library classes
+    # of the module and its overrides, so modules sharing them share the result
+    CacheKey = (ModuleType, Arch, Target, Toolchain, tuple(Module.LibraryClasses.items()),
+                tuple(Platform.Modules[str(Module)].LibraryClasses.items()))
+    if CacheKey in Platform.LibInstanceCache:
+        LibraryInstance, SortedLibraryList = Platform.LibInstanceCache[CacheKey]
+        if FileName:
+            for LibraryClassName, LibraryModule in LibraryInstance:
+                EdkLogger.verbose("\t" + str(LibraryClassName) + " : " + str(LibraryModule))
+        Module.LibInstances = list(SortedLibraryList)
+        return [lib.SetReferenceModule(Module) for lib in SortedLibraryList]
+
     # EdkII module
     LibraryConsumerList = [Module]
     Constructor = []
     ConsumedByList = OrderedListDict()
     LibraryInstance = OrderedDict()
 
-    if FileName:
-        EdkLogger.verbose("")
-        EdkLogger.verbose("Library instances of module [%s] [%s]:" % (str(Module), Arch))
-
     while len(LibraryConsumerList) > 0:
         M = LibraryConsumerList.pop()
         for LibraryClassName in M.LibraryClasses:
@@ -248,6 +260,7 @@ def GetModuleLibInstances(Module, Platform, BuildDatabase, Arch, Target, Toolcha
     # The DAG Topo sort produces the destructor order, so the list of constructors must generated in the reverse order
     #
     SortedLibraryList.reverse()
+    Platform.LibInstanceCache[CacheKey] = (list(LibraryInstance.items()), list(SortedLibraryList))
     Module.LibInstances = SortedLibraryList
     SortedLibraryList = [lib.SetReferenceModule(Module) for lib in SortedLibraryList]
     return SortedLibraryList
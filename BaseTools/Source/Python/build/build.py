@@ -33,16 +33,22 @@ from AutoGen.WorkspaceAutoGen import WorkspaceAutoGen
 from AutoGen.AutoGenWorker import AutoGenWorkerInProcess,AutoGenManager,\
     LogAgent
 from AutoGen import GenMake
+from AutoGen.MakeRunner import RunMakefile
+from AutoGen.GenNinja import NinjaFile
+from AutoGen import BinaryCache
 from Common import Misc as Utils
 
 from Common.TargetTxtClassObject import TargetTxt
 from Common.ToolDefClassObject import ToolDef
 from Common.Misc import PathClass,SaveFileOnChange,RemoveDirectory
+from Common.FileIndex import FileIndex
 from Common.StringUtils import NormPath
 from Common.MultipleWorkspace import MultipleWorkspace as mws
 from Common.BuildToolError import *
 from Common.DataType import *
 import Common.EdkLogger as EdkLogger
+from Common.OutputPump import OutputPump
+from Common import BuildTrace
 
 from Workspace.WorkspaceDatabase import BuildDB
 
@@ -163,33 +169,12 @@ def NormFile(FilePath, Workspace):
     else:
         return FileFullPath[(len(Workspace) + 1):]
 
-## Get the output of an external program
-#
-# This is the entrance method of thread reading output of an external program and
-# putting them in STDOUT/STDERR of current program.
-#
-# @param  From      The stream message read from
-# @param  To        The stream message put on
-# @param  ExitFlag  The flag used to indicate stopping reading
-#
-def ReadMessage(From, To, ExitFlag):
-    while True:
-        # read one line a time
-        Line = From.readline()
-        # empty string means "end"
-        if Line is not None and Line != b"":
-            To(Line.rstrip().decode(encoding='utf-8', errors='ignore'))
-        else:
-            break
-        if ExitFlag.isSet():
-            break
-
 ## Launch an external program
 #
 # This method will call subprocess.Popen to execute an external program with
 # given options in specified directory. Because of the dead-lock issue during
-# redirecting output of the external program, threads are used to to do the
-# redirection work.
+# redirecting output of the external program, the output is drained by the
+# OutputPump shared by all running commands.
 #
 # @param  Command               A list or string containing the call of the program
 # @param  WorkingDir            The directory in which the program will be running
@@ -210,42 +195,29 @@ def LaunchCommand(Command, WorkingDir):
         Command = ' '.join(Command)
 
     Proc = None
-    EndOfProcedure = None
+    Watch = None
     try:
         # launch the command
         Proc = Popen(Command, stdout=PIPE, stderr=PIPE, env=os.environ, cwd=WorkingDir, bufsize=-1, shell=True)
 
-        # launch two threads to read the STDOUT and STDERR
-        EndOfProcedure = Event()
-        EndOfProcedure.clear()
-        if Proc.stdout:
-            StdOutThread = Thread(target=ReadMessage, args=(Proc.stdout, EdkLogger.info, EndOfProcedure))
-            StdOutThread.setName("STDOUT-Redirector")
-            StdOutThread.setDaemon(False)
-            StdOutThread.start()
-
-        if Proc.stderr:
-            StdErrThread = Thread(target=ReadMessage, args=(Proc.stderr, EdkLogger.quiet, EndOfProcedure))
-            StdErrThread.setName("STDERR-Redirector")
-            StdErrThread.setDaemon(False)
-            StdErrThread.start()
+        # let the output pump redirect the STDOUT and STDERR
+        Watch = OutputPump.Get().Watch(Proc, EdkLogger.info, EdkLogger.quiet)
 
         # waiting for program exit
         Proc.wait()
     except: # in case of aborting
-        # terminate the threads redirecting the program output
         EdkLogger.quiet("(Python %s on %s) " % (platform.python_version(), sys.platform) + traceback.format_exc())
-        if EndOfProcedure is not None:
-            EndOfProcedure.set()
         if Proc is None:
             if not isinstance(Command, type("")):
                 Command = " ".join(Command)
             EdkLogger.error("build", COMMAND_FAILURE, "Failed to start command", ExtraData="%s [%s]" % (Command, WorkingDir))
 
-    if Proc.stdout:
-        StdOutThread.join()
-    if Proc.stderr:
-        StdErrThread.join()
+    if Watch is not None:
+        Watch.Wait()
+
+    BuildTrace.Complete(os.path.basename(Command.split()[0]) if isinstance(Command, str) else Command[0],
+                        "command", BeginTime * 1000000, BuildTrace.Now(),
+                        {"command" : Command, "cwd" : WorkingDir, "returncode" : Proc.returncode})
 
     # check the return code of the program
     if Proc.returncode != 0:
@@ -262,6 +234,21 @@ def LaunchCommand(Command, WorkingDir):
         EdkLogger.error("build", COMMAND_FAILURE, ExtraData="%s [%s]" % (Command, WorkingDir))
     return "%dms" % (int(round((time.time() - BeginTime) * 1000)))
 
+## Build a module with its makefile
+#
+# With --direct-build, the out-of-date commands in the module makefile are run
+# by the build process itself. Otherwise make is launched as usual.
+#
+# @param  BuildCommand          The make command list of the tool chain
+# @param  Target                The makefile target to build
+# @param  WorkingDir            The directory containing the module makefile
+#
+def LaunchModuleBuild(BuildCommand, Target, WorkingDir):
+    if GlobalData.gDirectBuild:
+        MakefilePath = os.path.join(WorkingDir, GenMake.BuildFile._FILE_NAME_[GenMake.gMakeType])
+        return RunMakefile(MakefilePath, Target, WorkingDir, BuildCommand[0])
+    return LaunchCommand(BuildCommand + [Target], WorkingDir)
+
 ## The smallest unit that can be built in multi-thread build mode
 #
 # This is the base class of build unit. The "Obj" parameter must provide
@@ -605,7 +592,11 @@ class BuildTask:
     #
     def _CommandThread(self, Command, WorkingDir):
         try:
-            self.BuildItem.BuildObject.BuildTime = LaunchCommand(Command, WorkingDir)
+            with BuildTrace.Span(str(self.BuildItem.BuildObject), "make", arch=self.BuildItem.BuildObject.Arch):
+                if isinstance(self.BuildItem, ModuleMakeUnit):
+                    self.BuildItem.BuildObject.BuildTime = LaunchModuleBuild(self.BuildItem.BuildCommand, self.BuildItem.Target, WorkingDir)
+                else:
+                    self.BuildItem.BuildObject.BuildTime = LaunchCommand(Command, WorkingDir)
             self.CompleteFlag = True
 
             # Run hash operation post dependency, to account for libs
@@ -711,6 +702,7 @@ class Build():
         self.SilentMode     = BuildOptions.SilentMode
         self.ThreadNumber   = 1
         self.SkipAutoGen    = BuildOptions.SkipAutoGen
+        self.BinCacheSize   = BuildOptions.BinCacheSize
         self.Reparse        = BuildOptions.Reparse
         self.SkuId          = BuildOptions.SkuId
         if self.SkuId:
@@ -731,6 +723,8 @@ class Build():
         GlobalData.gBinCacheSource = BuildOptions.BinCacheSource
         GlobalData.gEnableGenfdsMultiThread = BuildOptions.GenfdsMultiThread
         GlobalData.gDisableIncludePathCheck = BuildOptions.DisableIncludePathCheck
+        GlobalData.gDirectBuild = BuildOptions.DirectBuild
+        GlobalData.gNinjaBuild = BuildOptions.NinjaBuild
 
         if GlobalData.gBinCacheDest and not GlobalData.gUseHashCache:
             EdkLogger.error("build", OPTION_NOT_SUPPORTED, ExtraData="--binary-destination must be used together with --hash.")
@@ -738,23 +732,37 @@ class Build():
         if GlobalData.gBinCacheSource and not GlobalData.gUseHashCache:
             EdkLogger.error("build", OPTION_NOT_SUPPORTED, ExtraData="--binary-source must be used together with --hash.")
 
+        if self.BinCacheSize is not None and not GlobalData.gBinCacheDest:
+            EdkLogger.error("build", OPTION_NOT_SUPPORTED, ExtraData="--binary-cache-size must be used together with --binary-destination.")
+
         if GlobalData.gBinCacheDest and GlobalData.gBinCacheSource:
             EdkLogger.error("build", OPTION_NOT_SUPPORTED, ExtraData="--binary-destination can not be used together with --binary-source.")
 
+        # ninja only replaces the make of the modules in a platform build
+        if GlobalData.gNinjaBuild and self.ModuleFile:
+            EdkLogger.error("build", OPTION_NOT_SUPPORTED, ExtraData="--ninja can not be used together with -m.")
+
+        if GlobalData.gNinjaBuild and self.Target not in ["", "all"]:
+            EdkLogger.error("build", OPTION_NOT_SUPPORTED, ExtraData="--ninja is not supported with the target [%s]." % self.Target)
+
         if GlobalData.gBinCacheSource:
-            BinCacheSource = os.path.normpath(GlobalData.gBinCacheSource)
-            if not os.path.isabs(BinCacheSource):
-                BinCacheSource = mws.join(self.WorkspaceDir, BinCacheSource)
-            GlobalData.gBinCacheSource = BinCacheSource
+            # a remote cache URL is used as is
+            if not BinaryCache.IsRemote(GlobalData.gBinCacheSource):
+                BinCacheSource = os.path.normpath(GlobalData.gBinCacheSource)
+                if not os.path.isabs(BinCacheSource):
+                    BinCacheSource = mws.join(self.WorkspaceDir, BinCacheSource)
+                GlobalData.gBinCacheSource = BinCacheSource
         else:
             if GlobalData.gBinCacheSource is not None:
                 EdkLogger.error("build", OPTION_VALUE_INVALID, ExtraData="Invalid value of option --binary-source.")
 
         if GlobalData.gBinCacheDest:
-            BinCacheDest = os.path.normpath(GlobalData.gBinCacheDest)
-            if not os.path.isabs(BinCacheDest):
-                BinCacheDest = mws.join(self.WorkspaceDir, BinCacheDest)
-            GlobalData.gBinCacheDest = BinCacheDest
+            # a remote cache URL is used as is
+            if not BinaryCache.IsRemote(GlobalData.gBinCacheDest):
+                BinCacheDest = os.path.normpath(GlobalData.gBinCacheDest)
+                if not os.path.isabs(BinCacheDest):
+                    BinCacheDest = mws.join(self.WorkspaceDir, BinCacheDest)
+                GlobalData.gBinCacheDest = BinCacheDest
         else:
             if GlobalData.gBinCacheDest is not None:
                 EdkLogger.error("build", OPTION_VALUE_INVALID, ExtraData="Invalid value of option --binary-destination.")
@@ -1072,27 +1080,11 @@ class Build():
                 args = ' && '.join((self.Prebuild, 'env > ' + PrebuildEnvFile))
                 Process = Popen(args, stdout=PIPE, stderr=PIPE, shell=True)
 
-            # launch two threads to read the STDOUT and STDERR
-            EndOfProcedure = Event()
-            EndOfProcedure.clear()
-            if Process.stdout:
-                StdOutThread = Thread(target=ReadMessage, args=(Process.stdout, EdkLogger.info, EndOfProcedure))
-                StdOutThread.setName("STDOUT-Redirector")
-                StdOutThread.setDaemon(False)
-                StdOutThread.start()
-
-            if Process.stderr:
-                StdErrThread = Thread(target=ReadMessage, args=(Process.stderr, EdkLogger.quiet, EndOfProcedure))
-                StdErrThread.setName("STDERR-Redirector")
-                StdErrThread.setDaemon(False)
-                StdErrThread.start()
+            # let the output pump redirect the STDOUT and STDERR
+            Watch = OutputPump.Get().Watch(Process, EdkLogger.info, EdkLogger.quiet)
             # waiting for program exit
             Process.wait()
-
-            if Process.stdout:
-                StdOutThread.join()
-            if Process.stderr:
-                StdErrThread.join()
+            Watch.Wait()
             if Process.returncode != 0 :
                 EdkLogger.error("Prebuild", PREBUILD_ERROR, 'Prebuild process is not success!')
 
@@ -1112,27 +1104,11 @@ class Build():
                 Process = Popen(self.Postbuild, stdout=PIPE, stderr=PIPE, shell=True)
             else:
                 Process = Popen(self.Postbuild, stdout=PIPE, stderr=PIPE, shell=True)
-            # launch two threads to read the STDOUT and STDERR
-            EndOfProcedure = Event()
-            EndOfProcedure.clear()
-            if Process.stdout:
-                StdOutThread = Thread(target=ReadMessage, args=(Process.stdout, EdkLogger.info, EndOfProcedure))
-                StdOutThread.setName("STDOUT-Redirector")
-                StdOutThread.setDaemon(False)
-                StdOutThread.start()
-
-            if Process.stderr:
-                StdErrThread = Thread(target=ReadMessage, args=(Process.stderr, EdkLogger.quiet, EndOfProcedure))
-                StdErrThread.setName("STDERR-Redirector")
-                StdErrThread.setDaemon(False)
-                StdErrThread.start()
+            # let the output pump redirect the STDOUT and STDERR
+            Watch = OutputPump.Get().Watch(Process, EdkLogger.info, EdkLogger.quiet)
             # waiting for program exit
             Process.wait()
-
-            if Process.stdout:
-                StdOutThread.join()
-            if Process.stderr:
-                StdErrThread.join()
+            Watch.Wait()
             if Process.returncode != 0 :
                 EdkLogger.error("Postbuild", POSTBUILD_ERROR, 'Postbuild process is not success!')
             EdkLogger.info("\n- Postbuild Done -\n")
@@ -1163,12 +1139,12 @@ class Build():
                 if os.path.exists(ModuleHashFile):
                     os.remove(ModuleHashFile)
 
-                # Remove .hash file from cache
+                # Remove the module manifest from cache
                 if GlobalData.gBinCacheDest:
-                    FileDir = os.path.join(GlobalData.gBinCacheDest, moduleAutoGenObj.Arch, moduleAutoGenObj.SourceDir, moduleAutoGenObj.MetaFile.BaseName)
-                    HashFile = os.path.join(FileDir, moduleAutoGenObj.Name + '.hash')
-                    if os.path.exists(HashFile):
-                        os.remove(HashFile)
+                    FileDir = moduleAutoGenObj.GetBinCacheDir(BinaryCache.GetCacheManager(GlobalData.gBinCacheDest).Root)
+                    ManifestFile = os.path.join(FileDir, moduleAutoGenObj.Name + BinaryCache.MANIFEST_SUFFIX)
+                    if os.path.exists(ManifestFile):
+                        os.remove(ManifestFile)
 
     ## Build a module or platform
     #
@@ -1202,7 +1178,8 @@ class Build():
             self.Progress.Start("Generating makefile and code")
             data_pipe_file = os.path.join(AutoGenObject.BuildDir, "GlobalVar_%s_%s.bin" % (str(AutoGenObject.Guid),AutoGenObject.Arch))
             AutoGenObject.DataPipe.dump(data_pipe_file)
-            autogen_rt, errorcode = self.StartAutoGen(mqueue, AutoGenObject.DataPipe, self.SkipAutoGen, PcdMaList,self.share_data)
+            with BuildTrace.Span("AutoGen", "autogen", arch=AutoGenObject.Arch):
+                autogen_rt, errorcode = self.StartAutoGen(mqueue, AutoGenObject.DataPipe, self.SkipAutoGen, PcdMaList,self.share_data)
             self.Progress.Stop("done!")
             if not autogen_rt:
                 self.AutoGenMgr.TerminateWorkers()
@@ -1234,8 +1211,7 @@ class Build():
 
         # build modules
         if BuildModule:
-            BuildCommand = BuildCommand + [Target]
-            LaunchCommand(BuildCommand, AutoGenObject.MakeFileDir)
+            LaunchModuleBuild(BuildCommand, Target, AutoGenObject.MakeFileDir)
             self.CreateAsBuiltInf()
             if GlobalData.gBinCacheDest:
                 self.UpdateBuildCache()
@@ -1351,8 +1327,9 @@ class Build():
         # build modules
         if BuildModule:
             if Target != 'fds':
-                BuildCommand = BuildCommand + [Target]
-            AutoGenObject.BuildTime = LaunchCommand(BuildCommand, AutoGenObject.MakeFileDir)
+                AutoGenObject.BuildTime = LaunchModuleBuild(BuildCommand, Target, AutoGenObject.MakeFileDir)
+            else:
+                AutoGenObject.BuildTime = LaunchCommand(BuildCommand, AutoGenObject.MakeFileDir)
             self.CreateAsBuiltInf()
             if GlobalData.gBinCacheDest:
                 self.UpdateBuildCache()
@@ -1361,8 +1338,9 @@ class Build():
 
         # genfds
         if Target == 'fds':
-            if GenFdsApi(AutoGenObject.GenFdsCommandDict, self.Db):
-                EdkLogger.error("build", COMMAND_FAILURE)
+            with BuildTrace.Span("GenFds", "genfds"):
+                if GenFdsApi(AutoGenObject.GenFdsCommandDict, self.Db):
+                    EdkLogger.error("build", COMMAND_FAILURE)
             return True
 
         # run
@@ -1814,6 +1792,8 @@ class Build():
                             if Ma is None:
                                 continue
                             MaList.append(Ma)
+                            if self._PreflightCacheHit(Ma):
+                                continue
                             if Ma.CanSkipbyHash():
                                 self.HashSkipModules.append(Ma)
                                 if GlobalData.gBinCacheSource:
@@ -1821,7 +1801,8 @@ class Build():
                                 continue
                             else:
                                 if GlobalData.gBinCacheSource:
-                                    EdkLogger.quiet("cache miss: %s[%s]" % (Ma.MetaFile.Path, Ma.Arch))
+                                    EdkLogger.quiet("cache miss: %s[%s] (%s)" % (Ma.MetaFile.Path, Ma.Arch,
+                                                    GlobalData.gBinCacheLookup.get((Ma.MetaFile.Path, Ma.Arch), "not cacheable")))
                             # Not to auto-gen for targets 'clean', 'cleanlib', 'cleanall', 'run', 'fds'
                             if self.Target not in ['clean', 'cleanlib', 'cleanall', 'run', 'fds']:
                                 # for target which must generate AutoGen code and makefile
@@ -1945,6 +1926,47 @@ class Build():
             CmdSetDict[tmpInf, tmpArch].add(Cmd)
         return CmdSetDict
 
+    ## Restore a module from the binary cache before its AutoGen
+    #
+    #   @param  Ma              The ModuleAutoGen object of the module
+    #
+    #   @retval True            The module is restored, and needs neither AutoGen nor build
+    #   @retval False           The module has to go through AutoGen and CanSkipbyHash
+    #
+    def _PreflightCacheHit(self, Ma):
+        # the FFS rules are in the module makefile, which must be created
+        if not GlobalData.gBinCacheSource or GlobalData.gEnableGenfdsMultiThread:
+            return False
+        if not Ma.AttemptPreflightCacheCopy():
+            return False
+        self.HashSkipModules.append(Ma)
+        EdkLogger.quiet("cache hit: %s[%s] (preflight)" % (Ma.MetaFile.Path, Ma.Arch))
+        return True
+
+    ## Return the modules and libraries the AutoGen workers have to process
+    #
+    # The modules restored by _PreflightCacheHit, and the libraries used only
+    # by them, are left out.
+    #
+    #   @param  Pa              The PlatformAutoGen object
+    #   @param  SkipModules     The set of (File, Root) of the restored modules
+    #
+    def _GetAutoGenModuleInfo(self, Pa, SkipModules):
+        if not SkipModules:
+            return Pa.GetAllModuleInfo
+        LibUsers = Pa.DataPipe.Get("REFS") or {}
+        ModuleInfo = []
+        for Info in Pa.GetAllModuleInfo:
+            File, Root, Path, BaseName, OriginalPath, Arch, IsLib = Info
+            if (File, Root) in SkipModules:
+                continue
+            if IsLib:
+                Users = LibUsers.get((File, Root, Arch, Path))
+                if Users and all((User[0], User[1]) in SkipModules for User in Users):
+                    continue
+            ModuleInfo.append(Info)
+        return ModuleInfo
+
     ## Build a platform in multi-thread mode
     #
     def _MultiThreadBuildPlatform(self):
@@ -2009,6 +2031,7 @@ class Build():
                             ModuleList.append(Inf)
                     Pa.DataPipe.DataContainer = {"FfsCommand":CmdListDict}
                     Pa.DataPipe.DataContainer = {"Workspace_timestamp": Wa._SrcTimeStamp}
+                    PreflightHits = set()
                     for Module in ModuleList:
                         # Get ModuleAutoGen object to generate C code file and makefile
                         Ma = ModuleAutoGen(Wa, Module, BuildTarget, ToolChain, Arch, self.PlatformFile,Pa.DataPipe)
@@ -2019,6 +2042,9 @@ class Build():
                             Ma.PlatformInfo = Pa
                             Ma.Workspace = Wa
                             PcdMaList.append(Ma)
+                        if self._PreflightCacheHit(Ma):
+                            PreflightHits.add((Module.File, Module.Root))
+                            continue
                         if Ma.CanSkipbyHash():
                             self.HashSkipModules.append(Ma)
                             if GlobalData.gBinCacheSource:
@@ -2026,7 +2052,8 @@ class Build():
                             continue
                         else:
                             if GlobalData.gBinCacheSource:
-                                EdkLogger.quiet("cache miss: %s[%s]" % (Ma.MetaFile.Path, Ma.Arch))
+                                EdkLogger.quiet("cache miss: %s[%s] (%s)" % (Ma.MetaFile.Path, Ma.Arch,
+                                                    GlobalData.gBinCacheLookup.get((Ma.MetaFile.Path, Ma.Arch), "not cacheable")))
 
                         # Not to auto-gen for targets 'clean', 'cleanlib', 'cleanall', 'run', 'fds'
                             # for target which must generate AutoGen code and makefile
@@ -2038,11 +2065,12 @@ class Build():
                         if Ma not in GlobalData.gModuleBuildTracking[Ma.Arch]:
                             GlobalData.gModuleBuildTracking[Ma.Arch][Ma] = 'FAIL'
                     mqueue = mp.Queue()
-                    for m in Pa.GetAllModuleInfo:
+                    for m in self._GetAutoGenModuleInfo(Pa, PreflightHits):
                         mqueue.put(m)
                     data_pipe_file = os.path.join(Pa.BuildDir, "GlobalVar_%s_%s.bin" % (str(Pa.Guid),Pa.Arch))
                     Pa.DataPipe.dump(data_pipe_file)
-                    autogen_rt, errorcode = self.StartAutoGen(mqueue, Pa.DataPipe, self.SkipAutoGen, PcdMaList,self.share_data)
+                    with BuildTrace.Span("AutoGen", "autogen", arch=Pa.Arch):
+                        autogen_rt, errorcode = self.StartAutoGen(mqueue, Pa.DataPipe, self.SkipAutoGen, PcdMaList,self.share_data)
 
                     if not autogen_rt:
                         self.AutoGenMgr.TerminateWorkers()
@@ -2052,6 +2080,11 @@ class Build():
                 self.Progress.Stop("done!")
                 for Arch in Wa.ArchList:
                     MakeStart = time.time()
+                    if GlobalData.gNinjaBuild:
+                        self._NinjaBuildModules(Wa)
+                        Pa.CreateMakeFile(False)
+                        self.MakeTime += int(round((time.time() - MakeStart)))
+                        break
                     for Ma in self.BuildModules:
                         # Generate build task for the module
                         if not Ma.IsBinaryModule:
@@ -2127,8 +2160,9 @@ class Build():
                         # Generate FD image if there's a FDF file found
                         #
                         GenFdsStart = time.time()
-                        if GenFdsApi(Wa.GenFdsCommandDict, self.Db):
-                            EdkLogger.error("build", COMMAND_FAILURE)
+                        with BuildTrace.Span("GenFds", "genfds"):
+                            if GenFdsApi(Wa.GenFdsCommandDict, self.Db):
+                                EdkLogger.error("build", COMMAND_FAILURE)
 
                         #
                         # Create MAP file for all platform FVs after GenFds.
@@ -2141,6 +2175,40 @@ class Build():
                     self._SaveMapFile(MapBuffer, Wa)
         self.invalidateHash()
 
+    ## Build all modules and libraries of the platform with one ninja process
+    #
+    # The makefiles of the modules must have been generated. The rules in them
+    # are put in one build.ninja in the platform build directory.
+    #
+    #   @param  Wa          The WorkspaceAutoGen object of the platform
+    #
+    def _NinjaBuildModules(self, Wa):
+        if not IsToolInPath("ninja"):
+            EdkLogger.error("build", FILE_NOT_FOUND, "ninja is required by --ninja but not found in PATH")
+        ModuleList = [Ma for Ma in self.BuildModules if not Ma.IsBinaryModule]
+        if not ModuleList:
+            return
+        Ninja = NinjaFile(Wa.BuildDir, ModuleList, GenMake.BuildFile._FILE_NAME_[GenMake.gMakeType])
+        Ninja.Generate()
+        try:
+            LaunchCommand(["ninja", "-f", Ninja.FilePath, "-j", str(self.ThreadNumber)], Wa.BuildDir)
+        except FatalError:
+            self.invalidateHash()
+            raise
+
+        BuiltList = set(ModuleList)
+        for Ma in ModuleList:
+            BuiltList.update(Lib for Lib in Ma.LibraryAutoGenList if not Lib.IsBinaryModule and not Lib.CanSkipbyHash())
+        for Ma in BuiltList:
+            # Run hash operation post dependency, to account for libs
+            if GlobalData.gUseHashCache and Ma.IsLibrary:
+                HashFile = path.join(Ma.BuildDir, Ma.Name + ".hash")
+                SaveFileOnChange(HashFile, Ma.GenModuleHash(), True)
+            if (Ma.Arch in GlobalData.gModuleBuildTracking and
+               Ma in GlobalData.gModuleBuildTracking[Ma.Arch] and
+               GlobalData.gModuleBuildTracking[Ma.Arch][Ma] != 'FAIL_METAFILE'):
+                GlobalData.gModuleBuildTracking[Ma.Arch][Ma] = 'SUCCESS'
+
     ## Generate GuidedSectionTools.txt in the FV directories.
     #
     def CreateGuidedSectionToolsFile(self):
@@ -2247,6 +2315,19 @@ class Build():
         all_lib_set.clear()
         all_mod_set.clear()
         self.HashSkipModules = []
+
+    ## Update the LRU index and the size of the binary cache, and report the cache lookups
+    def FinishBinaryCache(self):
+        BinaryCache.FlushAll()
+        if GlobalData.gBinCacheDest and self.BinCacheSize is not None:
+            Manager = BinaryCache.GetCacheManager(GlobalData.gBinCacheDest)
+            if os.path.isdir(Manager.Root):
+                Modules, Objects, Size = Manager.Prune(self.BinCacheSize * 1024 * 1024)
+                if Modules or Objects:
+                    EdkLogger.quiet("Binary cache: removed %d module(s) and %d object(s), %d bytes freed" % (Modules, Objects, Size))
+        if GlobalData.gBinCacheSource and GlobalData.gBinCacheLookup:
+            for Line in BinaryCache.SummarizeLookups(GlobalData.gBinCacheLookup):
+                EdkLogger.quiet(Line)
     ## Do some clean-up works when error occurred
     def Relinquish(self):
         OldLogLevel = EdkLogger.GetLevel()
@@ -2326,6 +2407,7 @@ def Main():
     Option, Target = BuildOption, BuildTarget
     GlobalData.gOptions = Option
     GlobalData.gCaseInsensitive = Option.CaseInsensitive
+    BuildTrace.Initialize(Option.TraceFile)
 
     # Set log level
     LogLevel = EdkLogger.INFO
@@ -2379,7 +2461,7 @@ def Main():
         #
         # Get files real name in workspace dir
         #
-        GlobalData.gAllFiles = Utils.DirCache(Workspace)
+        GlobalData.gAllFiles = FileIndex(Workspace, mws.getPkgPath())
 
         WorkingDirectory = os.getcwd()
         if not Option.ModuleFile:
@@ -2495,13 +2577,19 @@ def Main():
     else:
         BuildDurationStr = time.strftime("%H:%M:%S", BuildDuration)
     if MyBuild is not None:
+        MyBuild.FinishBinaryCache()
         if not BuildError:
             MyBuild.BuildReport.GenerateReport(BuildDurationStr, LogBuildTime(MyBuild.AutoGenTime), LogBuildTime(MyBuild.MakeTime), LogBuildTime(MyBuild.GenFdsTime))
+    if BuildTrace.IsEnabled():
+        BuildTrace.Complete("build", "build", StartTime * 1000000, FinishTime * 1000000, {"result" : Conclusion})
+        BuildTrace.Save()
 
     EdkLogger.SetLevel(EdkLogger.QUIET)
     EdkLogger.quiet("\n- %s -" % Conclusion)
     EdkLogger.quiet(time.strftime("Build end time: %H:%M:%S, %b.%d %Y", time.localtime()))
     EdkLogger.quiet("Build total time: %s\n" % BuildDurationStr)
+    if BuildTrace.IsEnabled():
+        EdkLogger.quiet("Build trace: %s\n" % BuildTrace.GetTraceFile())
     Log_Agent.kill()
     Log_Agent.join()
     return ReturnCode
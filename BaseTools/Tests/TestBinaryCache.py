@@ -0,0 +1,146 @@
+## @file
+# Unit tests for the content addressed binary cache store
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import TestTools
+from AutoGen import BinaryCache
+
+class TestBinaryCache(unittest.TestCase):
+    def setUp(self):
+        self.Dir = tempfile.mkdtemp()
+        self.Store = BinaryCache.ObjectStore(os.path.join(self.Dir, "cache"))
+
+    def tearDown(self):
+        shutil.rmtree(self.Dir, True)
+
+    def WriteFile(self, Name, Content):
+        FilePath = os.path.join(self.Dir, Name)
+        with open(FilePath, "wb") as Fd:
+            Fd.write(Content)
+        return FilePath
+
+    def ReadFile(self, FilePath):
+        with open(FilePath, "rb") as Fd:
+            return Fd.read()
+
+    def test_identical_outputs_stored_once(self):
+        Digest1 = self.Store.Put(self.WriteFile("a.efi", b"same content"))
+        Digest2 = self.Store.Put(self.WriteFile("b.efi", b"same content"))
+        Digest3 = self.Store.Put(self.WriteFile("c.efi", b"other content"))
+        self.assertEqual(Digest1, Digest2)
+        self.assertNotEqual(Digest1, Digest3)
+        Objects = [Name for Root, Dirs, Files in os.walk(self.Store.Root) for Name in Files]
+        self.assertEqual(sorted(Objects), sorted([Digest1, Digest3]))
+
+    def test_restore(self):
+        Digest = self.Store.Put(self.WriteFile("a.efi", b"image"))
+        DstFile = os.path.join(self.Dir, "build", "DEBUG", "a.efi")
+        How = self.Store.Restore(Digest, DstFile)
+        self.assertIn(How, (BinaryCache.LINK_CLONE, BinaryCache.LINK_HARD, BinaryCache.LINK_COPY))
+        self.assertEqual(self.ReadFile(DstFile), b"image")
+        # restoring again is a no-op for a hard link, and harmless otherwise
+        self.Store.Restore(Digest, DstFile)
+        self.assertEqual(self.ReadFile(DstFile), b"image")
+
+    def test_manifest(self):
+        ManifestFile = os.path.join(self.Dir, "cache", "Pkg", "Driver", "Driver" + BinaryCache.MANIFEST_SUFFIX)
+        self.assertIsNone(BinaryCache.LoadManifest(ManifestFile))
+        BinaryCache.SaveManifest(ManifestFile, "1234", {"DEBUG/Driver.efi" : "ab"}, {"Source" : "cd"})
+        Manifest = BinaryCache.LoadManifest(ManifestFile)
+        self.assertEqual(Manifest["Hash"], "1234")
+        self.assertEqual(Manifest["Files"], {"DEBUG/Driver.efi" : "ab"})
+        self.assertEqual(Manifest["Inputs"], {"Source" : "cd"})
+        self.assertIsNone(Manifest["Preflight"])
+        BinaryCache.SaveManifest(ManifestFile, "1234", {}, None, "ef")
+        self.assertEqual(BinaryCache.LoadManifest(ManifestFile)["Preflight"], "ef")
+        self.WriteFile(ManifestFile, b"{broken")
+        self.assertIsNone(BinaryCache.LoadManifest(ManifestFile))
+
+    def test_unshare_before_rebuild(self):
+        Digest = self.Store.Put(self.WriteFile("a.efi", b"image"))
+        DstFile = os.path.join(self.Dir, "a.out")
+        if self.Store.Restore(Digest, DstFile) != BinaryCache.LINK_HARD:
+            self.skipTest("hard link is not used on this file system")
+        BinaryCache.SaveLinkList(self.Dir, "Driver", [DstFile])
+        BinaryCache.UnshareLinkedFiles(self.Dir, "Driver")
+        self.assertEqual(os.stat(DstFile).st_nlink, 1)
+        with open(DstFile, "wb") as Fd:
+            Fd.write(b"rebuilt")
+        self.assertEqual(self.ReadFile(self.Store.ObjectPath(Digest)), b"image")
+        self.assertFalse(os.path.exists(os.path.join(self.Dir, "Driver" + BinaryCache.LINK_LIST_SUFFIX)))
+
+    def AddModule(self, Manager, Name, Content, LastUse):
+        ManifestFile = os.path.join(Manager.Root, "Platform", "DEBUG_GCC5", "X64", Name, Name + BinaryCache.MANIFEST_SUFFIX)
+        Digest = Manager.Store.Put(self.WriteFile(Name + ".efi", Content))
+        BinaryCache.SaveManifest(ManifestFile, Name, {Name + ".efi" : Digest})
+        os.utime(ManifestFile, (LastUse, LastUse))
+        return ManifestFile
+
+    def test_miss_reason(self):
+        Inputs = {"Platform" : "p", "Package" : "k", "Library" : {"BaseLib" : "1"}, "Source" : "s"}
+        self.assertEqual(BinaryCache.GetMissReason(None, Inputs), BinaryCache.MISS_NOT_CACHED)
+        for Key, Value, Reason in (("Platform", "p2", BinaryCache.MISS_PLATFORM),
+                                   ("Library", {"BaseLib" : "2"}, BinaryCache.MISS_LIBRARY),
+                                   ("Source", "s2", BinaryCache.MISS_SOURCE)):
+            Cached = dict(Inputs)
+            Cached[Key] = Value
+            self.assertEqual(BinaryCache.GetMissReason({"Inputs" : Cached}, Inputs), Reason)
+        Lines = BinaryCache.SummarizeLookups({("a.inf", "X64") : None, ("b.inf", "X64") : BinaryCache.MISS_SOURCE,
+                                              ("c.inf", "X64") : BinaryCache.MISS_SOURCE})
+        self.assertEqual(Lines[0], "Binary cache: 1 hit(s), 2 miss(es)")
+        self.assertIn(BinaryCache.MISS_SOURCE, Lines[1])
+
+    def test_prune_lru(self):
+        Manager = BinaryCache.CacheManager(os.path.join(self.Dir, "cache"))
+        Now = time.time()
+        Old = self.AddModule(Manager, "Old", b"o" * 1000, Now - 300)
+        Used = self.AddModule(Manager, "Used", b"u" * 1000, Now - 200)
+        New = self.AddModule(Manager, "New", b"n" * 1000, Now - 100)
+        # a hit makes the oldest module the most recently used one
+        Manager.Touch(Used)
+        Manager.Flush()
+        self.assertEqual([Entry[1] for Entry in Manager.GetEntries()], [Old, New, Used])
+
+        self.assertEqual(Manager.Prune(MaxSize=2000, GraceTime=0), (1, 1, 1000))
+        self.assertFalse(os.path.exists(Old))
+        self.assertTrue(os.path.exists(New) and os.path.exists(Used))
+        self.assertEqual(len(Manager.GetObjects()), 2)
+
+        # modules unused for too long go away whatever the size
+        self.assertEqual(Manager.Prune(MaxAge=50, GraceTime=0)[0], 1)
+        self.assertEqual([Entry[1] for Entry in Manager.GetEntries()], [Used])
+
+    def test_prune_grace_time(self):
+        Manager = BinaryCache.CacheManager(os.path.join(self.Dir, "cache"))
+        Now = time.time()
+        Old = self.AddModule(Manager, "Old", b"o" * 1000, Now - 300)
+        New = self.AddModule(Manager, "New", b"n" * 1000, Now - 200)
+        Last = self.AddModule(Manager, "Last", b"l" * 1000, Now - 100)
+        OldDigest = BinaryCache.FileDigest(os.path.join(self.Dir, "Old.efi"))
+        for Digest in Manager.GetObjects():
+            if Digest != OldDigest:
+                os.utime(Manager.Store.ObjectPath(Digest), (Now - 7200, Now - 7200))
+        # the object of Old is in the grace time, removing Old frees nothing
+        self.assertEqual(Manager.Prune(MaxSize=2000, GraceTime=3600), (2, 1, 1000))
+        self.assertEqual([Entry[1] for Entry in Manager.GetEntries()], [Last])
+        self.assertEqual(sum(Size for Size, MTime in Manager.GetObjects().values()), 2000)
+
+    def test_prune_command(self):
+        Manager = BinaryCache.CacheManager(os.path.join(self.Dir, "cache"))
+        self.AddModule(Manager, "Old", b"o", time.time() - 3 * 24 * 3600)
+        self.assertEqual(BinaryCache.Main(["prune", Manager.Root, "--max-age", "2"]), 0)
+        self.assertEqual(Manager.GetEntries(), [])
+
+TheTestSuite = TestTools.MakeTheTestSuite(locals())
+
+if __name__ == '__main__':
+    allTests = TheTestSuite()
+    unittest.TextTestRunner().run(allTests)
@@ -0,0 +1,92 @@
+## @file
+# Unit tests for the build trace recorder
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+
+import TestTools
+from Common import BuildTrace
+
+def WorkerMain(TraceFile):
+    BuildTrace.Initialize(TraceFile, "worker", IsWorker=True)
+    with BuildTrace.Span("Module.inf : X64", "autogen"):
+        pass
+    BuildTrace.SavePart()
+
+class TracedObject(object):
+    def __str__(self):
+        return "Module.inf [X64]"
+
+    @BuildTrace.TraceMethod("cache")
+    def Copy(self, Value):
+        return Value + 1
+
+class TestBuildTrace(unittest.TestCase):
+    def setUp(self):
+        self.Dir = tempfile.mkdtemp()
+        self.TraceFile = os.path.join(self.Dir, "trace.json")
+
+    def tearDown(self):
+        BuildTrace.Initialize(None)
+        shutil.rmtree(self.Dir, True)
+
+    def Load(self):
+        with open(self.TraceFile) as Fd:
+            Trace = json.load(Fd)
+        return [Event for Event in Trace["traceEvents"] if Event["ph"] == "X"]
+
+    def test_disabled(self):
+        BuildTrace.Initialize(None)
+        self.assertFalse(BuildTrace.IsEnabled())
+        with BuildTrace.Span("build", "build"):
+            pass
+        self.assertEqual(TracedObject().Copy(1), 2)
+        BuildTrace.Save()
+        self.assertFalse(os.path.exists(self.TraceFile))
+
+    def test_spans(self):
+        BuildTrace.Initialize(self.TraceFile)
+        self.assertEqual(TracedObject().Copy(1), 2)
+        try:
+            with BuildTrace.Span("GenFds", "genfds", command="GenFds -f a.fdf"):
+                raise ValueError
+        except ValueError:
+            pass
+        BuildTrace.Save()
+        Events = self.Load()
+        self.assertEqual([Event["name"] for Event in Events], ["Copy", "GenFds"])
+        self.assertEqual(Events[0]["args"]["object"], "Module.inf [X64]")
+        self.assertEqual(Events[1]["args"]["error"], "ValueError")
+        self.assertGreaterEqual(Events[1]["ts"], Events[0]["ts"])
+
+    def test_worker_parts(self):
+        BuildTrace.Initialize(self.TraceFile)
+        Stale = self.TraceFile + ".1.1" + BuildTrace.TRACE_PART_SUFFIX
+        with open(Stale, "w") as Fd:
+            Fd.write("[]")
+        BuildTrace.Initialize(self.TraceFile)
+        self.assertFalse(os.path.exists(Stale))
+
+        Worker = multiprocessing.get_context("spawn").Process(target=WorkerMain, args=(self.TraceFile,))
+        Worker.start()
+        Worker.join()
+        with BuildTrace.Span("AutoGen", "autogen"):
+            pass
+        BuildTrace.Save()
+        Events = self.Load()
+        self.assertEqual(sorted(Event["name"] for Event in Events), ["AutoGen", "Module.inf : X64"])
+        self.assertEqual(len(set(Event["pid"] for Event in Events)), 2)
+        self.assertEqual(os.listdir(self.Dir), ["trace.json"])
+
+TheTestSuite = TestTools.MakeTheTestSuite(locals())
+
+if __name__ == '__main__':
+    allTests = TheTestSuite()
+    unittest.TextTestRunner().run(allTests)
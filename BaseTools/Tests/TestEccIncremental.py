@@ -0,0 +1,180 @@
+## @file
+# Unit tests for the incremental and the parallel runs of Ecc
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+
+import csv
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import TestTools
+
+BaseToolsDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PythonSourceDir = os.path.join(BaseToolsDir, "Source", "Python")
+
+TEST_DEC = """[Defines]
+  DEC_SPECIFICATION              = 0x00010005
+  PACKAGE_NAME                   = TestPkg
+  PACKAGE_GUID                   = 6C1A7B2E-5F4B-4E43-9E2A-7F3D3E1F0A11
+  PACKAGE_VERSION                = 0.1
+
+[Includes]
+  Include
+"""
+
+TEST_INF = """[Defines]
+  INF_VERSION                    = 0x00010005
+  BASE_NAME                      = TestLib
+  FILE_GUID                      = 2D9A1B4C-3E5F-4A6B-8C7D-9E0F1A2B3C4D
+  MODULE_TYPE                    = BASE
+  VERSION_STRING                 = 1.0
+  LIBRARY_CLASS                  = TestLib
+
+[Sources]
+  TestLib.c
+  Other.c
+
+[Packages]
+  TestPkg/TestPkg.dec
+"""
+
+TEST_C = """#include <Test.h>
+
+VOID
+EFIAPI
+%s (
+  VOID
+  )
+{
+}
+"""
+
+TEST_STRUCT_C = """#include <Test.h>
+
+typedef struct {
+  UINT32    Count;
+  VOID      *Buffer;
+} TEST_STRUCT;
+
+STATIC TEST_STRUCT  mTest = { 0, NULL };
+
+UINT32
+EFIAPI
+%sGetCount (
+  IN TEST_STRUCT  *Test
+  )
+{
+  if (Test == NULL) {
+    return mTest.Count;
+  }
+  return Test->Count;
+}
+"""
+
+class TestEccIncremental(unittest.TestCase):
+    def setUp(self):
+        self.Dir = tempfile.mkdtemp()
+        self.Workspace = os.path.join(self.Dir, "ws")
+        self.Package = os.path.join(self.Workspace, "TestPkg")
+        self.WriteFile(os.path.join(self.Package, "TestPkg.dec"), TEST_DEC)
+        self.WriteFile(os.path.join(self.Package, "Include", "Test.h"), "VOID\nEFIAPI\nTestFunc (\n  VOID\n  );\n")
+        self.WriteFile(os.path.join(self.Package, "Library", "TestLib", "TestLib.inf"), TEST_INF)
+        self.WriteFile(os.path.join(self.Package, "Library", "TestLib", "TestLib.c"), TEST_C % "TestFunc")
+        self.WriteFile(os.path.join(self.Package, "Library", "TestLib", "Other.c"), TEST_C % "OtherFunc")
+        # the Conf directory of a workspace set up by edksetup
+        os.makedirs(os.path.join(self.Workspace, "Conf"))
+        for Name in ("target", "tools_def", "build_rule"):
+            shutil.copy(os.path.join(BaseToolsDir, "Conf", Name + ".template"),
+                        os.path.join(self.Workspace, "Conf", Name + ".txt"))
+
+    def tearDown(self):
+        shutil.rmtree(self.Dir)
+
+    def WriteFile(self, Path, Content):
+        if not os.path.isdir(os.path.dirname(Path)):
+            os.makedirs(os.path.dirname(Path))
+        with open(Path, "w") as Fd:
+            Fd.write(Content)
+
+    ## Run Ecc on the package in a directory, return its output and its report
+    def RunEcc(self, RunDir, *Options, **KwArgs):
+        if not os.path.isdir(RunDir):
+            os.makedirs(RunDir)
+        Env = dict(os.environ, WORKSPACE=self.Workspace, PYTHONPATH=PythonSourceDir)
+        Env.pop("CONF_PATH", None)
+        Env.pop("PACKAGES_PATH", None)
+        Command = [sys.executable, os.path.join(PythonSourceDir, "Ecc", "EccMain.py"),
+                   "-t", self.Package, "-n", KwArgs.get("ThreadNumber", "1")] + list(Options)
+        Proc = subprocess.Popen(Command, cwd=RunDir, env=Env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        Output = Proc.communicate()[0].decode("utf-8", "ignore")
+        self.assertEqual(Proc.returncode, 0, Output)
+        with open(os.path.join(RunDir, "Report.csv")) as Fd:
+            # the reports without their numbers, which depend on the order of the checks
+            Report = sorted(tuple(Row[1:]) for Row in list(csv.reader(Fd))[1:])
+        return Output, Report
+
+    def ParsedFiles(self, Output):
+        return sorted(os.path.basename(Line.split()[-1]) for Line in Output.splitlines()
+                      if Line.startswith("Parsing ") and Line.endswith(".c"))
+
+    def test_incremental(self):
+        RunDir = os.path.join(self.Dir, "run")
+        Output, Report = self.RunEcc(RunDir, "--incremental")
+        self.assertEqual(self.ParsedFiles(Output), ["Other.c", "TestLib.c"])
+
+        # only the changed file is parsed again
+        self.WriteFile(os.path.join(self.Package, "Library", "TestLib", "Other.c"), TEST_C % "OtherFunc" + "\n")
+        Output, Report = self.RunEcc(RunDir, "--incremental")
+        self.assertEqual(self.ParsedFiles(Output), ["Other.c"])
+        self.assertIn("1 of 5 files changed", Output)
+
+        # and the report is the one of a full run
+        self.assertEqual(Report, self.RunEcc(os.path.join(self.Dir, "full"))[1])
+
+    def test_parallel_parse(self):
+        # enough files for the pool to give some to each process
+        FileList = ["Struct%d.c" % Index for Index in range(10)]
+        for Name in FileList:
+            self.WriteFile(os.path.join(self.Package, "Library", "TestLib", Name), TEST_STRUCT_C % Name[:-2])
+        Serial, SerialReport = self.RunEcc(os.path.join(self.Dir, "serial"))
+        Parallel, ParallelReport = self.RunEcc(os.path.join(self.Dir, "parallel"), ThreadNumber="2")
+        self.assertEqual(self.ParsedFiles(Parallel), sorted(["Other.c", "TestLib.c"] + FileList))
+        self.assertEqual(ParallelReport, SerialReport)
+        # the files are added to the tables in the same order
+        Rows = self.DatabaseRows(os.path.join(self.Dir, "serial"))
+        self.assertEqual(self.DatabaseRows(os.path.join(self.Dir, "parallel")), Rows)
+        # each C file and header has its own table of identifiers
+        self.assertEqual(len([Table for Table in Rows if Table.startswith("Identifier")]), len(FileList) + 3)
+
+    ## Return the rows of all tables in the Ecc database of a run directory
+    def DatabaseRows(self, RunDir):
+        Conn = sqlite3.connect(os.path.join(RunDir, "Ecc.db"))
+        try:
+            Tables = [Row[0] for Row in Conn.execute("select name from sqlite_master where type = 'table' order by name")]
+            return dict((Table, Conn.execute("select * from %s order by rowid" % Table).fetchall()) for Table in Tables)
+        finally:
+            Conn.close()
+
+    def test_corrupted_database(self):
+        RunDir = os.path.join(self.Dir, "run")
+        Output, Report = self.RunEcc(RunDir, "--incremental")
+        # the database left by a crash
+        with open(os.path.join(RunDir, "Ecc.db"), "r+b") as Fd:
+            Fd.seek(0)
+            Fd.write(b"\0" * 4096)
+        Output, NewReport = self.RunEcc(RunDir, "--incremental")
+        self.assertIn("is built again", Output)
+        self.assertEqual(self.ParsedFiles(Output), ["Other.c", "TestLib.c"])
+        self.assertEqual(NewReport, Report)
+
+TheTestSuite = TestTools.MakeTheTestSuite(locals())
+
+if __name__ == '__main__':
+    allTests = TheTestSuite()
+    unittest.TextTestRunner().run(allTests)
@@ -0,0 +1,263 @@
+## @file
+# Unit tests for the dispatch order of the modules in Eot
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+
+import random
+import re
+import unittest
+from collections import OrderedDict
+
+import TestTools
+
+# Eot creates its log files in the current directory
+EotMain = TestTools.ImportFromWorkspace("Eot.EotMain")
+
+## A section of a FFS, the image in it is the depex or the sections in it
+class SectionStub(object):
+    def __init__(self, Type, SubImage=None):
+        self.Type = Type
+        self._SubImages = {4 : SubImage}
+
+class SectionListStub(object):
+    def __init__(self, Sections):
+        self.Sections = Sections
+
+class DepexStub(object):
+    def __init__(self, Expression):
+        self.Expression = Expression
+        self._OPCODE_STRING_ = EotMain.Depex._OPCODE_STRING_
+
+class FfsStub(object):
+    def __init__(self, Type, Sections):
+        self.Type = Type
+        self.Sections = OrderedDict(enumerate(Sections))
+        self.Depex = ''
+
+## The report table of the database, with the PPIs and protocols produced by each module
+class ReportTableStub(object):
+    def __init__(self, Produced):
+        self.Produced = Produced
+
+    def Exec(self, SqlCommand):
+        if "ItemMode = 'Produced'" not in SqlCommand:
+            return []
+        ModuleGuid = re.search(r"Value2 like '([^']*)'", SqlCommand).group(1)
+        ItemType = re.search(r"ItemType = '(\w+)'", SqlCommand).group(1)
+        return [(Guid,) for Guid in self.Produced.get((ModuleGuid, ItemType), [])]
+
+class DatabaseStub(object):
+    def __init__(self, Produced):
+        self.TblReport = ReportTableStub(Produced)
+
+def GuidTuple(Guid):
+    Hex = Guid.replace('-', '')
+    return (int(Hex[0:8], 16), int(Hex[8:12], 16), int(Hex[12:16], 16)) + \
+           tuple(int(Hex[Index:Index + 2], 16) for Index in range(16, 32, 2))
+
+def RandomGuid(Rand):
+    return '%08X-%04X-%04X-%04X-%012X' % (Rand.getrandbits(32), Rand.getrandbits(16), Rand.getrandbits(16),
+                                          Rand.getrandbits(16), Rand.getrandbits(48))
+
+## A random FV, the same for the same seed
+class RandomFv(object):
+    def __init__(self, Seed):
+        Rand = random.Random(Seed)
+        self.Rand = Rand
+        self.ModuleList = [(RandomGuid(Rand), Rand.choice([0x02, 0x06, 0x08, 0x07, 0x07]))
+                           for _ in range(Rand.randint(1, 24))]
+        self.PpiList = [RandomGuid(Rand) for _ in range(Rand.randint(1, 8))]
+        self.ProtocolList = [RandomGuid(Rand) for _ in range(Rand.randint(1, 8))] + \
+                            [Guid.upper() for Guid in sorted(EotMain.EotGlobalData.gArchProtocolGuids)]
+        self.Produced = {}
+        for ModuleGuid, Type in self.ModuleList:
+            ItemType, GuidList = ('Ppi', self.PpiList) if Type in (0x06, 0x08) else ('Protocol', self.ProtocolList)
+            self.Produced[ModuleGuid, ItemType] = Rand.sample(GuidList, Rand.randint(0, min(3, len(GuidList))))
+        self.InstalledPpi = Rand.sample(self.PpiList, Rand.randint(0, min(2, len(self.PpiList))))
+        self.InstalledProtocol = Rand.sample(self.ProtocolList, Rand.randint(0, 2))
+        self.Ffs = [(ModuleGuid, self.RandomFfs(ModuleGuid, Type)) for ModuleGuid, Type in self.ModuleList]
+
+    def RandomExpression(self, GuidList, Depth=0):
+        Choice = self.Rand.random()
+        if Depth > 2 or Choice < 0.5:
+            if self.Rand.random() < 0.1:
+                return [self.Rand.choice([0x06, 0x07])]
+            return [0x02, GuidTuple(self.Rand.choice(GuidList))]
+        if Choice < 0.6:
+            return self.RandomExpression(GuidList, Depth + 1) + [0x05]
+        return self.RandomExpression(GuidList, Depth + 1) + self.RandomExpression(GuidList, Depth + 1) + \
+               [self.Rand.choice([0x03, 0x04])]
+
+    def RandomFfs(self, ModuleGuid, Type):
+        if Type in (0x06, 0x08):
+            DepexType, GuidList = 0x1B, self.PpiList
+        else:
+            DepexType, GuidList = 0x13, self.ProtocolList
+        Choice = self.Rand.random()
+        if Type == 0x02 or Choice < 0.15:
+            Depex = None
+        elif Type != 0x07 and Choice < 0.2:
+            # BEFORE or AFTER a PEIM
+            Target = self.Rand.choice([Guid for Guid, FfsType in self.ModuleList if FfsType in (0x06, 0x08)])
+            Depex = DepexStub([self.Rand.choice([0x00, 0x01]), GuidTuple(Target), 0x08])
+        else:
+            Depex = DepexStub(self.RandomExpression(GuidList) + [0x08])
+        Sections = [SectionStub(0x10)]
+        if Depex is not None:
+            Where = self.Rand.randint(0, 2)
+            if Where == 0:
+                Sections.append(SectionStub(DepexType, Depex))
+            elif Where == 1:
+                Sections.append(SectionStub(0x01, SectionListStub([SectionStub(0x10), SectionStub(DepexType, Depex)])))
+            else:
+                Sections.append(SectionStub(0x01, SectionListStub([SectionStub(0x02, SectionListStub([SectionStub(DepexType, Depex)]))])))
+        return FfsStub(Type, Sections)
+
+    ## Dispatch the PEIMs then the DXE drivers, return the order and the state after it
+    def Dispatch(self, FvClass):
+        Fv = FvClass()
+        for ModuleGuid, Ffs in self.Ffs:
+            Ffs.Depex = ''
+            Fv.UnDispatchedFfsDict[ModuleGuid] = Ffs
+        EotMain.EotGlobalData.gPpiList = {Guid.lower() : 'Core' for Guid in self.InstalledPpi}
+        EotMain.EotGlobalData.gProtocolList = {Guid.lower() : 'Core' for Guid in self.InstalledProtocol}
+        Db = DatabaseStub(self.Produced)
+        try:
+            Fv.DisPatchPei(Db)
+            Fv.DisPatchDxe(Db)
+            Error = None
+        except Exception as Excpt:
+            Error = type(Excpt)
+        return (Error, list(Fv.OrderedFfsDict), list(Fv.UnDispatchedFfsDict),
+                [Ffs.Depex for _, Ffs in self.Ffs],
+                EotMain.EotGlobalData.gPpiList, EotMain.EotGlobalData.gProtocolList)
+
+## The dispatcher before the modules were indexed by the GUIDs they wait for
+#
+# The schedule list of DisPatchDxe is walked over a copy of its items, it
+# raised "OrderedDict mutated during iteration" before
+#
+class PreviousFirmwareVolume(EotMain.FirmwareVolume):
+    def DisPatchDxe(self, Db):
+        IsInstalled = False
+        ScheduleList = OrderedDict()
+        for FfsID in list(self.UnDispatchedFfsDict.keys()):
+            CouldBeLoaded = False
+            DepexString = ''
+            FileDepex = None
+            Ffs = self.UnDispatchedFfsDict[FfsID]
+            if Ffs.Type == 0x07:
+                # Get Depex
+                IsFoundDepex = False
+                for Section in Ffs.Sections.values():
+                    # Find Depex
+                    if Section.Type == 0x13:
+                        IsFoundDepex = True
+                        CouldBeLoaded, DepexString, FileDepex = self.ParseDepex(Section._SubImages[4], 'Protocol')
+                        break
+                    if Section.Type == 0x01:
+                        CompressSections = Section._SubImages[4]
+                        for CompressSection in CompressSections.Sections:
+                            if CompressSection.Type == 0x13:
+                                IsFoundDepex = True
+                                CouldBeLoaded, DepexString, FileDepex = self.ParseDepex(CompressSection._SubImages[4], 'Protocol')
+                                break
+                            if CompressSection.Type == 0x02:
+                                NewSections = CompressSection._SubImages[4]
+                                for NewSection in NewSections.Sections:
+                                    if NewSection.Type == 0x13:
+                                        IsFoundDepex = True
+                                        CouldBeLoaded, DepexString, FileDepex = self.ParseDepex(NewSection._SubImages[4], 'Protocol')
+                                        break
+
+                # Not find Depex
+                if not IsFoundDepex:
+                    CouldBeLoaded = self.CheckArchProtocol()
+                    DepexString = ''
+                    FileDepex = None
+
+                # Append New Ffs
+                if CouldBeLoaded:
+                    IsInstalled = True
+                    NewFfs = self.UnDispatchedFfsDict.pop(FfsID)
+                    NewFfs.Depex = DepexString
+                    if FileDepex is not None:
+                        ScheduleList.insert(FileDepex[1], FfsID, NewFfs, FileDepex[0])
+                    else:
+                        ScheduleList[FfsID] = NewFfs
+                else:
+                    self.UnDispatchedFfsDict[FfsID].Depex = DepexString
+
+        for FfsID in list(ScheduleList.keys()):
+            NewFfs = ScheduleList.pop(FfsID)
+            self.OrderedFfsDict[FfsID] = NewFfs
+            self.LoadProtocol(Db, FfsID)
+
+        if IsInstalled:
+            self.DisPatchDxe(Db)
+
+    def DisPatchPei(self, Db):
+        IsInstalled = False
+        for FfsID in list(self.UnDispatchedFfsDict.keys()):
+            CouldBeLoaded = True
+            DepexString = ''
+            FileDepex = None
+            Ffs = self.UnDispatchedFfsDict[FfsID]
+            if Ffs.Type == 0x06 or Ffs.Type == 0x08:
+                # Get Depex
+                for Section in Ffs.Sections.values():
+                    if Section.Type == 0x1B:
+                        CouldBeLoaded, DepexString, FileDepex = self.ParseDepex(Section._SubImages[4], 'Ppi')
+                        break
+                    if Section.Type == 0x01:
+                        CompressSections = Section._SubImages[4]
+                        for CompressSection in CompressSections.Sections:
+                            if CompressSection.Type == 0x1B:
+                                CouldBeLoaded, DepexString, FileDepex = self.ParseDepex(CompressSection._SubImages[4], 'Ppi')
+                                break
+                            if CompressSection.Type == 0x02:
+                                NewSections = CompressSection._SubImages[4]
+                                for NewSection in NewSections.Sections:
+                                    if NewSection.Type == 0x1B:
+                                        CouldBeLoaded, DepexString, FileDepex = self.ParseDepex(NewSection._SubImages[4], 'Ppi')
+                                        break
+
+                # Append New Ffs
+                if CouldBeLoaded:
+                    IsInstalled = True
+                    NewFfs = self.UnDispatchedFfsDict.pop(FfsID)
+                    NewFfs.Depex = DepexString
+                    self.OrderedFfsDict[FfsID] = NewFfs
+                    self.LoadPpi(Db, FfsID)
+                else:
+                    self.UnDispatchedFfsDict[FfsID].Depex = DepexString
+
+        if IsInstalled:
+            self.DisPatchPei(Db)
+
+class TestEotDispatch(unittest.TestCase):
+    def setUp(self):
+        self.PpiList = EotMain.EotGlobalData.gPpiList
+        self.ProtocolList = EotMain.EotGlobalData.gProtocolList
+
+    def tearDown(self):
+        EotMain.EotGlobalData.gPpiList = self.PpiList
+        EotMain.EotGlobalData.gProtocolList = self.ProtocolList
+
+    def test_same_order(self):
+        Dispatched = 0
+        for Seed in range(300):
+            Fv = RandomFv(Seed)
+            Expected = Fv.Dispatch(PreviousFirmwareVolume)
+            self.assertEqual(Fv.Dispatch(EotMain.FirmwareVolume), Expected, "seed %d" % Seed)
+            if Expected[0] is None and Expected[2]:
+                Dispatched += 1
+        # most FVs are dispatched without error, and leave modules not dispatched
+        self.assertGreater(Dispatched, 100)
+
+TheTestSuite = TestTools.MakeTheTestSuite(locals())
+
+if __name__ == '__main__':
+    allTests = TheTestSuite()
+    unittest.TextTestRunner().run(allTests)
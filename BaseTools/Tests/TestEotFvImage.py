@@ -0,0 +1,109 @@
+## @file
+# Unit tests for the firmware volume parser of Eot
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+import TestTools
+
+# Eot creates its log files in the current directory
+EotMain = TestTools.ImportFromWorkspace("Eot.EotMain")
+
+FV_SIZE = 0x200
+FV_HEADER_SIZE = 0x48
+FV_ATTRIB_ERASE_POLARITY = 0x800
+FV_FILE_SYSTEM_GUID = "8C8CE578-8A3D-4F1C-9935-896185C32DD3"
+
+DRIVER_GUID = "1B45CC0A-156A-428A-AF62-49864DA0E6E6"
+PEIM_GUID = "2D2E62CF-9ECF-43B7-8219-94E7FC713DFE"
+PROTOCOL_GUID = "5B1B31A1-9562-11D2-8E3F-00A0C969723B"
+
+def GuidBytes(Guid):
+    Hex = Guid.replace('-', '')
+    return struct.pack("<1I2H", int(Hex[0:8], 16), int(Hex[8:12], 16), int(Hex[12:16], 16)) + bytes.fromhex(Hex[16:])
+
+def GuidTuple(Guid):
+    return struct.unpack("<1I2H8B", GuidBytes(Guid))
+
+def Section(Type, Payload):
+    Size = 4 + len(Payload)
+    Data = struct.pack("<3B 1B", Size & 0xFF, (Size >> 8) & 0xFF, Size >> 16, Type) + Payload
+    # sections are 4-byte aligned in the FFS
+    return Data + b'\0' * (-len(Data) % 4)
+
+def Ffs(Guid, Type, Sections):
+    Payload = b''.join(Sections)
+    Size = 24 + len(Payload)
+    return GuidBytes(Guid) + struct.pack("<2x 1B 1B 3B 1B", Type, 0, Size & 0xFF, (Size >> 8) & 0xFF, Size >> 16, 0xF8) + Payload
+
+## A FV with a driver and a PEIM, each with a depex and a UI section
+def FirmwareVolumeImage():
+    Driver = Ffs(DRIVER_GUID, 0x07, [
+        Section(0x10, b'MZ' + b'\0' * 6),
+        Section(0x13, b'\x02' + GuidBytes(PROTOCOL_GUID) + b'\x08'),
+        Section(0x15, "Driver".encode("utf-16-le") + b'\0\0'),
+        ])
+    Peim = Ffs(PEIM_GUID, 0x06, [
+        Section(0x1B, b'\x06\x08'),
+        Section(0x15, "Peim".encode("utf-16-le") + b'\0\0'),
+        ])
+    Files = Driver + b'\xff' * (-len(Driver) % 8) + Peim
+    Header = b'\0' * 16 + GuidBytes(FV_FILE_SYSTEM_GUID) + \
+             struct.pack("<1Q 4s 1I 1H 1H", FV_SIZE, b'_FVH', FV_ATTRIB_ERASE_POLARITY, FV_HEADER_SIZE, 0x1234)
+    Header += b'\0' * (FV_HEADER_SIZE - len(Header))
+    Image = Header + Files
+    return Image + b'\xff' * (FV_SIZE - len(Image)), len(Driver), len(Peim)
+
+class TestEotFvImage(unittest.TestCase):
+    def setUp(self):
+        self.Dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.Dir, True)
+
+    def test_parse(self):
+        Image, DriverSize, PeimSize = FirmwareVolumeImage()
+        FvPath = os.path.join(self.Dir, "DXEFV.Fv")
+        with open(FvPath, "wb") as Fd:
+            Fd.write(Image)
+
+        # the empty entries of the list are skipped
+        Fv = EotMain.MultipleFv(["", FvPath, " "])
+        self.assertEqual(Fv.BasicInfo, [["DXEFV", FV_FILE_SYSTEM_GUID, FV_SIZE]])
+        self.assertEqual(list(Fv.FfsDict), [DRIVER_GUID, PEIM_GUID])
+
+        Driver = Fv.FfsDict[DRIVER_GUID]
+        self.assertEqual((Driver.Type, Driver.Size, Driver.State, Driver._OFF_), (0x07, DriverSize, 0xF8, FV_HEADER_SIZE))
+        self.assertEqual([Section.Type for Section in Driver.Sections.values()], [0x10, 0x13, 0x15])
+        self.assertEqual(list(Driver.Sections), [24, 36, 60])
+        Pe32, DepexSection, UiSection = Driver.Sections.values()
+        self.assertEqual(bytes(Pe32[4:6]), b'MZ')
+        self.assertEqual(DepexSection._SubImages[4].Expression, [0x02, GuidTuple(PROTOCOL_GUID), 0x08])
+        self.assertEqual(UiSection._SubImages[4].String, "Driver")
+        self.assertEqual(Driver.FreeSpace, (-DriverSize % 8))
+
+        Peim = Fv.FfsDict[PEIM_GUID]
+        self.assertEqual((Peim.Type, Peim.Size), (0x06, PeimSize))
+        self.assertEqual(Peim.Sections[24]._SubImages[4].Expression, [0x06, 0x08])
+        self.assertEqual(Peim.Sections[32]._SubImages[4].String, "Peim")
+        # the rest of the FV is free space
+        self.assertEqual(Peim.FreeSpace, FV_SIZE - Peim._OFF_ - PeimSize)
+
+        # the images refer to the bytes of the file, a field set copies them
+        self.assertEqual(bytes(Driver._DATA_), Image[FV_HEADER_SIZE:FV_HEADER_SIZE + DriverSize])
+        Driver.State = 0xF0
+        self.assertEqual(Driver.State, 0xF0)
+        self.assertEqual(bytes(Driver._BUF_[Driver._OFF_:Driver._OFF_ + DriverSize]),
+                         Image[FV_HEADER_SIZE:FV_HEADER_SIZE + DriverSize])
+
+TheTestSuite = TestTools.MakeTheTestSuite(locals())
+
+if __name__ == '__main__':
+    allTests = TheTestSuite()
+    unittest.TextTestRunner().run(allTests)
@@ -0,0 +1,82 @@
+## @file
+# Unit tests for the workspace file index
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import TestTools
+from Common.FileIndex import FileIndex
+
+class TestFileIndex(unittest.TestCase):
+    def setUp(self):
+        self.Workspace = tempfile.mkdtemp()
+        self.PackagesPath = tempfile.mkdtemp()
+        self.CreateFile(self.Workspace, "MdePkg", "Include", "Base.h")
+        self.CreateFile(self.PackagesPath, "OtherPkg", "OtherPkg.dec")
+
+    def tearDown(self):
+        shutil.rmtree(self.Workspace)
+        shutil.rmtree(self.PackagesPath)
+
+    def CreateFile(self, *Names):
+        Path = os.path.join(*Names)
+        if not os.path.isdir(os.path.dirname(Path)):
+            os.makedirs(os.path.dirname(Path))
+        with open(Path, "w") as Fd:
+            Fd.write(Path)
+        return Path
+
+    def test_real_path(self):
+        Index = FileIndex(self.Workspace, [self.PackagesPath])
+        Base = os.path.join(self.Workspace, "MdePkg", "Include", "Base.h")
+        self.assertEqual(Index[Base], Base)
+        self.assertEqual(Index[os.path.join(self.Workspace, "mdepkg", "INCLUDE", "base.h")], Base)
+        self.assertEqual(Index[os.path.join("MdePkg", "Include", "Base.h")], Base)
+        self.assertEqual(Index[self.Workspace], self.Workspace)
+        self.assertIsNone(Index[os.path.join(self.Workspace, "MdePkg", "Base.h")])
+        self.assertIsNone(Index[os.path.join(Base, "Base.h")])
+        Dec = os.path.join(self.PackagesPath, "OtherPkg", "OtherPkg.dec")
+        self.assertEqual(Index[os.path.join(self.PackagesPath, "OTHERPKG", "OtherPkg.dec")], Dec)
+
+    def test_file_state(self):
+        Index = FileIndex(self.Workspace)
+        Include = os.path.join(self.Workspace, "MdePkg", "Include")
+        Base = os.path.join(Include, "Base.h")
+        self.assertTrue(Index.Exists(Base))
+        self.assertTrue(Index.IsFile(Base))
+        self.assertFalse(Index.IsDir(Base))
+        self.assertTrue(Index.IsDir(Include))
+        self.assertFalse(Index.IsFile(Include))
+        self.assertFalse(Index.Exists(os.path.join(Include, "Uefi.h")))
+        self.assertEqual(Index.GetTimeStamp(Base), os.stat(Base)[8])
+        # the time stamp of a file changed without Update is not stale
+        os.utime(Base, (0, 1000))
+        self.assertEqual(Index.GetTimeStamp(Base), 1000)
+        # paths out of the workspace are checked in the file system
+        Dec = os.path.join(self.PackagesPath, "OtherPkg", "OtherPkg.dec")
+        self.assertTrue(Index.IsFile(Dec))
+        self.assertEqual(Index[Dec], Dec)
+
+    def test_update(self):
+        Index = FileIndex(self.Workspace)
+        Uefi = os.path.join(self.Workspace, "MdePkg", "Include", "Uefi", "Uefi.h")
+        self.assertFalse(Index.Exists(Uefi))
+        self.CreateFile(Uefi)
+        self.assertFalse(Index.Exists(Uefi))
+        Index.Update(Uefi)
+        self.assertTrue(Index.IsFile(Uefi))
+        shutil.rmtree(os.path.join(self.Workspace, "MdePkg"))
+        Index.Update(os.path.join(self.Workspace, "MdePkg"))
+        self.assertFalse(Index.Exists(Uefi))
+        self.assertFalse(Index.IsDir(os.path.join(self.Workspace, "MdePkg")))
+
+TheTestSuite = TestTools.MakeTheTestSuite(locals())
+
+if __name__ == '__main__':
+    allTests = TheTestSuite()
+    unittest.TextTestRunner().run(allTests)
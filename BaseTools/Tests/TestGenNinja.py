@@ -0,0 +1,133 @@
+## @file
+# Unit tests for the ninja file generator
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import TestTools
+from AutoGen.GenNinja import NinjaFile
+
+BaseToolsDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PythonSourceDir = os.path.join(BaseToolsDir, "Source", "Python")
+
+MakefileContent = '''\
+MODULE_NAME = %(name)s
+MODULE_BUILD_DIR = %(dir)s
+OUTPUT_DIR = $(MODULE_BUILD_DIR)/OUTPUT
+DEBUG_DIR = $(MODULE_BUILD_DIR)/DEBUG
+MAKE_FILE = $(MODULE_BUILD_DIR)/GNUmakefile
+CC = gcc
+RM = rm -f
+CC_FLAGS = -Os
+INC = -I$(MODULE_BUILD_DIR)
+FORCE_REBUILD = force_build
+CODA_TARGET = %(coda)s \\
+
+
+tbuild: $(CODA_TARGET)
+
+force_build:
+\t-@
+
+$(OUTPUT_DIR)/%(name)s.obj : $(MAKE_FILE)
+$(OUTPUT_DIR)/%(name)s.obj : $(MODULE_BUILD_DIR)/%(name)s.c
+\t"$(CC)" $(CC_FLAGS) -c -o $(OUTPUT_DIR)/%(name)s.obj $(INC) $(MODULE_BUILD_DIR)/%(name)s.c
+
+$(OUTPUT_DIR)/%(name)s.lib : $(OUTPUT_DIR)/%(name)s.obj
+\t-$(RM) $(OUTPUT_DIR)/%(name)s.lib
+\tar cr $(OUTPUT_DIR)/%(name)s.lib $(OUTPUT_DIR)/%(name)s.obj
+
+$(DEBUG_DIR)/%(name)s.efi : $(OUTPUT_DIR)/%(name)s.obj $(FORCE_REBUILD)
+\tcp $(OUTPUT_DIR)/%(name)s.obj $(DEBUG_DIR)/%(name)s.efi
+'''
+
+## Minimum set of ModuleAutoGen attributes used by NinjaFile
+class ModuleInfo(object):
+    def __init__(self, BuildDir, Name, Coda, LibraryList=()):
+        self.MakeFileDir = os.path.join(BuildDir, Name)
+        self.BuildDir = self.MakeFileDir
+        self.Name = Name
+        self.MetaFile = Name + ".inf"
+        self.Arch = "X64"
+        self.ToolChainFamily = "GCC"
+        self.BuildCommand = ["make"]
+        self.IsBinaryModule = False
+        self.LibraryAutoGenList = list(LibraryList)
+        os.makedirs(self.MakeFileDir)
+        with open(os.path.join(self.MakeFileDir, "%s.c" % Name), "w") as Fd:
+            Fd.write("int a;\n")
+        with open(os.path.join(self.MakeFileDir, "GNUmakefile"), "w") as Fd:
+            Fd.write(MakefileContent % {"name" : Name, "dir" : self.MakeFileDir, "coda" : Coda % {"name" : Name}})
+
+    def CanSkipbyHash(self):
+        return False
+
+class TestGenNinja(unittest.TestCase):
+    def setUp(self):
+        self.Dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.Dir, True)
+
+    def test_generate(self):
+        Lib = ModuleInfo(self.Dir, "BaseLib", "$(OUTPUT_DIR)/%(name)s.lib")
+        Driver = ModuleInfo(self.Dir, "Driver", "$(DEBUG_DIR)/%(name)s.efi", [Lib])
+        Ninja = NinjaFile(self.Dir, [Driver, Lib], "GNUmakefile")
+        self.assertTrue(Ninja.Generate())
+        with open(Ninja.FilePath) as Fd:
+            Content = Fd.read()
+
+        LibTarget = os.path.join(Lib.MakeFileDir, "tbuild")
+        DrvTarget = os.path.join(Driver.MakeFileDir, "tbuild")
+        # library appears once and before the module using it
+        self.assertEqual(Content.count("build %s: phony" % LibTarget), 1)
+        self.assertLess(Content.index(LibTarget), Content.index("build %s" % DrvTarget))
+        self.assertIn("default %s %s\n" % (DrvTarget, LibTarget), Content)
+
+        # libraries are order-only dependencies of the module commands
+        self.assertIn("%s/Driver.c || %s\n" % (Driver.MakeFileDir, LibTarget), Content)
+        # compile command writes a depfile read by ninja
+        ObjFile = os.path.join(Lib.MakeFileDir, "OUTPUT", "BaseLib.obj")
+        self.assertIn("build %s: cc %s/GNUmakefile %s/BaseLib.c\n" % (ObjFile, Lib.MakeFileDir, Lib.MakeFileDir), Content)
+        self.assertIn("  depfile = %s.deps\n" % ObjFile, Content)
+        self.assertIn('-MMD -MF "%s.deps"' % ObjFile, Content)
+        # ignored errors and forced rebuild
+        self.assertIn("(rm -f %s/OUTPUT/BaseLib.lib) || true" % Lib.MakeFileDir, Content)
+        self.assertIn("build %s: phony\n" % os.path.join(Driver.MakeFileDir, "force_build"), Content)
+
+        # unchanged content is not written again
+        self.assertFalse(NinjaFile(self.Dir, [Driver, Lib], "GNUmakefile").Generate())
+
+    def test_unsupported_build(self):
+        os.makedirs(os.path.join(self.Dir, "Conf"))
+        for Name in ("target", "tools_def", "build_rule"):
+            shutil.copy(os.path.join(BaseToolsDir, "Conf", Name + ".template"),
+                        os.path.join(self.Dir, "Conf", Name + ".txt"))
+        os.makedirs(os.path.join(self.Dir, "Pkg"))
+        for Name in ("Pkg.dsc", "Driver.inf"):
+            open(os.path.join(self.Dir, "Pkg", Name), "w").close()
+        Env = dict(os.environ, WORKSPACE=self.Dir, EDK_TOOLS_PATH=BaseToolsDir, PYTHONPATH=PythonSourceDir)
+        Env.pop("CONF_PATH", None)
+        Env.pop("PACKAGES_PATH", None)
+        # ninja only builds all modules of a platform
+        for Args, Message in ((["clean"], "--ninja is not supported with the target [clean]."),
+                              (["fds"], "--ninja is not supported with the target [fds]."),
+                              (["-m", "Pkg/Driver.inf"], "--ninja can not be used together with -m.")):
+            Command = [sys.executable, os.path.join(PythonSourceDir, "build", "build.py"),
+                       "-p", "Pkg/Pkg.dsc", "-a", "X64", "-t", "GCC5", "-b", "DEBUG", "--ninja"] + Args
+            Proc = subprocess.Popen(Command, cwd=self.Dir, env=Env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+            Output = Proc.communicate()[0].decode("utf-8", "ignore")
+            self.assertIn(Message, Output)
+
+TheTestSuite = TestTools.MakeTheTestSuite(locals())
+
+if __name__ == '__main__':
+    allTests = TheTestSuite()
+    unittest.TextTestRunner().run(allTests)
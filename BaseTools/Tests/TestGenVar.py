@@ -0,0 +1,127 @@
+## @file
+# Unit tests for the dynamic HII variable packing of AutoGen.GenVar
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+
+import hashlib
+import unittest
+
+import TestTools
+from AutoGen.GenVar import VariableMgr, var_info
+
+SkuIds = {"DEFAULT" : (0, "DEFAULT", "DEFAULT"), "SKU1" : (1, "SKU1", "DEFAULT"), "SKU2" : (2, "SKU2", "SKU1")}
+DefaultStores = {"STANDARD" : (0, "STANDARD"), "MANUFACTURING" : (1, "MANUFACTURING")}
+NumericTypes = ["UINT8", "UINT16", "UINT32", "UINT64", "BOOLEAN"]
+NumericSize = {"UINT8" : 1, "UINT16" : 2, "UINT32" : 4, "UINT64" : 8, "BOOLEAN" : 1}
+
+## Linear congruential generator, so the variables don't depend on the random module
+class Generator(object):
+    def __init__(self, Seed):
+        self.State = Seed
+
+    def Next(self, Limit):
+        self.State = (self.State * 1103515245 + 12345) & 0x7FFFFFFF
+        return self.State % Limit
+
+def ToArray(Data):
+    return "{%s}" % ",".join("0x%02x" % Byte for Byte in Data)
+
+## Build the variables of the PCDs in all SKUs and default stores
+#
+#   @param  Seed            Seed of the generator
+#   @param  Count           Number of variables
+#   @param  ArraySize       Size of the VOID* PCDs
+#
+def BuildVariables(Seed, Count, ArraySize):
+    Gen = Generator(Seed)
+    Mgr = VariableMgr(DefaultStores, SkuIds)
+    DscLine = 0
+    for Index in range(Count):
+        Name = ToArray(("Var%d" % Index).encode("utf-16-le") + b"\0\0")
+        Guid = "%08x-1234-5678-9abc-def012345678" % Index
+        Items = []
+        Offset = 0
+        for Field in range(1 + Gen.Next(4)):
+            if Gen.Next(3) == 0:
+                DataType = "VOID*"
+                Size = 1 + Gen.Next(ArraySize)
+            else:
+                DataType = NumericTypes[Gen.Next(len(NumericTypes))]
+                Size = NumericSize[DataType]
+            Items.append((Field, DataType, Offset, Size))
+            Offset += Size + Gen.Next(3)
+        for Sku in SkuIds:
+            for Store in DefaultStores:
+                if (Sku, Store) != ("DEFAULT", "STANDARD") and Gen.Next(3) == 0:
+                    continue
+                for Field, DataType, Offset, Size in Items:
+                    DscLine += 1
+                    if DataType == "VOID*":
+                        Data = bytearray(Gen.Next(256) for Byte in range(Size))
+                        if (Sku, Store) != ("DEFAULT", "STANDARD"):
+                            # most of the bytes are the same as the default
+                            Data = bytearray(Byte if Gen.Next(8) else (Byte + 1) & 0xFF for Byte in Data)
+                        Value = ToArray(Data)
+                    elif DataType == "BOOLEAN":
+                        Value = str(Gen.Next(2))
+                    else:
+                        Value = hex(Gen.Next(1 << min(8 * Size, 31)))
+                    Mgr.append_variable(var_info(Index, "Pcd%d_%d" % (Index, Field), Store, Sku, Name, Guid, hex(Offset),
+                                                 "NV,BS", Value, Value, DataType, DscLine, False))
+    return Mgr
+
+class TestVariableMgr(unittest.TestCase):
+    def Digest(self, Seed, Count, ArraySize, MaxSize=0):
+        Mgr = BuildVariables(Seed, Count, ArraySize)
+        Mgr.SetVpdRegionMaxSize(MaxSize)
+        Value = Mgr.dump() + Mgr.PatchNVStoreDefaultMaxSize(MaxSize + 0x1000)
+        return hashlib.md5(Value.encode()).hexdigest(), len(Value)
+
+    def test_calculate_delta(self):
+        Default = bytes(range(256)) * 4
+        Other = bytearray(Default)
+        for Offset in (0, 1, 63, 64, 500, 1023):
+            Other[Offset] ^= 0x5A
+        self.assertEqual(VariableMgr.calculate_delta(Default, Other), [(Offset, Other[Offset]) for Offset in (0, 1, 63, 64, 500, 1023)])
+        self.assertEqual(VariableMgr.calculate_delta(Default, Default), [])
+        self.assertEqual(VariableMgr.calculate_delta((1, 2, 3), (1, 4, 3)), [(1, 4)])
+
+    def test_small(self):
+        Mgr = VariableMgr(DefaultStores, SkuIds)
+        Name = ToArray("A".encode("utf-16-le") + b"\0\0")
+        Guid = "8be4df61-93ca-11d2-aa0d-00e098032b8c"
+        Mgr.append_variable(var_info(0, "PcdA", "STANDARD", "DEFAULT", Name, Guid, "0x0", "NV,BS", "0x1234", "0x1234", "UINT16", 1, False))
+        Mgr.append_variable(var_info(0, "PcdB", "STANDARD", "DEFAULT", Name, Guid, "0x4", "NV,BS", "{0x01,0x02}", "{0x01,0x02}", "VOID*", 2, False))
+        Mgr.append_variable(var_info(0, "PcdA", "STANDARD", "SKU1", Name, Guid, "0x0", "NV,BS", "0x1235", "0x1235", "UINT16", 3, False))
+        Mgr.append_variable(var_info(0, "PcdB", "STANDARD", "SKU1", Name, Guid, "0x4", "NV,BS", "{0x01,0x03}", "{0x01,0x03}", "VOID*", 4, False))
+        self.assertEqual(Mgr.dump(), SmallResult)
+
+    def test_variables(self):
+        for Seed, Count, ArraySize, MaxSize, Expected in VariableResults:
+            self.assertEqual(self.Digest(Seed, Count, ArraySize, MaxSize), Expected)
+
+#
+# The results of the packing before it used bytearray and memoryview
+#
+SmallResult = (
+    "{0x4e,0x53,0x44,0x42,0x90,0x0,0x0,0x0,0x90,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x60,0x0,0x0,0x0,"
+    "0x14,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,"
+    "0x16,0x36,0xcf,0xdd,0x75,0x32,0x64,0x41,0x98,0xb6,0xfe,0x85,0x70,0x7f,0xfe,0x7d,0x48,0x0,0x0,0x0,"
+    "0x5a,0xfe,0x0,0x0,0x0,0x0,0x0,0x0,0xaa,0x55,0x3f,0x0,0x3,0x0,0x0,0x0,0x4,0x0,0x0,0x0,"
+    "0x6,0x0,0x0,0x0,0x61,0xdf,0xe4,0x8b,0xca,0x93,0xd2,0x11,0xaa,0xd,0x0,0xe0,0x98,0x3,0x2b,0x8c,"
+    "0x41,0x0,0x0,0x0,0x34,0x12,0x0,0x0,0x1,0x2,0x0,0x0,0x20,0x0,0x0,0x0,0x14,0x0,0x0,0x0,"
+    "0x1,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x40,0x0,0x0,0x35,"
+    "0x45,0x0,0x0,0x3}"
+    )
+VariableResults = [
+    (1, 8, 16, 0, ('01029aa1e6d67c349076d1bd68c53c6d', 15977)),
+    (7, 40, 300, 0x10000, ('e5ee2a5c589c7f6ae8b62c34dbe19786', 565753)),
+    (11, 6, 2000, 0, ('c55bda0ef27493caff2338e3f6390ec6', 294541)),
+    ]
+
+TheTestSuite = TestTools.MakeTheTestSuite(locals())
+
+if __name__ == '__main__':
+    allTests = TheTestSuite()
+    unittest.TextTestRunner().run(allTests)
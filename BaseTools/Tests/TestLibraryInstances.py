@@ -0,0 +1,98 @@
+## @file
+# Unit tests for the library instance resolution of modules
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+
+import unittest
+from collections import OrderedDict
+
+import TestTools
+from Workspace.BuildClassObject import LibraryClassObject
+from Workspace.WorkspaceCommon import GetModuleLibInstances
+
+## Minimum set of InfBuildData attributes used by GetModuleLibInstances
+class ModuleData(object):
+    def __init__(self, Path, ModuleType, LibraryClasses=(), LibraryClass=None, Constructor=False):
+        self.Path = Path
+        self.ModuleType = ModuleType
+        self.LibraryClasses = OrderedDict((Name, None) for Name in LibraryClasses)
+        self.LibraryClass = [LibraryClassObject(LibraryClass, [ModuleType])] if LibraryClass else []
+        self.ConstructorList = ["%sConstructor" % LibraryClass] if Constructor else []
+        self.LibInstances = []
+        self.ReferenceModules = set()
+
+    def SetReferenceModule(self, Module):
+        self.ReferenceModules.add(Module)
+        return self
+
+    def __str__(self):
+        return self.Path
+
+class LibraryClassDict(dict):
+    def GetKeys(self):
+        return [Key[0] for Key in self]
+
+    def __getitem__(self, Key):
+        return self.get(Key)
+
+class ModuleOverride(object):
+    def __init__(self, LibraryClasses=None):
+        self.LibraryClasses = LibraryClasses or {}
+
+class PlatformData(object):
+    def __init__(self):
+        self.LibraryClasses = LibraryClassDict()
+        self.Modules = {}
+        self.LibInstanceCache = {}
+
+class TestLibraryInstances(unittest.TestCase):
+    def setUp(self):
+        self.Platform = PlatformData()
+        self.Database = {}
+        self.AddLibrary("BaseLib", [], True)
+        self.AddLibrary("DebugLib", ["BaseLib"])
+        self.AddLibrary("PrintLib", ["BaseLib", "DebugLib"], True)
+
+    def AddLibrary(self, Name, LibraryClasses, Constructor=False, Path=None):
+        Path = Path or "%s/%s.inf" % (Name, Name)
+        self.Database[Path, "X64", "DEBUG", "GCC5"] = ModuleData(Path, "DXE_DRIVER", LibraryClasses, Name, Constructor)
+        self.Platform.LibraryClasses.setdefault((Name, "DXE_DRIVER"), Path)
+        return Path
+
+    def AddModule(self, Name, LibraryClasses, Overrides=None):
+        Module = ModuleData("%s/%s.inf" % (Name, Name), "DXE_DRIVER", LibraryClasses)
+        self.Platform.Modules[str(Module)] = ModuleOverride(Overrides)
+        return Module
+
+    def Resolve(self, Module):
+        return GetModuleLibInstances(Module, self.Platform, self.Database, "X64", "DEBUG", "GCC5")
+
+    def test_shared_resolution(self):
+        First = self.AddModule("First", ["PrintLib", "DebugLib"])
+        Second = self.AddModule("Second", ["PrintLib", "DebugLib"])
+        Libs = self.Resolve(First)
+        self.assertEqual([str(Lib) for Lib in Libs], ["BaseLib/BaseLib.inf", "DebugLib/DebugLib.inf", "PrintLib/PrintLib.inf"])
+        self.assertEqual(len(self.Platform.LibInstanceCache), 1)
+
+        # same library instances, in the same order, from the cache
+        self.assertEqual(self.Resolve(Second), Libs)
+        self.assertEqual(Second.LibInstances, Libs)
+        self.assertIsNot(Second.LibInstances, First.LibInstances)
+        self.assertEqual(len(self.Platform.LibInstanceCache), 1)
+        for Lib in Libs:
+            self.assertEqual(Lib.ReferenceModules, {First, Second})
+
+    def test_override(self):
+        OtherPath = self.AddLibrary("DebugLib", ["BaseLib"], Path="OtherDebugLib/OtherDebugLib.inf")
+        First = self.AddModule("First", ["DebugLib"])
+        Second = self.AddModule("Second", ["DebugLib"], {"DebugLib" : OtherPath})
+        self.assertEqual([str(Lib) for Lib in self.Resolve(First)], ["BaseLib/BaseLib.inf", "DebugLib/DebugLib.inf"])
+        self.assertEqual([str(Lib) for Lib in self.Resolve(Second)], ["BaseLib/BaseLib.inf", OtherPath])
+        self.assertEqual(len(self.Platform.LibInstanceCache), 2)
+
+TheTestSuite = TestTools.MakeTheTestSuite(locals())
+
+if __name__ == '__main__':
+    allTests = TheTestSuite()
+    unittest.TextTestRunner().run(allTests)
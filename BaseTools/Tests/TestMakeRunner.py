@@ -0,0 +1,136 @@
+## @file
+# Unit tests for running module makefile rules without make
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+import TestTools
+from AutoGen.MakeRunner import MakefileRunner, StatCache
+from Common.BuildToolError import FatalError
+
+MakefileContent = '''\
+#
+# DO NOT EDIT
+#
+MAKE_FLAGS = -s
+MODULE_NAME = Sample
+MODULE_BUILD_DIR = %(dir)s
+OUTPUT_DIR = $(MODULE_BUILD_DIR)/OUTPUT
+DEBUG_DIR = $(MODULE_BUILD_DIR)/DEBUG
+MAKE_FILE = $(MODULE_BUILD_DIR)/GNUmakefile
+CP = %(python)s copy.py
+FORCE_REBUILD = force_build
+OBJLIST_0 = $(OUTPUT_DIR)/a.obj \\
+    $(OUTPUT_DIR)/b.obj
+
+CODA_TARGET = $(DEBUG_DIR)/$(MODULE_NAME).efi \\
+
+
+all: mbuild
+
+tbuild: $(CODA_TARGET)
+
+force_build:
+\t-@
+
+dirs:
+\t-@%(python)s -c "import os; [os.path.isdir(d) or os.makedirs(d) for d in ('OUTPUT', 'DEBUG')]"
+
+$(OBJLIST_0): $(MAKE_FILE) \\
+\t$(MODULE_BUILD_DIR)/a.c \\
+\t$(MODULE_BUILD_DIR)/b.c
+\t$(CP) a.c $(OUTPUT_DIR)/a.obj
+\t$(CP) b.c $(OUTPUT_DIR)/b.obj
+
+$(DEBUG_DIR)/$(MODULE_NAME).efi : dirs $(OUTPUT_DIR)/a.obj $(OUTPUT_DIR)/b.obj
+\t$(CP) $(OUTPUT_DIR)/a.obj $(DEBUG_DIR)/$(MODULE_NAME).efi
+
+forced : $(FORCE_REBUILD)
+\t@%(python)s copy.py a.c forced.out
+
+copies : $(OUTPUT_DIR)/x.out $(OUTPUT_DIR)/y.out
+
+$(OUTPUT_DIR)/x.out $(OUTPUT_DIR)/y.out : a.c
+\t$(CP) a.c $@
+'''
+
+CopyScript = '''\
+import shutil, sys
+shutil.copyfile(sys.argv[1], sys.argv[2])
+'''
+
+class TestMakeRunner(unittest.TestCase):
+    def setUp(self):
+        self.Dir = tempfile.mkdtemp()
+        for Name, Content in (("copy.py", CopyScript), ("a.c", "a"), ("b.c", "b"),
+                              ("GNUmakefile", MakefileContent % {"dir" : self.Dir, "python" : sys.executable})):
+            with open(os.path.join(self.Dir, Name), "w") as Fd:
+                Fd.write(Content)
+        os.makedirs(os.path.join(self.Dir, "OUTPUT"))
+        os.makedirs(os.path.join(self.Dir, "DEBUG"))
+
+    def tearDown(self):
+        shutil.rmtree(self.Dir, True)
+
+    def Runner(self):
+        return MakefileRunner(os.path.join(self.Dir, "GNUmakefile"), self.Dir, Cache=StatCache())
+
+    def Run(self, Target):
+        Runner = self.Runner()
+        Runner.Run(Target)
+        return Runner.CommandCount
+
+    def test_incremental(self):
+        # dirs is phony and always runs, objects are built once for both targets
+        self.assertEqual(self.Run("tbuild"), 4)
+        self.assertTrue(os.path.isfile(os.path.join(self.Dir, "DEBUG", "Sample.efi")))
+
+        # dirs makes the image always out of date, like make does
+        self.assertEqual(self.Run("tbuild"), 2)
+
+        Future = time.time() + 10
+        os.utime(os.path.join(self.Dir, "b.c"), (Future, Future))
+        self.assertEqual(self.Run(os.path.join(self.Dir, "OUTPUT", "a.obj")), 2)
+
+    def test_force_rebuild(self):
+        self.assertEqual(self.Run("forced"), 1)
+        self.assertEqual(self.Run("forced"), 1)
+
+    def test_several_targets(self):
+        # the command runs for each target, with its own $@
+        self.assertEqual(self.Run("copies"), 2)
+        for Name in ("x.out", "y.out"):
+            self.assertTrue(os.path.isfile(os.path.join(self.Dir, "OUTPUT", Name)))
+        self.assertEqual(self.Run("copies"), 0)
+
+        os.remove(os.path.join(self.Dir, "OUTPUT", "y.out"))
+        self.assertEqual(self.Run("copies"), 1)
+
+    def test_make_flags(self):
+        # the MAKE_FLAGS of the makefile is used before the one of the environment
+        SavedFlags = os.environ.get("MAKE_FLAGS")
+        os.environ["MAKE_FLAGS"] = "-k"
+        try:
+            self.assertTrue(self.Runner().Silent)
+        finally:
+            if SavedFlags is None:
+                del os.environ["MAKE_FLAGS"]
+            else:
+                os.environ["MAKE_FLAGS"] = SavedFlags
+
+    def test_missing_prerequisite(self):
+        os.remove(os.path.join(self.Dir, "a.c"))
+        self.assertRaises(FatalError, self.Run, "tbuild")
+
+TheTestSuite = TestTools.MakeTheTestSuite(locals())
+
+if __name__ == '__main__':
+    allTests = TheTestSuite()
+    unittest.TextTestRunner().run(allTests)
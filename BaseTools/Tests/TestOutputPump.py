@@ -0,0 +1,80 @@
+## @file
+# Unit tests for the build output pump
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+
+import sys
+import threading
+import unittest
+from subprocess import Popen, PIPE
+
+import TestTools
+from Common.OutputPump import OutputPump
+import Common.EdkLogger as EdkLogger
+
+class Collector(object):
+    def __init__(self):
+        self.Lines = []
+        self.Calls = 0
+        self.Lock = threading.Lock()
+
+    def __call__(self, Message):
+        with self.Lock:
+            self.Calls += 1
+            self.Lines.extend(Message.split("\n"))
+
+def LaunchPython(Script):
+    return Popen([sys.executable, "-c", Script], stdout=PIPE, stderr=PIPE, bufsize=-1)
+
+class TestOutputPump(unittest.TestCase):
+    def test_lines_delivered_in_order(self):
+        Out = Collector()
+        Err = Collector()
+        Proc = LaunchPython("import sys\n"
+                            "for i in range(2000): print('out %d' % i)\n"
+                            "sys.stderr.write('err line\\npartial')\n")
+        Watch = OutputPump.Get().Watch(Proc, Out, Err)
+        Proc.wait()
+        self.assertTrue(Watch.Wait(30))
+        self.assertEqual(Out.Lines, ['out %d' % i for i in range(2000)])
+        self.assertEqual(Err.Lines, ['err line', 'partial'])
+        # lines are handed over in batches, not one call per line
+        self.assertLess(Out.Calls, 2000)
+
+    def test_many_concurrent_processes(self):
+        Outputs = [Collector() for _ in range(32)]
+        Procs = [LaunchPython("print('job %d')\nprint('')\nprint('end')" % Index) for Index in range(32)]
+        Watches = [OutputPump.Get().Watch(Proc, Out, Out) for Proc, Out in zip(Procs, Outputs)]
+        for Index, (Proc, Watch) in enumerate(zip(Procs, Watches)):
+            Proc.wait()
+            self.assertTrue(Watch.Wait(30))
+            self.assertEqual(Outputs[Index].Lines, ['job %d' % Index, '', 'end'])
+
+    def test_logger_failure(self):
+        def Failing(Message):
+            raise ValueError("logger failure")
+        Logged = []
+        OldError = EdkLogger.error
+        EdkLogger.error = lambda *Args, **Kwargs: Logged.append(Kwargs.get("ExtraData"))
+        try:
+            Proc = LaunchPython("print('lost')")
+            Watch = OutputPump.Get().Watch(Proc, Failing, Failing)
+            Proc.wait()
+            self.assertTrue(Watch.Wait(30))
+        finally:
+            EdkLogger.error = OldError
+        # the output is reported along with the error, and the pump keeps running
+        self.assertEqual(Logged, ['lost'])
+        Out = Collector()
+        Proc = LaunchPython("print('next')")
+        Watch = OutputPump.Get().Watch(Proc, Out, Out)
+        Proc.wait()
+        self.assertTrue(Watch.Wait(30))
+        self.assertEqual(Out.Lines, ['next'])
+
+TheTestSuite = TestTools.MakeTheTestSuite(locals())
+
+if __name__ == '__main__':
+    allTests = TheTestSuite()
+    unittest.TextTestRunner().run(allTests)
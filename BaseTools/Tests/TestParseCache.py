@@ -0,0 +1,60 @@
+## @file
+# Unit tests for the cache of the results of parsing the C source files by Eot
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+import TestTools
+from Eot import ParseCache
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.TempDir = tempfile.mkdtemp()
+        self.DbPath = os.path.join(self.TempDir, ParseCache.PARSE_CACHE_PATH)
+
+    def tearDown(self):
+        shutil.rmtree(self.TempDir)
+
+    def test_persist(self):
+        Cache = ParseCache.ParseCache(self.DbPath)
+        self.assertIsNone(Cache.Get("d1"))
+        Cache.Set("d1", ([], ["Id"], False))
+        Cache.Set(None, ([], [], True))
+        Cache.Close()
+
+        Cache = ParseCache.ParseCache(self.DbPath)
+        self.assertEqual(Cache.Get("d1"), ([], ["Id"], False))
+        self.assertIsNone(Cache.Get(None))
+        Cache.Close()
+
+    def test_version(self):
+        Cache = ParseCache.ParseCache(self.DbPath)
+        Cache.Set("d1", ([], [], False))
+        Cache.Close()
+        Conn = sqlite3.connect(self.DbPath)
+        Conn.execute("PRAGMA user_version=%d" % (ParseCache.PARSE_CACHE_VERSION - 1))
+        Conn.close()
+
+        Cache = ParseCache.ParseCache(self.DbPath)
+        self.assertIsNone(Cache.Get("d1"))
+        Cache.Close()
+
+    def test_broken(self):
+        with open(self.DbPath, "wb") as Fd:
+            Fd.write(b"not a database" * 100)
+        Cache = ParseCache.ParseCache(self.DbPath)
+        Cache.Set("d1", ([], [], False))
+        self.assertEqual(Cache.Get("d1"), ([], [], False))
+        Cache.Close()
+
+TheTestSuite = TestTools.MakeTheTestSuite(locals())
+
+if __name__ == '__main__':
+    allTests = TheTestSuite()
+    unittest.TextTestRunner().run(allTests)
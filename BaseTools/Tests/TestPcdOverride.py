@@ -0,0 +1,218 @@
+## @file
+# Unit tests for the platform PCD settings applied to the modules by AutoGen
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import TestTools
+
+BaseToolsDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PythonSourceDir = os.path.join(BaseToolsDir, "Source", "Python")
+
+TEST_DEC = """[Defines]
+  DEC_SPECIFICATION              = 0x00010005
+  PACKAGE_NAME                   = PcdPkg
+  PACKAGE_GUID                   = 0A6F1C1E-8E7B-4D3A-9E0B-3C1D2E4F5A61
+  PACKAGE_VERSION                = 0.1
+
+[Guids]
+  gPcdPkgTokenSpaceGuid = { 0x1c2a3b4d, 0x5e6f, 0x4a7b, { 0x8c, 0x9d, 0xae, 0xbf, 0xc0, 0xd1, 0xe2, 0xf3 } }
+  gPcdPkgVariableGuid   = { 0x2d3b4c5e, 0x6f70, 0x4b8c, { 0x9d, 0xae, 0xbf, 0xc0, 0xd1, 0xe2, 0xf3, 0x04 } }
+
+[PcdsFixedAtBuild, PcdsPatchableInModule]
+  gPcdPkgTokenSpaceGuid.PcdFromCommandLine|0x1|UINT32|0x00000001
+  gPcdPkgTokenSpaceGuid.PcdPatchable|0x2|UINT32|0x00000002
+  gPcdPkgTokenSpaceGuid.PcdMixed|0x4|UINT32|0x00000004
+
+[PcdsDynamic, PcdsDynamicEx]
+  gPcdPkgTokenSpaceGuid.PcdHii|0x3|UINT32|0x00000003
+"""
+
+#
+# PcdMixed is FixedAtBuild in a source module and PatchableInModule in a
+# binary module, PcdFromCommandLine is also set in the scope of a module
+#
+TEST_DSC = """[Defines]
+  PLATFORM_NAME                  = PcdPkg
+  PLATFORM_GUID                  = 3E4C5D6F-7081-4C9D-AEBF-C0D1E2F30415
+  PLATFORM_VERSION               = 0.1
+  DSC_SPECIFICATION              = 0x00010005
+  OUTPUT_DIRECTORY               = Build/PcdPkg
+  SUPPORTED_ARCHITECTURES        = X64
+  BUILD_TARGETS                  = DEBUG
+  SKUID_IDENTIFIER               = DEFAULT
+
+[PcdsFixedAtBuild]
+  gPcdPkgTokenSpaceGuid.PcdFromCommandLine|0x10
+  gPcdPkgTokenSpaceGuid.PcdMixed|0x40
+
+[PcdsPatchableInModule]
+  gPcdPkgTokenSpaceGuid.PcdPatchable|0x21
+  gPcdPkgTokenSpaceGuid.PcdMixed|0x41
+
+[PcdsDynamicHii]
+  gPcdPkgTokenSpaceGuid.PcdHii|L"Setup"|gPcdPkgVariableGuid|0x0|0x30
+
+[Components]
+  PcdPkg/Fixed/Fixed.inf {
+    <PcdsFixedAtBuild>
+      gPcdPkgTokenSpaceGuid.PcdFromCommandLine|0x11
+  }
+  PcdPkg/Patchable/Patchable.inf
+  PcdPkg/Binary/Binary.inf
+"""
+
+TEST_INF = """[Defines]
+  INF_VERSION                    = 0x00010005
+  BASE_NAME                      = %(Name)s
+  FILE_GUID                      = %(Guid)s
+  MODULE_TYPE                    = DXE_DRIVER
+  VERSION_STRING                 = 1.0
+  ENTRY_POINT                    = %(Name)sEntry
+
+[Sources]
+  %(Name)s.c
+
+[Packages]
+  PcdPkg/PcdPkg.dec
+
+[%(Section)s]
+%(Pcds)s
+
+[Pcd]
+  gPcdPkgTokenSpaceGuid.PcdHii
+
+[Depex]
+  TRUE
+"""
+
+TEST_BINARY_INF = """[Defines]
+  INF_VERSION                    = 0x00010017
+  BASE_NAME                      = Binary
+  FILE_GUID                      = 1A2B3C4D-5E6F-4A0B-8C1D-2E3F4A5B6C7D
+  MODULE_TYPE                    = DXE_DRIVER
+  VERSION_STRING                 = 1.0
+  ENTRY_POINT                    = BinaryEntry
+
+[Packages]
+  PcdPkg/PcdPkg.dec
+
+[Binaries.X64]
+  PE32|Binary.efi
+
+[PatchPcd.X64]
+  gPcdPkgTokenSpaceGuid.PcdMixed|0x41|0x100
+
+[Depex.X64]
+  TRUE
+"""
+
+#
+# The PCD values in AutoGen.h and in the PCD report of the sample platform,
+# as generated before the PCD lookups of AutoGen were indexed
+#
+BASELINE_AUTOGEN = {
+    "Fixed": [
+        "#define _PCD_TOKEN_PcdMixed  3U",
+        "#define _PCD_VALUE_PcdMixed  0x4U",
+        "#define _PCD_TOKEN_PcdFromCommandLine  1U",
+        "#define _PCD_VALUE_PcdFromCommandLine  0x42U",
+        "#define _PCD_TOKEN_PcdHii  0U",
+        ],
+    "Patchable": [
+        "#define _PCD_TOKEN_PcdPatchable  2U",
+        "#define _PCD_PATCHABLE_VALUE_PcdPatchable  ((UINT32)0x21U)",
+        "#define _PCD_TOKEN_PcdHii  0U",
+        ],
+    }
+
+BASELINE_REPORT = [
+    "gPcdPkgTokenSpaceGuid.PcdMixed",
+    "*P PcdHii : DYNHII (UINT32) = 0x30 (48)",
+    "gPcdPkgVariableGuid: L\"Setup\": 0x0",
+    "DEC DEFAULT = 0x3 (3)",
+    "*B PcdFromCommandLine : FIXED (UINT32) = 0x42 (66)",
+    "DSC DEFAULT = 0x10 (16)",
+    "DEC DEFAULT = 0x1 (1)",
+    "PcdMixed : PATCH (UINT32) = 0x4 (4)",
+    "*M Binary.inf = 0x41 (65)",
+    "*P PcdPatchable : PATCH (UINT32) = 0x21 (33)",
+    "DEC DEFAULT = 0x2 (2)",
+    "*B PcdFromCommandLine : FIXED (UINT32) = 0x42 (66)",
+    "DSC DEFAULT = 0x10 (16)",
+    "DEC DEFAULT = 0x1 (1)",
+    "*P PcdPatchable : PATCH (UINT32) = 0x21 (33)",
+    "DEC DEFAULT = 0x2 (2)",
+    "*M PcdMixed : PATCH (UINT32) = 0x41 (65)",
+    "DEC DEFAULT = 0x4 (4)",
+    ]
+
+class TestPcdOverride(unittest.TestCase):
+    def setUp(self):
+        self.Workspace = tempfile.mkdtemp()
+        Package = os.path.join(self.Workspace, "PcdPkg")
+        self.WriteFile(os.path.join(Package, "PcdPkg.dec"), TEST_DEC)
+        self.WriteFile(os.path.join(Package, "PcdPkg.dsc"), TEST_DSC)
+        self.WriteFile(os.path.join(Package, "Fixed", "Fixed.inf"), TEST_INF % {
+            "Name" : "Fixed", "Guid" : "ED1A2B3C-4D5E-4F60-8172-839405A6B7C8", "Section" : "FixedPcd",
+            "Pcds" : "  gPcdPkgTokenSpaceGuid.PcdMixed\n  gPcdPkgTokenSpaceGuid.PcdFromCommandLine"})
+        self.WriteFile(os.path.join(Package, "Patchable", "Patchable.inf"), TEST_INF % {
+            "Name" : "Patchable", "Guid" : "FE2B3C4D-5E6F-4071-8283-9405A6B7C8D9", "Section" : "PatchPcd",
+            "Pcds" : "  gPcdPkgTokenSpaceGuid.PcdPatchable"})
+        for Name in ("Fixed", "Patchable"):
+            self.WriteFile(os.path.join(Package, Name, Name + ".c"), "int %sEntry (void) { return 0; }\n" % Name)
+        self.WriteFile(os.path.join(Package, "Binary", "Binary.inf"), TEST_BINARY_INF)
+        self.WriteFile(os.path.join(Package, "Binary", "Binary.efi"), "MZ")
+        # the Conf directory of a workspace set up by edksetup
+        os.makedirs(os.path.join(self.Workspace, "Conf"))
+        for Name in ("target", "tools_def", "build_rule"):
+            shutil.copy(os.path.join(BaseToolsDir, "Conf", Name + ".template"),
+                        os.path.join(self.Workspace, "Conf", Name + ".txt"))
+
+    def tearDown(self):
+        shutil.rmtree(self.Workspace)
+
+    def WriteFile(self, Path, Content):
+        if not os.path.isdir(os.path.dirname(Path)):
+            os.makedirs(os.path.dirname(Path))
+        with open(Path, "w") as Fd:
+            Fd.write(Content)
+
+    def test_pcd_values(self):
+        Env = dict(os.environ, WORKSPACE=self.Workspace, EDK_TOOLS_PATH=BaseToolsDir, PYTHONPATH=PythonSourceDir)
+        Env.pop("CONF_PATH", None)
+        Env.pop("PACKAGES_PATH", None)
+        Command = [sys.executable, os.path.join(PythonSourceDir, "build", "build.py"),
+                   "-p", "PcdPkg/PcdPkg.dsc", "-a", "X64", "-t", "GCC5", "-b", "DEBUG", "-n", "1",
+                   "--pcd", "gPcdPkgTokenSpaceGuid.PcdFromCommandLine=0x42",
+                   "-y", "Report.txt", "-Y", "PCD", "genc"]
+        Proc = subprocess.Popen(Command, cwd=self.Workspace, env=Env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        Output = Proc.communicate()[0].decode("utf-8", "ignore")
+        self.assertEqual(Proc.returncode, 0, Output)
+
+        BuildDir = os.path.join(self.Workspace, "Build", "PcdPkg", "DEBUG_GCC5", "X64", "PcdPkg")
+        for Name in BASELINE_AUTOGEN:
+            with open(os.path.join(BuildDir, Name, Name, "DEBUG", "AutoGen.h")) as Fd:
+                Defines = [Line.strip() for Line in Fd
+                           if re.match("#define _PCD_(TOKEN|VALUE|PATCHABLE_VALUE)_", Line)]
+            self.assertEqual(Defines, BASELINE_AUTOGEN[Name], Name)
+
+        # the PCD lines of the report, without the alignment
+        with open(os.path.join(self.Workspace, "Report.txt")) as Fd:
+            Report = [" ".join(Line.split()) for Line in Fd
+                      if " = " in Line or Line.lstrip().startswith(("gPcdPkgTokenSpaceGuid.", "gPcdPkgVariableGuid"))]
+        self.assertEqual(Report, BASELINE_REPORT)
+
+TheTestSuite = TestTools.MakeTheTestSuite(locals())
+
+if __name__ == '__main__':
+    allTests = TheTestSuite()
+    unittest.TextTestRunner().run(allTests)
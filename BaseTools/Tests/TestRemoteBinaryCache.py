@@ -0,0 +1,121 @@
+## @file
+# Unit tests for the remote binary cache client and the cache server script
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import TestTools
+from AutoGen import BinaryCache
+from Common import GlobalData
+
+ModuleAutoGen = TestTools.ImportFromWorkspace("AutoGen.ModuleAutoGen")
+
+ServerScript = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Scripts", "BinCacheServer.py")
+
+## The attributes of a module used by the preflight lookup of the binary cache
+class ModuleStub(object):
+    Name = "Driver"
+    Arch = "X64"
+    PreflightHash = "Driver-preflight"
+
+    def __init__(self, Dir):
+        self.OutputDir = os.path.join(Dir, "OUTPUT")
+        self.BuildDir = Dir
+        self.MetaFile = type("MetaFileStub", (object,), {"Path" : os.path.join(Dir, "Driver.inf")})
+
+    def GetBinCacheDir(self, CacheRoot):
+        return os.path.join(CacheRoot, "Platform", "DEBUG_GCC5", "X64", "Pkg", self.Name)
+
+    AttemptPreflightCacheCopy = ModuleAutoGen.ModuleAutoGen.AttemptPreflightCacheCopy
+    _RestoreFromCache = ModuleAutoGen.ModuleAutoGen._RestoreFromCache
+
+class TestRemoteBinaryCache(unittest.TestCase):
+    def setUp(self):
+        self.Dir = tempfile.mkdtemp()
+        self.ServerDir = os.path.join(self.Dir, "server")
+        self.Server = subprocess.Popen([sys.executable, ServerScript, self.ServerDir, "--port", "0", "--quiet"],
+                                       stdout=subprocess.PIPE, universal_newlines=True)
+        Port = re.search(r":(\d+)/", self.Server.stdout.readline()).group(1)
+        self.Url = "http://127.0.0.1:%s" % Port
+
+    def tearDown(self):
+        self.Server.terminate()
+        self.Server.wait()
+        self.Server.stdout.close()
+        shutil.rmtree(self.Dir, True)
+
+    def Manager(self, Name, Url=None):
+        return BinaryCache.RemoteCacheManager(Url or self.Url, os.path.join(self.Dir, Name))
+
+    def Publish(self, Manager, Module, Outputs, Preflight=None):
+        Files = {}
+        for Name, Content in Outputs.items():
+            FilePath = os.path.join(self.Dir, Name)
+            with open(FilePath, "wb") as Fd:
+                Fd.write(Content)
+            Files[Name] = Manager.Store.Put(FilePath)
+        ManifestFile = os.path.join(Manager.Root, "Platform", "DEBUG_GCC5", "X64", "Pkg", Module, Module + BinaryCache.MANIFEST_SUFFIX)
+        BinaryCache.SaveManifest(ManifestFile, Module + "-hash", Files, Preflight=Preflight)
+        Manager.Publish(ManifestFile)
+        return ManifestFile
+
+    def test_push_and_fetch(self):
+        Pusher = self.Manager("pusher")
+        self.Publish(Pusher, "Driver", {"Driver.efi" : b"driver", "Driver.inf" : b"inf"})
+        self.Publish(Pusher, "Shared", {"Shared.efi" : b"driver"})
+        Pusher.Flush()
+        Objects = [Name for Root, Dirs, Files in os.walk(os.path.join(self.ServerDir, "objects")) for Name in Files]
+        self.assertEqual(len(Objects), 2)
+
+        Consumer = self.Manager("consumer")
+        ManifestFile = os.path.join(Consumer.Root, "Platform", "DEBUG_GCC5", "X64", "Pkg", "Driver", "Driver" + BinaryCache.MANIFEST_SUFFIX)
+        Manifest = Consumer.GetManifest(ManifestFile)
+        self.assertEqual(Manifest["Hash"], "Driver-hash")
+        # the other manifests of the platform came with the same request
+        self.assertTrue(os.path.isfile(ManifestFile.replace("Driver", "Shared")))
+        self.assertTrue(Consumer.FetchObjects(Manifest["Files"].values()))
+        with open(Consumer.Store.ObjectPath(Manifest["Files"]["Driver.efi"]), "rb") as Fd:
+            self.assertEqual(Fd.read(), b"driver")
+
+        # an object the server doesn't have makes a miss
+        self.assertFalse(Consumer.FetchObjects(["0" * 64]))
+
+    def test_preflight_from_remote(self):
+        Pusher = self.Manager("pusher")
+        self.Publish(Pusher, "Driver", {"Driver.efi" : b"driver"}, ModuleStub.PreflightHash)
+        Pusher.Flush()
+
+        # a build with an empty local mirror of the remote cache
+        Saved = (GlobalData.gConfDirectory, GlobalData.gBinCacheSource, dict(BinaryCache._Managers))
+        GlobalData.gConfDirectory = os.path.join(self.Dir, "Conf")
+        GlobalData.gBinCacheSource = self.Url
+        BinaryCache._Managers.clear()
+        try:
+            Module = ModuleStub(os.path.join(self.Dir, "build"))
+            self.assertTrue(Module.AttemptPreflightCacheCopy())
+            with open(os.path.join(Module.OutputDir, "Driver.efi"), "rb") as Fd:
+                self.assertEqual(Fd.read(), b"driver")
+        finally:
+            GlobalData.gConfDirectory, GlobalData.gBinCacheSource, Managers = Saved
+            BinaryCache._Managers.clear()
+            BinaryCache._Managers.update(Managers)
+
+    def test_server_unreachable(self):
+        Consumer = self.Manager("consumer", "http://127.0.0.1:1")
+        ManifestFile = os.path.join(Consumer.Root, "Platform", "DEBUG_GCC5", "X64", "Pkg", "Driver", "Driver" + BinaryCache.MANIFEST_SUFFIX)
+        self.assertIsNone(Consumer.GetManifest(ManifestFile))
+        self.assertFalse(Consumer.FetchObjects(["0" * 64]))
+
+TheTestSuite = TestTools.MakeTheTestSuite(locals())
+
+if __name__ == '__main__':
+    allTests = TheTestSuite()
+    unittest.TextTestRunner().run(allTests)
@@ -0,0 +1,56 @@
+## @file
+# Unit tests for the STRING_TOKEN search of AutoGen.StrGather
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+import TestTools
+from AutoGen import StrGather
+
+class TestStringTokens(unittest.TestCase):
+    def setUp(self):
+        self.TempDir = tempfile.mkdtemp()
+        StrGather.gStringTokenCache.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.TempDir)
+        StrGather.gStringTokenCache.clear()
+
+    def WriteFile(self, Name, Content):
+        FilePath = os.path.join(self.TempDir, Name)
+        with open(FilePath, 'wb') as Fd:
+            Fd.write(Content)
+        return FilePath
+
+    def test_search(self):
+        First = self.WriteFile('First.c', b'Id = STRING_TOKEN (STR_B);\r\nId = STRING_TOKEN(STR_A );\r\n// STRING_TOKEN (\r\nSTR_NOT)\r\n')
+        Second = self.WriteFile('Second.vfr', b'prompt = STRING_TOKEN(STR_A), help = STRING_TOKEN(STR_C),\n')
+        self.assertEqual(StrGather.SearchStringTokens([First, Second]), ['STR_A', 'STR_B', 'STR_C'])
+        self.assertEqual(len(StrGather.gStringTokenCache), 2)
+
+        # a changed file is searched again
+        self.WriteFile('Second.vfr', b'help = STRING_TOKEN(STR_D),\n')
+        self.assertEqual(StrGather.SearchStringTokens([First, Second]), ['STR_A', 'STR_B', 'STR_D'])
+        self.assertEqual(len(StrGather.gStringTokenCache), 3)
+
+    def test_load_cache(self):
+        Source = self.WriteFile('Source.c', b'Id = STRING_TOKEN (STR_A);\n')
+        Digest, StringTokens = StrGather.SearchFileStringTokens(Source)
+        CacheFile = self.WriteFile('Strings.cache', json.dumps({"Key" : "", "SourceTokens" : {Source : [Digest, ['STR_CACHED']]}}).encode())
+
+        StrGather.gStringTokenCache.clear()
+        Cache = StrGather.LoadStringCache(CacheFile)
+        self.assertFalse(StrGather.IsStringCacheValid(Cache, "Key"))
+        self.assertEqual(StrGather.SearchStringTokens([Source]), ['STR_CACHED'])
+
+TheTestSuite = TestTools.MakeTheTestSuite(locals())
+
+if __name__ == '__main__':
+    allTests = TheTestSuite()
+    unittest.TextTestRunner().run(allTests)
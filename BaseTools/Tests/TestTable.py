@@ -0,0 +1,50 @@
+## @file
+# Unit tests for the batch inserts and the indexes of the database tables
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+
+import sqlite3
+import unittest
+
+import TestTools
+from Table.Table import FlushTables
+from Table.TableFunction import TableFunction
+from Table.TableIdentifier import TableIdentifier
+
+class TestTable(unittest.TestCase):
+    def setUp(self):
+        self.Conn = sqlite3.connect(':memory:')
+        self.Cur = self.Conn.cursor()
+        self.Function = TableFunction(self.Cur)
+        self.Function.Create()
+        self.Identifier = TableIdentifier(self.Cur)
+        self.Identifier.Table = 'Identifier1'
+        self.Identifier.Create()
+
+    def tearDown(self):
+        FlushTables()
+        self.Conn.close()
+
+    def test_batch_insert(self):
+        ID = self.Function.Insert("", "", "Func'1", "", 1, 0, 9, 1, 2, 0, 1, 1, 0)
+        self.assertEqual(ID, 1)
+        self.Identifier.Insert("", "", "Id'1", "Value'1", 1, 1, -1, 3, 0, 3, 8)
+        # pending records are written before the tables are read, whatever table is queried
+        self.assertEqual(self.Identifier.Exec("select Name from Function"), [("Func'1",)])
+        self.assertEqual(self.Identifier.Exec("select Name, Value from Identifier1"), [("Id'1", "Value'1")])
+        self.Function.Insert("", "", "Func2", "", 11, 0, 19, 1, 12, 0, 1, 11, 0)
+        self.assertEqual(self.Function.GetCount(), 2)
+
+    def test_index(self):
+        self.Identifier.Insert("", "", "Id1", "", 1, 1, -1, 3, 0, 3, 8)
+        self.Identifier.CreateIndex('Model')
+        self.Identifier.CreateIndex('Model')
+        self.assertEqual(self.Identifier.Exec("select name from sqlite_master where type = 'index'"), [('Identifier1_Model',)])
+        self.assertEqual(self.Identifier.GetCount(), 1)
+
+TheTestSuite = TestTools.MakeTheTestSuite(locals())
+
+if __name__ == '__main__':
+    allTests = TheTestSuite()
+    unittest.TextTestRunner().run(allTests)
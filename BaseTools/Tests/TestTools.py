@@ -11,14 +11,17 @@ from __future__ import print_function
 # Import Modules
 #
 import base64
+import importlib
 import os
 import os.path
 import random
 import shutil
 import subprocess
 import sys
+import tempfile
 import unittest
 import codecs
+from unittest import mock
 
 TestsDir = os.path.realpath(os.path.split(sys.argv[0])[0])
 BaseToolsDir = os.path.realpath(os.path.join(TestsDir, '..'))
@@ -43,6 +46,29 @@ def MakeTheTestSuite(localItems):
                 tests.append(item())
     return lambda: unittest.TestSuite(tests)
 
+##
+# Import a BaseTools module which loads the Conf files of a workspace when it
+# is imported. It is imported in a temporary workspace with the Conf templates,
+# the files it creates in the current directory go there too.
+#
+def ImportFromWorkspace(ModuleName):
+    SourceBaseToolsDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    Workspace = tempfile.mkdtemp()
+    CurrentDir = os.getcwd()
+    try:
+        os.makedirs(os.path.join(Workspace, 'Conf'))
+        for Name in ('target', 'tools_def', 'build_rule'):
+            shutil.copy(os.path.join(SourceBaseToolsDir, 'Conf', Name + '.template'),
+                        os.path.join(Workspace, 'Conf', Name + '.txt'))
+        os.chdir(Workspace)
+        with mock.patch.dict(os.environ, {'WORKSPACE' : Workspace}):
+            os.environ.pop('CONF_PATH', None)
+            return importlib.import_module(ModuleName)
+    finally:
+        os.chdir(CurrentDir)
+        # the files created by the module may still be open
+        shutil.rmtree(Workspace, True)
+
 def GetBaseToolsPaths():
     if sys.platform in ('win32', 'win64'):
         return [ os.path.join(BaseToolsDir, 'Bin', sys.platform.title()) ]
@@ -0,0 +1,93 @@
+## @file
+# Unit tests for the cache of the preprocessed .uni files of AutoGen.UniClassObject
+#
+# Copyright (c) 2020, Intel Corporation. All rights reserved.<BR>
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import TestTools
+from AutoGen import UniClassObject
+from Common.Misc import PathClass
+
+TEST_UNI = u"""// the strings of the module
+#langdef en-US "English"
+#langdef fr-FR "Francais"
+
+#string STR_MODULE_NAME       #language en-US  "Test\\tModule"
+                              #language fr-FR  "Module de test"
+#string STR_MODULE_HELP       #language en-US  "Line one\\r\\nLine two \\"quoted\\" \\x0041\\\\path"
+#include "Include/Common.uni"
+#string STR_MODULE_VERSION    #language en-US  "1.0" // a comment
+"""
+
+COMMON_UNI = u"""#string STR_COMMON           #language en-US  "Common"
+                              #language fr-FR  "Commun"
+"""
+
+class TestUniFileCache(unittest.TestCase):
+    def setUp(self):
+        self.TempDir = tempfile.mkdtemp()
+        UniClassObject.gUniFileCache.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.TempDir)
+        UniClassObject.gUniFileCache.clear()
+
+    def WriteFile(self, Name, Content, Encoding='utf-8'):
+        FilePath = os.path.join(self.TempDir, Name)
+        if not os.path.isdir(os.path.dirname(FilePath)):
+            os.makedirs(os.path.dirname(FilePath))
+        with open(FilePath, 'wb') as Fd:
+            Fd.write(Content.encode(Encoding))
+        return FilePath
+
+    ## The language and string definitions of the .uni file
+    def Definitions(self, UniFile):
+        UniObj = UniClassObject.UniFileClassObject([PathClass(UniFile, self.TempDir)])
+        return UniObj.LanguageDef, dict((Lang, [str(Item) for Item in StringList])
+                                        for (Lang, StringList) in UniObj.OrderedStringList.items())
+
+    ## The definitions of the .uni file processed without the cache
+    def UncachedDefinitions(self, UniFile):
+        SavedCache = dict(UniClassObject.gUniFileCache)
+        UniClassObject.gUniFileCache.clear()
+        try:
+            return self.Definitions(UniFile)
+        finally:
+            UniClassObject.gUniFileCache.clear()
+            UniClassObject.gUniFileCache.update(SavedCache)
+
+    def test_cache(self):
+        UniFile = self.WriteFile('Test.uni', TEST_UNI)
+        self.WriteFile(os.path.join('Include', 'Common.uni'), COMMON_UNI, 'utf-16')
+        Expected = self.UncachedDefinitions(UniFile)
+        self.assertEqual(Expected[1]['fr-FR'][4], "'STR_COMMON' 4 False 'Commun\\x00' ''")
+
+        # processed twice, the second time from the cache
+        self.assertEqual(self.Definitions(UniFile), Expected)
+        self.assertEqual(len(UniClassObject.gUniFileCache), 2)
+        self.assertEqual(self.Definitions(UniFile), Expected)
+        self.assertEqual(len(UniClassObject.gUniFileCache), 2)
+
+        # the changed file is processed again, the included file comes from the cache
+        UniFile = self.WriteFile('Test.uni', TEST_UNI.replace(u'"1.0"', u'"2.0"'))
+        Changed = self.Definitions(UniFile)
+        self.assertNotEqual(Changed, Expected)
+        self.assertEqual(Changed, self.UncachedDefinitions(UniFile))
+        self.assertEqual(len(UniClassObject.gUniFileCache), 3)
+
+        # and so is a changed included file
+        self.WriteFile(os.path.join('Include', 'Common.uni'), COMMON_UNI.replace(u'"Commun"', u'"Partage"'), 'utf-16')
+        Changed = self.Definitions(UniFile)
+        self.assertEqual(Changed[1]['fr-FR'][4], "'STR_COMMON' 4 False 'Partage\\x00' ''")
+        self.assertEqual(Changed, self.UncachedDefinitions(UniFile))
+
+TheTestSuite = TestTools.MakeTheTestSuite(locals())
+
+if __name__ == '__main__':
+    allTests = TheTestSuite()
+    unittest.TextTestRunner().run(allTests)